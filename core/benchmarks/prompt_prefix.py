@@ -0,0 +1,70 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measures prompt prefix analysis of a conversation that grows by a turn per request.
+
+Compares the incremental analyzer, which only hashes the new messages of every
+turn, with hashing every prompt from scratch.
+
+Usage: python benchmarks/prompt_prefix.py
+"""
+
+import time
+
+from llm_tracekit.core import Message, PromptPrefixAnalyzer
+
+_TURNS = 200
+_RUNS = 5
+
+
+def _conversation() -> list[list[Message]]:
+    messages = [Message(role="system", content="You are a support agent. " * 200)]
+    prompts = []
+    for turn in range(_TURNS):
+        messages.append(Message(role="user", content=f"question {turn} " * 60))
+        prompts.append(list(messages))
+        messages.append(Message(role="assistant", content=f"answer {turn} " * 120))
+    return prompts
+
+
+def _best_of(run) -> float:
+    best = float("inf")
+    for _ in range(_RUNS):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    prompts = _conversation()
+    total_chars = PromptPrefixAnalyzer().fingerprint(prompts[-1])[0]
+
+    def incremental() -> None:
+        analyzer = PromptPrefixAnalyzer()
+        for prompt in prompts:
+            analyzer.analyze("model", prompt)
+
+    def from_scratch() -> None:
+        analyzer = PromptPrefixAnalyzer(cache_size=0)
+        for prompt in prompts:
+            analyzer.analyze("model", prompt)
+
+    print(f"{_TURNS} turns, {total_chars} characters in the last prompt")
+    print(f"incremental:   {_best_of(incremental) * 1000 / _TURNS:8.3f} ms/request")
+    print(f"from scratch:  {_best_of(from_scratch) * 1000 / _TURNS:8.3f} ms/request")
+
+
+if __name__ == "__main__":
+    main()
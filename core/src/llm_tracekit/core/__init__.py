@@ -21,16 +21,239 @@ from llm_tracekit.core.coralogix import (
     generate_exporter_config as generate_exporter_config,
     ExportConfig as ExportConfig,
 )
+from llm_tracekit.core._async_exporter import (
+    AsyncOTLPSpanProcessor as AsyncOTLPSpanProcessor,
+)
 from llm_tracekit.core._config import (
     is_content_enabled as is_content_enabled,
     enable_capture_content as enable_capture_content,
     handle_span_exception as handle_span_exception,
     OTEL_INSTRUMENTATION_GENAI_CAPTURE_MESSAGE_CONTENT as OTEL_INSTRUMENTATION_GENAI_CAPTURE_MESSAGE_CONTENT,
+    is_content_event_mode_enabled as is_content_event_mode_enabled,
+    enable_content_event_mode as enable_content_event_mode,
+    OTEL_INSTRUMENTATION_GENAI_CONTENT_EXPORT_MODE as OTEL_INSTRUMENTATION_GENAI_CONTENT_EXPORT_MODE,
+    is_redaction_enabled as is_redaction_enabled,
+    enable_redaction as enable_redaction,
+    OTEL_INSTRUMENTATION_GENAI_REDACT_CONTENT as OTEL_INSTRUMENTATION_GENAI_REDACT_CONTENT,
+    is_deferred_stream_processing_enabled as is_deferred_stream_processing_enabled,
+    enable_deferred_stream_processing as enable_deferred_stream_processing,
+    OTEL_INSTRUMENTATION_GENAI_DEFER_STREAM_PROCESSING as OTEL_INSTRUMENTATION_GENAI_DEFER_STREAM_PROCESSING,
+    get_embedding_vector_capture_mode as get_embedding_vector_capture_mode,
+    get_embedding_vector_prefix_length as get_embedding_vector_prefix_length,
+    set_embedding_vector_capture_mode as set_embedding_vector_capture_mode,
+    OTEL_INSTRUMENTATION_GENAI_EMBEDDING_VECTOR_CAPTURE as OTEL_INSTRUMENTATION_GENAI_EMBEDDING_VECTOR_CAPTURE,
+    OTEL_INSTRUMENTATION_GENAI_EMBEDDING_VECTOR_PREFIX_LENGTH as OTEL_INSTRUMENTATION_GENAI_EMBEDDING_VECTOR_PREFIX_LENGTH,
+    EMBEDDING_VECTOR_CAPTURE_FULL as EMBEDDING_VECTOR_CAPTURE_FULL,
+    EMBEDDING_VECTOR_CAPTURE_SUMMARY as EMBEDDING_VECTOR_CAPTURE_SUMMARY,
+    EMBEDDING_VECTOR_CAPTURE_INT8 as EMBEDDING_VECTOR_CAPTURE_INT8,
+    EMBEDDING_VECTOR_CAPTURE_FLOAT16 as EMBEDDING_VECTOR_CAPTURE_FLOAT16,
+    EMBEDDING_VECTOR_CAPTURE_PREFIX as EMBEDDING_VECTOR_CAPTURE_PREFIX,
+    EMBEDDING_VECTOR_CAPTURE_MODES as EMBEDDING_VECTOR_CAPTURE_MODES,
+    get_embedding_input_sample_size as get_embedding_input_sample_size,
+    set_embedding_input_sample_size as set_embedding_input_sample_size,
+    OTEL_INSTRUMENTATION_GENAI_EMBEDDING_INPUT_SAMPLE_SIZE as OTEL_INSTRUMENTATION_GENAI_EMBEDDING_INPUT_SAMPLE_SIZE,
+    is_prompt_prefix_analysis_enabled as is_prompt_prefix_analysis_enabled,
+    enable_prompt_prefix_analysis as enable_prompt_prefix_analysis,
+    OTEL_INSTRUMENTATION_GENAI_PROMPT_PREFIX_ANALYSIS as OTEL_INSTRUMENTATION_GENAI_PROMPT_PREFIX_ANALYSIS,
+    is_duplicate_call_detection_enabled as is_duplicate_call_detection_enabled,
+    enable_duplicate_call_detection as enable_duplicate_call_detection,
+    OTEL_INSTRUMENTATION_GENAI_DUPLICATE_CALL_DETECTION as OTEL_INSTRUMENTATION_GENAI_DUPLICATE_CALL_DETECTION,
+    is_response_cache_enabled as is_response_cache_enabled,
+    enable_response_cache as enable_response_cache,
+    get_response_cache_path as get_response_cache_path,
+    OTEL_INSTRUMENTATION_GENAI_RESPONSE_CACHE as OTEL_INSTRUMENTATION_GENAI_RESPONSE_CACHE,
+    OTEL_INSTRUMENTATION_GENAI_RESPONSE_CACHE_PATH as OTEL_INSTRUMENTATION_GENAI_RESPONSE_CACHE_PATH,
+    is_token_usage_estimation_enabled as is_token_usage_estimation_enabled,
+    enable_token_usage_estimation as enable_token_usage_estimation,
+    OTEL_INSTRUMENTATION_GENAI_ESTIMATE_TOKEN_USAGE as OTEL_INSTRUMENTATION_GENAI_ESTIMATE_TOKEN_USAGE,
+    is_stream_usage_injection_enabled as is_stream_usage_injection_enabled,
+    enable_stream_usage_injection as enable_stream_usage_injection,
+    OTEL_INSTRUMENTATION_GENAI_INJECT_STREAM_USAGE as OTEL_INSTRUMENTATION_GENAI_INJECT_STREAM_USAGE,
+    is_http_timing_enabled as is_http_timing_enabled,
+    enable_http_timing as enable_http_timing,
+    OTEL_INSTRUMENTATION_GENAI_HTTP_TIMING as OTEL_INSTRUMENTATION_GENAI_HTTP_TIMING,
+    is_rate_limit_capture_enabled as is_rate_limit_capture_enabled,
+    enable_rate_limit_capture as enable_rate_limit_capture,
+    OTEL_INSTRUMENTATION_GENAI_CAPTURE_RATE_LIMITS as OTEL_INSTRUMENTATION_GENAI_CAPTURE_RATE_LIMITS,
+    is_content_offload_enabled as is_content_offload_enabled,
+    enable_content_offload as enable_content_offload,
+    get_content_offload_path as get_content_offload_path,
+    get_content_offload_threshold as get_content_offload_threshold,
+    OTEL_INSTRUMENTATION_GENAI_CONTENT_OFFLOAD_PATH as OTEL_INSTRUMENTATION_GENAI_CONTENT_OFFLOAD_PATH,
+    OTEL_INSTRUMENTATION_GENAI_CONTENT_OFFLOAD_THRESHOLD as OTEL_INSTRUMENTATION_GENAI_CONTENT_OFFLOAD_THRESHOLD,
+    DEFAULT_CONTENT_OFFLOAD_THRESHOLD as DEFAULT_CONTENT_OFFLOAD_THRESHOLD,
+)
+from llm_tracekit.core._redaction import (
+    Redactor as Redactor,
+    DEFAULT_REDACTION_PATTERNS as DEFAULT_REDACTION_PATTERNS,
+    get_redactor as get_redactor,
+    set_redactor as set_redactor,
+    redact_content as redact_content,
+)
+from llm_tracekit.core._content_events import (
+    emit_message_events as emit_message_events,
+    emit_choice_events as emit_choice_events,
+    DeferredMessageEvents as DeferredMessageEvents,
+    deferred_message_events as deferred_message_events,
 )
 from llm_tracekit.core._metrics import (
     Instruments as Instruments,
     GEN_AI_CLIENT_OPERATION_DURATION_BUCKETS as GEN_AI_CLIENT_OPERATION_DURATION_BUCKETS,
     GEN_AI_CLIENT_TOKEN_USAGE_BUCKETS as GEN_AI_CLIENT_TOKEN_USAGE_BUCKETS,
+    GEN_AI_CLIENT_STREAM_BUFFERED_BYTES as GEN_AI_CLIENT_STREAM_BUFFERED_BYTES,
+    GEN_AI_CLIENT_STREAM_CAPTURE_DEGRADATIONS as GEN_AI_CLIENT_STREAM_CAPTURE_DEGRADATIONS,
+    GEN_AI_CLIENT_TOKEN_CACHE_HIT_RATIO as GEN_AI_CLIENT_TOKEN_CACHE_HIT_RATIO,
+    GEN_AI_CLIENT_TOKEN_CACHE_HIT_RATIO_BUCKETS as GEN_AI_CLIENT_TOKEN_CACHE_HIT_RATIO_BUCKETS,
+    GEN_AI_CLIENT_PROMPT_CACHEABLE_PREFIX_SHARE as GEN_AI_CLIENT_PROMPT_CACHEABLE_PREFIX_SHARE,
+    GEN_AI_CLIENT_REQUESTS as GEN_AI_CLIENT_REQUESTS,
+    GEN_AI_CLIENT_CACHE_HIT_DURATION as GEN_AI_CLIENT_CACHE_HIT_DURATION,
+    GEN_AI_CLIENT_CACHE_HIT_DURATION_BUCKETS as GEN_AI_CLIENT_CACHE_HIT_DURATION_BUCKETS,
+    GEN_AI_CLIENT_HTTP_PHASE_DURATION as GEN_AI_CLIENT_HTTP_PHASE_DURATION,
+    GEN_AI_CLIENT_HTTP_PHASE_DURATION_BUCKETS as GEN_AI_CLIENT_HTTP_PHASE_DURATION_BUCKETS,
+    GEN_AI_CLIENT_RATE_LIMIT_REMAINING as GEN_AI_CLIENT_RATE_LIMIT_REMAINING,
+    GEN_AI_CLIENT_RATE_LIMIT_LIMIT as GEN_AI_CLIENT_RATE_LIMIT_LIMIT,
+    GEN_AI_CLIENT_RATE_LIMITED_RESPONSES as GEN_AI_CLIENT_RATE_LIMITED_RESPONSES,
+    GEN_AI_CLIENT_REQUEST_RETRIES as GEN_AI_CLIENT_REQUEST_RETRIES,
+    GEN_AI_CLIENT_RETRY_BACKOFF_DURATION as GEN_AI_CLIENT_RETRY_BACKOFF_DURATION,
+    GEN_AI_CLIENT_RETRY_BACKOFF_DURATION_BUCKETS as GEN_AI_CLIENT_RETRY_BACKOFF_DURATION_BUCKETS,
+    GEN_AI_CLIENT_ACTIVE_REQUESTS as GEN_AI_CLIENT_ACTIVE_REQUESTS,
+    GEN_AI_CLIENT_ACTIVE_STREAMS as GEN_AI_CLIENT_ACTIVE_STREAMS,
+    GEN_AI_CLIENT_OUTPUT_THROUGHPUT as GEN_AI_CLIENT_OUTPUT_THROUGHPUT,
+    GEN_AI_CLIENT_OUTPUT_THROUGHPUT_BUCKETS as GEN_AI_CLIENT_OUTPUT_THROUGHPUT_BUCKETS,
+    GEN_AI_CLIENT_COLLAPSED_ATTRIBUTE_VALUES as GEN_AI_CLIENT_COLLAPSED_ATTRIBUTE_VALUES,
+)
+from llm_tracekit.core._http_timing import (
+    HTTP_PHASE_QUEUE as HTTP_PHASE_QUEUE,
+    HTTP_PHASE_CONNECT as HTTP_PHASE_CONNECT,
+    HTTP_PHASE_TLS as HTTP_PHASE_TLS,
+    HTTP_PHASE_TIME_TO_HEADERS as HTTP_PHASE_TIME_TO_HEADERS,
+    HTTP_PHASE_BODY as HTTP_PHASE_BODY,
+    HttpTimingRecorder as HttpTimingRecorder,
+    attach_http_timing as attach_http_timing,
+)
+from llm_tracekit.core._rate_limits import (
+    RATE_LIMIT_TYPE_REQUESTS as RATE_LIMIT_TYPE_REQUESTS,
+    RATE_LIMIT_TYPE_TOKENS as RATE_LIMIT_TYPE_TOKENS,
+    RATE_LIMIT_TYPE_INPUT_TOKENS as RATE_LIMIT_TYPE_INPUT_TOKENS,
+    RATE_LIMIT_TYPE_OUTPUT_TOKENS as RATE_LIMIT_TYPE_OUTPUT_TOKENS,
+    RateLimit as RateLimit,
+    parse_rate_limit_headers as parse_rate_limit_headers,
+    parse_retry_after as parse_retry_after,
+    record_retry_backoff as record_retry_backoff,
+    track_rate_limits as track_rate_limits,
+)
+from llm_tracekit.core._provider_requests import (
+    provider_build_request as provider_build_request,
+    provider_retry_timeout as provider_retry_timeout,
+)
+from llm_tracekit.core._prompt_cache import (
+    TOKEN_TYPE_CACHED_READ as TOKEN_TYPE_CACHED_READ,
+    TOKEN_TYPE_CACHED_WRITE as TOKEN_TYPE_CACHED_WRITE,
+    cache_hit_ratio as cache_hit_ratio,
+    generate_cache_usage_attributes as generate_cache_usage_attributes,
+    record_cache_usage_metrics as record_cache_usage_metrics,
+)
+from llm_tracekit.core._reasoning import (
+    TOKEN_TYPE_REASONING as TOKEN_TYPE_REASONING,
+    ReasoningTimer as ReasoningTimer,
+    generate_reasoning_usage_attributes as generate_reasoning_usage_attributes,
+    record_reasoning_usage_metrics as record_reasoning_usage_metrics,
+)
+from llm_tracekit.core._throughput import (
+    InFlight as InFlight,
+    in_flight_attributes as in_flight_attributes,
+    track_request as track_request,
+    track_stream as track_stream,
+    record_output_throughput as record_output_throughput,
+    record_stream_output_throughput as record_stream_output_throughput,
+)
+from llm_tracekit.core._cardinality import (
+    DEFAULT_METRIC_ATTRIBUTE_LIMIT as DEFAULT_METRIC_ATTRIBUTE_LIMIT,
+    LIMITED_METRIC_ATTRIBUTES as LIMITED_METRIC_ATTRIBUTES,
+    OTHER_ATTRIBUTE_VALUE as OTHER_ATTRIBUTE_VALUE,
+    MetricAttributeLimiter as MetricAttributeLimiter,
+    SpaceSavingSketch as SpaceSavingSketch,
+    configure_metric_attribute_limiter as configure_metric_attribute_limiter,
+    get_metric_attribute_limiter as get_metric_attribute_limiter,
+    limit_metric_attributes as limit_metric_attributes,
+)
+from llm_tracekit.core._metrics_export import (
+    DEFAULT_EXPONENTIAL_HISTOGRAM_MAX_SIZE as DEFAULT_EXPONENTIAL_HISTOGRAM_MAX_SIZE,
+    DEFAULT_METRIC_EXPORT_INTERVAL_MILLIS as DEFAULT_METRIC_EXPORT_INTERVAL_MILLIS,
+    DELTA_TEMPORALITY as DELTA_TEMPORALITY,
+    HISTOGRAM_BUCKETS as HISTOGRAM_BUCKETS,
+    create_meter_provider as create_meter_provider,
+    create_metric_views as create_metric_views,
+)
+from llm_tracekit.core._memory_budget import (
+    StreamMemoryBudget as StreamMemoryBudget,
+    StreamBufferReservation as StreamBufferReservation,
+    get_stream_memory_budget as get_stream_memory_budget,
+    configure_stream_memory_budget as configure_stream_memory_budget,
+    CAPTURE_MODE_FULL as CAPTURE_MODE_FULL,
+    CAPTURE_MODE_TRUNCATED as CAPTURE_MODE_TRUNCATED,
+    CAPTURE_MODE_METADATA_ONLY as CAPTURE_MODE_METADATA_ONLY,
+)
+from llm_tracekit.core._prompt_prefix import (
+    PromptPrefixAnalyzer as PromptPrefixAnalyzer,
+    CountMinSketch as CountMinSketch,
+    get_prompt_prefix_analyzer as get_prompt_prefix_analyzer,
+    configure_prompt_prefix_analyzer as configure_prompt_prefix_analyzer,
+    DEFAULT_PROMPT_PREFIX_BLOCK_SIZE as DEFAULT_PROMPT_PREFIX_BLOCK_SIZE,
+)
+from llm_tracekit.core._duplicate_calls import (
+    DuplicateCallDetector as DuplicateCallDetector,
+    DuplicateCallSpanProcessor as DuplicateCallSpanProcessor,
+    get_duplicate_call_detector as get_duplicate_call_detector,
+    configure_duplicate_call_detector as configure_duplicate_call_detector,
+    prompt_digest as prompt_digest,
+    request_digest as request_digest,
+)
+from llm_tracekit.core._content_store import (
+    ContentRef as ContentRef,
+    ContentStore as ContentStore,
+    FileSystemContentStore as FileSystemContentStore,
+    SqliteContentStore as SqliteContentStore,
+    ContentOffloader as ContentOffloader,
+    create_content_store as create_content_store,
+    get_content_offloader as get_content_offloader,
+    set_content_offloader as set_content_offloader,
+    offload_content as offload_content,
+)
+from llm_tracekit.core._response_cache import (
+    ResponseCache as ResponseCache,
+    ReplayStream as ReplayStream,
+    AsyncReplayStream as AsyncReplayStream,
+    get_response_cache as get_response_cache,
+    set_response_cache as set_response_cache,
+    request_cache_key as request_cache_key,
+    is_deterministic_request as is_deterministic_request,
+    record_response_cache_hit as record_response_cache_hit,
+    DEFAULT_RESPONSE_CACHE_MAX_ENTRIES as DEFAULT_RESPONSE_CACHE_MAX_ENTRIES,
+)
+from llm_tracekit.core._token_estimation import (
+    TokenEstimator as TokenEstimator,
+    ApproximateTokenEstimator as ApproximateTokenEstimator,
+    TiktokenTokenEstimator as TiktokenTokenEstimator,
+    get_token_estimator as get_token_estimator,
+    set_token_estimator as set_token_estimator,
+    DEFAULT_TOKEN_ESTIMATOR_CACHE_SIZE as DEFAULT_TOKEN_ESTIMATOR_CACHE_SIZE,
+)
+from llm_tracekit.core._stream_accumulator import (
+    StreamAccumulator as StreamAccumulator,
+)
+from llm_tracekit.core._client_attributes import (
+    ClientAttributesCache as ClientAttributesCache,
+)
+from llm_tracekit.core._tool_attributes import (
+    ToolAttributesCache as ToolAttributesCache,
+    DEFAULT_TOOL_ATTRIBUTES_CACHE_SIZE as DEFAULT_TOOL_ATTRIBUTES_CACHE_SIZE,
+)
+from llm_tracekit.core._embedding_vectors import (
+    generate_embedding_vector_attributes as generate_embedding_vector_attributes,
+)
+from llm_tracekit.core._embedding_inputs import (
+    generate_embedding_input_attributes as generate_embedding_input_attributes,
 )
 from llm_tracekit.core._span_builder import (
     ToolCall as ToolCall,
@@ -0,0 +1,318 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import gzip
+import importlib.util
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any
+
+from opentelemetry.context import Context
+from opentelemetry.exporter.otlp.proto.common.trace_encoder import encode_spans
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor
+
+logger = logging.getLogger(__name__)
+
+_RETRYABLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+_MAX_EXPORT_ATTEMPTS = 3
+
+
+def _compress(body: bytes, compression: str | None) -> bytes:
+    if compression == "gzip":
+        return gzip.compress(body, compresslevel=6)
+    if compression == "zstd":
+        import zstandard
+
+        return zstandard.ZstdCompressor().compress(body)
+    return body
+
+
+class AsyncOTLPSpanProcessor(SpanProcessor):
+    """Batches finished spans and exports them over OTLP/HTTP on an asyncio loop.
+
+    Spans are exported with a pooled `httpx.AsyncClient` (HTTP/2 when `h2` is
+    installed), either on the given event loop or on a dedicated loop thread.
+    At most `max_concurrent_exports` requests are in flight at once; while they
+    are, batches stay queued, and spans that do not fit in `max_queue_size` are
+    dropped. Spans are encoded and compressed on the loop's default executor,
+    so that a shared application loop is not blocked. Dropped spans, as well as
+    spans whose export failed, are counted in `dropped_spans`. When the given
+    loop is no longer running at flush or shutdown, the queued spans are
+    exported synchronously.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        headers: dict[str, Any] | None = None,
+        compression: str | None = "gzip",
+        http2: bool = True,
+        loop: asyncio.AbstractEventLoop | None = None,
+        max_queue_size: int = 2048,
+        max_export_batch_size: int = 512,
+        schedule_delay_millis: float = 5000,
+        max_concurrent_exports: int = 4,
+        timeout: float = 10.0,
+    ):
+        try:
+            import httpx
+        except ImportError as error:
+            raise ImportError(
+                "AsyncOTLPSpanProcessor requires httpx, install it with `pip install httpx`"
+            ) from error
+        if compression not in (None, "gzip", "zstd"):
+            raise ValueError(f"Unsupported compression: {compression!r}")
+        if compression == "zstd" and importlib.util.find_spec("zstandard") is None:
+            raise ImportError(
+                "zstd compression requires zstandard, install it with `pip install zstandard`"
+            )
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("h2 is not installed, exporting spans over HTTP/1.1")
+            http2 = False
+
+        if not endpoint.rstrip("/").endswith("/v1/traces"):
+            endpoint = f"{endpoint.rstrip('/')}/v1/traces"
+        self.endpoint = endpoint
+        self._headers = {
+            **{key: str(value) for key, value in (headers or {}).items()},
+            "content-type": "application/x-protobuf",
+        }
+        if compression is not None:
+            self._headers["content-encoding"] = compression
+        self._compression = compression
+        self._http2 = http2
+        self._timeout = timeout
+        self._httpx = httpx
+
+        self._max_queue_size = max_queue_size
+        self._max_export_batch_size = max_export_batch_size
+        self._schedule_delay = schedule_delay_millis / 1000
+        self._max_concurrent_exports = max_concurrent_exports
+        self._queue: deque[ReadableSpan] = deque()
+        self._lock = threading.Lock()
+        self._shutdown = False
+        self.dropped_spans = 0
+
+        self._loop_thread: threading.Thread | None = None
+        if loop is None:
+            loop = asyncio.new_event_loop()
+            self._loop_thread = threading.Thread(
+                target=loop.run_forever,
+                name="llm-tracekit-async-exporter",
+                daemon=True,
+            )
+            self._loop_thread.start()
+        self._loop = loop
+        self._ready = threading.Event()
+        self._worker = asyncio.run_coroutine_threadsafe(self._start(), loop)
+
+    async def _start(self) -> None:
+        self._client = self._httpx.AsyncClient(
+            http2=self._http2,
+            timeout=self._timeout,
+            limits=self._httpx.Limits(
+                max_connections=self._max_concurrent_exports,
+                max_keepalive_connections=self._max_concurrent_exports,
+            ),
+        )
+        self._wakeup = asyncio.Event()
+        self._semaphore = asyncio.Semaphore(self._max_concurrent_exports)
+        self._in_flight: set[asyncio.Task] = set()
+        self._ready.set()
+        await self._run()
+
+    def on_start(self, span: Span, parent_context: Context | None = None) -> None:
+        pass
+
+    def on_end(self, span: ReadableSpan) -> None:
+        if self._shutdown or not span.context.trace_flags.sampled:
+            return
+
+        with self._lock:
+            if len(self._queue) >= self._max_queue_size:
+                self.dropped_spans += 1
+                return
+            self._queue.append(span)
+            queue_size = len(self._queue)
+
+        if queue_size == self._max_export_batch_size and self._ready.is_set():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _drop(self, count: int) -> None:
+        with self._lock:
+            self.dropped_spans += count
+
+    def _encode(self, batch: list[ReadableSpan]) -> bytes:
+        return _compress(
+            encode_spans(batch).SerializePartialToString(), self._compression
+        )
+
+    def _take_batch(self) -> list[ReadableSpan]:
+        with self._lock:
+            count = min(len(self._queue), self._max_export_batch_size)
+            return [self._queue.popleft() for _ in range(count)]
+
+    async def _run(self) -> None:
+        while not self._shutdown:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self._schedule_delay)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self._drain()
+
+    async def _drain(self) -> None:
+        while self._queue:
+            # waiting for a free export slot is what bounds memory: while the
+            # collector is slow, spans pile up in the bounded queue instead.
+            await self._semaphore.acquire()
+            batch = self._take_batch()
+            if not batch:
+                self._semaphore.release()
+                break
+            task = asyncio.ensure_future(self._export(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _export(self, batch: list[ReadableSpan]) -> None:
+        try:
+            exported = await self._send(batch)
+        except asyncio.CancelledError:
+            # e.g. the application's loop is closing with the export in flight
+            self._drop(len(batch))
+            raise
+        except Exception:  # pylint: disable=broad-except
+            # nothing awaits the export task, so its errors are logged here
+            logger.warning("Failed to export spans", exc_info=True)
+            exported = False
+        finally:
+            self._semaphore.release()
+        if not exported:
+            self._drop(len(batch))
+
+    async def _send(self, batch: list[ReadableSpan]) -> bool:
+        body = await asyncio.get_running_loop().run_in_executor(
+            None, self._encode, batch
+        )
+        for attempt in range(_MAX_EXPORT_ATTEMPTS):
+            try:
+                response = await self._client.post(
+                    self.endpoint, content=body, headers=self._headers
+                )
+            except self._httpx.TransportError as error:
+                logger.warning("Failed to export spans: %s", error)
+            else:
+                if response.status_code < 300:
+                    return True
+                if response.status_code not in _RETRYABLE_STATUS_CODES:
+                    logger.warning(
+                        "Failed to export spans, status code: %s",
+                        response.status_code,
+                    )
+                    return False
+            if attempt < _MAX_EXPORT_ATTEMPTS - 1:
+                await asyncio.sleep(2**attempt * 0.5)
+        return False
+
+    async def _flush(self) -> None:
+        await self._drain()
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+    async def aforce_flush(self) -> None:
+        """Exports all queued spans; use from the loop the processor runs on."""
+        await self._flush()
+
+    async def ashutdown(self) -> None:
+        """Flushes and closes the processor; use from the loop the processor runs on."""
+        self._shutdown = True
+        self._wakeup.set()
+        await self._flush()
+        await self._client.aclose()
+
+    def _run_on_loop(self, coroutine, timeout_millis: int, final: bool = False) -> bool:
+        if self._loop.is_closed() or (
+            self._loop_thread is None and not self._loop.is_running()
+        ):
+            # the application's loop is gone (e.g. after `asyncio.run` returned),
+            # so the queued spans are exported from the calling thread instead
+            coroutine.close()
+            return self._export_synchronously(timeout_millis, final)
+        if self._loop_thread is None and self._is_loop_thread():
+            # blocking here would deadlock the application's loop
+            asyncio.ensure_future(coroutine, loop=self._loop)
+            return False
+
+        self._ready.wait(timeout_millis / 1000)
+        try:
+            future = asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+            future.result(timeout_millis / 1000)
+        except Exception:  # pylint: disable=broad-except
+            return False
+        return True
+
+    def _export_synchronously(self, timeout_millis: int, final: bool) -> bool:
+        deadline = time.monotonic() + timeout_millis / 1000
+        with self._httpx.Client(timeout=self._timeout) as client:
+            # the deadline is checked before taking a batch, so that spans are
+            # only taken from the queue when they are sent
+            while time.monotonic() < deadline:
+                batch = self._take_batch()
+                if not batch:
+                    return True
+                try:
+                    response = client.post(
+                        self.endpoint,
+                        content=self._encode(batch),
+                        headers=self._headers,
+                    )
+                except Exception as error:  # pylint: disable=broad-except
+                    logger.warning("Failed to export spans: %s", error)
+                    self._drop(len(batch))
+                    break
+                if response.status_code >= 300:
+                    logger.warning(
+                        "Failed to export spans, status code: %s",
+                        response.status_code,
+                    )
+                    self._drop(len(batch))
+                    break
+
+        if final:
+            # nothing exports the spans that are left after shutdown
+            with self._lock:
+                self.dropped_spans += len(self._queue)
+                self._queue.clear()
+        return False
+
+    def _is_loop_thread(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self._run_on_loop(self._flush(), timeout_millis)
+
+    def shutdown(self) -> None:
+        if self._shutdown:
+            return
+        self._run_on_loop(self.ashutdown(), 30000, final=True)
+        self._shutdown = True
+        if self._loop_thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join(timeout=5)
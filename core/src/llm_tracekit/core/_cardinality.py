@@ -0,0 +1,259 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import heapq
+import threading
+from typing import Iterable, Mapping
+
+from opentelemetry.semconv._incubating.attributes import (
+    gen_ai_attributes as GenAIAttributes,
+)
+from opentelemetry.semconv.attributes import error_attributes as ErrorAttributes
+from opentelemetry.util.types import AttributeValue
+
+import llm_tracekit.core._extended_gen_ai_attributes as ExtendedGenAIAttributes
+from llm_tracekit.core._metrics import Instruments
+
+OTHER_ATTRIBUTE_VALUE = "other"
+DEFAULT_METRIC_ATTRIBUTE_LIMIT = 100
+
+# the attributes of metrics whose values come from user input or exceptions
+LIMITED_METRIC_ATTRIBUTES = (
+    GenAIAttributes.GEN_AI_SYSTEM,
+    GenAIAttributes.GEN_AI_REQUEST_MODEL,
+    GenAIAttributes.GEN_AI_RESPONSE_MODEL,
+    ErrorAttributes.ERROR_TYPE,
+)
+
+# how many more values than it allows a limiter keeps counts of
+_SKETCH_CAPACITY_FACTOR = 4
+
+
+class SpaceSavingSketch:
+    """Approximate counts of the most frequent values seen, in bounded space.
+
+    The space-saving algorithm keeps a count for at most `capacity` values. A
+    new value takes the place of the value with the smallest count, inheriting
+    that count as its possible overestimate, so the counts of frequent values
+    are never underestimated. The values are grouped in buckets by count, so
+    the value with the smallest count is found without a scan.
+    """
+
+    __slots__ = ("capacity", "_counts", "_errors", "_buckets", "_min_count")
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._counts: dict[str, int] = {}
+        self._errors: dict[str, int] = {}
+        self._buckets: dict[int, dict[str, None]] = {}
+        self._min_count = 0
+
+    def add(self, value: str) -> str | None:
+        """Counts `value`, returning the value it replaced, if any."""
+        count = self._counts.get(value)
+        if count is not None:
+            self._remove_from_bucket(value, count)
+            self._add_to_bucket(value, count + 1)
+            return None
+
+        if len(self._counts) < self.capacity:
+            self._errors[value] = 0
+            self._add_to_bucket(value, 1)
+            return None
+
+        evicted_count = self._min_count
+        evicted = next(iter(self._buckets[evicted_count]))
+        self._remove_from_bucket(evicted, evicted_count)
+        del self._counts[evicted]
+        del self._errors[evicted]
+        self._errors[value] = evicted_count
+        self._add_to_bucket(value, evicted_count + 1)
+        return evicted
+
+    def _add_to_bucket(self, value: str, count: int) -> None:
+        self._counts[value] = count
+        self._buckets.setdefault(count, {})[value] = None
+        if self._min_count == 0 or count < self._min_count:
+            self._min_count = count
+
+    def _remove_from_bucket(self, value: str, count: int) -> None:
+        bucket = self._buckets[count]
+        del bucket[value]
+        if not bucket:
+            del self._buckets[count]
+            if self._min_count == count:
+                # the removed value is added again with the next count, which
+                # is then the smallest
+                self._min_count = 0
+
+    def count(self, value: str) -> int:
+        """The estimated count of `value`, at least its true count if it is kept."""
+        return self._counts.get(value, 0)
+
+    def guaranteed_count(self, value: str) -> int:
+        """The count `value` was certainly seen at least."""
+        return self._counts.get(value, 0) - self._errors.get(value, 0)
+
+
+class _AttributeValueLimiter:
+    __slots__ = ("_limit", "_allowed", "_sketch", "_heap")
+
+    def __init__(self, limit: int):
+        self._limit = limit
+        self._allowed: set[str] = set()
+        self._sketch = SpaceSavingSketch(max(limit * _SKETCH_CAPACITY_FACTOR, 1))
+        # (count, value) entries with a lower bound of the count of every
+        # allowed value, refreshed lazily when they reach the top
+        self._heap: list[tuple[int, str]] = []
+
+    def admit(self, value: str) -> bool:
+        evicted = self._sketch.add(value)
+        if evicted is not None and evicted in self._allowed:
+            # the count of an allowed value only drops when it is evicted
+            self._push(0, evicted)
+        if value in self._allowed:
+            return True
+        if len(self._allowed) < self._limit:
+            self._allow(value)
+            return True
+        if not self._allowed:
+            return False
+
+        # a heavy hitter takes the place of the least frequent allowed value
+        weakest_count, weakest = self._weakest()
+        if self._sketch.guaranteed_count(value) <= weakest_count:
+            return False
+        heapq.heappop(self._heap)
+        self._allowed.remove(weakest)
+        self._allow(value)
+        return True
+
+    def _allow(self, value: str) -> None:
+        self._allowed.add(value)
+        self._push(self._sketch.count(value), value)
+
+    def _push(self, count: int, value: str) -> None:
+        heapq.heappush(self._heap, (count, value))
+        if len(self._heap) > 2 * len(self._allowed) + 1:
+            # drop the entries of values that are no longer allowed
+            self._heap = [
+                (self._sketch.count(allowed), allowed) for allowed in self._allowed
+            ]
+            heapq.heapify(self._heap)
+
+    def _weakest(self) -> tuple[int, str]:
+        while True:
+            count, value = self._heap[0]
+            if value not in self._allowed:
+                heapq.heappop(self._heap)
+                continue
+            current_count = self._sketch.count(value)
+            if count == current_count:
+                return count, value
+            heapq.heapreplace(self._heap, (current_count, value))
+
+
+class MetricAttributeLimiter:
+    """Process-wide bound on the values of the metric attributes that come from user input.
+
+    Each of `attributes` keeps at most `limit` values in its metric series. The
+    values are admitted as they are first seen, and once the limit is reached a
+    new value is only admitted when it was seen more often than the least frequent
+    admitted one, which it replaces. The frequencies are estimated by a
+    `SpaceSavingSketch`. Other values are recorded as `other`.
+    """
+
+    def __init__(
+        self,
+        limit: int = DEFAULT_METRIC_ATTRIBUTE_LIMIT,
+        attributes: Iterable[str] = LIMITED_METRIC_ATTRIBUTES,
+    ):
+        if limit < 0:
+            raise ValueError(f"Metric attribute limit must not be negative: {limit}")
+
+        self.limit = limit
+        self._limiters = {
+            attribute: _AttributeValueLimiter(limit) for attribute in attributes
+        }
+        self._lock = threading.Lock()
+
+    def limit_attributes(
+        self,
+        attributes: Mapping[str, AttributeValue],
+        instruments: Instruments | None = None,
+        admitted: Mapping[str, AttributeValue] | None = None,
+    ) -> dict[str, AttributeValue]:
+        """Returns a copy of `attributes` with the values that were not admitted collapsed.
+
+        Every collapsed value is counted on the collapsed attribute values counter
+        of `instruments`, by attribute. The attributes of `admitted`, limited
+        earlier for the same request, keep their limited value, so that the
+        values of a request are only counted once.
+        """
+        limited_attributes = dict(attributes)
+        for attribute, limiter in self._limiters.items():
+            value = limited_attributes.get(attribute)
+            if not isinstance(value, str) or value == OTHER_ATTRIBUTE_VALUE:
+                continue
+            if admitted is not None and attribute in admitted:
+                limited_attributes[attribute] = admitted[attribute]
+                continue
+            with self._lock:
+                is_admitted = limiter.admit(value)
+            if is_admitted:
+                continue
+
+            limited_attributes[attribute] = OTHER_ATTRIBUTE_VALUE
+            if instruments is not None:
+                instruments.collapsed_attribute_values_counter.add(
+                    1, {ExtendedGenAIAttributes.GEN_AI_METRIC_ATTRIBUTE: attribute}
+                )
+
+        return limited_attributes
+
+
+_metric_attribute_limiter: MetricAttributeLimiter | None = MetricAttributeLimiter()
+
+
+def get_metric_attribute_limiter() -> MetricAttributeLimiter | None:
+    """Returns the process-wide metric attribute limiter, None when values are not limited."""
+    return _metric_attribute_limiter
+
+
+def configure_metric_attribute_limiter(
+    limit: int | None,
+) -> MetricAttributeLimiter | None:
+    """Replaces the process-wide metric attribute limiter, a `limit` of None disables it.
+
+    The values admitted so far are forgotten.
+    """
+    global _metric_attribute_limiter
+    _metric_attribute_limiter = None if limit is None else MetricAttributeLimiter(limit)
+    return _metric_attribute_limiter
+
+
+def limit_metric_attributes(
+    instruments: Instruments | None,
+    attributes: Mapping[str, AttributeValue],
+    admitted: Mapping[str, AttributeValue] | None = None,
+) -> dict[str, AttributeValue]:
+    """Collapses the values of `attributes` beyond the process-wide limit into `other`.
+
+    The values of `admitted`, the attributes of the same request limited
+    earlier, are reused instead of being admitted again.
+    """
+    limiter = _metric_attribute_limiter
+    if limiter is None:
+        return dict(attributes)
+    return limiter.limit_attributes(attributes, instruments, admitted)
@@ -0,0 +1,80 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any, Callable, Mapping
+from weakref import WeakKeyDictionary
+
+from opentelemetry.semconv._incubating.attributes import (
+    gen_ai_attributes as GenAIAttributes,
+)
+
+from llm_tracekit.core._span_builder import generate_base_attributes
+
+
+class ClientAttributesCache:
+    """Caches the span attributes that only depend on the client a request is made with.
+
+    The block holds the base attributes of the operation and the server
+    attributes derived from the client's `base_url`. It is computed once per
+    client and operation, kept in a weak-keyed mapping so clients are not kept
+    alive, and recomputed when the client's `base_url` is replaced. Clients
+    that cannot be weakly referenced get a freshly computed block every time.
+    """
+
+    def __init__(
+        self,
+        system: GenAIAttributes.GenAiSystemValues | str,
+        server_attributes: Callable[[Any], dict[str, Any]],
+    ):
+        self._system = system
+        self._server_attributes = server_attributes
+        self._entries: WeakKeyDictionary[
+            Any, tuple[Any, dict[Any, Mapping[str, Any]]]
+        ] = WeakKeyDictionary()
+
+    def _build(
+        self, client_instance: Any, operation: GenAIAttributes.GenAiOperationNameValues
+    ) -> Mapping[str, Any]:
+        return {
+            **generate_base_attributes(system=self._system, operation=operation),
+            **self._server_attributes(client_instance),
+        }
+
+    def get(
+        self,
+        client_instance: Any,
+        operation: GenAIAttributes.GenAiOperationNameValues = GenAIAttributes.GenAiOperationNameValues.CHAT,
+    ) -> Mapping[str, Any]:
+        """Returns the attribute block for `client_instance`.
+
+        The block is shared between calls, so it is merged into the request
+        attributes and never mutated.
+        """
+        base_url = getattr(getattr(client_instance, "_client", None), "base_url", None)
+        try:
+            entry = self._entries.get(client_instance)
+            if entry is None or entry[0] is not base_url:
+                entry = (base_url, {})
+                self._entries[client_instance] = entry
+        except TypeError:
+            return self._build(client_instance, operation)
+
+        blocks = entry[1]
+        block = blocks.get(operation)
+        if block is None:
+            block = blocks[operation] = self._build(client_instance, operation)
+        return block
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -22,6 +22,65 @@ from opentelemetry.trace.status import Status, StatusCode
 OTEL_INSTRUMENTATION_GENAI_CAPTURE_MESSAGE_CONTENT = (
     "OTEL_INSTRUMENTATION_GENAI_CAPTURE_MESSAGE_CONTENT"
 )
+OTEL_INSTRUMENTATION_GENAI_CONTENT_EXPORT_MODE = (
+    "OTEL_INSTRUMENTATION_GENAI_CONTENT_EXPORT_MODE"
+)
+OTEL_INSTRUMENTATION_GENAI_REDACT_CONTENT = "OTEL_INSTRUMENTATION_GENAI_REDACT_CONTENT"
+OTEL_INSTRUMENTATION_GENAI_DEFER_STREAM_PROCESSING = (
+    "OTEL_INSTRUMENTATION_GENAI_DEFER_STREAM_PROCESSING"
+)
+OTEL_INSTRUMENTATION_GENAI_EMBEDDING_VECTOR_CAPTURE = (
+    "OTEL_INSTRUMENTATION_GENAI_EMBEDDING_VECTOR_CAPTURE"
+)
+OTEL_INSTRUMENTATION_GENAI_EMBEDDING_VECTOR_PREFIX_LENGTH = (
+    "OTEL_INSTRUMENTATION_GENAI_EMBEDDING_VECTOR_PREFIX_LENGTH"
+)
+OTEL_INSTRUMENTATION_GENAI_EMBEDDING_INPUT_SAMPLE_SIZE = (
+    "OTEL_INSTRUMENTATION_GENAI_EMBEDDING_INPUT_SAMPLE_SIZE"
+)
+OTEL_INSTRUMENTATION_GENAI_PROMPT_PREFIX_ANALYSIS = (
+    "OTEL_INSTRUMENTATION_GENAI_PROMPT_PREFIX_ANALYSIS"
+)
+OTEL_INSTRUMENTATION_GENAI_DUPLICATE_CALL_DETECTION = (
+    "OTEL_INSTRUMENTATION_GENAI_DUPLICATE_CALL_DETECTION"
+)
+OTEL_INSTRUMENTATION_GENAI_RESPONSE_CACHE = "OTEL_INSTRUMENTATION_GENAI_RESPONSE_CACHE"
+OTEL_INSTRUMENTATION_GENAI_RESPONSE_CACHE_PATH = (
+    "OTEL_INSTRUMENTATION_GENAI_RESPONSE_CACHE_PATH"
+)
+OTEL_INSTRUMENTATION_GENAI_ESTIMATE_TOKEN_USAGE = (
+    "OTEL_INSTRUMENTATION_GENAI_ESTIMATE_TOKEN_USAGE"
+)
+OTEL_INSTRUMENTATION_GENAI_INJECT_STREAM_USAGE = (
+    "OTEL_INSTRUMENTATION_GENAI_INJECT_STREAM_USAGE"
+)
+OTEL_INSTRUMENTATION_GENAI_HTTP_TIMING = "OTEL_INSTRUMENTATION_GENAI_HTTP_TIMING"
+OTEL_INSTRUMENTATION_GENAI_CAPTURE_RATE_LIMITS = (
+    "OTEL_INSTRUMENTATION_GENAI_CAPTURE_RATE_LIMITS"
+)
+OTEL_INSTRUMENTATION_GENAI_CONTENT_OFFLOAD_PATH = (
+    "OTEL_INSTRUMENTATION_GENAI_CONTENT_OFFLOAD_PATH"
+)
+OTEL_INSTRUMENTATION_GENAI_CONTENT_OFFLOAD_THRESHOLD = (
+    "OTEL_INSTRUMENTATION_GENAI_CONTENT_OFFLOAD_THRESHOLD"
+)
+CONTENT_EXPORT_MODE_SPAN = "span"
+CONTENT_EXPORT_MODE_EVENT = "event"
+EMBEDDING_VECTOR_CAPTURE_FULL = "full"
+EMBEDDING_VECTOR_CAPTURE_SUMMARY = "summary"
+EMBEDDING_VECTOR_CAPTURE_INT8 = "int8"
+EMBEDDING_VECTOR_CAPTURE_FLOAT16 = "float16"
+EMBEDDING_VECTOR_CAPTURE_PREFIX = "prefix"
+EMBEDDING_VECTOR_CAPTURE_MODES = (
+    EMBEDDING_VECTOR_CAPTURE_FULL,
+    EMBEDDING_VECTOR_CAPTURE_SUMMARY,
+    EMBEDDING_VECTOR_CAPTURE_INT8,
+    EMBEDDING_VECTOR_CAPTURE_FLOAT16,
+    EMBEDDING_VECTOR_CAPTURE_PREFIX,
+)
+DEFAULT_EMBEDDING_VECTOR_PREFIX_LENGTH = 8
+DEFAULT_EMBEDDING_INPUT_SAMPLE_SIZE = 16
+DEFAULT_CONTENT_OFFLOAD_THRESHOLD = 8192
 
 
 def is_content_enabled() -> bool:
@@ -38,6 +97,234 @@ def enable_capture_content():
     os.environ[OTEL_INSTRUMENTATION_GENAI_CAPTURE_MESSAGE_CONTENT] = "true"
 
 
+def is_content_event_mode_enabled() -> bool:
+    """Checks if message content should be exported as log events instead of span attributes."""
+    export_mode = os.environ.get(
+        OTEL_INSTRUMENTATION_GENAI_CONTENT_EXPORT_MODE, CONTENT_EXPORT_MODE_SPAN
+    )
+
+    return export_mode.lower() == CONTENT_EXPORT_MODE_EVENT
+
+
+def enable_content_event_mode():
+    """Enables exporting message content as log events instead of span attributes."""
+    os.environ[OTEL_INSTRUMENTATION_GENAI_CONTENT_EXPORT_MODE] = (
+        CONTENT_EXPORT_MODE_EVENT
+    )
+
+
+def is_redaction_enabled() -> bool:
+    """Checks if sensitive values should be redacted from captured message content."""
+    redact_content = os.environ.get(OTEL_INSTRUMENTATION_GENAI_REDACT_CONTENT, "false")
+
+    return redact_content.lower() == "true"
+
+
+def enable_redaction():
+    """Enables redacting sensitive values from captured message content."""
+    os.environ[OTEL_INSTRUMENTATION_GENAI_REDACT_CONTENT] = "true"
+
+
+def is_deferred_stream_processing_enabled() -> bool:
+    """Checks if stream chunks should be kept as-is and only parsed once the stream ends."""
+    defer_processing = os.environ.get(
+        OTEL_INSTRUMENTATION_GENAI_DEFER_STREAM_PROCESSING, "false"
+    )
+
+    return defer_processing.lower() == "true"
+
+
+def enable_deferred_stream_processing():
+    """Enables parsing stream chunks once the stream ends instead of as they arrive."""
+    os.environ[OTEL_INSTRUMENTATION_GENAI_DEFER_STREAM_PROCESSING] = "true"
+
+
+def get_embedding_vector_capture_mode() -> str:
+    """Returns how captured embedding vectors are recorded, see `EMBEDDING_VECTOR_CAPTURE_MODES`."""
+    capture_mode = os.environ.get(
+        OTEL_INSTRUMENTATION_GENAI_EMBEDDING_VECTOR_CAPTURE,
+        EMBEDDING_VECTOR_CAPTURE_FULL,
+    ).lower()
+    if capture_mode not in EMBEDDING_VECTOR_CAPTURE_MODES:
+        return EMBEDDING_VECTOR_CAPTURE_FULL
+
+    return capture_mode
+
+
+def get_embedding_vector_prefix_length() -> int:
+    """Returns the number of components kept by the `prefix` embedding vector capture mode."""
+    prefix_length = os.environ.get(
+        OTEL_INSTRUMENTATION_GENAI_EMBEDDING_VECTOR_PREFIX_LENGTH
+    )
+    if prefix_length is None:
+        return DEFAULT_EMBEDDING_VECTOR_PREFIX_LENGTH
+    try:
+        return max(int(prefix_length), 0)
+    except ValueError:
+        return DEFAULT_EMBEDDING_VECTOR_PREFIX_LENGTH
+
+
+def set_embedding_vector_capture_mode(mode: str, prefix_length: int | None = None):
+    """Sets how captured embedding vectors are recorded."""
+    if mode not in EMBEDDING_VECTOR_CAPTURE_MODES:
+        raise ValueError(f"Unsupported embedding vector capture mode: {mode!r}")
+
+    os.environ[OTEL_INSTRUMENTATION_GENAI_EMBEDDING_VECTOR_CAPTURE] = mode
+    if prefix_length is not None:
+        os.environ[OTEL_INSTRUMENTATION_GENAI_EMBEDDING_VECTOR_PREFIX_LENGTH] = str(
+            prefix_length
+        )
+
+
+def get_embedding_input_sample_size() -> int:
+    """Returns the number of items of an embeddings request recorded as prompts."""
+    sample_size = os.environ.get(OTEL_INSTRUMENTATION_GENAI_EMBEDDING_INPUT_SAMPLE_SIZE)
+    if sample_size is None:
+        return DEFAULT_EMBEDDING_INPUT_SAMPLE_SIZE
+    try:
+        return max(int(sample_size), 0)
+    except ValueError:
+        return DEFAULT_EMBEDDING_INPUT_SAMPLE_SIZE
+
+
+def set_embedding_input_sample_size(sample_size: int):
+    """Sets the number of items of an embeddings request recorded as prompts."""
+    os.environ[OTEL_INSTRUMENTATION_GENAI_EMBEDDING_INPUT_SAMPLE_SIZE] = str(
+        sample_size
+    )
+
+
+def is_prompt_prefix_analysis_enabled() -> bool:
+    """Checks if prompt prefixes should be fingerprinted to measure how much of them could be cached."""
+    analyze_prefixes = os.environ.get(
+        OTEL_INSTRUMENTATION_GENAI_PROMPT_PREFIX_ANALYSIS, "false"
+    )
+
+    return analyze_prefixes.lower() == "true"
+
+
+def enable_prompt_prefix_analysis():
+    """Enables fingerprinting prompt prefixes."""
+    os.environ[OTEL_INSTRUMENTATION_GENAI_PROMPT_PREFIX_ANALYSIS] = "true"
+
+
+def is_duplicate_call_detection_enabled() -> bool:
+    """Checks if requests identical to an earlier request should be detected."""
+    detect_duplicates = os.environ.get(
+        OTEL_INSTRUMENTATION_GENAI_DUPLICATE_CALL_DETECTION, "false"
+    )
+
+    return detect_duplicates.lower() == "true"
+
+
+def enable_duplicate_call_detection():
+    """Enables detecting requests identical to an earlier request."""
+    os.environ[OTEL_INSTRUMENTATION_GENAI_DUPLICATE_CALL_DETECTION] = "true"
+
+
+def is_response_cache_enabled() -> bool:
+    """Checks if responses to deterministic requests should be served from a local cache."""
+    response_cache = os.environ.get(OTEL_INSTRUMENTATION_GENAI_RESPONSE_CACHE, "false")
+
+    return response_cache.lower() == "true"
+
+
+def enable_response_cache(path: str | None = None):
+    """Enables serving responses to deterministic requests from a local cache, kept on disk at `path` if set."""
+    os.environ[OTEL_INSTRUMENTATION_GENAI_RESPONSE_CACHE] = "true"
+    if path is not None:
+        os.environ[OTEL_INSTRUMENTATION_GENAI_RESPONSE_CACHE_PATH] = path
+
+
+def get_response_cache_path() -> str | None:
+    """Returns the path of the sqlite database backing the response cache, if any."""
+    return os.environ.get(OTEL_INSTRUMENTATION_GENAI_RESPONSE_CACHE_PATH) or None
+
+
+def is_token_usage_estimation_enabled() -> bool:
+    """Checks if token usage should be estimated for responses that do not report it."""
+    estimate_usage = os.environ.get(
+        OTEL_INSTRUMENTATION_GENAI_ESTIMATE_TOKEN_USAGE, "false"
+    )
+
+    return estimate_usage.lower() == "true"
+
+
+def enable_token_usage_estimation():
+    """Enables estimating token usage for responses that do not report it."""
+    os.environ[OTEL_INSTRUMENTATION_GENAI_ESTIMATE_TOKEN_USAGE] = "true"
+
+
+def is_stream_usage_injection_enabled() -> bool:
+    """Checks if streams should request their token usage when the caller did not."""
+    inject_usage = os.environ.get(
+        OTEL_INSTRUMENTATION_GENAI_INJECT_STREAM_USAGE, "false"
+    )
+
+    return inject_usage.lower() == "true"
+
+
+def enable_stream_usage_injection():
+    """Enables requesting the token usage of streams when the caller did not."""
+    os.environ[OTEL_INSTRUMENTATION_GENAI_INJECT_STREAM_USAGE] = "true"
+
+
+def is_http_timing_enabled() -> bool:
+    """Checks if the phases of the HTTP requests to the providers should be timed."""
+    http_timing = os.environ.get(OTEL_INSTRUMENTATION_GENAI_HTTP_TIMING, "false")
+
+    return http_timing.lower() == "true"
+
+
+def enable_http_timing():
+    """Enables timing the phases of the HTTP requests to the providers."""
+    os.environ[OTEL_INSTRUMENTATION_GENAI_HTTP_TIMING] = "true"
+
+
+def is_rate_limit_capture_enabled() -> bool:
+    """Checks if the rate limits and retries of the requests to the providers should be recorded."""
+    capture_rate_limits = os.environ.get(
+        OTEL_INSTRUMENTATION_GENAI_CAPTURE_RATE_LIMITS, "false"
+    )
+
+    return capture_rate_limits.lower() == "true"
+
+
+def enable_rate_limit_capture():
+    """Enables recording the rate limits and retries of the requests to the providers."""
+    os.environ[OTEL_INSTRUMENTATION_GENAI_CAPTURE_RATE_LIMITS] = "true"
+
+
+def is_content_offload_enabled() -> bool:
+    """Checks if large prompt content should be written to a content store instead of span attributes."""
+    return get_content_offload_path() is not None
+
+
+def enable_content_offload(path: str, threshold_bytes: int | None = None):
+    """Enables writing prompt content of at least `threshold_bytes` to the content store at `path`."""
+    os.environ[OTEL_INSTRUMENTATION_GENAI_CONTENT_OFFLOAD_PATH] = path
+    if threshold_bytes is not None:
+        os.environ[OTEL_INSTRUMENTATION_GENAI_CONTENT_OFFLOAD_THRESHOLD] = str(
+            threshold_bytes
+        )
+
+
+def get_content_offload_path() -> str | None:
+    """Returns the path of the content store large prompt content is written to, if any."""
+    return os.environ.get(OTEL_INSTRUMENTATION_GENAI_CONTENT_OFFLOAD_PATH) or None
+
+
+def get_content_offload_threshold() -> int:
+    """Returns the size in bytes from which prompt content is written to the content store."""
+    threshold = os.environ.get(OTEL_INSTRUMENTATION_GENAI_CONTENT_OFFLOAD_THRESHOLD)
+    if threshold is None:
+        return DEFAULT_CONTENT_OFFLOAD_THRESHOLD
+    try:
+        return max(int(threshold), 0)
+    except ValueError:
+        return DEFAULT_CONTENT_OFFLOAD_THRESHOLD
+
+
 def handle_span_exception(span, error):
     span.set_status(Status(StatusCode.ERROR, str(error)))
     if span.is_recording():
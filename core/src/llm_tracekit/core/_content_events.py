@@ -0,0 +1,166 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Iterator
+
+from opentelemetry._logs import LogRecord, get_logger
+
+from llm_tracekit.core._redaction import redact_content
+
+if TYPE_CHECKING:
+    from llm_tracekit.core._span_builder import Choice, Message, ToolCall
+
+GEN_AI_SYSTEM_MESSAGE_EVENT = "gen_ai.system.message"
+GEN_AI_USER_MESSAGE_EVENT = "gen_ai.user.message"
+GEN_AI_ASSISTANT_MESSAGE_EVENT = "gen_ai.assistant.message"
+GEN_AI_TOOL_MESSAGE_EVENT = "gen_ai.tool.message"
+GEN_AI_CHOICE_EVENT = "gen_ai.choice"
+
+_ROLE_TO_EVENT_NAME = {
+    "system": GEN_AI_SYSTEM_MESSAGE_EVENT,
+    "developer": GEN_AI_SYSTEM_MESSAGE_EVENT,
+    "user": GEN_AI_USER_MESSAGE_EVENT,
+    "assistant": GEN_AI_ASSISTANT_MESSAGE_EVENT,
+    "tool": GEN_AI_TOOL_MESSAGE_EVENT,
+}
+
+# The proxy logger resolves to the global logger provider once one is set, so
+# records emitted before `setup_export_to_coralogix` runs are simply dropped.
+_logger = get_logger(__name__)
+
+
+def _tool_calls_to_body(
+    tool_calls: "list[ToolCall]", redact: bool
+) -> list[dict[str, Any]]:
+    return [
+        {
+            key: value
+            for key, value in (
+                ("id", tool_call.id),
+                ("type", tool_call.type),
+                ("name", tool_call.function_name),
+                (
+                    "arguments",
+                    redact_content(tool_call.function_arguments)
+                    if redact
+                    else tool_call.function_arguments,
+                ),
+            )
+            if value is not None
+        }
+        for tool_call in tool_calls
+    ]
+
+
+def emit_message_events(messages: "list[Message]", redact: bool = False) -> None:
+    """Emits one gen_ai message event per prompt message.
+
+    The records are correlated with the span that is current at call time.
+    """
+    for index, message in enumerate(messages):
+        body: dict[str, Any] = {"index": index}
+        if message.role is not None:
+            body["role"] = message.role
+        if message.content is not None:
+            body["content"] = (
+                redact_content(message.content) if redact else message.content
+            )
+        if message.tool_call_id is not None:
+            body["id"] = message.tool_call_id
+        if message.tool_calls:
+            body["tool_calls"] = _tool_calls_to_body(message.tool_calls, redact)
+
+        _logger.emit(
+            LogRecord(
+                event_name=_ROLE_TO_EVENT_NAME.get(
+                    message.role or "", GEN_AI_USER_MESSAGE_EVENT
+                ),
+                body=body,
+            )
+        )
+
+
+class DeferredMessageEvents:
+    """Message events held back until the span they belong to is current."""
+
+    __slots__ = ("_events",)
+
+    def __init__(self) -> None:
+        self._events: "list[tuple[list[Message], bool]]" = []
+
+    def add(self, messages: "list[Message]", redact: bool = False) -> None:
+        self._events.append((messages, redact))
+
+    def emit(self) -> None:
+        """Emits the held back events, correlated with the span that is current at call time."""
+        events, self._events = self._events, []
+        for messages, redact in events:
+            emit_message_events(messages, redact=redact)
+
+
+_deferred_message_events: ContextVar[DeferredMessageEvents | None] = ContextVar(
+    "llm_tracekit_deferred_message_events", default=None
+)
+
+
+@contextmanager
+def deferred_message_events() -> Iterator[DeferredMessageEvents]:
+    """Holds back the message events of the attributes generated within the block.
+
+    Request attributes are generated before the span of the request starts, so
+    their events are emitted with `DeferredMessageEvents.emit` once the span is
+    current, instead of being correlated with its parent.
+    """
+    deferred = DeferredMessageEvents()
+    token = _deferred_message_events.set(deferred)
+    try:
+        yield deferred
+    finally:
+        _deferred_message_events.reset(token)
+
+
+def emit_or_defer_message_events(
+    messages: "list[Message]", redact: bool = False
+) -> None:
+    """Emits the message events, unless they are held back by `deferred_message_events`."""
+    deferred = _deferred_message_events.get()
+    if deferred is not None:
+        deferred.add(messages, redact=redact)
+    else:
+        emit_message_events(messages, redact=redact)
+
+
+def emit_choice_events(choices: "list[Choice]", redact: bool = False) -> None:
+    """Emits one gen_ai.choice event per completion choice.
+
+    The records are correlated with the span that is current at call time.
+    """
+    for index, choice in enumerate(choices):
+        message: dict[str, Any] = {}
+        if choice.role is not None:
+            message["role"] = choice.role
+        if choice.content is not None:
+            message["content"] = (
+                redact_content(choice.content) if redact else choice.content
+            )
+        if choice.tool_calls:
+            message["tool_calls"] = _tool_calls_to_body(choice.tool_calls, redact)
+
+        body: dict[str, Any] = {"index": index, "message": message}
+        if choice.finish_reason is not None:
+            body["finish_reason"] = choice.finish_reason
+
+        _logger.emit(LogRecord(event_name=GEN_AI_CHOICE_EVENT, body=body))
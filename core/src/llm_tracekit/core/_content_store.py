@@ -0,0 +1,324 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import abc
+import atexit
+import logging
+import os
+import queue
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from hashlib import sha256
+from typing import Any, Mapping
+
+from llm_tracekit.core._config import (
+    DEFAULT_CONTENT_OFFLOAD_THRESHOLD,
+    get_content_offload_path,
+    get_content_offload_threshold,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONTENT_OFFLOAD_MAX_BATCH_SIZE = 64
+DEFAULT_CONTENT_OFFLOAD_MAX_QUEUE_SIZE = 1024
+DEFAULT_CONTENT_OFFLOAD_FLUSH_INTERVAL_SECONDS = 1.0
+DEFAULT_CONTENT_OFFLOAD_DEDUP_SIZE = 4096
+
+_SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+
+@dataclass(frozen=True)
+class ContentRef:
+    """A reference to content written to a content store."""
+
+    digest: str
+    size: int
+
+    @property
+    def value(self) -> str:
+        """The reference as recorded on spans: `sha256:<hex digest>:<size in bytes>`."""
+        return f"sha256:{self.digest}:{self.size}"
+
+
+def content_ref(content: bytes) -> ContentRef:
+    return ContentRef(digest=sha256(content).hexdigest(), size=len(content))
+
+
+class ContentStore(abc.ABC):
+    """Storage backend of offloaded content, keyed by the SHA-256 digest of the content.
+
+    Writes of a digest that is already stored are ignored, so backends only
+    need to be idempotent, not to detect duplicates.
+    """
+
+    @abc.abstractmethod
+    def write_batch(self, contents: Mapping[str, bytes]) -> None:
+        """Writes every content of `contents` under its digest."""
+
+    @abc.abstractmethod
+    def read(self, digest: str) -> bytes | None:
+        """Returns the content of `digest`, None when it is not stored."""
+
+    def close(self) -> None:
+        pass
+
+
+class FileSystemContentStore(ContentStore):
+    """Keeps every content in its own file under `path`, fanned out by the first digest characters."""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def _content_path(self, digest: str) -> str:
+        return os.path.join(self.path, digest[:2], digest)
+
+    def write_batch(self, contents: Mapping[str, bytes]) -> None:
+        for digest, content in contents.items():
+            content_path = self._content_path(digest)
+            if os.path.exists(content_path):
+                continue
+            directory = os.path.dirname(content_path)
+            os.makedirs(directory, exist_ok=True)
+            # write to a temporary file first, so that readers never see partial content
+            file_descriptor, temporary_path = tempfile.mkstemp(dir=directory)
+            try:
+                with os.fdopen(file_descriptor, "wb") as temporary_file:
+                    temporary_file.write(content)
+                os.replace(temporary_path, content_path)
+            except BaseException:
+                os.unlink(temporary_path)
+                raise
+
+    def read(self, digest: str) -> bytes | None:
+        try:
+            with open(self._content_path(digest), "rb") as content_file:
+                return content_file.read()
+        except FileNotFoundError:
+            return None
+
+
+class SqliteContentStore(ContentStore):
+    """Keeps the contents in a sqlite database at `path`, one transaction per batch."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS contents "
+                "(digest TEXT PRIMARY KEY, size INTEGER NOT NULL, content BLOB NOT NULL)"
+            )
+
+    def write_batch(self, contents: Mapping[str, bytes]) -> None:
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO contents VALUES (?, ?, ?)",
+                [
+                    (digest, len(content), content)
+                    for digest, content in contents.items()
+                ],
+            )
+
+    def read(self, digest: str) -> bytes | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT content FROM contents WHERE digest = ?", (digest,)
+            ).fetchone()
+        return None if row is None else row[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+def create_content_store(path: str) -> ContentStore:
+    """Returns a sqlite store for paths ending with .db, .sqlite or .sqlite3, and a filesystem store otherwise."""
+    if path.endswith(_SQLITE_SUFFIXES):
+        return SqliteContentStore(path)
+    return FileSystemContentStore(path)
+
+
+class ContentOffloader:
+    """Writes content of at least `threshold_bytes` to a content store in the background.
+
+    `offload` returns the reference to the content right away, and a writer
+    thread writes the queued contents to `store` in batches of up to
+    `max_batch_size`, collected for at most `flush_interval_seconds`. Contents
+    whose digest was offloaded recently are not written again, so repeated
+    content (e.g. a long system prompt) only costs its digest. When the queue
+    is full, content is not offloaded and stays inline.
+    """
+
+    def __init__(
+        self,
+        store: ContentStore,
+        threshold_bytes: int = DEFAULT_CONTENT_OFFLOAD_THRESHOLD,
+        max_batch_size: int = DEFAULT_CONTENT_OFFLOAD_MAX_BATCH_SIZE,
+        max_queue_size: int = DEFAULT_CONTENT_OFFLOAD_MAX_QUEUE_SIZE,
+        flush_interval_seconds: float = DEFAULT_CONTENT_OFFLOAD_FLUSH_INTERVAL_SECONDS,
+        dedup_size: int = DEFAULT_CONTENT_OFFLOAD_DEDUP_SIZE,
+    ):
+        self.store = store
+        self.threshold_bytes = threshold_bytes
+        self.max_batch_size = max(max_batch_size, 1)
+        self.flush_interval_seconds = flush_interval_seconds
+        self.dedup_size = dedup_size
+        self.written = 0
+        self.deduplicated = 0
+        self.dropped = 0
+        self._queue: queue.Queue[tuple[str, bytes] | None] = queue.Queue(max_queue_size)
+        self._recent: OrderedDict[str, None] = OrderedDict()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._writer: threading.Thread | None = None
+
+    def offload(self, content: str) -> ContentRef | None:
+        """Queues `content` for writing, None when it stays inline."""
+        # a character takes at most 4 bytes, so short content is not encoded
+        if len(content) * 4 < self.threshold_bytes:
+            return None
+        encoded_content = content.encode("utf-8", "surrogatepass")
+        if len(encoded_content) < self.threshold_bytes:
+            return None
+
+        ref = content_ref(encoded_content)
+        with self._lock:
+            if self._closed:
+                return None
+            if ref.digest in self._recent:
+                self._recent.move_to_end(ref.digest)
+                self.deduplicated += 1
+                return ref
+            try:
+                self._queue.put_nowait((ref.digest, encoded_content))
+            except queue.Full:
+                self.dropped += 1
+                return None
+
+            self._remember(ref.digest)
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._run, name="llm-tracekit-content-offload", daemon=True
+                )
+                self._writer.start()
+        return ref
+
+    def _remember(self, digest: str) -> None:
+        self._recent[digest] = None
+        while len(self._recent) > self.dedup_size:
+            self._recent.popitem(last=False)
+
+    def _next_batch(self) -> tuple[dict[str, bytes], int, bool]:
+        batch: dict[str, bytes] = {}
+        items = 0
+        item = self._queue.get()
+        deadline = time.monotonic() + self.flush_interval_seconds
+        while True:
+            items += 1
+            if item is None:
+                return batch, items, True
+            batch[item[0]] = item[1]
+            if len(batch) >= self.max_batch_size:
+                return batch, items, False
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                return batch, items, False
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                return batch, items, False
+
+    def _run(self) -> None:
+        stopped = False
+        while not stopped:
+            batch, items, stopped = self._next_batch()
+            try:
+                if batch:
+                    self.store.write_batch(batch)
+                    self.written += len(batch)
+            except Exception:
+                logger.debug("Failed to write to the content store", exc_info=True)
+                # allow the contents to be written again by a later offload
+                with self._lock:
+                    for digest in batch:
+                        self._recent.pop(digest, None)
+            finally:
+                for _ in range(items):
+                    self._queue.task_done()
+
+    def flush(self) -> None:
+        """Blocks until every queued content was written."""
+        if self._writer is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        """Writes the queued contents and closes the store."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            writer = self._writer
+        if writer is not None:
+            self._queue.put(None)
+            writer.join()
+        self.store.close()
+
+
+_UNSET: Any = object()
+_content_offloader: ContentOffloader | None = _UNSET
+_content_offloader_lock = threading.Lock()
+
+
+def get_content_offloader() -> ContentOffloader | None:
+    """Returns the process-wide content offloader, None when content is not offloaded.
+
+    Unless an offloader was set with `set_content_offloader`, one writing to
+    the store at `OTEL_INSTRUMENTATION_GENAI_CONTENT_OFFLOAD_PATH` is created
+    once the path is set, and closed when the process exits.
+    """
+    global _content_offloader
+    if _content_offloader is _UNSET:
+        path = get_content_offload_path()
+        if path is None:
+            return None
+        with _content_offloader_lock:
+            if _content_offloader is _UNSET:
+                _content_offloader = ContentOffloader(
+                    create_content_store(path),
+                    threshold_bytes=get_content_offload_threshold(),
+                )
+                atexit.register(_content_offloader.close)
+    return _content_offloader
+
+
+def set_content_offloader(offloader: ContentOffloader | None) -> None:
+    """Sets the process-wide content offloader, None disables offloading."""
+    global _content_offloader
+    _content_offloader = offloader
+
+
+def offload_content(content: str) -> str | None:
+    """Offloads `content` with the process-wide offloader, returning its reference when it does not stay inline."""
+    offloader = get_content_offloader()
+    if offloader is None:
+        return None
+    ref = offloader.offload(content)
+    return None if ref is None else ref.value
@@ -0,0 +1,181 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+from collections import OrderedDict
+from hashlib import blake2b
+from timeit import default_timer
+from typing import TYPE_CHECKING, Any, Mapping, Sequence
+
+from opentelemetry.context import Context
+from opentelemetry.metrics import MeterProvider, get_meter
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor
+from opentelemetry.semconv._incubating.attributes import (
+    gen_ai_attributes as GenAIAttributes,
+)
+
+import llm_tracekit.core._extended_gen_ai_attributes as ExtendedGenAIAttributes
+from llm_tracekit.core._cardinality import limit_metric_attributes
+from llm_tracekit.core._metrics import GEN_AI_CLIENT_REQUESTS
+from llm_tracekit.core._prompt_prefix import _message_text
+
+if TYPE_CHECKING:
+    from llm_tracekit.core._span_builder import Message
+
+DEFAULT_DUPLICATE_CALL_WINDOW_SECONDS = 300.0
+DEFAULT_DUPLICATE_CALL_MAX_ENTRIES = 10000
+
+_REQUEST_ATTRIBUTE_PREFIX = "gen_ai."
+# attributes that differ between identical requests
+_EXCLUDED_ATTRIBUTES = frozenset(
+    {
+        ExtendedGenAIAttributes.GEN_AI_PROMPT_PREFIX_HASH,
+        ExtendedGenAIAttributes.GEN_AI_REQUEST_DUPLICATE_OF,
+    }
+)
+
+
+def prompt_digest(messages: "Sequence[Message]") -> str:
+    """Returns a short hash identifying the content of a prompt."""
+    digest = blake2b(digest_size=16)
+    for message in messages:
+        digest.update(_message_text(message).encode("utf-8", "surrogatepass"))
+    return digest.hexdigest()
+
+
+def request_digest(attributes: Mapping[str, Any]) -> bytes:
+    """Returns a canonical hash of the `gen_ai.*` request attributes of a span."""
+    items = sorted(
+        (key, value)
+        for key, value in attributes.items()
+        if key.startswith(_REQUEST_ATTRIBUTE_PREFIX) and key not in _EXCLUDED_ATTRIBUTES
+    )
+    return blake2b(
+        repr(items).encode("utf-8", "surrogatepass"), digest_size=16
+    ).digest()
+
+
+class DuplicateCallDetector:
+    """Finds requests identical to an earlier request of the last `window_seconds`.
+
+    Requests are identified by `request_digest`, and at most `max_entries` of
+    them are remembered; the oldest ones are dropped first.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = DEFAULT_DUPLICATE_CALL_WINDOW_SECONDS,
+        max_entries: int = DEFAULT_DUPLICATE_CALL_MAX_ENTRIES,
+    ):
+        self.window_seconds = window_seconds
+        self.max_entries = max_entries
+        self._seen: OrderedDict[bytes, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def observe(self, attributes: Mapping[str, Any], call_id: str) -> str | None:
+        """Records a request, returns the `call_id` of the request it duplicates if any."""
+        digest = request_digest(attributes)
+        now = default_timer()
+        with self._lock:
+            expired_before = now - self.window_seconds
+            while self._seen:
+                oldest_time, _ = next(iter(self._seen.values()))
+                if oldest_time >= expired_before:
+                    break
+                self._seen.popitem(last=False)
+
+            original = self._seen.get(digest)
+            if original is not None:
+                return original[1]
+
+            if self.max_entries > 0:
+                self._seen[digest] = (now, call_id)
+                while len(self._seen) > self.max_entries:
+                    self._seen.popitem(last=False)
+            return None
+
+
+class DuplicateCallSpanProcessor(SpanProcessor):
+    """Marks spans of requests identical to an earlier request with `gen_ai.request.duplicate_of`.
+
+    The request attributes a span is started with are checked by `detector`,
+    which defaults to the process-wide detector. The attribute holds the span
+    id of the earlier request. Every checked request is counted on
+    `gen_ai.client.requests` by model and `gen_ai.request.duplicate`, with a
+    meter of `meter_provider`, which defaults to the global one. Spans without
+    a `gen_ai.request.model` are ignored.
+    """
+
+    def __init__(
+        self,
+        detector: DuplicateCallDetector | None = None,
+        meter_provider: MeterProvider | None = None,
+    ):
+        self._detector = detector
+        self._requests_counter = get_meter(
+            __name__, meter_provider=meter_provider
+        ).create_counter(
+            name=GEN_AI_CLIENT_REQUESTS,
+            description="GenAI requests checked by duplicate call detection",
+            unit="{request}",
+        )
+
+    def on_start(self, span: Span, parent_context: Context | None = None) -> None:
+        attributes = span.attributes
+        if not attributes or GenAIAttributes.GEN_AI_REQUEST_MODEL not in attributes:
+            return
+
+        detector = self._detector or get_duplicate_call_detector()
+        duplicate_of = detector.observe(
+            attributes, format(span.get_span_context().span_id, "016x")
+        )
+        if duplicate_of is not None:
+            span.set_attribute(
+                ExtendedGenAIAttributes.GEN_AI_REQUEST_DUPLICATE_OF, duplicate_of
+            )
+        metric_attributes = limit_metric_attributes(
+            None,
+            {
+                GenAIAttributes.GEN_AI_REQUEST_MODEL: attributes[
+                    GenAIAttributes.GEN_AI_REQUEST_MODEL
+                ]
+            },
+        )
+        metric_attributes[ExtendedGenAIAttributes.GEN_AI_REQUEST_DUPLICATE] = (
+            duplicate_of is not None
+        )
+        self._requests_counter.add(1, metric_attributes)
+
+    def on_end(self, span: ReadableSpan) -> None:
+        pass
+
+
+_duplicate_call_detector = DuplicateCallDetector()
+
+
+def get_duplicate_call_detector() -> DuplicateCallDetector:
+    """Returns the process-wide duplicate call detector."""
+    return _duplicate_call_detector
+
+
+def configure_duplicate_call_detector(
+    window_seconds: float = DEFAULT_DUPLICATE_CALL_WINDOW_SECONDS,
+    max_entries: int = DEFAULT_DUPLICATE_CALL_MAX_ENTRIES,
+) -> DuplicateCallDetector:
+    """Replaces the process-wide duplicate call detector."""
+    global _duplicate_call_detector
+    _duplicate_call_detector = DuplicateCallDetector(
+        window_seconds=window_seconds, max_entries=max_entries
+    )
+    return _duplicate_call_detector
@@ -0,0 +1,98 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from hashlib import blake2b
+from typing import Any, Callable, Sequence
+
+import llm_tracekit.core._extended_gen_ai_attributes as ExtendedGenAIAttributes
+from llm_tracekit.core._config import get_embedding_input_sample_size
+from llm_tracekit.core._span_builder import Message, generate_message_attributes
+
+
+def _item_text(item: Any) -> str | None:
+    return item if isinstance(item, str) else None
+
+
+def _is_token_array(item: Any) -> bool:
+    return (
+        isinstance(item, (list, tuple))
+        and len(item) > 0
+        and isinstance(item[0], int)
+        and not isinstance(item[0], bool)
+    )
+
+
+def _content_hash(data: bytes) -> str:
+    return blake2b(data, digest_size=8).hexdigest()
+
+
+def generate_embedding_input_attributes(
+    items: Sequence[Any],
+    capture_content: bool,
+    item_text: Callable[[Any], str | None] = _item_text,
+    sample_size: int | None = None,
+) -> dict[str, Any]:
+    """Builds the attributes describing the input items of an embeddings request.
+
+    Batches are summarized in a single pass: the number of items, their total
+    characters (text items) and tokens (token array items) and, when content
+    capture is enabled, a short hash of every item. Only the first
+    `sample_size` items (see `get_embedding_input_sample_size`) are recorded
+    as `gen_ai.prompt.N.*` messages.
+    """
+    if sample_size is None:
+        sample_size = get_embedding_input_sample_size()
+
+    characters = 0
+    tokens = 0
+    has_text = False
+    has_tokens = False
+    hashes: list[str] | None = [] if capture_content else None
+    sample: list[Message] = []
+    for index, item in enumerate(items):
+        if _is_token_array(item):
+            text = None
+            tokens += len(item)
+            has_tokens = True
+            if hashes is not None:
+                hashes.append(_content_hash(",".join(map(str, item)).encode()))
+        else:
+            text = item_text(item)
+            if text is not None:
+                characters += len(text)
+                has_text = True
+            if hashes is not None:
+                hashes.append(
+                    _content_hash((text or "").encode("utf-8", "surrogatepass"))
+                )
+
+        if index < sample_size:
+            sample.append(Message(role="user", content=text))
+
+    attributes: dict[str, Any] = {
+        ExtendedGenAIAttributes.GEN_AI_EMBEDDINGS_INPUT_COUNT: len(items),
+    }
+    if has_text:
+        attributes[ExtendedGenAIAttributes.GEN_AI_EMBEDDINGS_INPUT_CHARACTERS] = (
+            characters
+        )
+    if has_tokens:
+        attributes[ExtendedGenAIAttributes.GEN_AI_EMBEDDINGS_INPUT_TOKENS] = tokens
+    if hashes:
+        attributes[ExtendedGenAIAttributes.GEN_AI_EMBEDDINGS_INPUT_HASHES] = hashes
+
+    attributes.update(
+        generate_message_attributes(messages=sample, capture_content=capture_content)
+    )
+    return attributes
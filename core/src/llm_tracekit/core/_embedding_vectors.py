@@ -0,0 +1,194 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import base64
+import math
+import struct
+import sys
+from array import array
+from functools import lru_cache
+from typing import Any
+
+import llm_tracekit.core._extended_gen_ai_attributes as ExtendedGenAIAttributes
+from llm_tracekit.core._config import (
+    EMBEDDING_VECTOR_CAPTURE_FLOAT16,
+    EMBEDDING_VECTOR_CAPTURE_FULL,
+    EMBEDDING_VECTOR_CAPTURE_INT8,
+    EMBEDDING_VECTOR_CAPTURE_PREFIX,
+    EMBEDDING_VECTOR_CAPTURE_SUMMARY,
+    get_embedding_vector_capture_mode,
+    get_embedding_vector_prefix_length,
+)
+
+_FLOAT16_MAX = 65504.0
+_INT8_MAX = 127
+
+
+@lru_cache(maxsize=None)
+def _numpy() -> Any | None:
+    try:
+        import numpy
+    except ImportError:
+        return None
+
+    return numpy
+
+
+def _decode_float32(encoded: str) -> Any:
+    """Decodes a vector returned with `encoding_format="base64"`."""
+    raw = base64.b64decode(encoded)
+    numpy = _numpy()
+    if numpy is not None:
+        return numpy.frombuffer(raw, dtype="<f4")
+
+    values = array("f")
+    values.frombytes(raw[: len(raw) - len(raw) % values.itemsize])
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def _summary_attributes(embedding_index: int, vector: Any) -> dict[str, Any]:
+    numpy = _numpy()
+    if numpy is not None:
+        values = numpy.asarray(vector, dtype=numpy.float64)
+        norm = float(numpy.sqrt(numpy.dot(values, values)))
+        minimum = float(values.min())
+        maximum = float(values.max())
+        mean = float(values.mean())
+    else:
+        values = [float(value) for value in vector]
+        norm = math.hypot(*values)
+        minimum = min(values)
+        maximum = max(values)
+        mean = math.fsum(values) / len(values)
+
+    return {
+        ExtendedGenAIAttributes.GEN_AI_EMBEDDING_VECTOR_NORM.format(
+            embedding_index=embedding_index
+        ): norm,
+        ExtendedGenAIAttributes.GEN_AI_EMBEDDING_VECTOR_MIN.format(
+            embedding_index=embedding_index
+        ): minimum,
+        ExtendedGenAIAttributes.GEN_AI_EMBEDDING_VECTOR_MAX.format(
+            embedding_index=embedding_index
+        ): maximum,
+        ExtendedGenAIAttributes.GEN_AI_EMBEDDING_VECTOR_MEAN.format(
+            embedding_index=embedding_index
+        ): mean,
+    }
+
+
+def _int8_attributes(embedding_index: int, vector: Any) -> dict[str, Any]:
+    numpy = _numpy()
+    if numpy is not None:
+        values = numpy.asarray(vector, dtype=numpy.float64)
+        peak = float(numpy.abs(values).max())
+        scale = peak / _INT8_MAX if peak else 1.0
+        quantized = numpy.clip(numpy.rint(values / scale), -_INT8_MAX, _INT8_MAX)
+        raw = quantized.astype(numpy.int8).tobytes()
+    else:
+        values = [float(value) for value in vector]
+        peak = max(abs(value) for value in values)
+        scale = peak / _INT8_MAX if peak else 1.0
+        raw = array(
+            "b",
+            [max(-_INT8_MAX, min(_INT8_MAX, round(value / scale))) for value in values],
+        ).tobytes()
+
+    return {
+        ExtendedGenAIAttributes.GEN_AI_EMBEDDING_VECTOR_ENCODED.format(
+            embedding_index=embedding_index
+        ): base64.b64encode(raw).decode("ascii"),
+        ExtendedGenAIAttributes.GEN_AI_EMBEDDING_VECTOR_ENCODING.format(
+            embedding_index=embedding_index
+        ): EMBEDDING_VECTOR_CAPTURE_INT8,
+        ExtendedGenAIAttributes.GEN_AI_EMBEDDING_VECTOR_SCALE.format(
+            embedding_index=embedding_index
+        ): scale,
+    }
+
+
+def _float16_attributes(embedding_index: int, vector: Any) -> dict[str, Any]:
+    numpy = _numpy()
+    if numpy is not None:
+        values = numpy.clip(
+            numpy.asarray(vector, dtype=numpy.float64), -_FLOAT16_MAX, _FLOAT16_MAX
+        )
+        raw = values.astype("<f2").tobytes()
+    else:
+        values = [
+            max(-_FLOAT16_MAX, min(_FLOAT16_MAX, float(value))) for value in vector
+        ]
+        raw = struct.pack(f"<{len(values)}e", *values)
+
+    return {
+        ExtendedGenAIAttributes.GEN_AI_EMBEDDING_VECTOR_ENCODED.format(
+            embedding_index=embedding_index
+        ): base64.b64encode(raw).decode("ascii"),
+        ExtendedGenAIAttributes.GEN_AI_EMBEDDING_VECTOR_ENCODING.format(
+            embedding_index=embedding_index
+        ): EMBEDDING_VECTOR_CAPTURE_FLOAT16,
+    }
+
+
+def generate_embedding_vector_attributes(
+    embedding_index: int,
+    vector: Any,
+    capture_mode: str | None = None,
+) -> dict[str, Any]:
+    """Builds the attributes recording a captured embedding vector.
+
+    In the default `full` mode the vector is recorded as is. The other modes
+    (see `EMBEDDING_VECTOR_CAPTURE_MODES`) record the number of dimensions and a
+    compact representation instead: statistics (`summary`), the base64 encoded
+    components quantized to `int8` or `float16`, or the first components
+    (`prefix`). They are computed with NumPy when it is installed.
+    """
+    if capture_mode is None:
+        capture_mode = get_embedding_vector_capture_mode()
+
+    vector_key = ExtendedGenAIAttributes.GEN_AI_EMBEDDING_VECTOR.format(
+        embedding_index=embedding_index
+    )
+    if capture_mode == EMBEDDING_VECTOR_CAPTURE_FULL:
+        if not isinstance(vector, (list, str)):
+            vector = list(vector)
+        return {vector_key: vector}
+
+    if isinstance(vector, str):
+        vector = _decode_float32(vector)
+    elif not hasattr(vector, "__len__"):
+        vector = list(vector)
+
+    attributes: dict[str, Any] = {
+        ExtendedGenAIAttributes.GEN_AI_EMBEDDING_VECTOR_DIMENSIONS.format(
+            embedding_index=embedding_index
+        ): len(vector),
+    }
+    if len(vector) == 0:
+        return attributes
+
+    if capture_mode == EMBEDDING_VECTOR_CAPTURE_SUMMARY:
+        attributes.update(_summary_attributes(embedding_index, vector))
+    elif capture_mode == EMBEDDING_VECTOR_CAPTURE_INT8:
+        attributes.update(_int8_attributes(embedding_index, vector))
+    elif capture_mode == EMBEDDING_VECTOR_CAPTURE_FLOAT16:
+        attributes.update(_float16_attributes(embedding_index, vector))
+    elif capture_mode == EMBEDDING_VECTOR_CAPTURE_PREFIX:
+        attributes[vector_key] = [
+            float(value) for value in vector[: get_embedding_vector_prefix_length()]
+        ]
+
+    return attributes
@@ -61,6 +61,12 @@ The content of the prompt.
 Only captured if OTEL_INSTRUMENTATION_GENAI_CAPTURE_MESSAGE_CONTENT is set to `true`.
 """
 
+GEN_AI_PROMPT_CONTENT_REF: Final = "gen_ai.prompt.{prompt_index}.content_ref"
+"""
+A reference to the content of the prompt, written to the content store instead of `gen_ai.prompt.{prompt_index}.content`
+because of its size, as `sha256:<hex digest>:<size in bytes>`.
+"""
+
 GEN_AI_PROMPT_TOOL_CALL_ID: Final = "gen_ai.prompt.{prompt_index}.tool_call_id"
 """
 The id of the tool call.
@@ -146,6 +152,60 @@ The embedding vector at the given index.
 Only captured if OTEL_INSTRUMENTATION_GENAI_CAPTURE_MESSAGE_CONTENT is set to `true`.
 """
 
+GEN_AI_EMBEDDING_VECTOR_DIMENSIONS: Final = (
+    "gen_ai.embeddings.{embedding_index}.vector.dimensions"
+)
+"""
+The number of components of the embedding vector at the given index.
+Only set when the vector is not captured in full.
+"""
+
+GEN_AI_EMBEDDING_VECTOR_NORM: Final = "gen_ai.embeddings.{embedding_index}.vector.norm"
+"""
+The L2 norm of the embedding vector at the given index.
+Only set in the `summary` embedding vector capture mode.
+"""
+
+GEN_AI_EMBEDDING_VECTOR_MIN: Final = "gen_ai.embeddings.{embedding_index}.vector.min"
+"""
+The smallest component of the embedding vector at the given index.
+Only set in the `summary` embedding vector capture mode.
+"""
+
+GEN_AI_EMBEDDING_VECTOR_MAX: Final = "gen_ai.embeddings.{embedding_index}.vector.max"
+"""
+The largest component of the embedding vector at the given index.
+Only set in the `summary` embedding vector capture mode.
+"""
+
+GEN_AI_EMBEDDING_VECTOR_MEAN: Final = "gen_ai.embeddings.{embedding_index}.vector.mean"
+"""
+The mean of the components of the embedding vector at the given index.
+Only set in the `summary` embedding vector capture mode.
+"""
+
+GEN_AI_EMBEDDING_VECTOR_ENCODED: Final = (
+    "gen_ai.embeddings.{embedding_index}.vector.encoded"
+)
+"""
+The base64 encoded, quantized embedding vector at the given index.
+Only set in the `int8` and `float16` embedding vector capture modes.
+"""
+
+GEN_AI_EMBEDDING_VECTOR_ENCODING: Final = (
+    "gen_ai.embeddings.{embedding_index}.vector.encoding"
+)
+"""
+The little-endian element type of `gen_ai.embeddings.{embedding_index}.vector.encoded`: `int8` or `float16`.
+"""
+
+GEN_AI_EMBEDDING_VECTOR_SCALE: Final = (
+    "gen_ai.embeddings.{embedding_index}.vector.scale"
+)
+"""
+The factor the `int8` encoded components are multiplied by to restore the embedding vector at the given index.
+"""
+
 GEN_AI_REQUEST_ENCODING_FORMATS: Final = "gen_ai.request.encoding_formats"
 """
 The encoding formats requested in an embeddings operation.
@@ -155,3 +215,174 @@ GEN_AI_EMBEDDINGS_DIMENSION_COUNT: Final = "gen_ai.embeddings.dimension.count"
 """
 The number of dimensions requested for the output embeddings.
 """
+
+GEN_AI_EMBEDDINGS_INPUT_COUNT: Final = "gen_ai.embeddings.input.count"
+"""
+The number of items embedded by an embeddings operation.
+"""
+
+GEN_AI_EMBEDDINGS_INPUT_CHARACTERS: Final = "gen_ai.embeddings.input.characters"
+"""
+The total number of characters of the text items embedded by an embeddings operation.
+"""
+
+GEN_AI_EMBEDDINGS_INPUT_TOKENS: Final = "gen_ai.embeddings.input.tokens"
+"""
+The total number of tokens of the token array items embedded by an embeddings operation.
+"""
+
+GEN_AI_EMBEDDINGS_INPUT_HASHES: Final = "gen_ai.embeddings.input.hashes"
+"""
+A short hash of the content of every item embedded by an embeddings operation, in order.
+Only captured if OTEL_INSTRUMENTATION_GENAI_CAPTURE_MESSAGE_CONTENT is set to `true`.
+"""
+
+GEN_AI_USAGE_CACHE_READ_INPUT_TOKENS: Final = "gen_ai.usage.cache_read.input_tokens"
+"""
+The number of input tokens read from the provider's prompt cache.
+"""
+
+GEN_AI_USAGE_CACHE_CREATION_INPUT_TOKENS: Final = (
+    "gen_ai.usage.cache_creation.input_tokens"
+)
+"""
+The number of input tokens written to the provider's prompt cache.
+"""
+
+GEN_AI_USAGE_CACHE_HIT_RATIO: Final = "gen_ai.usage.cache_hit_ratio"
+"""
+The share of the input tokens, including cached ones, that were read from the provider's prompt cache.
+"""
+
+GEN_AI_USAGE_REASONING_OUTPUT_TOKENS: Final = "gen_ai.usage.reasoning.output_tokens"
+"""
+The number of output tokens the model spent on hidden reasoning, included in `gen_ai.usage.output_tokens`.
+"""
+
+GEN_AI_RESPONSE_REASONING_DURATION: Final = "gen_ai.response.reasoning_duration"
+"""
+An estimate, in seconds, of the time a streamed response spent reasoning: the time from the request until the
+first visible content delta. Only set for streams of responses that reasoned.
+"""
+
+GEN_AI_PROMPT_PREFIX_HASH: Final = "gen_ai.prompt.prefix_hash"
+"""
+A hash of the longest block-aligned prefix of the prompt shared with an earlier prompt to the same model, or of
+the first block of the prompt when there is none. Only set when prompt prefix analysis is enabled.
+"""
+
+GEN_AI_PROMPT_DIGEST: Final = "gen_ai.prompt.digest"
+"""
+A hash of the whole content of the prompt, identifying identical prompts even when content is not captured.
+Only set when duplicate call detection is enabled.
+"""
+
+GEN_AI_REQUEST_DUPLICATE_OF: Final = "gen_ai.request.duplicate_of"
+"""
+The span id of an earlier request identical to this one: same model, prompt, tools and request parameters.
+"""
+
+GEN_AI_REQUEST_DUPLICATE: Final = "gen_ai.request.duplicate"
+"""
+Whether a request is identical to an earlier request, as an attribute of the requests counted by duplicate call
+detection.
+"""
+
+GEN_AI_CACHE_HIT: Final = "gen_ai.cache.hit"
+"""
+Whether the response was served from the local response cache instead of the provider. Only set for requests
+that could be cached.
+"""
+
+GEN_AI_USAGE_ESTIMATED: Final = "gen_ai.usage.estimated"
+"""
+Whether the token usage of the span was estimated locally, because the response did not report it. Only set
+for estimated usage.
+"""
+
+GEN_AI_HTTP_CONNECTION_REUSED: Final = "gen_ai.http.connection.reused"
+"""
+Whether the HTTP request to the provider was sent on a connection reused from the connection pool.
+"""
+
+GEN_AI_HTTP_PHASE: Final = "gen_ai.http.phase"
+"""
+The phase of an HTTP request to the provider: `queue`, `connect`, `tls`, `time_to_headers` or `body`.
+"""
+
+GEN_AI_HTTP_QUEUE_DURATION: Final = "gen_ai.http.queue_duration"
+"""
+The seconds the HTTP request waited for a connection from the pool, including the client overhead.
+"""
+
+GEN_AI_HTTP_CONNECT_DURATION: Final = "gen_ai.http.connect_duration"
+"""
+The seconds spent opening a new TCP connection to the provider, including the DNS lookup.
+"""
+
+GEN_AI_HTTP_TLS_DURATION: Final = "gen_ai.http.tls_duration"
+"""
+The seconds spent on the TLS handshake of a new connection to the provider.
+"""
+
+GEN_AI_HTTP_TIME_TO_HEADERS: Final = "gen_ai.http.time_to_headers"
+"""
+The seconds from sending the HTTP request until the response headers arrived.
+"""
+
+GEN_AI_HTTP_BODY_DURATION: Final = "gen_ai.http.body_duration"
+"""
+The seconds spent receiving the HTTP response body, which for streams is the whole stream.
+"""
+
+GEN_AI_API_KEY_ID: Final = "gen_ai.api_key.id"
+"""
+A short SHA-256 fingerprint of the API key the request was sent with, to tell keys apart without exposing them.
+"""
+
+GEN_AI_RATE_LIMIT_TYPE: Final = "gen_ai.rate_limit.type"
+"""
+What a provider rate limit counts: `requests`, `tokens`, `input_tokens` or `output_tokens`.
+"""
+
+GEN_AI_RATE_LIMIT_REMAINING_REQUESTS: Final = "gen_ai.rate_limit.remaining_requests"
+"""
+The requests left in the provider's rate limit window, as reported by the last response of the call.
+"""
+
+GEN_AI_RATE_LIMIT_REMAINING_TOKENS: Final = "gen_ai.rate_limit.remaining_tokens"
+"""
+The tokens left in the provider's rate limit window, as reported by the last response of the call.
+"""
+
+GEN_AI_RATE_LIMIT_RESPONSES: Final = "gen_ai.rate_limit.responses"
+"""
+The number of responses of the call rejected by the provider's rate limits (HTTP 429), including the ones the SDK
+retried. Only set for calls that were rate limited.
+"""
+
+GEN_AI_RATE_LIMIT_RETRY_AFTER: Final = "gen_ai.rate_limit.retry_after"
+"""
+The seconds the provider asked the client to wait in the `retry-after` header of the last rate limited response.
+"""
+
+GEN_AI_REQUEST_RETRIES: Final = "gen_ai.request.retries"
+"""
+The number of times the provider SDK retried the request of the call. Only set for retried calls.
+"""
+
+GEN_AI_REQUEST_BACKOFF_DURATION: Final = "gen_ai.request.backoff_duration"
+"""
+The seconds the provider SDK waited before the retries of the call. Only set for retried calls.
+"""
+
+GEN_AI_METRIC_ATTRIBUTE: Final = "gen_ai.metric.attribute"
+"""
+The metric attribute whose value was collapsed into `other` by the metric attribute limiter.
+"""
+
+GEN_AI_STREAM_CAPTURE_MODE: Final = "gen_ai.stream.capture_mode"
+"""
+How content of a stream was captured after the stream memory budget was exhausted: `truncated` or `metadata_only`.
+Only set for streams whose capture was degraded.
+"""
@@ -0,0 +1,163 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import inspect
+from timeit import default_timer
+from typing import Any
+
+from opentelemetry.trace import Span
+from opentelemetry.util.types import AttributeValue
+
+import llm_tracekit.core._extended_gen_ai_attributes as ExtendedGenAIAttributes
+from llm_tracekit.core._metrics import Instruments
+
+HTTP_PHASE_QUEUE = "queue"
+HTTP_PHASE_CONNECT = "connect"
+HTTP_PHASE_TLS = "tls"
+HTTP_PHASE_TIME_TO_HEADERS = "time_to_headers"
+HTTP_PHASE_BODY = "body"
+
+_PHASE_ATTRIBUTES = {
+    HTTP_PHASE_QUEUE: ExtendedGenAIAttributes.GEN_AI_HTTP_QUEUE_DURATION,
+    HTTP_PHASE_CONNECT: ExtendedGenAIAttributes.GEN_AI_HTTP_CONNECT_DURATION,
+    HTTP_PHASE_TLS: ExtendedGenAIAttributes.GEN_AI_HTTP_TLS_DURATION,
+    HTTP_PHASE_TIME_TO_HEADERS: ExtendedGenAIAttributes.GEN_AI_HTTP_TIME_TO_HEADERS,
+    HTTP_PHASE_BODY: ExtendedGenAIAttributes.GEN_AI_HTTP_BODY_DURATION,
+}
+
+# httpcore steps timed from their start to their end
+_STEP_PHASES = {
+    "connect_tcp": HTTP_PHASE_CONNECT,
+    "connect_unix_socket": HTTP_PHASE_CONNECT,
+    "start_tls": HTTP_PHASE_TLS,
+    "receive_response_body": HTTP_PHASE_BODY,
+}
+# the first step of a request on a new connection, or on a reused one
+_CONNECT_STEPS = frozenset(("connect_tcp", "connect_unix_socket"))
+_SEND_STEP = "send_request_headers"
+_RECEIVE_HEADERS_STEP = "receive_response_headers"
+
+
+class HttpTimingRecorder:
+    """Times the phases of an HTTP request from the events of the httpcore `trace` extension.
+
+    The phases are the wait for a connection from the pool (`queue`), which
+    includes the client overhead from the creation of the recorder, the TCP
+    connection, including the DNS lookup (`connect`), the TLS handshake
+    (`tls`), the time from sending the request until the response headers
+    arrived (`time_to_headers`) and the transfer of the response body
+    (`body`). Requests on a reused connection have no `connect` and `tls`
+    phases.
+
+    Every phase is set as an attribute of `span` and recorded to the HTTP phase
+    duration histogram, along with whether the connection was reused.
+    """
+
+    __slots__ = (
+        "span",
+        "instruments",
+        "attributes",
+        "start_time",
+        "connection_reused",
+        "_step_start_times",
+    )
+
+    def __init__(
+        self,
+        span: Span,
+        instruments: Instruments,
+        attributes: dict[str, AttributeValue],
+        start_time: float | None = None,
+    ) -> None:
+        self.span = span
+        self.instruments = instruments
+        self.attributes = attributes
+        self.start_time = default_timer() if start_time is None else start_time
+        self.connection_reused: bool | None = None
+        self._step_start_times: dict[str, float] = {}
+
+    def on_event(self, name: str) -> None:
+        # e.g. "http11.receive_response_headers.started"
+        step, _, state = name.partition(".")[2].rpartition(".")
+        now = default_timer()
+        if state == "started":
+            if self.connection_reused is None and (
+                step in _CONNECT_STEPS or step == _SEND_STEP
+            ):
+                self.connection_reused = step == _SEND_STEP
+                if self.span.is_recording():
+                    self.span.set_attribute(
+                        ExtendedGenAIAttributes.GEN_AI_HTTP_CONNECTION_REUSED,
+                        self.connection_reused,
+                    )
+                self._record(HTTP_PHASE_QUEUE, now - self.start_time)
+            self._step_start_times[step] = now
+            return
+
+        # a body that is not read to the end, as streams closed early, fails
+        if state == "complete" or (state == "failed" and step in _STEP_PHASES):
+            if step == _RECEIVE_HEADERS_STEP:
+                send_start_time = self._step_start_times.get(_SEND_STEP)
+                if send_start_time is not None:
+                    self._record(HTTP_PHASE_TIME_TO_HEADERS, now - send_start_time)
+            elif step in _STEP_PHASES:
+                step_start_time = self._step_start_times.pop(step, None)
+                if step_start_time is not None:
+                    self._record(_STEP_PHASES[step], now - step_start_time)
+
+    def trace(self, name: str, info: dict[str, Any]) -> None:
+        """The `trace` extension of requests sent by a sync client."""
+        self.on_event(name)
+
+    async def atrace(self, name: str, info: dict[str, Any]) -> None:
+        """The `trace` extension of requests sent by an async client."""
+        self.on_event(name)
+
+    def _record(self, phase: str, duration: float) -> None:
+        duration = max(duration, 0.0)
+        if self.span.is_recording():
+            self.span.set_attribute(_PHASE_ATTRIBUTES[phase], duration)
+        self.instruments.http_phase_duration_histogram.record(
+            duration,
+            attributes={
+                **self.attributes,
+                ExtendedGenAIAttributes.GEN_AI_HTTP_PHASE: phase,
+                ExtendedGenAIAttributes.GEN_AI_HTTP_CONNECTION_REUSED: bool(
+                    self.connection_reused
+                ),
+            },
+        )
+
+
+def attach_http_timing(
+    request: Any,
+    client_instance: Any,
+    span: Span,
+    instruments: Instruments,
+    attributes: dict[str, AttributeValue],
+) -> None:
+    """Times an httpx request with an `HttpTimingRecorder` as its `trace` extension.
+
+    A `trace` extension set by the application is kept, and the request is not
+    timed.
+    """
+    extensions = getattr(request, "extensions", None)
+    if not isinstance(extensions, dict) or "trace" in extensions:
+        return
+
+    recorder = HttpTimingRecorder(span, instruments, attributes)
+    send = getattr(getattr(client_instance, "_client", None), "send", None)
+    extensions["trace"] = (
+        recorder.atrace if inspect.iscoroutinefunction(send) else recorder.trace
+    )
@@ -0,0 +1,157 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+from typing import Any
+
+import llm_tracekit.core._extended_gen_ai_attributes as ExtendedGenAIAttributes
+
+CAPTURE_MODE_FULL = "full"
+CAPTURE_MODE_TRUNCATED = "truncated"
+CAPTURE_MODE_METADATA_ONLY = "metadata_only"
+
+
+class StreamMemoryBudget:
+    """Process-wide accounting of the content buffered by stream wrappers.
+
+    Every stream wrapper opens a `StreamBufferReservation` and charges it for
+    the content it buffers. Once `limit_bytes` is reached, reservations that
+    need more space degrade to `degrade_to`:
+
+    * `truncated` - content buffered so far is kept, the rest is dropped.
+    * `metadata_only` - no content is reported for the stream at all.
+
+    Sizes of `str` chunks are measured with `len`, a cheap approximation of
+    their encoded size. When `limit_bytes` is None nothing is accounted.
+
+    `content_limit_bytes` caps every content a stream accumulates (a text or
+    the arguments of a tool call) on its own, regardless of the other streams;
+    content crossing it is truncated.
+    """
+
+    def __init__(
+        self,
+        limit_bytes: int | None = None,
+        degrade_to: str = CAPTURE_MODE_TRUNCATED,
+        content_limit_bytes: int | None = None,
+    ):
+        if degrade_to not in (CAPTURE_MODE_TRUNCATED, CAPTURE_MODE_METADATA_ONLY):
+            raise ValueError(f"Unsupported degrade mode: {degrade_to!r}")
+
+        self.limit_bytes = limit_bytes
+        self.degrade_to = degrade_to
+        self.content_limit_bytes = content_limit_bytes
+        self.buffered_bytes = 0
+        self.degradations = {
+            CAPTURE_MODE_TRUNCATED: 0,
+            CAPTURE_MODE_METADATA_ONLY: 0,
+        }
+        self._lock = threading.Lock()
+
+    def open_buffer(self) -> "StreamBufferReservation":
+        return StreamBufferReservation(self)
+
+    def _try_reserve(self, size: int) -> bool:
+        with self._lock:
+            if self.buffered_bytes + size > self.limit_bytes:  # type: ignore[operator]
+                self.degradations[self.degrade_to] += 1
+                return False
+            self.buffered_bytes += size
+            return True
+
+    def _release(self, size: int) -> None:
+        with self._lock:
+            self.buffered_bytes -= size
+
+
+class StreamBufferReservation:
+    """The share of a `StreamMemoryBudget` held by a single stream."""
+
+    __slots__ = ("_budget", "size", "capture_mode", "content_truncated")
+
+    def __init__(self, budget: StreamMemoryBudget):
+        self._budget = budget
+        self.size = 0
+        self.capture_mode = CAPTURE_MODE_FULL
+        self.content_truncated = False
+
+    @property
+    def content_limit_bytes(self) -> int | None:
+        return self._budget.content_limit_bytes
+
+    @property
+    def is_degraded(self) -> bool:
+        return self.capture_mode != CAPTURE_MODE_FULL
+
+    @property
+    def content_allowed(self) -> bool:
+        """Whether the buffered content may be reported at the end of the stream."""
+        return self.capture_mode != CAPTURE_MODE_METADATA_ONLY
+
+    def charge(self, size: int) -> bool:
+        """Accounts for `size` more buffered bytes, returns whether they may be buffered."""
+        if self.capture_mode != CAPTURE_MODE_FULL:
+            return False
+        if self._budget.limit_bytes is None:
+            return True
+        if not self._budget._try_reserve(size):
+            self.capture_mode = self._budget.degrade_to
+            return False
+        self.size += size
+        return True
+
+    def attributes(self) -> dict[str, Any]:
+        """Span attributes describing a degraded capture, empty if nothing was degraded."""
+        if self.capture_mode == CAPTURE_MODE_FULL:
+            if self.content_truncated:
+                return {
+                    ExtendedGenAIAttributes.GEN_AI_STREAM_CAPTURE_MODE: CAPTURE_MODE_TRUNCATED
+                }
+            return {}
+        return {ExtendedGenAIAttributes.GEN_AI_STREAM_CAPTURE_MODE: self.capture_mode}
+
+    def release(self) -> None:
+        """Returns the buffered bytes to the budget, called once the stream has ended."""
+        if self.size:
+            self._budget._release(self.size)
+            self.size = 0
+
+    def __del__(self):
+        self.release()
+
+
+_stream_memory_budget = StreamMemoryBudget()
+
+
+def get_stream_memory_budget() -> StreamMemoryBudget:
+    """Returns the process-wide stream memory budget."""
+    return _stream_memory_budget
+
+
+def configure_stream_memory_budget(
+    limit_bytes: int | None,
+    degrade_to: str = CAPTURE_MODE_TRUNCATED,
+    content_limit_bytes: int | None = None,
+) -> StreamMemoryBudget:
+    """Replaces the process-wide stream memory budget.
+
+    Streams that are already running keep accounting against the previous budget.
+    """
+    global _stream_memory_budget
+    _stream_memory_budget = StreamMemoryBudget(
+        limit_bytes=limit_bytes,
+        degrade_to=degrade_to,
+        content_limit_bytes=content_limit_bytes,
+    )
+    return _stream_memory_budget
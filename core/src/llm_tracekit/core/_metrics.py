@@ -12,9 +12,108 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from opentelemetry.metrics import Histogram, Meter
+import threading
+import weakref
+from typing import Any, Iterable
+
+from opentelemetry.metrics import (
+    CallbackOptions,
+    Counter,
+    Histogram,
+    Meter,
+    Observation,
+    UpDownCounter,
+)
+from opentelemetry.semconv._incubating.attributes import (
+    gen_ai_attributes as GenAIAttributes,
+)
 from opentelemetry.semconv._incubating.metrics import gen_ai_metrics
 
+import llm_tracekit.core._extended_gen_ai_attributes as ExtendedGenAIAttributes
+from llm_tracekit.core._config import is_prompt_prefix_analysis_enabled
+from llm_tracekit.core._memory_budget import get_stream_memory_budget
+from llm_tracekit.core._prompt_prefix import get_prompt_prefix_analyzer
+
+GEN_AI_CLIENT_STREAM_BUFFERED_BYTES = "gen_ai.client.stream.buffered_bytes"
+GEN_AI_CLIENT_STREAM_CAPTURE_DEGRADATIONS = "gen_ai.client.stream.capture_degradations"
+GEN_AI_CLIENT_TOKEN_CACHE_HIT_RATIO = "gen_ai.client.token.cache_hit_ratio"
+GEN_AI_CLIENT_PROMPT_CACHEABLE_PREFIX_SHARE = (
+    "gen_ai.client.prompt.cacheable_prefix_share"
+)
+GEN_AI_CLIENT_REQUESTS = "gen_ai.client.requests"
+GEN_AI_CLIENT_CACHE_HIT_DURATION = "gen_ai.client.cache_hit.duration"
+GEN_AI_CLIENT_HTTP_PHASE_DURATION = "gen_ai.client.http.phase.duration"
+GEN_AI_CLIENT_RATE_LIMIT_REMAINING = "gen_ai.client.rate_limit.remaining"
+GEN_AI_CLIENT_RATE_LIMIT_LIMIT = "gen_ai.client.rate_limit.limit"
+GEN_AI_CLIENT_RATE_LIMITED_RESPONSES = "gen_ai.client.rate_limited_responses"
+GEN_AI_CLIENT_REQUEST_RETRIES = "gen_ai.client.request.retries"
+GEN_AI_CLIENT_RETRY_BACKOFF_DURATION = "gen_ai.client.retry.backoff.duration"
+GEN_AI_CLIENT_ACTIVE_REQUESTS = "gen_ai.client.request.active"
+GEN_AI_CLIENT_ACTIVE_STREAMS = "gen_ai.client.stream.active"
+GEN_AI_CLIENT_OUTPUT_THROUGHPUT = "gen_ai.client.output_throughput"
+GEN_AI_CLIENT_COLLAPSED_ATTRIBUTE_VALUES = (
+    "gen_ai.client.metric.collapsed_attribute_values"
+)
+
+GEN_AI_CLIENT_CACHE_HIT_DURATION_BUCKETS = [
+    0.0001,
+    0.0002,
+    0.0005,
+    0.001,
+    0.002,
+    0.005,
+    0.01,
+    0.02,
+    0.05,
+    0.1,
+]
+
+GEN_AI_CLIENT_HTTP_PHASE_DURATION_BUCKETS = [
+    0.001,
+    0.002,
+    0.005,
+    0.01,
+    0.02,
+    0.05,
+    0.1,
+    0.2,
+    0.5,
+    1.0,
+    2.0,
+    5.0,
+    10.0,
+    20.0,
+    50.0,
+]
+
+GEN_AI_CLIENT_RETRY_BACKOFF_DURATION_BUCKETS = [
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.0,
+    4.0,
+    8.0,
+    15.0,
+    30.0,
+    60.0,
+]
+
+GEN_AI_CLIENT_OUTPUT_THROUGHPUT_BUCKETS = [
+    1,
+    2,
+    5,
+    10,
+    20,
+    50,
+    100,
+    200,
+    500,
+    1000,
+    2000,
+    5000,
+]
+
 GEN_AI_CLIENT_OPERATION_DURATION_BUCKETS = [
     0.01,
     0.02,
@@ -32,6 +131,20 @@ GEN_AI_CLIENT_OPERATION_DURATION_BUCKETS = [
     81.92,
 ]
 
+GEN_AI_CLIENT_TOKEN_CACHE_HIT_RATIO_BUCKETS = [
+    0.0,
+    0.1,
+    0.2,
+    0.3,
+    0.4,
+    0.5,
+    0.6,
+    0.7,
+    0.8,
+    0.9,
+    1.0,
+]
+
 GEN_AI_CLIENT_TOKEN_USAGE_BUCKETS = [
     1,
     4,
@@ -64,3 +177,172 @@ class Instruments:
             unit="{token}",
             explicit_bucket_boundaries_advisory=GEN_AI_CLIENT_TOKEN_USAGE_BUCKETS,
         )
+        self.cache_hit_ratio_histogram: Histogram = meter.create_histogram(
+            name=GEN_AI_CLIENT_TOKEN_CACHE_HIT_RATIO,
+            description="Share of the input tokens read from the provider's prompt cache",
+            unit="1",
+            explicit_bucket_boundaries_advisory=GEN_AI_CLIENT_TOKEN_CACHE_HIT_RATIO_BUCKETS,
+        )
+        self.cache_hit_duration_histogram: Histogram = meter.create_histogram(
+            name=GEN_AI_CLIENT_CACHE_HIT_DURATION,
+            description="Duration of GenAI operations served from the local response cache",
+            unit="s",
+            explicit_bucket_boundaries_advisory=GEN_AI_CLIENT_CACHE_HIT_DURATION_BUCKETS,
+        )
+        self.http_phase_duration_histogram: Histogram = meter.create_histogram(
+            name=GEN_AI_CLIENT_HTTP_PHASE_DURATION,
+            description="Duration of the phases of the HTTP requests of GenAI operations",
+            unit="s",
+            explicit_bucket_boundaries_advisory=GEN_AI_CLIENT_HTTP_PHASE_DURATION_BUCKETS,
+        )
+        # the rate limits reported by the provider are last values per model and
+        # key, so they are recorded with synchronous gauges.
+        self.rate_limit_remaining_gauge = meter.create_gauge(
+            name=GEN_AI_CLIENT_RATE_LIMIT_REMAINING,
+            description="Capacity left in the provider's current rate limit window",
+            unit="1",
+        )
+        self.rate_limit_limit_gauge = meter.create_gauge(
+            name=GEN_AI_CLIENT_RATE_LIMIT_LIMIT,
+            description="Capacity of the provider's rate limit window",
+            unit="1",
+        )
+        self.rate_limited_responses_counter: Counter = meter.create_counter(
+            name=GEN_AI_CLIENT_RATE_LIMITED_RESPONSES,
+            description="Responses rejected by the provider's rate limits, including retried ones",
+            unit="{response}",
+        )
+        self.request_retries_counter: Counter = meter.create_counter(
+            name=GEN_AI_CLIENT_REQUEST_RETRIES,
+            description="Requests retried by the provider SDK",
+            unit="{request}",
+        )
+        self.retry_backoff_duration_histogram: Histogram = meter.create_histogram(
+            name=GEN_AI_CLIENT_RETRY_BACKOFF_DURATION,
+            description="Time the provider SDK waited before retrying a request",
+            unit="s",
+            explicit_bucket_boundaries_advisory=GEN_AI_CLIENT_RETRY_BACKOFF_DURATION_BUCKETS,
+        )
+        self.active_requests_counter: UpDownCounter = meter.create_up_down_counter(
+            name=GEN_AI_CLIENT_ACTIVE_REQUESTS,
+            description="GenAI requests waiting for their response",
+            unit="{request}",
+        )
+        self.active_streams_counter: UpDownCounter = meter.create_up_down_counter(
+            name=GEN_AI_CLIENT_ACTIVE_STREAMS,
+            description="GenAI response streams that have not ended yet",
+            unit="{stream}",
+        )
+        self.output_throughput_histogram: Histogram = meter.create_histogram(
+            name=GEN_AI_CLIENT_OUTPUT_THROUGHPUT,
+            description="Output tokens generated per second, excluding the time to the first token of streams",
+            unit="{token}/s",
+            explicit_bucket_boundaries_advisory=GEN_AI_CLIENT_OUTPUT_THROUGHPUT_BUCKETS,
+        )
+        self.collapsed_attribute_values_counter: Counter = meter.create_counter(
+            name=GEN_AI_CLIENT_COLLAPSED_ATTRIBUTE_VALUES,
+            description="Metric attribute values recorded as `other` by the metric attribute limiter",
+            unit="{value}",
+        )
+        _register_process_instruments(meter)
+
+
+class _GlobalMeterPipeline:
+    """Stands for the global meter provider, which proxy and no-op meters report to."""
+
+
+_GLOBAL_METER_PIPELINE = _GlobalMeterPipeline()
+
+_process_instruments_lock = threading.Lock()
+_process_instruments_pipelines: weakref.WeakSet[Any] = weakref.WeakSet()
+
+
+def _meter_pipeline(meter: Meter) -> Any:
+    # the meters of an SDK meter provider share its measurement consumer
+    return getattr(meter, "_measurement_consumer", _GLOBAL_METER_PIPELINE)
+
+
+def _register_process_instruments(meter: Meter) -> None:
+    """Registers the observable instruments of process-wide state with the first meter of every meter provider.
+
+    Every instrumentation creates its own `Instruments`, and registering them
+    with each of their meters would report the same values once per
+    instrumentation. The meter providers are tracked weakly, so a meter
+    provider that replaces another one gets the instruments as well.
+    """
+    pipeline = _meter_pipeline(meter)
+    with _process_instruments_lock:
+        if pipeline in _process_instruments_pipelines:
+            return
+        _process_instruments_pipelines.add(pipeline)
+
+    # the stream memory budget is process-wide, so it is observed rather than
+    # recorded, and only once a limit has been configured.
+    meter.create_observable_gauge(
+        name=GEN_AI_CLIENT_STREAM_BUFFERED_BYTES,
+        callbacks=[_observe_stream_buffered_bytes],
+        description="Content currently buffered by stream wrappers",
+        unit="By",
+    )
+    meter.create_observable_counter(
+        name=GEN_AI_CLIENT_STREAM_CAPTURE_DEGRADATIONS,
+        callbacks=[_observe_stream_capture_degradations],
+        description="Streams whose content capture was degraded by the stream memory budget",
+        unit="{stream}",
+    )
+    meter.create_observable_gauge(
+        name=GEN_AI_CLIENT_PROMPT_CACHEABLE_PREFIX_SHARE,
+        callbacks=[_CacheablePrefixShareCallback()],
+        description="Share of the prompt characters in prefixes already sent to the model",
+        unit="1",
+    )
+
+
+def _observe_stream_buffered_bytes(options: CallbackOptions) -> Iterable[Observation]:
+    budget = get_stream_memory_budget()
+    if budget.limit_bytes is None:
+        return []
+    return [Observation(budget.buffered_bytes)]
+
+
+def _observe_stream_capture_degradations(
+    options: CallbackOptions,
+) -> Iterable[Observation]:
+    budget = get_stream_memory_budget()
+    if budget.limit_bytes is None:
+        return []
+    return [
+        Observation(
+            count, {ExtendedGenAIAttributes.GEN_AI_STREAM_CAPTURE_MODE: capture_mode}
+        )
+        for capture_mode, count in budget.degradations.items()
+    ]
+
+
+class _CacheablePrefixShareCallback:
+    """Observes the cacheable prefix share of the prompts analyzed since the previous collection."""
+
+    def __init__(self) -> None:
+        self._previous: dict[str, tuple[int, int]] = {}
+
+    def __call__(self, options: CallbackOptions) -> Iterable[Observation]:
+        if not is_prompt_prefix_analysis_enabled():
+            return []
+
+        observations = []
+        totals = get_prompt_prefix_analyzer().totals()
+        for model, (cacheable_length, total_length) in totals.items():
+            previous_cacheable, previous_total = self._previous.get(model, (0, 0))
+            if total_length < previous_total:
+                # the analyzer was replaced or dropped the model since
+                previous_cacheable, previous_total = 0, 0
+            if total_length > previous_total:
+                observations.append(
+                    Observation(
+                        (cacheable_length - previous_cacheable)
+                        / (total_length - previous_total),
+                        {GenAIAttributes.GEN_AI_REQUEST_MODEL: model},
+                    )
+                )
+        self._previous = totals
+        return observations
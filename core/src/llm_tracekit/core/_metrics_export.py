@@ -0,0 +1,130 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Sequence
+
+from opentelemetry.sdk.metrics import (
+    Counter,
+    Histogram,
+    MeterProvider,
+    ObservableCounter,
+    ObservableGauge,
+    ObservableUpDownCounter,
+    UpDownCounter,
+    _Gauge,
+)
+from opentelemetry.sdk.metrics.export import AggregationTemporality, MetricReader
+from opentelemetry.sdk.metrics.view import (
+    ExplicitBucketHistogramAggregation,
+    ExponentialBucketHistogramAggregation,
+    View,
+)
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.semconv._incubating.metrics import gen_ai_metrics
+
+from llm_tracekit.core._metrics import (
+    GEN_AI_CLIENT_CACHE_HIT_DURATION,
+    GEN_AI_CLIENT_CACHE_HIT_DURATION_BUCKETS,
+    GEN_AI_CLIENT_HTTP_PHASE_DURATION,
+    GEN_AI_CLIENT_HTTP_PHASE_DURATION_BUCKETS,
+    GEN_AI_CLIENT_OPERATION_DURATION_BUCKETS,
+    GEN_AI_CLIENT_OUTPUT_THROUGHPUT,
+    GEN_AI_CLIENT_OUTPUT_THROUGHPUT_BUCKETS,
+    GEN_AI_CLIENT_RETRY_BACKOFF_DURATION,
+    GEN_AI_CLIENT_RETRY_BACKOFF_DURATION_BUCKETS,
+    GEN_AI_CLIENT_TOKEN_CACHE_HIT_RATIO,
+    GEN_AI_CLIENT_TOKEN_CACHE_HIT_RATIO_BUCKETS,
+    GEN_AI_CLIENT_TOKEN_USAGE_BUCKETS,
+)
+
+DEFAULT_METRIC_EXPORT_INTERVAL_MILLIS = 60000
+DEFAULT_EXPONENTIAL_HISTOGRAM_MAX_SIZE = 160
+
+# counters and histograms are exported as the change since the previous export,
+# so that the backend does not have to keep the state of every series. Up-down
+# counters and gauges report current values, which stay cumulative.
+DELTA_TEMPORALITY: dict[type, AggregationTemporality] = {
+    Counter: AggregationTemporality.DELTA,
+    UpDownCounter: AggregationTemporality.CUMULATIVE,
+    Histogram: AggregationTemporality.DELTA,
+    ObservableCounter: AggregationTemporality.DELTA,
+    ObservableUpDownCounter: AggregationTemporality.CUMULATIVE,
+    ObservableGauge: AggregationTemporality.CUMULATIVE,
+    _Gauge: AggregationTemporality.CUMULATIVE,
+}
+
+# the explicit bucket boundaries of the histograms recorded by the instrumentations
+HISTOGRAM_BUCKETS: dict[str, Sequence[float]] = {
+    gen_ai_metrics.GEN_AI_CLIENT_OPERATION_DURATION: GEN_AI_CLIENT_OPERATION_DURATION_BUCKETS,
+    gen_ai_metrics.GEN_AI_CLIENT_TOKEN_USAGE: GEN_AI_CLIENT_TOKEN_USAGE_BUCKETS,
+    GEN_AI_CLIENT_TOKEN_CACHE_HIT_RATIO: GEN_AI_CLIENT_TOKEN_CACHE_HIT_RATIO_BUCKETS,
+    GEN_AI_CLIENT_CACHE_HIT_DURATION: GEN_AI_CLIENT_CACHE_HIT_DURATION_BUCKETS,
+    GEN_AI_CLIENT_HTTP_PHASE_DURATION: GEN_AI_CLIENT_HTTP_PHASE_DURATION_BUCKETS,
+    GEN_AI_CLIENT_RETRY_BACKOFF_DURATION: GEN_AI_CLIENT_RETRY_BACKOFF_DURATION_BUCKETS,
+    GEN_AI_CLIENT_OUTPUT_THROUGHPUT: GEN_AI_CLIENT_OUTPUT_THROUGHPUT_BUCKETS,
+}
+
+
+def create_metric_views(
+    exponential_histograms: bool = False,
+    exponential_histogram_max_size: int = DEFAULT_EXPONENTIAL_HISTOGRAM_MAX_SIZE,
+) -> list[View]:
+    """Returns the views that aggregate the gen_ai histograms.
+
+    By default every histogram gets its explicit bucket boundaries, whether or
+    not the SDK honours the boundaries advised by the instrument. With
+    `exponential_histograms`, all gen_ai histograms use a base-2 exponential
+    aggregation of at most `exponential_histogram_max_size` buckets instead,
+    which adapts its scale to the recorded values.
+    """
+    if exponential_histograms:
+        if exponential_histogram_max_size < 2:
+            raise ValueError(
+                f"Exponential histogram max size must be at least 2: {exponential_histogram_max_size}"
+            )
+        return [
+            View(
+                instrument_type=Histogram,
+                instrument_name="gen_ai.*",
+                aggregation=ExponentialBucketHistogramAggregation(
+                    max_size=exponential_histogram_max_size
+                ),
+            )
+        ]
+
+    return [
+        View(
+            instrument_type=Histogram,
+            instrument_name=name,
+            aggregation=ExplicitBucketHistogramAggregation(boundaries=boundaries),
+        )
+        for name, boundaries in HISTOGRAM_BUCKETS.items()
+    ]
+
+
+def create_meter_provider(
+    metric_readers: Sequence[MetricReader],
+    resource: Resource | None = None,
+    exponential_histograms: bool = False,
+    exponential_histogram_max_size: int = DEFAULT_EXPONENTIAL_HISTOGRAM_MAX_SIZE,
+) -> MeterProvider:
+    """Returns a meter provider that collects the metrics of the instrumentations into `metric_readers`."""
+    return MeterProvider(
+        metric_readers=metric_readers,
+        resource=resource,
+        views=create_metric_views(
+            exponential_histograms=exponential_histograms,
+            exponential_histogram_max_size=exponential_histogram_max_size,
+        ),
+    )
@@ -0,0 +1,87 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any
+
+from opentelemetry.semconv._incubating.attributes import (
+    gen_ai_attributes as GenAIAttributes,
+)
+
+import llm_tracekit.core._extended_gen_ai_attributes as ExtendedGenAIAttributes
+from llm_tracekit.core._metrics import Instruments
+from llm_tracekit.core._utils import attribute_generator
+
+TOKEN_TYPE_CACHED_READ = "cached_read"
+TOKEN_TYPE_CACHED_WRITE = "cached_write"
+
+
+def cache_hit_ratio(
+    cache_read_input_tokens: int | None, total_input_tokens: int | None
+) -> float | None:
+    """Returns the share of `total_input_tokens` (cached tokens included) read from the cache."""
+    if cache_read_input_tokens is None or not total_input_tokens:
+        return None
+
+    return min(cache_read_input_tokens / total_input_tokens, 1.0)
+
+
+@attribute_generator
+def generate_cache_usage_attributes(
+    cache_read_input_tokens: int | None = None,
+    cache_creation_input_tokens: int | None = None,
+    total_input_tokens: int | None = None,
+) -> dict[str, Any]:
+    return {
+        ExtendedGenAIAttributes.GEN_AI_USAGE_CACHE_READ_INPUT_TOKENS: cache_read_input_tokens,
+        ExtendedGenAIAttributes.GEN_AI_USAGE_CACHE_CREATION_INPUT_TOKENS: cache_creation_input_tokens,
+        ExtendedGenAIAttributes.GEN_AI_USAGE_CACHE_HIT_RATIO: cache_hit_ratio(
+            cache_read_input_tokens, total_input_tokens
+        ),
+    }
+
+
+def record_cache_usage_metrics(
+    instruments: Instruments,
+    attributes: dict[str, Any],
+    cache_read_input_tokens: int | None = None,
+    cache_creation_input_tokens: int | None = None,
+    total_input_tokens: int | None = None,
+) -> None:
+    """Records the prompt cache usage of a request.
+
+    Cached tokens are recorded to the token usage histogram with the
+    `cached_read` and `cached_write` token types, and the cache hit ratio to
+    its own histogram whenever the provider reported how many tokens were read
+    from the cache. `attributes` are the common metric attributes of the request.
+    """
+    if cache_read_input_tokens:
+        instruments.token_usage_histogram.record(
+            cache_read_input_tokens,
+            attributes={
+                **attributes,
+                GenAIAttributes.GEN_AI_TOKEN_TYPE: TOKEN_TYPE_CACHED_READ,
+            },
+        )
+    if cache_creation_input_tokens:
+        instruments.token_usage_histogram.record(
+            cache_creation_input_tokens,
+            attributes={
+                **attributes,
+                GenAIAttributes.GEN_AI_TOKEN_TYPE: TOKEN_TYPE_CACHED_WRITE,
+            },
+        )
+
+    hit_ratio = cache_hit_ratio(cache_read_input_tokens, total_input_tokens)
+    if hit_ratio is not None:
+        instruments.cache_hit_ratio_histogram.record(hit_ratio, attributes=attributes)
@@ -0,0 +1,280 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+from array import array
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import TYPE_CHECKING, Any, Sequence
+
+import llm_tracekit.core._extended_gen_ai_attributes as ExtendedGenAIAttributes
+
+if TYPE_CHECKING:
+    from llm_tracekit.core._span_builder import Message
+
+DEFAULT_PROMPT_PREFIX_BLOCK_SIZE = 1024
+DEFAULT_PROMPT_PREFIX_SKETCH_WIDTH = 4096
+DEFAULT_PROMPT_PREFIX_SKETCH_DEPTH = 4
+DEFAULT_PROMPT_PREFIX_MAX_MODELS = 64
+DEFAULT_PROMPT_PREFIX_CACHE_SIZE = 4096
+
+_FIELD_SEPARATOR = "\x1f"
+_TOOL_CALL_SEPARATOR = "\x1d"
+_MESSAGE_SEPARATOR = "\x1e"
+_MAX_COUNT = 0xFFFFFFFF
+
+# (digest of the hashed blocks, length of the hashed blocks, text not hashed yet)
+_PrefixState = tuple[bytes, int, str]
+_INITIAL_STATE: _PrefixState = (bytes(8), 0, "")
+
+
+class CountMinSketch:
+    """Approximate counts of 64 bit keys in a fixed amount of memory.
+
+    Every key is counted in one counter of each of the `depth` rows, and its
+    estimate is the smallest of them, so collisions can only overcount.
+    """
+
+    __slots__ = ("width", "depth", "_rows")
+
+    def __init__(
+        self,
+        width: int = DEFAULT_PROMPT_PREFIX_SKETCH_WIDTH,
+        depth: int = DEFAULT_PROMPT_PREFIX_SKETCH_DEPTH,
+    ):
+        self.width = width
+        self.depth = depth
+        self._rows = [array("I", [0]) * width for _ in range(depth)]
+
+    def _indexes(self, key: int) -> list[int]:
+        first = key & 0xFFFFFFFF
+        step = (key >> 32) | 1
+        return [(first + row * step) % self.width for row in range(self.depth)]
+
+    def add(self, key: int) -> int:
+        """Counts `key` once more and returns its estimate before the addition."""
+        estimate = _MAX_COUNT
+        for row, index in zip(self._rows, self._indexes(key)):
+            count = row[index]
+            if count < estimate:
+                estimate = count
+            if count < _MAX_COUNT:
+                row[index] = count + 1
+        return estimate
+
+    def estimate(self, key: int) -> int:
+        return min(row[index] for row, index in zip(self._rows, self._indexes(key)))
+
+    def add_prefixes(self, keys: Sequence[int]) -> int:
+        """Counts every key once more, returns how many leading keys were already counted."""
+        rows = self._rows
+        width = self.width
+        counted = 0
+        shared = True
+        for key in keys:
+            first = key & 0xFFFFFFFF
+            step = (key >> 32) | 1
+            estimate = _MAX_COUNT
+            for row in rows:
+                index = first % width
+                count = row[index]
+                if count < estimate:
+                    estimate = count
+                if count < _MAX_COUNT:
+                    row[index] = count + 1
+                first += step
+            if shared and estimate:
+                counted += 1
+            else:
+                shared = False
+        return counted
+
+
+def _message_text(message: "Message") -> str:
+    """The canonical serialization of a message that prefixes are hashed over.
+
+    Whitespace is kept as-is, as provider prompt caches only match exact prefixes.
+    """
+    parts = [
+        message.role or "",
+        _FIELD_SEPARATOR,
+        message.content or "",
+        _FIELD_SEPARATOR,
+        message.tool_call_id or "",
+    ]
+    for tool_call in message.tool_calls or ():
+        parts += (
+            _TOOL_CALL_SEPARATOR,
+            tool_call.id or "",
+            _FIELD_SEPARATOR,
+            tool_call.function_name or "",
+            _FIELD_SEPARATOR,
+            tool_call.function_arguments or "",
+        )
+    parts.append(_MESSAGE_SEPARATOR)
+    return "".join(parts)
+
+
+def _advance(
+    state: _PrefixState, text: str, block_size: int
+) -> tuple[_PrefixState, tuple[int, ...]]:
+    """Appends `text` to the prefix, returns the new state and the digests of the prefixes it completed."""
+    digest, hashed_length, pending = state
+    if pending:
+        text = pending + text
+
+    boundaries = []
+    end = len(text) - len(text) % block_size
+    for start in range(0, end, block_size):
+        block = text[start : start + block_size].encode("utf-8", "surrogatepass")
+        digest = blake2b(digest + block, digest_size=8).digest()
+        boundaries.append(int.from_bytes(digest, "big"))
+
+    return (digest, hashed_length + end, text[end:]), tuple(boundaries)
+
+
+class PromptPrefixAnalyzer:
+    """Measures how much of every prompt repeats the prefix of an earlier one.
+
+    Messages are serialized to a canonical text, which is split into blocks of
+    `block_size` characters. The digest of every block-aligned prefix is chained
+    from the digest of the prefix before it, so it identifies the whole prefix.
+    Prefix digests are counted in a count-min sketch per model (at most
+    `max_models`, least recently used ones are dropped), and the cacheable
+    prefix of a prompt is its longest prefix that was already counted.
+
+    Hashing is incremental: the transition of the prefix state over a message
+    is memoized (up to `cache_size` transitions) by the state and a digest of
+    the message, so a conversation that grows by a message per turn only
+    hashes the new messages.
+    """
+
+    def __init__(
+        self,
+        block_size: int = DEFAULT_PROMPT_PREFIX_BLOCK_SIZE,
+        sketch_width: int = DEFAULT_PROMPT_PREFIX_SKETCH_WIDTH,
+        sketch_depth: int = DEFAULT_PROMPT_PREFIX_SKETCH_DEPTH,
+        max_models: int = DEFAULT_PROMPT_PREFIX_MAX_MODELS,
+        cache_size: int = DEFAULT_PROMPT_PREFIX_CACHE_SIZE,
+    ):
+        if block_size <= 0:
+            raise ValueError(f"Unsupported block size: {block_size!r}")
+
+        self.block_size = block_size
+        self.sketch_width = sketch_width
+        self.sketch_depth = sketch_depth
+        self.max_models = max_models
+        self.cache_size = cache_size
+        self._transitions: OrderedDict[
+            tuple[_PrefixState, bytes], tuple[_PrefixState, tuple[int, ...]]
+        ] = OrderedDict()
+        self._sketches: OrderedDict[str, CountMinSketch] = OrderedDict()
+        self._totals: dict[str, tuple[int, int]] = {}
+        self._lock = threading.Lock()
+
+    def fingerprint(self, messages: "Sequence[Message]") -> tuple[int, list[int]]:
+        """Returns the length of the serialized prompt and the digests of its block-aligned prefixes."""
+        state = _INITIAL_STATE
+        boundaries: list[int] = []
+        for message in messages:
+            text = _message_text(message)
+            key = (
+                state,
+                blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest(),
+            )
+            with self._lock:
+                transition = self._transitions.get(key)
+                if transition is not None:
+                    self._transitions.move_to_end(key)
+
+            if transition is None:
+                transition = _advance(state, text, self.block_size)
+                if self.cache_size > 0:
+                    with self._lock:
+                        self._transitions[key] = transition
+                        while len(self._transitions) > self.cache_size:
+                            self._transitions.popitem(last=False)
+
+            state, message_boundaries = transition
+            boundaries.extend(message_boundaries)
+
+        return state[1] + len(state[2]), boundaries
+
+    def _sketch(self, model: str) -> CountMinSketch:
+        sketch = self._sketches.get(model)
+        if sketch is not None:
+            self._sketches.move_to_end(model)
+            return sketch
+
+        sketch = CountMinSketch(self.sketch_width, self.sketch_depth)
+        self._sketches[model] = sketch
+        while len(self._sketches) > self.max_models:
+            evicted_model, _ = self._sketches.popitem(last=False)
+            self._totals.pop(evicted_model, None)
+        return sketch
+
+    def analyze(self, model: str, messages: "Sequence[Message]") -> dict[str, Any]:
+        """Counts the prefixes of a prompt sent to `model`, returns its span attributes.
+
+        `gen_ai.prompt.prefix_hash` is the digest of the longest prefix shared
+        with an earlier prompt, or of the first block when there is none.
+        Prompts shorter than a block have no prefix hash.
+        """
+        length, boundaries = self.fingerprint(messages)
+        with self._lock:
+            cached_blocks = self._sketch(model).add_prefixes(boundaries)
+            cacheable_length, total_length = self._totals.get(model, (0, 0))
+            self._totals[model] = (
+                cacheable_length + cached_blocks * self.block_size,
+                total_length + length,
+            )
+
+        if not boundaries:
+            return {}
+        prefix_hash = boundaries[max(cached_blocks - 1, 0)]
+        return {
+            ExtendedGenAIAttributes.GEN_AI_PROMPT_PREFIX_HASH: f"{prefix_hash:016x}"
+        }
+
+    def totals(self) -> dict[str, tuple[int, int]]:
+        """Returns the cacheable prefix and total length of all prompts analyzed per model."""
+        with self._lock:
+            return dict(self._totals)
+
+
+_prompt_prefix_analyzer = PromptPrefixAnalyzer()
+
+
+def get_prompt_prefix_analyzer() -> PromptPrefixAnalyzer:
+    """Returns the process-wide prompt prefix analyzer."""
+    return _prompt_prefix_analyzer
+
+
+def configure_prompt_prefix_analyzer(
+    block_size: int = DEFAULT_PROMPT_PREFIX_BLOCK_SIZE,
+    sketch_width: int = DEFAULT_PROMPT_PREFIX_SKETCH_WIDTH,
+    sketch_depth: int = DEFAULT_PROMPT_PREFIX_SKETCH_DEPTH,
+    max_models: int = DEFAULT_PROMPT_PREFIX_MAX_MODELS,
+    cache_size: int = DEFAULT_PROMPT_PREFIX_CACHE_SIZE,
+) -> PromptPrefixAnalyzer:
+    """Replaces the process-wide prompt prefix analyzer, forgetting all counted prefixes."""
+    global _prompt_prefix_analyzer
+    _prompt_prefix_analyzer = PromptPrefixAnalyzer(
+        block_size=block_size,
+        sketch_width=sketch_width,
+        sketch_depth=sketch_depth,
+        max_models=max_models,
+        cache_size=cache_size,
+    )
+    return _prompt_prefix_analyzer
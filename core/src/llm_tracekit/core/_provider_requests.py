@@ -0,0 +1,180 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import threading
+import weakref
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Optional
+
+from opentelemetry import trace
+from opentelemetry.trace import Span
+from opentelemetry.semconv._incubating.attributes import (
+    gen_ai_attributes as GenAIAttributes,
+)
+from opentelemetry.semconv._incubating.attributes import (
+    server_attributes as ServerAttributes,
+)
+from opentelemetry.util.types import AttributeValue
+
+import llm_tracekit.core._extended_gen_ai_attributes as ExtendedGenAIAttributes
+from llm_tracekit.core._config import (
+    is_http_timing_enabled,
+    is_rate_limit_capture_enabled,
+)
+from llm_tracekit.core._cardinality import limit_metric_attributes
+from llm_tracekit.core._http_timing import attach_http_timing
+from llm_tracekit.core._metrics import Instruments
+from llm_tracekit.core._rate_limits import record_retry_backoff, track_rate_limits
+
+
+@lru_cache(maxsize=64)
+def _api_key_id(api_key: str) -> str:
+    """A short fingerprint of an API key, to tell keys apart without exposing them."""
+    return hashlib.sha256(api_key.encode()).hexdigest()[:12]
+
+
+# the rate limit attributes of a call and their limited copy
+_CallAttributes = tuple[dict[str, AttributeValue], dict[str, AttributeValue]]
+
+_lock = threading.Lock()
+# by the span of the call, so that its retries and backoffs reuse the limited
+# attributes instead of limiting them again
+_call_attributes: "weakref.WeakKeyDictionary[Span, _CallAttributes]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _options(args: tuple, kwargs: dict) -> Any:
+    return args[0] if args else kwargs.get("options")
+
+
+def _rate_limit_attributes(
+    span: Span,
+    instruments: Instruments,
+    attributes: dict[str, AttributeValue],
+    client_instance: Any,
+    options: Any,
+) -> dict[str, AttributeValue]:
+    rate_limit_attributes = dict(attributes)
+    json_data = getattr(options, "json_data", None)
+    if isinstance(json_data, dict) and isinstance(json_data.get("model"), str):
+        rate_limit_attributes[GenAIAttributes.GEN_AI_REQUEST_MODEL] = json_data["model"]
+    api_key = getattr(client_instance, "api_key", None)
+    if isinstance(api_key, str) and api_key:
+        rate_limit_attributes[ExtendedGenAIAttributes.GEN_AI_API_KEY_ID] = _api_key_id(
+            api_key
+        )
+    with _lock:
+        call_attributes = _call_attributes.get(span)
+    if call_attributes is not None and call_attributes[0] == rate_limit_attributes:
+        return call_attributes[1]
+
+    limited_attributes = limit_metric_attributes(instruments, rate_limit_attributes)
+    with _lock:
+        _call_attributes[span] = (rate_limit_attributes, limited_attributes)
+    return limited_attributes
+
+
+def provider_build_request(
+    instruments: Instruments,
+    system: str,
+    paths: Iterable[str],
+) -> Callable[..., Any]:
+    """Wrap the `_build_request` method of an httpx based API client to observe its requests.
+
+    Requests to URLs whose path ends with one of `paths`, sent while a span is
+    recording, are timed phase by phase when HTTP timing is enabled, and have
+    their retries and the rate limits of their responses recorded when rate
+    limit capture is enabled.
+    """
+    path_suffixes = tuple(paths)
+
+    def traced_method(wrapped, instance, args, kwargs):
+        request = wrapped(*args, **kwargs)
+        http_timing = is_http_timing_enabled()
+        capture_rate_limits = is_rate_limit_capture_enabled()
+        if not http_timing and not capture_rate_limits:
+            return request
+
+        span = trace.get_current_span()
+        if not span.is_recording() or not request.url.path.endswith(path_suffixes):
+            return request
+
+        attributes: dict[str, AttributeValue] = {
+            GenAIAttributes.GEN_AI_SYSTEM: system,
+            ServerAttributes.SERVER_ADDRESS: request.url.host,
+        }
+        if http_timing:
+            attach_http_timing(request, instance, span, instruments, attributes)
+        if capture_rate_limits:
+            track_rate_limits(
+                request,
+                instance,
+                span,
+                instruments,
+                _rate_limit_attributes(
+                    span, instruments, attributes, instance, _options(args, kwargs)
+                ),
+                kwargs.get("retries_taken", 0),
+            )
+        return request
+
+    return traced_method
+
+
+def provider_retry_timeout(
+    instruments: Instruments,
+    system: str,
+    paths: Iterable[str],
+) -> Callable[..., Any]:
+    """Wrap the `_calculate_retry_timeout` method of an API client to record its backoff.
+
+    The SDKs call it right before sleeping for a retry, in the span of the call,
+    so the returned timeout is the backoff of the retry. Only requests to URLs
+    whose path ends with one of `paths` are recorded, when rate limit capture is
+    enabled.
+    """
+    path_suffixes = tuple(paths)
+
+    def traced_method(wrapped, instance, args, kwargs):
+        timeout = wrapped(*args, **kwargs)
+        if not is_rate_limit_capture_enabled():
+            return timeout
+
+        span = trace.get_current_span()
+        # (remaining_retries, options, response_headers)
+        options: Optional[Any] = args[1] if len(args) > 1 else kwargs.get("options")
+        url = getattr(options, "url", None)
+        if (
+            not span.is_recording()
+            or not isinstance(url, str)
+            or not url.split("?", 1)[0].endswith(path_suffixes)
+        ):
+            return timeout
+
+        base_url = getattr(instance, "base_url", None)
+        attributes: dict[str, AttributeValue] = {
+            GenAIAttributes.GEN_AI_SYSTEM: system,
+            ServerAttributes.SERVER_ADDRESS: getattr(base_url, "host", ""),
+        }
+        record_retry_backoff(
+            span,
+            instruments,
+            _rate_limit_attributes(span, instruments, attributes, instance, options),
+            timeout,
+        )
+        return timeout
+
+    return traced_method
@@ -0,0 +1,255 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import inspect
+import threading
+import weakref
+from dataclasses import dataclass
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Any, Mapping, Optional
+
+from opentelemetry.trace import Span
+from opentelemetry.util.types import AttributeValue
+
+import llm_tracekit.core._extended_gen_ai_attributes as ExtendedGenAIAttributes
+from llm_tracekit.core._metrics import Instruments
+
+RATE_LIMIT_TYPE_REQUESTS = "requests"
+RATE_LIMIT_TYPE_TOKENS = "tokens"
+RATE_LIMIT_TYPE_INPUT_TOKENS = "input_tokens"
+RATE_LIMIT_TYPE_OUTPUT_TOKENS = "output_tokens"
+
+# header: (rate limit type, field of RateLimit)
+_RATE_LIMIT_HEADERS = {
+    # OpenAI and Azure OpenAI
+    "x-ratelimit-remaining-requests": (RATE_LIMIT_TYPE_REQUESTS, "remaining"),
+    "x-ratelimit-limit-requests": (RATE_LIMIT_TYPE_REQUESTS, "limit"),
+    "x-ratelimit-remaining-tokens": (RATE_LIMIT_TYPE_TOKENS, "remaining"),
+    "x-ratelimit-limit-tokens": (RATE_LIMIT_TYPE_TOKENS, "limit"),
+    # Anthropic
+    "anthropic-ratelimit-requests-remaining": (RATE_LIMIT_TYPE_REQUESTS, "remaining"),
+    "anthropic-ratelimit-requests-limit": (RATE_LIMIT_TYPE_REQUESTS, "limit"),
+    "anthropic-ratelimit-tokens-remaining": (RATE_LIMIT_TYPE_TOKENS, "remaining"),
+    "anthropic-ratelimit-tokens-limit": (RATE_LIMIT_TYPE_TOKENS, "limit"),
+    "anthropic-ratelimit-input-tokens-remaining": (
+        RATE_LIMIT_TYPE_INPUT_TOKENS,
+        "remaining",
+    ),
+    "anthropic-ratelimit-input-tokens-limit": (RATE_LIMIT_TYPE_INPUT_TOKENS, "limit"),
+    "anthropic-ratelimit-output-tokens-remaining": (
+        RATE_LIMIT_TYPE_OUTPUT_TOKENS,
+        "remaining",
+    ),
+    "anthropic-ratelimit-output-tokens-limit": (RATE_LIMIT_TYPE_OUTPUT_TOKENS, "limit"),
+}
+
+_REMAINING_ATTRIBUTES = {
+    RATE_LIMIT_TYPE_REQUESTS: ExtendedGenAIAttributes.GEN_AI_RATE_LIMIT_REMAINING_REQUESTS,
+    RATE_LIMIT_TYPE_TOKENS: ExtendedGenAIAttributes.GEN_AI_RATE_LIMIT_REMAINING_TOKENS,
+}
+
+_HTTP_TOO_MANY_REQUESTS = 429
+
+
+@dataclass
+class RateLimit:
+    remaining: Optional[int] = None
+    limit: Optional[int] = None
+
+
+def parse_rate_limit_headers(headers: Mapping[str, str]) -> dict[str, RateLimit]:
+    """Parses the rate limits reported in the headers of a provider response, by type."""
+    rate_limits: dict[str, RateLimit] = {}
+    for header, (rate_limit_type, field) in _RATE_LIMIT_HEADERS.items():
+        value = headers.get(header)
+        if value is None:
+            continue
+        try:
+            count = int(value)
+        except ValueError:
+            continue
+        setattr(rate_limits.setdefault(rate_limit_type, RateLimit()), field, count)
+
+    return rate_limits
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """Parses the seconds to wait from the `retry-after-ms` or `retry-after` header."""
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms is not None:
+        try:
+            return max(float(retry_after_ms) / 1000, 0.0)
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if retry_after is None:
+        return None
+    try:
+        return max(float(retry_after), 0.0)
+    except ValueError:
+        pass
+    # `retry-after` may also be an HTTP date
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    return max((retry_at - datetime.now(retry_at.tzinfo)).total_seconds(), 0.0)
+
+
+class _CallRetries:
+    """The rate limited responses and backoff of a call, accumulated over its retries."""
+
+    __slots__ = ("rate_limited_responses", "backoff_duration")
+
+    def __init__(self) -> None:
+        self.rate_limited_responses = 0
+        self.backoff_duration = 0.0
+
+
+class _TrackedRequest:
+    __slots__ = ("span", "instruments", "attributes")
+
+    def __init__(
+        self,
+        span: Span,
+        instruments: Instruments,
+        attributes: dict[str, AttributeValue],
+    ) -> None:
+        self.span = span
+        self.instruments = instruments
+        self.attributes = attributes
+
+
+_lock = threading.Lock()
+_hooked_http_clients: "weakref.WeakSet[Any]" = weakref.WeakSet()
+_tracked_requests: "weakref.WeakKeyDictionary[Any, _TrackedRequest]" = (
+    weakref.WeakKeyDictionary()
+)
+_call_retries: "weakref.WeakKeyDictionary[Span, _CallRetries]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_call_retries(span: Span) -> _CallRetries:
+    with _lock:
+        call_retries = _call_retries.get(span)
+        if call_retries is None:
+            call_retries = _call_retries[span] = _CallRetries()
+        return call_retries
+
+
+def track_rate_limits(
+    request: Any,
+    client_instance: Any,
+    span: Span,
+    instruments: Instruments,
+    attributes: dict[str, AttributeValue],
+    retries_taken: int = 0,
+) -> None:
+    """Records the rate limits reported in the response to an httpx request of an API client.
+
+    The response is observed by a response event hook, added once to the httpx
+    client of `client_instance`. A request retried by the SDK is counted, and
+    its number of retries is set on `span`.
+    """
+    http_client = getattr(client_instance, "_client", None)
+    event_hooks = getattr(http_client, "event_hooks", None)
+    if not isinstance(event_hooks, dict):
+        return
+
+    if retries_taken > 0:
+        instruments.request_retries_counter.add(1, attributes)
+        if span.is_recording():
+            span.set_attribute(
+                ExtendedGenAIAttributes.GEN_AI_REQUEST_RETRIES, retries_taken
+            )
+
+    with _lock:
+        _tracked_requests[request] = _TrackedRequest(span, instruments, attributes)
+        if http_client not in _hooked_http_clients:
+            send = getattr(http_client, "send", None)
+            event_hooks.setdefault("response", []).append(
+                _on_async_response
+                if inspect.iscoroutinefunction(send)
+                else _on_response
+            )
+            _hooked_http_clients.add(http_client)
+
+
+def record_retry_backoff(
+    span: Span,
+    instruments: Instruments,
+    attributes: dict[str, AttributeValue],
+    backoff: float,
+) -> None:
+    """Records the time an SDK waits before retrying a request of the call of `span`."""
+    instruments.retry_backoff_duration_histogram.record(backoff, attributes)
+    if span.is_recording():
+        call_retries = _get_call_retries(span)
+        call_retries.backoff_duration += backoff
+        span.set_attribute(
+            ExtendedGenAIAttributes.GEN_AI_REQUEST_BACKOFF_DURATION,
+            call_retries.backoff_duration,
+        )
+
+
+def _record_response(response: Any) -> None:
+    with _lock:
+        tracked_request = _tracked_requests.pop(response.request, None)
+    if tracked_request is None:
+        return
+
+    span = tracked_request.span
+    instruments = tracked_request.instruments
+    headers = response.headers
+    for rate_limit_type, rate_limit in parse_rate_limit_headers(headers).items():
+        attributes = {
+            **tracked_request.attributes,
+            ExtendedGenAIAttributes.GEN_AI_RATE_LIMIT_TYPE: rate_limit_type,
+        }
+        if rate_limit.remaining is not None:
+            instruments.rate_limit_remaining_gauge.set(rate_limit.remaining, attributes)
+            if span.is_recording() and rate_limit_type in _REMAINING_ATTRIBUTES:
+                span.set_attribute(
+                    _REMAINING_ATTRIBUTES[rate_limit_type], rate_limit.remaining
+                )
+        if rate_limit.limit is not None:
+            instruments.rate_limit_limit_gauge.set(rate_limit.limit, attributes)
+
+    if response.status_code != _HTTP_TOO_MANY_REQUESTS:
+        return
+
+    instruments.rate_limited_responses_counter.add(1, tracked_request.attributes)
+    if span.is_recording():
+        call_retries = _get_call_retries(span)
+        call_retries.rate_limited_responses += 1
+        span.set_attribute(
+            ExtendedGenAIAttributes.GEN_AI_RATE_LIMIT_RESPONSES,
+            call_retries.rate_limited_responses,
+        )
+        retry_after = parse_retry_after(headers)
+        if retry_after is not None:
+            span.set_attribute(
+                ExtendedGenAIAttributes.GEN_AI_RATE_LIMIT_RETRY_AFTER, retry_after
+            )
+
+
+def _on_response(response: Any) -> None:
+    _record_response(response)
+
+
+async def _on_async_response(response: Any) -> None:
+    _record_response(response)
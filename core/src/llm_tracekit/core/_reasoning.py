@@ -0,0 +1,95 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from timeit import default_timer
+from typing import Any
+
+from opentelemetry.semconv._incubating.attributes import (
+    gen_ai_attributes as GenAIAttributes,
+)
+
+import llm_tracekit.core._extended_gen_ai_attributes as ExtendedGenAIAttributes
+from llm_tracekit.core._metrics import Instruments
+from llm_tracekit.core._utils import attribute_generator
+
+TOKEN_TYPE_REASONING = "reasoning"
+
+
+class ReasoningTimer:
+    """Estimates how long a streamed response spent reasoning.
+
+    Reasoning models produce their hidden tokens before any visible content, so
+    the time from the request until the first content delta is used as the
+    estimate. It is only reported for responses that reasoned: a reasoning
+    delta was seen or the provider reported reasoning tokens.
+
+    `start_time` is a `timeit.default_timer` reading taken when the request was
+    sent, and defaults to the creation of the timer. Streams whose deltas are
+    only processed once they ended are not `observed`, and have no estimate.
+    """
+
+    __slots__ = ("start_time", "first_content_time", "reasoning_seen", "observed")
+
+    def __init__(self, start_time: float | None = None, observed: bool = True) -> None:
+        self.start_time = default_timer() if start_time is None else start_time
+        self.first_content_time: float | None = None
+        self.reasoning_seen = False
+        self.observed = observed
+
+    def mark_reasoning(self) -> None:
+        self.reasoning_seen = True
+
+    def mark_content(self) -> None:
+        if self.first_content_time is None:
+            self.first_content_time = default_timer()
+
+    def estimate(self, reasoning_output_tokens: int | None = None) -> float | None:
+        if not self.observed or self.first_content_time is None:
+            return None
+        if not (self.reasoning_seen or reasoning_output_tokens):
+            return None
+
+        return max(self.first_content_time - self.start_time, 0.0)
+
+
+@attribute_generator
+def generate_reasoning_usage_attributes(
+    reasoning_output_tokens: int | None = None,
+    reasoning_duration: float | None = None,
+) -> dict[str, Any]:
+    return {
+        ExtendedGenAIAttributes.GEN_AI_USAGE_REASONING_OUTPUT_TOKENS: reasoning_output_tokens,
+        ExtendedGenAIAttributes.GEN_AI_RESPONSE_REASONING_DURATION: reasoning_duration,
+    }
+
+
+def record_reasoning_usage_metrics(
+    instruments: Instruments,
+    attributes: dict[str, Any],
+    reasoning_output_tokens: int | None = None,
+) -> None:
+    """Records the reasoning tokens of a request to the token usage histogram.
+
+    They are recorded with the `reasoning` token type, on top of the output
+    tokens that already include them. `attributes` are the common metric
+    attributes of the request.
+    """
+    if reasoning_output_tokens:
+        instruments.token_usage_histogram.record(
+            reasoning_output_tokens,
+            attributes={
+                **attributes,
+                GenAIAttributes.GEN_AI_TOKEN_TYPE: TOKEN_TYPE_REASONING,
+            },
+        )
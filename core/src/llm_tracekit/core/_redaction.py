@@ -0,0 +1,167 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from hashlib import blake2b
+
+DEFAULT_REDACTION_PATTERNS: dict[str, str] = {
+    "EMAIL": r"(?<![A-Za-z0-9._%+-])[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}",
+    "CREDIT_CARD": r"(?<!\d)(?:\d[ -]?){12,18}\d(?!\d)",
+    "API_KEY": (
+        r"\b(?:"
+        r"(?:sk|pk|rk)-[A-Za-z0-9_-]{16,}"
+        r"|AKIA[0-9A-Z]{16}"
+        r"|gh[pousr]_[A-Za-z0-9]{36}"
+        r"|AIza[0-9A-Za-z_-]{35}"
+        r"|xox[abprs]-[A-Za-z0-9-]{10,}"
+        r")\b"
+    ),
+    "PHONE": (
+        r"(?<![\w+])(?:\+\d{1,3}[ .-]?)?"
+        r"(?:\(\d{2,4}\)[ .-]?|\d{2,4}[ .-])"
+        r"\d{3,4}[ .-]?\d{3,4}(?!\w)"
+    ),
+}
+
+# Cheap searches that must succeed for the matching pattern to possibly match.
+# Patterns whose trigger is absent are left out of the combined regex, which
+# keeps the common case (plain prose) away from the per-position alternation.
+DEFAULT_REDACTION_TRIGGERS: dict[str, str] = {
+    "EMAIL": "@",
+    "CREDIT_CARD": r"\d",
+    "API_KEY": r"[spr]k-|AKIA|gh[pousr]_|AIza|xox",
+    "PHONE": r"\d",
+}
+
+
+def _passes_luhn(candidate: str) -> bool:
+    digits = [int(char) for char in candidate if char.isdigit()]
+    checksum = 0
+    for index, digit in enumerate(reversed(digits)):
+        if index % 2 == 1:
+            digit *= 2
+            if digit > 9:
+                digit -= 9
+        checksum += digit
+    return checksum % 10 == 0
+
+
+class Redactor:
+    """Replaces sensitive values in message content before it is exported.
+
+    The patterns that can apply to a string (see `triggers`) are compiled into
+    a single alternation, so every string is scanned once regardless of the
+    number of patterns. Results are memoized in an LRU of `cache_size` entries
+    keyed by a digest of the string, so repeated content (system prompts,
+    conversation history) is only scanned once, and the cache does not keep
+    the content itself alive. Content without sensitive values is cached as
+    unchanged, without a copy.
+    """
+
+    def __init__(
+        self,
+        patterns: dict[str, str] | None = None,
+        triggers: dict[str, str] | None = None,
+        cache_size: int = 4096,
+    ):
+        if patterns is None:
+            patterns = DEFAULT_REDACTION_PATTERNS
+            if triggers is None:
+                triggers = DEFAULT_REDACTION_TRIGGERS
+        if triggers is None:
+            triggers = {}
+
+        for name in patterns:
+            if not name.isidentifier():
+                raise ValueError(f"Invalid redaction pattern name: {name!r}")
+
+        self.patterns = dict(patterns)
+        self._triggers = [
+            (name, re.compile(triggers[name])) for name in patterns if name in triggers
+        ]
+        self._untriggered = frozenset(name for name in patterns if name not in triggers)
+        self._compile = lru_cache(maxsize=None)(self._compile_combined)
+        self.cache_size = cache_size
+        self._cache: OrderedDict[bytes, str | None] = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def _compile_combined(self, names: frozenset[str]) -> re.Pattern:
+        return re.compile(
+            "|".join(
+                f"(?P<{name}>{pattern})"
+                for name, pattern in self.patterns.items()
+                if name in names
+            )
+        )
+
+    def _replace(self, match: re.Match) -> str:
+        name = match.lastgroup
+        if name == "CREDIT_CARD" and not _passes_luhn(match.group()):
+            return match.group()
+        return f"[REDACTED_{name}]"
+
+    def _redact(self, text: str) -> str:
+        names = self._untriggered.union(
+            name for name, trigger in self._triggers if trigger.search(text)
+        )
+        if not names:
+            return text
+        return self._compile(names).sub(self._replace, text)
+
+    def redact(self, text: str) -> str:
+        """Returns `text` with every sensitive value replaced by a placeholder."""
+        if self.cache_size <= 0:
+            return self._redact(text)
+
+        key = blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        with self._cache_lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                redacted = self._cache[key]
+                return text if redacted is None else redacted
+
+        redacted = self._redact(text)
+        with self._cache_lock:
+            self._cache[key] = None if redacted == text else redacted
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return redacted
+
+    def clear_cache(self) -> None:
+        with self._cache_lock:
+            self._cache.clear()
+
+
+_redactor = Redactor()
+
+
+def get_redactor() -> Redactor:
+    """Returns the redactor used when redaction is enabled."""
+    return _redactor
+
+
+def set_redactor(redactor: Redactor) -> None:
+    """Replaces the redactor used when redaction is enabled."""
+    global _redactor
+    _redactor = redactor
+
+
+def redact_content(text: str | None) -> str | None:
+    """Redacts `text` with the configured redactor."""
+    if not text:
+        return text
+    return _redactor.redact(text)
@@ -0,0 +1,306 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import Any, Iterable, Mapping
+
+from opentelemetry.semconv._incubating.attributes import (
+    gen_ai_attributes as GenAIAttributes,
+)
+from opentelemetry.util.types import AttributeValue
+
+from llm_tracekit.core._config import (
+    get_response_cache_path,
+    is_response_cache_enabled,
+)
+from llm_tracekit.core._cardinality import limit_metric_attributes
+from llm_tracekit.core._metrics import Instruments
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESPONSE_CACHE_MAX_ENTRIES = 1024
+# how often expired rows are deleted from the sqlite database
+_PURGE_INTERVAL_SECONDS = 60.0
+
+_METRIC_ATTRIBUTES = (
+    GenAIAttributes.GEN_AI_OPERATION_NAME,
+    GenAIAttributes.GEN_AI_SYSTEM,
+    GenAIAttributes.GEN_AI_REQUEST_MODEL,
+)
+
+
+class ResponseCache:
+    """Exact-match cache of the responses to deterministic requests.
+
+    Responses are kept in an in-memory LRU of `max_entries` entries, and when
+    `path` is set, also in a sqlite database that survives restarts and can be
+    shared between processes. Entries expire after `ttl_seconds`, or never
+    when it is None; expired rows are deleted from the database when the
+    cache is opened and then at most once a minute, as entries are written.
+
+    Cached values are JSON-serializable data (e.g. a dumped response model or a
+    list of dumped stream chunks) that the instrumentations turn back into
+    response objects on every hit.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_RESPONSE_CACHE_MAX_ENTRIES,
+        ttl_seconds: float | None = None,
+        path: str | None = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float | None, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+        self._purged_at = 0.0
+        if path is not None:
+            self._connection = sqlite3.connect(path, check_same_thread=False)
+            with self._connection:
+                self._connection.execute("PRAGMA journal_mode=WAL")
+                self._connection.execute(
+                    "CREATE TABLE IF NOT EXISTS responses "
+                    "(key TEXT PRIMARY KEY, expires_at REAL, value TEXT NOT NULL)"
+                )
+            self._purge_expired(time.time())
+
+    def _expires_at(self) -> float | None:
+        if self.ttl_seconds is None:
+            return None
+        return time.time() + self.ttl_seconds
+
+    def _remember(self, key: str, expires_at: float | None, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _purge_expired(self, now: float) -> None:
+        if self._connection is None:
+            return
+        self._purged_at = time.monotonic()
+        try:
+            with self._connection:
+                self._connection.execute(
+                    "DELETE FROM responses WHERE expires_at <= ?", (now,)
+                )
+        except sqlite3.Error:
+            logger.debug("Failed to purge the response cache", exc_info=True)
+
+    def _load(self, key: str) -> tuple[float | None, Any] | None:
+        if self._connection is None:
+            return None
+        try:
+            row = self._connection.execute(
+                "SELECT expires_at, value FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error:
+            logger.debug("Failed to read the response cache", exc_info=True)
+            return None
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def get(self, key: str) -> Any | None:
+        """Returns the cached value of `key`, or None when it is missing or expired."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            else:
+                entry = self._load(key)
+                if entry is not None and (entry[0] is None or entry[0] > now):
+                    self._remember(key, *entry)
+            if entry is None or (entry[0] is not None and entry[0] <= now):
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value: Any) -> None:
+        expires_at = self._expires_at()
+        with self._lock:
+            self._remember(key, expires_at, value)
+            if self._connection is None:
+                return
+            if time.monotonic() - self._purged_at >= _PURGE_INTERVAL_SECONDS:
+                self._purge_expired(time.time())
+            try:
+                with self._connection:
+                    self._connection.execute(
+                        "INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                        (key, expires_at, json.dumps(value)),
+                    )
+            except (sqlite3.Error, TypeError, ValueError):
+                logger.debug("Failed to write the response cache", exc_info=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._connection is not None:
+                with self._connection:
+                    self._connection.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _canonical_value(value: Any) -> Any:
+    model_dump = getattr(value, "model_dump", None)
+    if callable(model_dump):
+        return model_dump(mode="json")
+    raise TypeError(f"Unsupported request value: {type(value).__qualname__}")
+
+
+def request_cache_key(system: str, request: Mapping[str, Any]) -> str | None:
+    """Returns the cache key of a request, or None when it cannot be serialized canonically.
+
+    `request` holds the request parameters that affect the response, without
+    unset values.
+    """
+    try:
+        canonical = json.dumps(
+            [system, request],
+            sort_keys=True,
+            separators=(",", ":"),
+            default=_canonical_value,
+        )
+    except (TypeError, ValueError):
+        return None
+    return blake2b(
+        canonical.encode("utf-8", "surrogatepass"), digest_size=20
+    ).hexdigest()
+
+
+def is_deterministic_request(temperature: Any = None, seed: Any = None) -> bool:
+    """Checks if a request asks for a reproducible response: temperature 0 or an explicit seed."""
+    return temperature == 0 or seed is not None
+
+
+def record_response_cache_hit(
+    instruments: Instruments,
+    duration: float,
+    span_attributes: Mapping[str, Any],
+    admitted: Mapping[str, AttributeValue] | None = None,
+) -> None:
+    """Records the latency of a request served from the response cache.
+
+    Cache hits are recorded to their own histogram instead of the operation
+    duration and token usage histograms, which only count provider calls.
+    `admitted` are the metric attributes the request was already limited with.
+    """
+    attributes = {
+        key: span_attributes[key]
+        for key in _METRIC_ATTRIBUTES
+        if key in span_attributes
+    }
+    instruments.cache_hit_duration_histogram.record(
+        duration, attributes=limit_metric_attributes(instruments, attributes, admitted)
+    )
+
+
+class ReplayStream:
+    """Replays the cached chunks of a stream with the interface of an SDK stream."""
+
+    def __init__(self, chunks: Iterable[Any]):
+        self._chunks = iter(chunks)
+
+    def __iter__(self) -> "ReplayStream":
+        return self
+
+    def __next__(self) -> Any:
+        return next(self._chunks)
+
+    def __enter__(self) -> "ReplayStream":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._chunks = iter(())
+
+
+class AsyncReplayStream:
+    """Async variant of `ReplayStream`."""
+
+    def __init__(self, chunks: Iterable[Any]):
+        self._chunks = iter(chunks)
+
+    def __aiter__(self) -> "AsyncReplayStream":
+        return self
+
+    async def __anext__(self) -> Any:
+        try:
+            return next(self._chunks)
+        except StopIteration:
+            raise StopAsyncIteration from None
+
+    async def __aenter__(self) -> "AsyncReplayStream":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        self._chunks = iter(())
+
+
+_UNSET: Any = object()
+_response_cache: ResponseCache | None = _UNSET
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache | None:
+    """Returns the process-wide response cache, None when responses are not cached.
+
+    Unless a cache was set with `set_response_cache`, an in-memory cache (with a
+    disk tier at `OTEL_INSTRUMENTATION_GENAI_RESPONSE_CACHE_PATH`, if set) is
+    created once the response cache is enabled.
+    """
+    global _response_cache
+    if _response_cache is _UNSET:
+        if not is_response_cache_enabled():
+            return None
+        with _response_cache_lock:
+            if _response_cache is _UNSET:
+                _response_cache = ResponseCache(path=get_response_cache_path())
+    return _response_cache
+
+
+def set_response_cache(cache: ResponseCache | None) -> None:
+    """Sets the process-wide response cache, None disables caching."""
+    global _response_cache
+    _response_cache = cache
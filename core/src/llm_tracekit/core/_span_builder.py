@@ -12,6 +12,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from llm_tracekit.core._config import (
+    is_content_event_mode_enabled,
+    is_duplicate_call_detection_enabled,
+    is_prompt_prefix_analysis_enabled,
+    is_redaction_enabled,
+)
+from llm_tracekit.core._content_events import (
+    emit_choice_events,
+    emit_or_defer_message_events,
+)
+from llm_tracekit.core._content_store import offload_content
+from llm_tracekit.core._duplicate_calls import prompt_digest
+from llm_tracekit.core._prompt_prefix import get_prompt_prefix_analyzer
+from llm_tracekit.core._redaction import redact_content
 from llm_tracekit.core._utils import attribute_generator
 from pydantic import BaseModel
 from dataclasses import dataclass
@@ -85,8 +99,13 @@ def generate_request_attributes(
 
 @attribute_generator
 def generate_message_attributes(
-    messages: list[Message], capture_content: bool
+    messages: list[Message], capture_content: bool, model: str | None = None
 ) -> dict[str, Any]:
+    redact = capture_content and is_redaction_enabled()
+    if capture_content and is_content_event_mode_enabled():
+        emit_or_defer_message_events(messages, redact=redact)
+        capture_content = False
+
     attributes = {}
     for index, message in enumerate(messages):
         attributes[
@@ -94,9 +113,20 @@ def generate_message_attributes(
         ] = message.role
 
         if capture_content and message.content is not None:
-            attributes[
-                ExtendedGenAIAttributes.GEN_AI_PROMPT_CONTENT.format(prompt_index=index)
-            ] = message.content
+            content = redact_content(message.content) if redact else message.content
+            content_ref = None if content is None else offload_content(content)
+            if content_ref is not None:
+                attributes[
+                    ExtendedGenAIAttributes.GEN_AI_PROMPT_CONTENT_REF.format(
+                        prompt_index=index
+                    )
+                ] = content_ref
+            else:
+                attributes[
+                    ExtendedGenAIAttributes.GEN_AI_PROMPT_CONTENT.format(
+                        prompt_index=index
+                    )
+                ] = content
 
         attributes[
             ExtendedGenAIAttributes.GEN_AI_PROMPT_TOOL_CALL_ID.format(
@@ -125,7 +155,18 @@ def generate_message_attributes(
                         ExtendedGenAIAttributes.GEN_AI_PROMPT_TOOL_CALLS_FUNCTION_ARGUMENTS.format(
                             prompt_index=index, tool_call_index=tool_index
                         )
-                    ] = tool_call.function_arguments
+                    ] = (
+                        redact_content(tool_call.function_arguments)
+                        if redact
+                        else tool_call.function_arguments
+                    )
+
+    if model is not None and is_prompt_prefix_analysis_enabled():
+        attributes.update(get_prompt_prefix_analyzer().analyze(model, messages))
+    if is_duplicate_call_detection_enabled():
+        attributes[ExtendedGenAIAttributes.GEN_AI_PROMPT_DIGEST] = prompt_digest(
+            messages
+        )
 
     return attributes
 
@@ -152,6 +193,11 @@ def generate_response_attributes(
 def generate_choice_attributes(
     choices: list[Choice], capture_content: bool
 ) -> dict[str, Any]:
+    redact = capture_content and is_redaction_enabled()
+    if capture_content and is_content_event_mode_enabled():
+        emit_choice_events(choices, redact=redact)
+        capture_content = False
+
     attributes = {}
     for index, choice in enumerate(choices):
         attributes[
@@ -170,7 +216,7 @@ def generate_choice_attributes(
                 ExtendedGenAIAttributes.GEN_AI_COMPLETION_CONTENT.format(
                     completion_index=index
                 )
-            ] = choice.content
+            ] = redact_content(choice.content) if redact else choice.content
 
         if choice.tool_calls is not None:
             for tool_index, tool_call in enumerate(choice.tool_calls):
@@ -194,7 +240,11 @@ def generate_choice_attributes(
                         ExtendedGenAIAttributes.GEN_AI_COMPLETION_TOOL_CALLS_FUNCTION_ARGUMENTS.format(
                             completion_index=index, tool_call_index=tool_index
                         )
-                    ] = tool_call.function_arguments
+                    ] = (
+                        redact_content(tool_call.function_arguments)
+                        if redact
+                        else tool_call.function_arguments
+                    )
 
     return attributes
 
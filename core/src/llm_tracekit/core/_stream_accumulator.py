@@ -0,0 +1,113 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import codecs
+
+from llm_tracekit.core._memory_budget import StreamBufferReservation
+
+
+class StreamAccumulator:
+    """Collects the content deltas of a stream in linear time.
+
+    Chunks are kept in a list and joined once when the value is read, instead
+    of being concatenated on every delta. `bytes` chunks are decoded as UTF-8
+    incrementally, so a character split across two chunks is decoded once
+    both halves have arrived.
+
+    Every chunk is charged to `reservation` (when given) before it is kept;
+    once the reservation refuses a chunk the rest of the stream is dropped.
+    `max_bytes` caps the accumulated content on its own: the chunk crossing
+    it is cut and `truncated` is set. It defaults to the content limit of the
+    reservation's budget, and a reservation whose content was cut reports it
+    as truncated. Like the memory budget, sizes are measured with `len` of
+    the decoded text.
+    """
+
+    __slots__ = (
+        "_parts",
+        "_length",
+        "_decoder",
+        "_reservation",
+        "max_bytes",
+        "truncated",
+    )
+
+    def __init__(
+        self,
+        reservation: StreamBufferReservation | None = None,
+        max_bytes: int | None = None,
+    ):
+        self._parts: list[str] = []
+        self._length = 0
+        self._decoder: codecs.IncrementalDecoder | None = None
+        self._reservation = reservation
+        if max_bytes is None and reservation is not None:
+            max_bytes = reservation.content_limit_bytes
+        self.max_bytes = max_bytes
+        self.truncated = False
+
+    def append(self, chunk: str | bytes) -> bool:
+        """Adds a chunk, returns whether it was kept in full."""
+        if isinstance(chunk, (bytes, bytearray)):
+            if self._decoder is None:
+                self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            chunk = self._decoder.decode(chunk)
+        if not chunk or self.truncated:
+            return not self.truncated
+
+        kept_in_full = True
+        if self.max_bytes is not None and self._length + len(chunk) > self.max_bytes:
+            chunk = chunk[: max(self.max_bytes - self._length, 0)]
+            self.truncated = True
+            kept_in_full = False
+            if self._reservation is not None:
+                self._reservation.content_truncated = True
+            if not chunk:
+                return False
+
+        if self._reservation is not None and not self._reservation.charge(len(chunk)):
+            self.truncated = True
+            return False
+
+        self._parts.append(chunk)
+        self._length += len(chunk)
+        return kept_in_full
+
+    def getvalue(self) -> str:
+        """Returns the accumulated content.
+
+        Bytes of a character that is still incomplete are decoded with a
+        replacement character, without consuming them.
+        """
+        if len(self._parts) > 1:
+            self._parts = ["".join(self._parts)]
+        value = self._parts[0] if self._parts else ""
+        if self._decoder is not None and not self.truncated:
+            pending, _ = self._decoder.getstate()
+            if pending:
+                value += pending.decode("utf-8", errors="replace")
+        return value
+
+    def clear(self) -> None:
+        """Empties the accumulator so it can be reused for the next content block."""
+        self._parts = []
+        self._length = 0
+        self._decoder = None
+        self.truncated = False
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __bool__(self) -> bool:
+        return self._length > 0
@@ -0,0 +1,149 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from timeit import default_timer
+from typing import Any, Mapping
+
+from opentelemetry.metrics import UpDownCounter
+from opentelemetry.semconv._incubating.attributes import (
+    gen_ai_attributes as GenAIAttributes,
+)
+from opentelemetry.util.types import AttributeValue
+
+from llm_tracekit.core._cardinality import limit_metric_attributes
+from llm_tracekit.core._metrics import Instruments
+from llm_tracekit.core._reasoning import ReasoningTimer
+
+_IN_FLIGHT_ATTRIBUTES = (
+    GenAIAttributes.GEN_AI_OPERATION_NAME,
+    GenAIAttributes.GEN_AI_SYSTEM,
+    GenAIAttributes.GEN_AI_REQUEST_MODEL,
+)
+
+
+class InFlight:
+    """Counts a request or a stream on an up-down counter from its creation until `end`.
+
+    `end` only counts once, so it can be called from every path a request or a
+    stream may end by.
+    """
+
+    __slots__ = ("_counter", "_attributes", "_ended")
+
+    def __init__(
+        self, counter: UpDownCounter, attributes: dict[str, AttributeValue]
+    ) -> None:
+        self._counter = counter
+        self._attributes = attributes
+        self._ended = False
+        counter.add(1, attributes)
+
+    @property
+    def attributes(self) -> dict[str, AttributeValue]:
+        """The limited metric attributes the request or stream is counted with."""
+        return self._attributes
+
+    def end(self) -> None:
+        if self._ended:
+            return
+        self._ended = True
+        self._counter.add(-1, self._attributes)
+
+
+def in_flight_attributes(
+    span_attributes: Mapping[str, Any],
+) -> dict[str, AttributeValue]:
+    """The operation, system and request model of a request, from its span attributes."""
+    return {
+        key: span_attributes[key]
+        for key in _IN_FLIGHT_ATTRIBUTES
+        if isinstance(span_attributes.get(key), str) and span_attributes[key]
+    }
+
+
+def track_request(
+    instruments: Instruments, span_attributes: Mapping[str, Any]
+) -> InFlight:
+    """Counts a request as in flight until its response, or the stream of it, is returned."""
+    return InFlight(
+        instruments.active_requests_counter,
+        limit_metric_attributes(instruments, in_flight_attributes(span_attributes)),
+    )
+
+
+def track_stream(
+    instruments: Instruments,
+    span_attributes: Mapping[str, Any],
+    request: InFlight | None = None,
+) -> InFlight:
+    """Counts a response stream as active until it ends.
+
+    The stream is counted with the attributes of `request`, the request that
+    returned it, when given, instead of limiting them again.
+    """
+    if request is not None:
+        return InFlight(instruments.active_streams_counter, request.attributes)
+    return InFlight(
+        instruments.active_streams_counter,
+        limit_metric_attributes(instruments, in_flight_attributes(span_attributes)),
+    )
+
+
+def record_output_throughput(
+    instruments: Instruments,
+    attributes: dict[str, AttributeValue],
+    output_tokens: int | None,
+    generation_time: float | None,
+) -> None:
+    """Records the output tokens per second of a response to the output throughput histogram.
+
+    For responses returned at once, `generation_time` is the duration of the
+    whole request, as the time to their first token cannot be told apart.
+    """
+    if not output_tokens or output_tokens <= 0:
+        return
+    if generation_time is None or generation_time <= 0:
+        return
+
+    instruments.output_throughput_histogram.record(
+        output_tokens / generation_time, attributes=attributes
+    )
+
+
+def record_stream_output_throughput(
+    instruments: Instruments,
+    attributes: dict[str, AttributeValue],
+    output_tokens: int | None,
+    reasoning_timer: ReasoningTimer,
+    reasoning_output_tokens: int | None = None,
+) -> None:
+    """Records the output throughput of a stream that ended, excluding its time to first token.
+
+    The generation time runs from the first content delta seen by
+    `reasoning_timer` until now. Reasoning tokens are produced before that
+    delta, so they are not counted either. Streams whose deltas were not
+    observed as they arrived are not recorded.
+    """
+    if output_tokens is None or not reasoning_timer.observed:
+        return
+    first_content_time = reasoning_timer.first_content_time
+    if first_content_time is None:
+        return
+
+    record_output_throughput(
+        instruments,
+        attributes,
+        output_tokens - (reasoning_output_tokens or 0),
+        default_timer() - first_content_time,
+    )
@@ -0,0 +1,258 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import abc
+import logging
+import math
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from hashlib import blake2b
+from typing import TYPE_CHECKING, Any, Callable, Mapping, Sequence
+
+if TYPE_CHECKING:
+    from llm_tracekit.core._span_builder import Choice, Message, ToolCall
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOKEN_ESTIMATOR_CACHE_SIZE = 4096
+DEFAULT_TIKTOKEN_ENCODING = "o200k_base"
+
+# tokens the chat format adds around every message, and to prime the reply
+_MESSAGE_OVERHEAD_TOKENS = 3
+_REPLY_OVERHEAD_TOKENS = 3
+
+# splits text the way BPE tokenizers pre-tokenize it: contractions, words with
+# their leading space, runs of up to 3 digits, punctuation and whitespace
+_PRE_TOKENIZE_PATTERN = re.compile(
+    r"'(?:[sdmt]|ll|ve|re)| ?[^\W\d_]+|\d{1,3}| ?[^\s\w]+|\s+"
+)
+# characters of an ASCII word, and bytes of other text, merged into a token
+_CHARS_PER_WORD_TOKEN = 6
+_BYTES_PER_TOKEN = 3
+
+
+class TokenEstimator(abc.ABC):
+    """Estimates the number of tokens of text sent to or received from a model.
+
+    Subclasses implement `_count_text`. The counts of prompt messages are
+    memoized per model and digest of their text in an LRU of `cache_size`
+    entries, so the messages of a conversation that are sent again on every
+    turn are only tokenized once. Other text, such as stream deltas, is
+    counted without the memoization.
+    """
+
+    def __init__(self, cache_size: int = DEFAULT_TOKEN_ESTIMATOR_CACHE_SIZE):
+        self.cache_size = cache_size
+        self._counts: OrderedDict[tuple[str | None, bytes], int] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @abc.abstractmethod
+    def _count_text(self, text: str, model: str | None) -> int:
+        """Returns the number of tokens of `text`, without the memoization."""
+
+    def count_tokens(self, text: str | None, model: str | None = None) -> int:
+        """Returns the estimated number of tokens of `text`."""
+        if not text:
+            return 0
+        return self._count_text(text, model)
+
+    def _count_message_text(self, text: str | None, model: str | None) -> int:
+        if not text:
+            return 0
+
+        key = (
+            model,
+            blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest(),
+        )
+        with self._lock:
+            count = self._counts.get(key)
+            if count is not None:
+                self._counts.move_to_end(key)
+                return count
+
+        count = self._count_text(text, model)
+        if self.cache_size > 0:
+            with self._lock:
+                self._counts[key] = count
+                while len(self._counts) > self.cache_size:
+                    self._counts.popitem(last=False)
+        return count
+
+    def _count_tool_calls(
+        self,
+        tool_calls: "Sequence[ToolCall] | None",
+        model: str | None,
+        count_text: Callable[[str | None, str | None], int],
+    ) -> int:
+        count = 0
+        for tool_call in tool_calls or ():
+            count += count_text(tool_call.function_name, model)
+            count += count_text(tool_call.function_arguments, model)
+        return count
+
+    def count_message_tokens(
+        self, messages: "Sequence[Message]", model: str | None = None
+    ) -> int:
+        """Returns the estimated number of input tokens of a prompt."""
+        count = _REPLY_OVERHEAD_TOKENS
+        for message in messages:
+            count += _MESSAGE_OVERHEAD_TOKENS
+            count += self._count_message_text(message.content, model)
+            count += self._count_tool_calls(
+                message.tool_calls, model, self._count_message_text
+            )
+        return count
+
+    def count_choice_tokens(
+        self, choices: "Sequence[Choice]", model: str | None = None
+    ) -> int:
+        """Returns the estimated number of output tokens of the choices of a response."""
+        return sum(
+            self.count_tokens(choice.content, model)
+            + self._count_tool_calls(choice.tool_calls, model, self.count_tokens)
+            for choice in choices
+        )
+
+
+class ApproximateTokenEstimator(TokenEstimator):
+    """Approximates byte-pair encoding without a tokenizer.
+
+    Text is split the way BPE tokenizers pre-tokenize it, and every piece is
+    counted as the number of merged tokens it would likely take: a token per
+    6 characters of an ASCII word, per run of up to 3 digits and per 3 bytes
+    of other text. Counts are multiplied by the calibration factor of the
+    model, the one of the longest model name prefix in `calibration`, so the
+    estimate can be matched to the tokenizer of every model family.
+    """
+
+    def __init__(
+        self,
+        calibration: Mapping[str, float] | None = None,
+        cache_size: int = DEFAULT_TOKEN_ESTIMATOR_CACHE_SIZE,
+    ):
+        super().__init__(cache_size)
+        # longest prefixes first, so the most specific one matches
+        self.calibration = dict(
+            sorted((calibration or {}).items(), key=lambda item: -len(item[0]))
+        )
+
+    def calibration_factor(self, model: str | None) -> float:
+        if model:
+            for prefix, factor in self.calibration.items():
+                if model.startswith(prefix):
+                    return factor
+        return 1.0
+
+    def _count_text(self, text: str, model: str | None) -> int:
+        count = 0
+        for piece in _PRE_TOKENIZE_PATTERN.findall(text):
+            if piece.isascii():
+                if piece.isspace() or piece.isdigit():
+                    count += 1
+                else:
+                    count += math.ceil(len(piece) / _CHARS_PER_WORD_TOKEN)
+            else:
+                count += math.ceil(
+                    len(piece.encode("utf-8", "surrogatepass")) / _BYTES_PER_TOKEN
+                )
+        return max(1, round(count * self.calibration_factor(model)))
+
+
+@lru_cache(maxsize=None)
+def _tiktoken() -> Any | None:
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+
+    return tiktoken
+
+
+class TiktokenTokenEstimator(TokenEstimator):
+    """Counts tokens exactly with `tiktoken`, when it is installed.
+
+    The encoding of every model is the one `tiktoken` maps it to, or
+    `default_encoding` for models it does not know. When `tiktoken` is not
+    installed or an encoding cannot be loaded, tokens are counted by
+    `fallback`, an `ApproximateTokenEstimator` by default.
+    """
+
+    def __init__(
+        self,
+        default_encoding: str = DEFAULT_TIKTOKEN_ENCODING,
+        fallback: TokenEstimator | None = None,
+        cache_size: int = DEFAULT_TOKEN_ESTIMATOR_CACHE_SIZE,
+    ):
+        super().__init__(cache_size)
+        self.default_encoding = default_encoding
+        self.fallback = fallback or ApproximateTokenEstimator(cache_size=0)
+        self._encodings: dict[str | None, Any] = {}
+
+    def _encoding(self, model: str | None) -> Any | None:
+        if model in self._encodings:
+            return self._encodings[model]
+
+        encoding = None
+        tiktoken = _tiktoken()
+        if tiktoken is not None:
+            try:
+                encoding = tiktoken.encoding_for_model(model or "")
+            except KeyError:
+                try:
+                    encoding = tiktoken.get_encoding(self.default_encoding)
+                except Exception:
+                    logger.debug("Failed to load a tiktoken encoding", exc_info=True)
+            except Exception:
+                # encodings are downloaded on first use, which can fail
+                logger.debug("Failed to load a tiktoken encoding", exc_info=True)
+        self._encodings[model] = encoding
+        return encoding
+
+    def _count_text(self, text: str, model: str | None) -> int:
+        encoding = self._encoding(model)
+        if encoding is None:
+            return self.fallback.count_tokens(text, model)
+        return len(encoding.encode(text, disallowed_special=()))
+
+
+def _default_token_estimator() -> TokenEstimator:
+    if _tiktoken() is not None:
+        return TiktokenTokenEstimator()
+    return ApproximateTokenEstimator()
+
+
+_token_estimator: TokenEstimator | None = None
+_token_estimator_lock = threading.Lock()
+
+
+def get_token_estimator() -> TokenEstimator:
+    """Returns the process-wide token estimator.
+
+    Unless one was set with `set_token_estimator`, tokens are counted with
+    `tiktoken` when it is installed, and approximated otherwise.
+    """
+    global _token_estimator
+    if _token_estimator is None:
+        with _token_estimator_lock:
+            if _token_estimator is None:
+                _token_estimator = _default_token_estimator()
+    return _token_estimator
+
+
+def set_token_estimator(estimator: TokenEstimator | None) -> None:
+    """Sets the process-wide token estimator, None restores the default one."""
+    global _token_estimator
+    _token_estimator = estimator
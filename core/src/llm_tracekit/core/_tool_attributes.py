@@ -0,0 +1,138 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import Any, Callable, Iterable, Mapping, Sequence
+
+DEFAULT_TOOL_ATTRIBUTES_CACHE_SIZE = 128
+
+_EMPTY: Mapping[str, Any] = {}
+
+
+def _tool_structure(value: Any) -> Any:
+    model_dump = getattr(value, "model_dump", None)
+    if callable(model_dump):
+        return model_dump()
+    if callable(value):
+        # functions are told apart by their name and identity
+        return repr(value)
+    if hasattr(value, "__dict__"):
+        return [f"{type(value).__module__}.{type(value).__qualname__}", vars(value)]
+    return repr(value)
+
+
+def _serialize_tools(tools: Sequence[Any]) -> str | None:
+    try:
+        return json.dumps(tools, default=_tool_structure)
+    except (TypeError, ValueError, RecursionError):
+        return None
+
+
+class ToolAttributesCache:
+    """Memoizes the `gen_ai.request.tools.*` attributes of tool lists.
+
+    Tool definitions are usually passed again on every request, so the
+    attribute block (including the serialized JSON schemas) is computed once
+    per tool list. Blocks are keyed by a digest of the structure of the tools
+    (pydantic models by their `model_dump`, other objects by their attributes),
+    so equal tools rebuilt for every request are a hit, while adding, removing,
+    reordering or mutating a tool is a miss. Tool lists that cannot be
+    serialized are not cached.
+
+    Serializing the tools costs about half of building the block, so the
+    identity of the tools is remembered along with a snapshot of them, and a
+    list holding the same tools that are still equal to the snapshot is a hit
+    without serializing them again. The tools themselves are not kept alive.
+    """
+
+    def __init__(
+        self,
+        build: Callable[[Sequence[Any]], dict[str, Any]],
+        maxsize: int = DEFAULT_TOOL_ATTRIBUTES_CACHE_SIZE,
+    ):
+        self._build = build
+        self._maxsize = maxsize
+        self._blocks: OrderedDict[bytes, Mapping[str, Any]] = OrderedDict()
+        self._identities: OrderedDict[
+            tuple[int, ...], tuple[tuple[Any, ...], bytes]
+        ] = OrderedDict()
+
+    def get(self, tools: Iterable[Any]) -> Mapping[str, Any]:
+        """Returns the attribute block for `tools`.
+
+        The block is shared between calls, so it is merged into the request
+        attributes and never mutated.
+        """
+        tool_list = tuple(tools)
+        if not tool_list:
+            return _EMPTY
+        if self._maxsize <= 0:
+            return self._build(tool_list)
+
+        identity = tuple(map(id, tool_list))
+        identity_entry = self._identities.get(identity)
+        if identity_entry is not None and identity_entry[0] == tool_list:
+            block = self._blocks.get(identity_entry[1])
+            if block is not None:
+                self._touch(self._identities, identity)
+                self._touch(self._blocks, identity_entry[1])
+                return block
+
+        serialized = _serialize_tools(tool_list)
+        if serialized is None:
+            return self._build(tool_list)
+
+        digest = blake2b(
+            serialized.encode("utf-8", "surrogatepass"), digest_size=16
+        ).digest()
+        block = self._blocks.get(digest)
+        if block is not None:
+            self._touch(self._blocks, digest)
+            if identity_entry is None:
+                # tools rebuilt for every request would never hit a snapshot
+                return block
+        else:
+            block = self._build(tool_list)
+            self._insert(self._blocks, digest, block)
+
+        # only plain JSON tools compare equal to their snapshot
+        snapshot = tuple(json.loads(serialized))
+        if snapshot == tool_list:
+            self._insert(self._identities, identity, (snapshot, digest))
+        else:
+            self._identities.pop(identity, None)
+        return block
+
+    def _touch(self, entries: OrderedDict, key: Any) -> None:
+        try:
+            entries.move_to_end(key)
+        except KeyError:
+            pass
+
+    def _insert(self, entries: OrderedDict, key: Any, value: Any) -> None:
+        entries[key] = value
+        while len(entries) > self._maxsize:
+            try:
+                entries.popitem(last=False)
+            except KeyError:
+                break
+
+    def clear(self) -> None:
+        self._blocks.clear()
+        self._identities.clear()
+
+    def __len__(self) -> int:
+        return len(self._blocks)
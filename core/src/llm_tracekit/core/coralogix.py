@@ -12,12 +12,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import os
 import logging
 from typing import Any
 from dataclasses import dataclass
 
 from opentelemetry import trace
+from opentelemetry._logs import set_logger_provider
+from opentelemetry.metrics import get_meter_provider, set_meter_provider
+from opentelemetry.sdk._logs import LoggerProvider
+from opentelemetry.sdk._logs.export import BatchLogRecordProcessor
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+from opentelemetry.sdk.environment_variables import (
+    OTEL_EXPORTER_OTLP_ENDPOINT,
+    OTEL_EXPORTER_OTLP_TRACES_ENDPOINT,
+)
 from opentelemetry.sdk.resources import SERVICE_NAME, Resource
 from opentelemetry.sdk.trace import TracerProvider, SpanLimits
 from opentelemetry.sdk.trace.export import (
@@ -25,9 +36,42 @@ from opentelemetry.sdk.trace.export import (
     SimpleSpanProcessor,
     SpanProcessor,
 )
+from opentelemetry.exporter.otlp.proto.grpc._log_exporter import OTLPLogExporter
+from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import OTLPMetricExporter
 from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
 
-from llm_tracekit.core._config import enable_capture_content
+from llm_tracekit.core._async_exporter import AsyncOTLPSpanProcessor
+from llm_tracekit.core._cardinality import (
+    DEFAULT_METRIC_ATTRIBUTE_LIMIT,
+    configure_metric_attribute_limiter,
+)
+from llm_tracekit.core._duplicate_calls import DuplicateCallSpanProcessor
+from llm_tracekit.core._metrics_export import (
+    DEFAULT_METRIC_EXPORT_INTERVAL_MILLIS,
+    DELTA_TEMPORALITY,
+    create_meter_provider,
+)
+from llm_tracekit.core._memory_budget import (
+    CAPTURE_MODE_TRUNCATED,
+    configure_stream_memory_budget,
+)
+from llm_tracekit.core._config import (
+    enable_capture_content,
+    enable_content_event_mode,
+    enable_redaction,
+    enable_deferred_stream_processing,
+    set_embedding_vector_capture_mode,
+    set_embedding_input_sample_size,
+    enable_prompt_prefix_analysis,
+    enable_duplicate_call_detection,
+    enable_response_cache,
+    enable_token_usage_estimation,
+    enable_stream_usage_injection,
+    enable_http_timing,
+    enable_rate_limit_capture,
+    enable_content_offload,
+    EMBEDDING_VECTOR_CAPTURE_FULL,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -72,6 +116,35 @@ def setup_export_to_coralogix(
     capture_content: bool = True,
     processors: list[SpanProcessor] | None = None,
     span_attribute_count_limit: int = 512,
+    export_content_as_events: bool = False,
+    log_max_queue_size: int = 2048,
+    log_max_export_batch_size: int = 512,
+    log_schedule_delay_millis: float = 5000,
+    redact_content: bool = False,
+    use_async_exporter: bool = False,
+    async_exporter_loop: asyncio.AbstractEventLoop | None = None,
+    export_compression: str | None = "gzip",
+    stream_buffer_limit_bytes: int | None = None,
+    stream_buffer_degrade_to: str = CAPTURE_MODE_TRUNCATED,
+    stream_content_limit_bytes: int | None = None,
+    defer_stream_processing: bool = False,
+    embedding_vector_capture: str = EMBEDDING_VECTOR_CAPTURE_FULL,
+    embedding_vector_prefix_length: int | None = None,
+    embedding_input_sample_size: int | None = None,
+    analyze_prompt_prefixes: bool = False,
+    detect_duplicate_calls: bool = False,
+    response_cache: bool = False,
+    response_cache_path: str | None = None,
+    estimate_token_usage: bool = False,
+    inject_stream_usage: bool = False,
+    record_http_timing: bool = False,
+    capture_rate_limits: bool = False,
+    metric_attribute_limit: int | None = DEFAULT_METRIC_ATTRIBUTE_LIMIT,
+    export_metrics: bool = False,
+    metric_export_interval_millis: float = DEFAULT_METRIC_EXPORT_INTERVAL_MILLIS,
+    exponential_histograms: bool = False,
+    content_offload_path: str | None = None,
+    content_offload_threshold_bytes: int | None = None,
 ):
     """
     Setup OpenAI spans to be exported to Coralogix.
@@ -86,10 +159,105 @@ def setup_export_to_coralogix(
         capture_content: Whether to capture the content of the messages.
         processors: Optional list of SpanProcessor instances to add to the tracer provider before the exporter processor.
         span_attribute_count_limit: The maximum number of span attributes.
+        export_content_as_events: Whether to export message content as gen_ai log events, correlated to the
+            spans by trace and span id, instead of as span attributes.
+        log_max_queue_size: The maximum number of content events buffered before new events are dropped.
+        log_max_export_batch_size: The maximum number of content events exported in a single batch.
+        log_schedule_delay_millis: The delay between two consecutive exports of content events.
+        redact_content: Whether to redact emails, credit card numbers, API keys and phone numbers from captured content.
+        use_async_exporter: Whether to export spans over OTLP/HTTP with an asyncio based exporter instead of the
+            thread based gRPC exporter. Requires httpx. Without a Coralogix endpoint, spans are exported to
+            OTEL_EXPORTER_OTLP_TRACES_ENDPOINT or OTEL_EXPORTER_OTLP_ENDPOINT, defaulting to http://localhost:4318.
+        async_exporter_loop: The event loop the async exporter runs on. Defaults to a dedicated loop thread.
+        export_compression: The compression used by the async exporter: "gzip", "zstd" or None.
+        stream_buffer_limit_bytes: The maximum content buffered by all running streams together. Defaults to no limit.
+        stream_buffer_degrade_to: How streams are captured once the limit is reached: "truncated" or "metadata_only".
+        stream_content_limit_bytes: The maximum size of every content of a stream (a text or the arguments of a tool
+            call), beyond which it is truncated. Defaults to no limit.
+        defer_stream_processing: Whether stream chunks are only collected while streaming and parsed once the
+            stream ends, keeping the latency added to every chunk to a minimum.
+        embedding_vector_capture: How captured embedding vectors are recorded: "full", "summary" (dimensions, L2 norm,
+            min, max and mean), "int8" or "float16" (base64 encoded quantized components) or "prefix" (the first
+            components).
+        embedding_vector_prefix_length: The number of components kept by the "prefix" embedding vector capture mode.
+        embedding_input_sample_size: The number of input items of an embeddings request recorded as prompts. The whole
+            batch is summarized by its item, character and token counts. Defaults to 16.
+        analyze_prompt_prefixes: Whether to fingerprint prompt prefixes, recording `gen_ai.prompt.prefix_hash` and
+            the share of the prompts in prefixes already sent to the model, which a provider prompt cache could serve.
+        detect_duplicate_calls: Whether to mark requests identical to an earlier request of the last 5 minutes with
+            `gen_ai.request.duplicate_of`, and count them per model.
+        response_cache: Whether to serve the responses to deterministic requests (temperature 0 or an explicit seed)
+            of the OpenAI and Anthropic instrumentations from a local cache instead of the provider.
+        response_cache_path: Path of a sqlite database that keeps the cached responses across restarts.
+        estimate_token_usage: Whether to estimate the token usage of responses that do not report it, such as
+            OpenAI streams without `stream_options.include_usage`, marking the spans with `gen_ai.usage.estimated`.
+        inject_stream_usage: Whether to add `stream_options={"include_usage": True}` to the OpenAI and Microsoft
+            Foundry chat streams that do not request it, for exact token usage. The extra usage chunk is not
+            returned to the caller.
+        record_http_timing: Whether to time the phases of the HTTP requests of the OpenAI, Microsoft Foundry and
+            Anthropic instrumentations: connection pool wait, connect, TLS, time to response headers and body
+            transfer, and whether the connection was reused.
+        capture_rate_limits: Whether to record the rate limits reported in the response headers of the OpenAI,
+            Microsoft Foundry and Anthropic instrumentations per model and API key, along with the rate limited
+            responses, retries and retry backoff hidden by the SDKs.
+        metric_attribute_limit: The maximum number of values of the system, model and error type attributes of
+            metrics. The values that are not among the most frequent ones are recorded as "other". None disables
+            the limit. Defaults to 100.
+        export_metrics: Whether to set up a meter provider that exports the metrics of the instrumentations, with
+            delta temporality for counters and histograms. A meter provider that is already set up is kept.
+            Defaults to False.
+        metric_export_interval_millis: The interval between two consecutive exports of metrics.
+        exponential_histograms: Whether to aggregate the gen_ai histograms into base-2 exponential histograms instead
+            of explicit buckets, for smaller payloads and more precise percentiles.
+        content_offload_path: Path of a content store that prompt content of at least
+            `content_offload_threshold_bytes` is written to instead of `gen_ai.prompt.<n>.content`, the span only
+            recording `gen_ai.prompt.<n>.content_ref`. Paths ending with .db, .sqlite or .sqlite3 are sqlite
+            databases, others are directories.
+        content_offload_threshold_bytes: The size from which prompt content is offloaded. Defaults to 8192.
     """
 
     if capture_content:
         enable_capture_content()
+    if export_content_as_events:
+        enable_content_event_mode()
+    if redact_content:
+        enable_redaction()
+    if stream_buffer_limit_bytes is not None or stream_content_limit_bytes is not None:
+        configure_stream_memory_budget(
+            stream_buffer_limit_bytes,
+            degrade_to=stream_buffer_degrade_to,
+            content_limit_bytes=stream_content_limit_bytes,
+        )
+    if defer_stream_processing:
+        enable_deferred_stream_processing()
+    if (
+        embedding_vector_capture != EMBEDDING_VECTOR_CAPTURE_FULL
+        or embedding_vector_prefix_length is not None
+    ):
+        set_embedding_vector_capture_mode(
+            embedding_vector_capture, prefix_length=embedding_vector_prefix_length
+        )
+    if embedding_input_sample_size is not None:
+        set_embedding_input_sample_size(embedding_input_sample_size)
+    if analyze_prompt_prefixes:
+        enable_prompt_prefix_analysis()
+    if detect_duplicate_calls:
+        enable_duplicate_call_detection()
+    if response_cache:
+        enable_response_cache(response_cache_path)
+    if estimate_token_usage:
+        enable_token_usage_estimation()
+    if inject_stream_usage:
+        enable_stream_usage_injection()
+    if record_http_timing:
+        enable_http_timing()
+    if capture_rate_limits:
+        enable_rate_limit_capture()
+    if content_offload_path is not None:
+        enable_content_offload(
+            content_offload_path, threshold_bytes=content_offload_threshold_bytes
+        )
+    configure_metric_attribute_limiter(metric_attribute_limit)
 
     exporter_config = generate_exporter_config(
         coralogix_token=coralogix_token,
@@ -128,23 +296,79 @@ def setup_export_to_coralogix(
         span_limits=span_attribute_limit,
     )
 
+    if detect_duplicate_calls:
+        tracer_provider.add_span_processor(DuplicateCallSpanProcessor())
+
     # add any custom span processors before configuring the exporter processor
     if processors:
-        for span_processor in processors:
-            tracer_provider.add_span_processor(span_processor)
+        for processor in processors:
+            tracer_provider.add_span_processor(processor)
 
-    # set up an OTLP exporter to send spans to coralogix directly.
-    exporter = OTLPSpanExporter(
-        endpoint=exporter_config.endpoint, headers=exporter_config.headers
-    )
+    span_processor: SpanProcessor
+    if use_async_exporter:
+        # the async processor batches and exports spans itself, on an event loop.
+        span_processor = AsyncOTLPSpanProcessor(
+            endpoint=exporter_config.endpoint
+            or os.environ.get(OTEL_EXPORTER_OTLP_TRACES_ENDPOINT)
+            or os.environ.get(OTEL_EXPORTER_OTLP_ENDPOINT, "http://localhost:4318"),
+            headers=exporter_config.headers,
+            compression=export_compression,
+            loop=async_exporter_loop,
+        )
+    else:
+        # set up an OTLP exporter to send spans to coralogix directly.
+        exporter = OTLPSpanExporter(
+            endpoint=exporter_config.endpoint, headers=exporter_config.headers
+        )
 
-    # set up a span processor to send spans to the exporter
-    span_processor = (
-        BatchSpanProcessor(exporter)
-        if use_batch_processor
-        else SimpleSpanProcessor(exporter)
-    )
+        # set up a span processor to send spans to the exporter
+        span_processor = (
+            BatchSpanProcessor(exporter)
+            if use_batch_processor
+            else SimpleSpanProcessor(exporter)
+        )
 
     # add the span processor to the tracer provider
     tracer_provider.add_span_processor(span_processor)
     trace.set_tracer_provider(tracer_provider)
+
+    if export_content_as_events:
+        # content events go through their own batched pipeline, so that they can
+        # be dropped under load without affecting span export.
+        logger_provider = LoggerProvider(resource=tracer_provider.resource)
+        log_exporter = OTLPLogExporter(
+            endpoint=exporter_config.endpoint, headers=exporter_config.headers
+        )
+        logger_provider.add_log_record_processor(
+            BatchLogRecordProcessor(
+                log_exporter,
+                schedule_delay_millis=log_schedule_delay_millis,
+                max_export_batch_size=log_max_export_batch_size,
+                max_queue_size=log_max_queue_size,
+            )
+        )
+        set_logger_provider(logger_provider)
+
+    if export_metrics and isinstance(get_meter_provider(), MeterProvider):
+        logger.warning(
+            "A meter provider is already set up; metrics are not exported to Coralogix"
+        )
+    elif export_metrics:
+        # metrics are exported periodically as deltas, so that the backend does
+        # not have to keep the state of every series.
+        metric_exporter = OTLPMetricExporter(
+            endpoint=exporter_config.endpoint,
+            headers=exporter_config.headers,
+            preferred_temporality=DELTA_TEMPORALITY,
+        )
+        meter_provider = create_meter_provider(
+            [
+                PeriodicExportingMetricReader(
+                    metric_exporter,
+                    export_interval_millis=metric_export_interval_millis,
+                )
+            ],
+            resource=tracer_provider.resource,
+            exponential_histograms=exponential_histograms,
+        )
+        set_meter_provider(meter_provider)
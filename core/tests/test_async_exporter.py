@@ -0,0 +1,267 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import gzip
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import (
+    ExportTraceServiceRequest,
+)
+from opentelemetry.sdk.trace import TracerProvider
+
+import llm_tracekit.core._async_exporter as async_exporter
+import llm_tracekit.core.coralogix as coralogix
+from llm_tracekit.core import AsyncOTLPSpanProcessor, setup_export_to_coralogix
+
+pytest.importorskip("httpx")
+
+
+class _StubCollector:
+    """A minimal OTLP/HTTP collector that counts the spans it receives."""
+
+    def __init__(self):
+        self.span_names: list[str] = []
+        self.content_encodings: set[str] = set()
+        self._lock = threading.Lock()
+        collector = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["content-length"]))
+                encoding = self.headers.get("content-encoding")
+                if encoding == "gzip":
+                    body = gzip.decompress(body)
+                elif encoding == "zstd":
+                    import zstandard
+
+                    body = zstandard.ZstdDecompressor().decompress(body)
+                request = ExportTraceServiceRequest.FromString(body)
+                names = [
+                    span.name
+                    for resource_spans in request.resource_spans
+                    for scope_spans in resource_spans.scope_spans
+                    for span in scope_spans.spans
+                ]
+                with collector._lock:
+                    collector.span_names.extend(names)
+                    collector.content_encodings.add(encoding)
+                self.send_response(200)
+                self.send_header("content-length", "0")
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.endpoint = f"http://127.0.0.1:{self.server.server_port}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture(name="collector")
+def fixture_collector():
+    collector = _StubCollector()
+    yield collector
+    collector.close()
+
+
+def _create_spans_concurrently(tracer, tasks: int, spans_per_task: int) -> None:
+    async def worker(task_index: int):
+        for span_index in range(spans_per_task):
+            with tracer.start_as_current_span(f"chat {task_index}-{span_index}"):
+                await asyncio.sleep(0)
+
+    async def main():
+        await asyncio.gather(*(worker(index) for index in range(tasks)))
+
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize("compression", ["gzip", "zstd", None])
+def test_exports_all_spans_under_concurrency(collector, compression):
+    """Test every span reaches the collector when many tasks create spans at once."""
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+    processor = AsyncOTLPSpanProcessor(
+        endpoint=collector.endpoint,
+        compression=compression,
+        max_queue_size=10000,
+        max_export_batch_size=200,
+        schedule_delay_millis=50,
+    )
+    tracer_provider = TracerProvider()
+    tracer_provider.add_span_processor(processor)
+
+    _create_spans_concurrently(
+        tracer_provider.get_tracer(__name__), tasks=50, spans_per_task=40
+    )
+
+    assert processor.force_flush()
+    tracer_provider.shutdown()
+
+    assert len(collector.span_names) == 2000
+    assert len(set(collector.span_names)) == 2000
+    assert collector.content_encodings == {compression}
+    assert processor.dropped_spans == 0
+
+
+def test_drops_spans_when_queue_is_full(collector):
+    """Test spans beyond the queue limit are dropped instead of buffered."""
+    processor = AsyncOTLPSpanProcessor(
+        endpoint=collector.endpoint,
+        max_queue_size=100,
+        max_export_batch_size=1000,
+        schedule_delay_millis=60000,
+    )
+    tracer_provider = TracerProvider()
+    tracer_provider.add_span_processor(processor)
+    tracer = tracer_provider.get_tracer(__name__)
+
+    for index in range(150):
+        with tracer.start_as_current_span(f"chat {index}"):
+            pass
+
+    assert processor.force_flush()
+    tracer_provider.shutdown()
+
+    assert processor.dropped_spans == 50
+    assert len(collector.span_names) == 100
+
+
+def test_runs_on_application_loop(collector):
+    """Test the processor can share the application's event loop."""
+
+    async def main():
+        processor = AsyncOTLPSpanProcessor(
+            endpoint=collector.endpoint,
+            loop=asyncio.get_running_loop(),
+            schedule_delay_millis=50,
+        )
+        tracer_provider = TracerProvider()
+        tracer_provider.add_span_processor(processor)
+        tracer = tracer_provider.get_tracer(__name__)
+
+        for index in range(10):
+            with tracer.start_as_current_span(f"chat {index}"):
+                await asyncio.sleep(0)
+
+        await processor.aforce_flush()
+        await processor.ashutdown()
+
+    asyncio.run(main())
+
+    assert len(collector.span_names) == 10
+
+
+def test_shutdown_after_application_loop_closed(collector):
+    """Test spans queued on a closed application loop are exported on shutdown."""
+    tracer_provider = TracerProvider()
+
+    async def main():
+        processor = AsyncOTLPSpanProcessor(
+            endpoint=collector.endpoint,
+            loop=asyncio.get_running_loop(),
+            schedule_delay_millis=60000,
+        )
+        tracer_provider.add_span_processor(processor)
+        tracer = tracer_provider.get_tracer(__name__)
+        for index in range(10):
+            with tracer.start_as_current_span(f"chat {index}"):
+                await asyncio.sleep(0)
+
+    asyncio.run(main())
+    tracer_provider.shutdown()
+
+    assert len(collector.span_names) == 10
+
+
+def test_failed_export_is_logged_and_counted(monkeypatch, caplog, collector):
+    """Test errors raised while exporting a batch are logged and its spans counted as dropped."""
+
+    def fail_to_encode(batch):
+        raise ValueError("cannot encode")
+
+    monkeypatch.setattr(async_exporter, "encode_spans", fail_to_encode)
+    processor = AsyncOTLPSpanProcessor(
+        endpoint=collector.endpoint, schedule_delay_millis=60000
+    )
+    tracer_provider = TracerProvider()
+    tracer_provider.add_span_processor(processor)
+    tracer = tracer_provider.get_tracer(__name__)
+    for index in range(5):
+        with tracer.start_as_current_span(f"chat {index}"):
+            pass
+
+    assert processor.force_flush()
+    tracer_provider.shutdown()
+
+    assert processor.dropped_spans == 5
+    assert collector.span_names == []
+    assert "cannot encode" in caplog.text
+
+
+def test_spans_left_after_shutdown_are_counted():
+    """Test spans that cannot be exported once the application loop closed are counted as dropped."""
+    tracer_provider = TracerProvider()
+    processors = []
+
+    async def main():
+        processor = AsyncOTLPSpanProcessor(
+            endpoint="http://127.0.0.1:1",
+            loop=asyncio.get_running_loop(),
+            max_export_batch_size=4,
+            schedule_delay_millis=60000,
+        )
+        processors.append(processor)
+        tracer_provider.add_span_processor(processor)
+        tracer = tracer_provider.get_tracer(__name__)
+        for index in range(10):
+            with tracer.start_as_current_span(f"chat {index}"):
+                await asyncio.sleep(0)
+
+    asyncio.run(main())
+    tracer_provider.shutdown()
+
+    assert processors[0].dropped_spans == 10
+
+
+def test_setup_uses_otlp_endpoint_environment_variable(monkeypatch, collector):
+    """Test the async exporter falls back to the OTLP endpoint environment variables."""
+    monkeypatch.delenv("CX_ENDPOINT", raising=False)
+    monkeypatch.delenv("OTEL_EXPORTER_OTLP_TRACES_ENDPOINT", raising=False)
+    monkeypatch.setenv("OTEL_EXPORTER_OTLP_ENDPOINT", collector.endpoint)
+    tracer_providers = []
+    monkeypatch.setattr(coralogix.trace, "set_tracer_provider", tracer_providers.append)
+
+    setup_export_to_coralogix(
+        service_name="test",
+        use_async_exporter=True,
+        export_metrics=False,
+    )
+
+    (tracer_provider,) = tracer_providers
+    with tracer_provider.get_tracer(__name__).start_as_current_span("chat"):
+        pass
+    tracer_provider.shutdown()
+
+    assert collector.span_names == ["chat"]
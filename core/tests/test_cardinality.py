@@ -0,0 +1,176 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+
+import llm_tracekit.core._cardinality as cardinality
+from llm_tracekit.core import (
+    GEN_AI_CLIENT_COLLAPSED_ATTRIBUTE_VALUES,
+    Instruments,
+    MetricAttributeLimiter,
+    SpaceSavingSketch,
+    configure_metric_attribute_limiter,
+    limit_metric_attributes,
+)
+
+_REQUEST_MODEL = "gen_ai.request.model"
+
+
+@pytest.fixture(autouse=True)
+def restore_limiter(monkeypatch):
+    monkeypatch.setattr(
+        cardinality,
+        "_metric_attribute_limiter",
+        cardinality._metric_attribute_limiter,
+    )
+
+
+def _model(limiter, model, instruments=None):
+    return limiter.limit_attributes({_REQUEST_MODEL: model}, instruments)[
+        _REQUEST_MODEL
+    ]
+
+
+class TestSpaceSavingSketch:
+    def test_counts_below_capacity(self):
+        """Test values are counted exactly while they fit."""
+        sketch = SpaceSavingSketch(capacity=2)
+        for value in ["a", "a", "b"]:
+            sketch.add(value)
+
+        assert sketch.count("a") == 2
+        assert sketch.guaranteed_count("a") == 2
+        assert sketch.count("c") == 0
+
+    def test_new_value_replaces_least_frequent(self):
+        """Test a new value inherits the count of the value it replaces as its error."""
+        sketch = SpaceSavingSketch(capacity=2)
+        for value in ["a", "a", "a", "b"]:
+            sketch.add(value)
+
+        assert sketch.add("c") == "b"
+
+        assert sketch.count("b") == 0
+        assert sketch.count("c") == 2
+        assert sketch.guaranteed_count("c") == 1
+        assert sketch.count("a") == 3
+
+
+class TestMetricAttributeLimiter:
+    def test_collapses_values_beyond_limit(self):
+        """Test the values first seen are kept and the rest are recorded as `other`."""
+        limiter = MetricAttributeLimiter(limit=2)
+
+        assert _model(limiter, "gpt-4o") == "gpt-4o"
+        assert _model(limiter, "gpt-4o-mini") == "gpt-4o-mini"
+        assert _model(limiter, "user-model-1") == "other"
+        assert _model(limiter, "gpt-4o") == "gpt-4o"
+
+    def test_heavy_hitter_replaces_rare_value(self):
+        """Test a value seen more often than an admitted one takes its place."""
+        limiter = MetricAttributeLimiter(limit=1)
+        assert _model(limiter, "rare") == "rare"
+
+        assert _model(limiter, "frequent") == "other"
+        assert _model(limiter, "frequent") == "frequent"
+        assert _model(limiter, "rare") == "other"
+        assert _model(limiter, "frequent") == "frequent"
+
+    def test_least_frequent_value_is_replaced(self):
+        """Test a heavy hitter replaces the least frequent of the admitted values."""
+        limiter = MetricAttributeLimiter(limit=2)
+        for model in ["frequent", "rare", "frequent", "frequent"]:
+            assert _model(limiter, model) == model
+
+        assert _model(limiter, "new") == "other"
+        assert _model(limiter, "new") == "new"
+        assert _model(limiter, "frequent") == "frequent"
+        assert _model(limiter, "rare") == "other"
+
+    def test_admitted_values_are_reused(self):
+        """Test values limited earlier for the same request are not counted again."""
+        limiter = MetricAttributeLimiter(limit=1)
+        assert _model(limiter, "rare") == "rare"
+
+        in_flight_attributes = limiter.limit_attributes({_REQUEST_MODEL: "frequent"})
+        metric_attributes = limiter.limit_attributes(
+            {_REQUEST_MODEL: "frequent", "gen_ai.response.model": "frequent-1"},
+            admitted=in_flight_attributes,
+        )
+
+        assert metric_attributes == {
+            _REQUEST_MODEL: "other",
+            "gen_ai.response.model": "frequent-1",
+        }
+        assert _model(limiter, "frequent") == "frequent"
+
+    def test_other_attributes_are_kept(self):
+        """Test only the limited attributes are collapsed, on a copy of the attributes."""
+        limiter = MetricAttributeLimiter(limit=0)
+        attributes = {
+            _REQUEST_MODEL: "gpt-4o",
+            "error.type": "ValueError",
+            "server.address": "api.openai.com",
+        }
+
+        assert limiter.limit_attributes(attributes) == {
+            _REQUEST_MODEL: "other",
+            "error.type": "other",
+            "server.address": "api.openai.com",
+        }
+        assert attributes[_REQUEST_MODEL] == "gpt-4o"
+
+    def test_collapsed_values_metric(self):
+        """Test every collapsed value is counted by attribute."""
+        reader = InMemoryMetricReader()
+        instruments = Instruments(
+            MeterProvider(metric_readers=[reader]).get_meter(__name__)
+        )
+        limiter = MetricAttributeLimiter(limit=1)
+        for model in ["gpt-4o", "a", "b", "c"]:
+            _model(limiter, model, instruments)
+
+        metrics = {
+            metric.name: metric
+            for resource_metrics in reader.get_metrics_data().resource_metrics
+            for scope_metrics in resource_metrics.scope_metrics
+            for metric in scope_metrics.metrics
+        }
+        (data_point,) = metrics[
+            GEN_AI_CLIENT_COLLAPSED_ATTRIBUTE_VALUES
+        ].data.data_points
+        assert data_point.value == 3
+        assert dict(data_point.attributes) == {
+            "gen_ai.metric.attribute": _REQUEST_MODEL
+        }
+
+    def test_negative_limit(self):
+        """Test a negative limit is rejected."""
+        with pytest.raises(ValueError):
+            MetricAttributeLimiter(limit=-1)
+
+
+def test_configure_limiter():
+    """Test the process-wide limiter can be replaced, or disabled."""
+    configure_metric_attribute_limiter(0)
+    assert limit_metric_attributes(None, {_REQUEST_MODEL: "gpt-4o"}) == {
+        _REQUEST_MODEL: "other"
+    }
+
+    configure_metric_attribute_limiter(None)
+    assert limit_metric_attributes(None, {_REQUEST_MODEL: "gpt-4o"}) == {
+        _REQUEST_MODEL: "gpt-4o"
+    }
@@ -0,0 +1,101 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gc
+from types import SimpleNamespace
+
+from opentelemetry.semconv._incubating.attributes import (
+    gen_ai_attributes as GenAIAttributes,
+)
+
+from llm_tracekit.core import ClientAttributesCache
+
+
+class _Resource:
+    def __init__(self, base_url: str):
+        self._client = SimpleNamespace(base_url=base_url)
+
+
+class _UnhashableResource(_Resource):
+    __hash__ = None  # type: ignore[assignment]
+
+
+class _CountingServerAttributes:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, client_instance):
+        self.calls += 1
+        return {"server.address": client_instance._client.base_url}
+
+
+class TestClientAttributesCache:
+    def test_block_is_computed_once_per_client(self):
+        """Test the attribute block is reused for the same client."""
+        server_attributes = _CountingServerAttributes()
+        cache = ClientAttributesCache("openai", server_attributes)
+        client_instance = _Resource("api.openai.com")
+
+        first = cache.get(client_instance)
+        second = cache.get(client_instance)
+
+        assert first is second
+        assert first == {
+            GenAIAttributes.GEN_AI_OPERATION_NAME: "chat",
+            GenAIAttributes.GEN_AI_SYSTEM: "openai",
+            "server.address": "api.openai.com",
+        }
+        assert server_attributes.calls == 1
+
+    def test_operations_are_cached_separately(self):
+        """Test each operation gets its own block."""
+        cache = ClientAttributesCache("openai", _CountingServerAttributes())
+        client_instance = _Resource("api.openai.com")
+
+        block = cache.get(
+            client_instance, GenAIAttributes.GenAiOperationNameValues.EMBEDDINGS
+        )
+
+        assert block[GenAIAttributes.GEN_AI_OPERATION_NAME] == "embeddings"
+        assert cache.get(client_instance)[GenAIAttributes.GEN_AI_OPERATION_NAME] == (
+            "chat"
+        )
+
+    def test_base_url_change_invalidates(self):
+        """Test replacing the client's base_url recomputes the block."""
+        cache = ClientAttributesCache("openai", _CountingServerAttributes())
+        client_instance = _Resource("api.openai.com")
+        cache.get(client_instance)
+
+        client_instance._client.base_url = "proxy.example.com"
+
+        assert cache.get(client_instance)["server.address"] == "proxy.example.com"
+
+    def test_clients_are_not_kept_alive(self):
+        """Test cached clients can still be garbage collected."""
+        cache = ClientAttributesCache("openai", _CountingServerAttributes())
+        cache.get(_Resource("api.openai.com"))
+        gc.collect()
+
+        assert len(cache._entries) == 0
+
+    def test_unhashable_client(self):
+        """Test clients that cannot be cached still get their attributes."""
+        server_attributes = _CountingServerAttributes()
+        cache = ClientAttributesCache("openai", server_attributes)
+        client_instance = _UnhashableResource("a.b")
+
+        assert cache.get(client_instance)["server.address"] == "a.b"
+        assert cache.get(client_instance)["server.address"] == "a.b"
+        assert server_attributes.calls == 2
@@ -0,0 +1,147 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from opentelemetry.sdk._logs import LoggerProvider
+from opentelemetry.sdk._logs.export import (
+    InMemoryLogRecordExporter,
+    SimpleLogRecordProcessor,
+)
+from opentelemetry.sdk.trace import TracerProvider
+
+import llm_tracekit.core._content_events as content_events
+import llm_tracekit.core._extended_gen_ai_attributes as ExtendedGenAIAttributes
+from llm_tracekit.core import (
+    OTEL_INSTRUMENTATION_GENAI_CONTENT_EXPORT_MODE,
+    Choice,
+    Message,
+    ToolCall,
+    deferred_message_events,
+    generate_choice_attributes,
+    generate_message_attributes,
+)
+
+
+@pytest.fixture(name="log_exporter")
+def fixture_log_exporter(monkeypatch):
+    exporter = InMemoryLogRecordExporter()
+    logger_provider = LoggerProvider()
+    logger_provider.add_log_record_processor(SimpleLogRecordProcessor(exporter))
+    monkeypatch.setattr(content_events, "_logger", logger_provider.get_logger(__name__))
+    return exporter
+
+
+@pytest.fixture(name="event_mode")
+def fixture_event_mode(monkeypatch):
+    monkeypatch.setenv(OTEL_INSTRUMENTATION_GENAI_CONTENT_EXPORT_MODE, "event")
+
+
+class TestContentEventMode:
+    def test_span_mode_keeps_content_on_attributes(self, log_exporter):
+        """Test content stays on span attributes when event mode is disabled."""
+        messages = [Message(role="user", content="Hello")]
+
+        result = generate_message_attributes(messages, capture_content=True)
+
+        assert result["gen_ai.prompt.0.content"] == "Hello"
+        assert log_exporter.get_finished_logs() == ()
+
+    def test_message_events_replace_content_attributes(self, log_exporter, event_mode):
+        """Test messages are emitted as events correlated to the current span."""
+        messages = [
+            Message(role="system", content="Be brief"),
+            Message(
+                role="assistant",
+                tool_calls=[
+                    ToolCall(
+                        id="call_1",
+                        type="function",
+                        function_name="get_weather",
+                        function_arguments='{"city": "Paris"}',
+                    )
+                ],
+            ),
+        ]
+        tracer = TracerProvider().get_tracer(__name__)
+
+        with tracer.start_as_current_span("chat") as span:
+            result = generate_message_attributes(messages, capture_content=True)
+
+        assert result["gen_ai.prompt.0.role"] == "system"
+        assert "gen_ai.prompt.0.content" not in result
+        assert result["gen_ai.prompt.1.tool_calls.0.function.name"] == "get_weather"
+        assert (
+            ExtendedGenAIAttributes.GEN_AI_PROMPT_TOOL_CALLS_FUNCTION_ARGUMENTS.format(
+                prompt_index=1, tool_call_index=0
+            )
+            not in result
+        )
+
+        logs = [log.log_record for log in log_exporter.get_finished_logs()]
+        assert [log.event_name for log in logs] == [
+            "gen_ai.system.message",
+            "gen_ai.assistant.message",
+        ]
+        assert logs[0].body == {"index": 0, "role": "system", "content": "Be brief"}
+        assert logs[1].body["tool_calls"][0]["arguments"] == '{"city": "Paris"}'
+        for log in logs:
+            assert log.trace_id == span.get_span_context().trace_id
+            assert log.span_id == span.get_span_context().span_id
+
+    def test_deferred_message_events(self, log_exporter, event_mode):
+        """Test messages of attributes generated before the span starts are emitted within it."""
+        tracer = TracerProvider().get_tracer(__name__)
+
+        with deferred_message_events() as message_events:
+            generate_message_attributes(
+                [Message(role="user", content="Hello")], capture_content=True
+            )
+        assert log_exporter.get_finished_logs() == ()
+
+        with tracer.start_as_current_span("chat") as span:
+            message_events.emit()
+        message_events.emit()
+
+        (log,) = [log.log_record for log in log_exporter.get_finished_logs()]
+        assert log.event_name == "gen_ai.user.message"
+        assert log.span_id == span.get_span_context().span_id
+
+    def test_choice_events(self, log_exporter, event_mode):
+        """Test choices are emitted as gen_ai.choice events."""
+        choices = [Choice(finish_reason="stop", role="assistant", content="Hi!")]
+
+        result = generate_choice_attributes(choices, capture_content=True)
+
+        assert result["gen_ai.completion.0.finish_reason"] == "stop"
+        assert "gen_ai.completion.0.content" not in result
+
+        logs = [log.log_record for log in log_exporter.get_finished_logs()]
+        assert len(logs) == 1
+        assert logs[0].event_name == "gen_ai.choice"
+        assert logs[0].body == {
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": "Hi!"},
+        }
+
+    def test_no_events_without_capture_content(self, log_exporter, event_mode):
+        """Test nothing is emitted when content capture is disabled."""
+        generate_message_attributes(
+            [Message(role="user", content="Hello")], capture_content=False
+        )
+        generate_choice_attributes(
+            [Choice(role="assistant", content="Hi!")], capture_content=False
+        )
+
+        assert log_exporter.get_finished_logs() == ()
@@ -0,0 +1,207 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+from hashlib import sha256
+
+import pytest
+
+import llm_tracekit.core._content_store as content_store
+from llm_tracekit.core import (
+    OTEL_INSTRUMENTATION_GENAI_CONTENT_OFFLOAD_PATH,
+    OTEL_INSTRUMENTATION_GENAI_CONTENT_OFFLOAD_THRESHOLD,
+    ContentOffloader,
+    ContentStore,
+    FileSystemContentStore,
+    Message,
+    SqliteContentStore,
+    create_content_store,
+    generate_message_attributes,
+    get_content_offloader,
+    set_content_offloader,
+)
+
+_LARGE_CONTENT = "You are a helpful assistant. " * 10
+
+
+class _RecordingStore(ContentStore):
+    def __init__(self):
+        self.batches = []
+        self.contents = {}
+
+    def write_batch(self, contents):
+        self.batches.append(dict(contents))
+        self.contents.update(contents)
+
+    def read(self, digest):
+        return self.contents.get(digest)
+
+
+class _FailingStore(_RecordingStore):
+    def __init__(self):
+        super().__init__()
+        self.failures = 1
+
+    def write_batch(self, contents):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("disk full")
+        super().write_batch(contents)
+
+
+class _BlockingStore(_RecordingStore):
+    def __init__(self):
+        super().__init__()
+        self.writing = threading.Event()
+        self.unblock = threading.Event()
+
+    def write_batch(self, contents):
+        self.writing.set()
+        self.unblock.wait(timeout=5)
+        super().write_batch(contents)
+
+
+@pytest.fixture(name="offloader")
+def fixture_offloader():
+    offloader = ContentOffloader(
+        _RecordingStore(), threshold_bytes=100, flush_interval_seconds=0.01
+    )
+    yield offloader
+    offloader.close()
+
+
+@pytest.mark.parametrize("path", ["contents", "contents.db"])
+def test_stores(tmp_path, path):
+    """Test both stores keep the contents by digest, ignoring rewrites."""
+    store = create_content_store(str(tmp_path / path))
+    assert isinstance(
+        store, SqliteContentStore if path.endswith(".db") else FileSystemContentStore
+    )
+
+    store.write_batch({"ab12": b"first"})
+    store.write_batch({"ab12": b"second", "cd34": b"other"})
+
+    assert store.read("ab12") == b"first"
+    assert store.read("cd34") == b"other"
+    assert store.read("ef56") is None
+    store.close()
+
+
+def test_offload_threshold(offloader):
+    """Test only content of at least the threshold is offloaded, by its digest and size."""
+    assert offloader.offload("short") is None
+
+    ref = offloader.offload(_LARGE_CONTENT)
+    offloader.flush()
+
+    encoded_content = _LARGE_CONTENT.encode()
+    assert ref.value == f"sha256:{sha256(encoded_content).hexdigest()}:290"
+    assert offloader.store.read(ref.digest) == encoded_content
+
+
+def test_offload_lone_surrogate(offloader):
+    """Test content with a lone surrogate is offloaded instead of failing to encode."""
+    content = f"\ud800{_LARGE_CONTENT}"
+    ref = offloader.offload(content)
+    offloader.flush()
+
+    assert offloader.store.read(ref.digest) == content.encode("utf-8", "surrogatepass")
+
+
+def test_offload_batches_and_deduplicates(offloader):
+    """Test queued contents are written together, and repeated content only once."""
+    offloader.flush_interval_seconds = 1.0
+    offloader.max_batch_size = 3
+    refs = [offloader.offload(f"{index} {_LARGE_CONTENT}") for index in range(3)]
+    repeated_ref = offloader.offload(f"0 {_LARGE_CONTENT}")
+    offloader.flush()
+
+    assert repeated_ref == refs[0]
+    assert offloader.store.batches == [
+        {ref.digest: offloader.store.contents[ref.digest] for ref in refs}
+    ]
+    assert (offloader.written, offloader.deduplicated) == (3, 1)
+
+
+def test_offload_full_queue():
+    """Test content stays inline once the queue is full."""
+    store = _BlockingStore()
+    offloader = ContentOffloader(
+        store, threshold_bytes=1, max_batch_size=1, max_queue_size=1
+    )
+    offloader.offload(f"0 {_LARGE_CONTENT}")
+    store.writing.wait(timeout=5)
+
+    assert offloader.offload(f"1 {_LARGE_CONTENT}") is not None
+    assert offloader.offload(f"2 {_LARGE_CONTENT}") is None
+    assert offloader.dropped == 1
+
+    store.unblock.set()
+    offloader.close()
+    assert len(store.contents) == 2
+
+
+def test_failed_write_is_retried():
+    """Test contents whose write failed are written again by a later offload."""
+    offloader = ContentOffloader(
+        _FailingStore(), threshold_bytes=1, flush_interval_seconds=0.01
+    )
+    ref = offloader.offload(_LARGE_CONTENT)
+    offloader.flush()
+    assert offloader.store.read(ref.digest) is None
+
+    offloader.offload(_LARGE_CONTENT)
+    offloader.close()
+    assert offloader.store.read(ref.digest) == _LARGE_CONTENT.encode()
+
+
+class TestMessageAttributes:
+    @pytest.fixture(autouse=True)
+    def reset_offloader(self):
+        yield
+        set_content_offloader(content_store._UNSET)
+
+    def test_large_prompt_is_referenced(self, offloader):
+        """Test prompts above the threshold are recorded by reference."""
+        set_content_offloader(offloader)
+        attributes = generate_message_attributes(
+            [
+                Message(role="system", content=_LARGE_CONTENT),
+                Message(role="user", content="Hi"),
+            ],
+            capture_content=True,
+        )
+
+        assert attributes["gen_ai.prompt.0.content_ref"].startswith("sha256:")
+        assert "gen_ai.prompt.0.content" not in attributes
+        assert attributes["gen_ai.prompt.1.content"] == "Hi"
+        assert "gen_ai.prompt.1.content_ref" not in attributes
+
+    def test_configured_by_environment(self, monkeypatch, tmp_path):
+        """Test a single offloader is created once a content store path is set."""
+        monkeypatch.delenv(
+            OTEL_INSTRUMENTATION_GENAI_CONTENT_OFFLOAD_PATH, raising=False
+        )
+        assert get_content_offloader() is None
+
+        monkeypatch.setenv(
+            OTEL_INSTRUMENTATION_GENAI_CONTENT_OFFLOAD_PATH, str(tmp_path / "store.db")
+        )
+        monkeypatch.setenv(OTEL_INSTRUMENTATION_GENAI_CONTENT_OFFLOAD_THRESHOLD, "64")
+        offloader = get_content_offloader()
+
+        assert isinstance(offloader.store, SqliteContentStore)
+        assert offloader.threshold_bytes == 64
+        assert get_content_offloader() is offloader
+        offloader.close()
@@ -0,0 +1,169 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import mock
+
+import pytest
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+
+import llm_tracekit.core._duplicate_calls as duplicate_calls
+from llm_tracekit.core import (
+    GEN_AI_CLIENT_REQUESTS,
+    OTEL_INSTRUMENTATION_GENAI_DUPLICATE_CALL_DETECTION,
+    DuplicateCallDetector,
+    DuplicateCallSpanProcessor,
+    Message,
+    configure_duplicate_call_detector,
+    generate_message_attributes,
+    prompt_digest,
+)
+
+_REQUEST = {
+    "gen_ai.request.model": "gpt-4o",
+    "gen_ai.request.temperature": 0.0,
+    "gen_ai.prompt.0.role": "user",
+    "gen_ai.prompt.digest": "abc",
+}
+
+
+class TestDuplicateCallDetector:
+    def test_duplicate(self):
+        """Test an identical request is reported as a duplicate of the first one."""
+        detector = DuplicateCallDetector()
+
+        assert detector.observe(_REQUEST, "first") is None
+        assert detector.observe(dict(reversed(_REQUEST.items())), "second") == "first"
+
+    def test_different_requests(self):
+        """Test requests that differ in a request attribute are not duplicates."""
+        detector = DuplicateCallDetector()
+        detector.observe(_REQUEST, "first")
+
+        assert (
+            detector.observe({**_REQUEST, "gen_ai.request.temperature": 1.0}, "second")
+            is None
+        )
+        assert (
+            detector.observe({**_REQUEST, "gen_ai.prompt.digest": "def"}, "third")
+            is None
+        )
+
+    def test_ignored_attributes(self):
+        """Test attributes that differ between identical requests are ignored."""
+        detector = DuplicateCallDetector()
+        detector.observe({**_REQUEST, "gen_ai.prompt.prefix_hash": "1"}, "first")
+
+        assert (
+            detector.observe(
+                {**_REQUEST, "gen_ai.prompt.prefix_hash": "2", "server.port": 1},
+                "second",
+            )
+            == "first"
+        )
+
+    def test_window(self):
+        """Test requests older than the window are forgotten."""
+        detector = DuplicateCallDetector(window_seconds=10)
+        with mock.patch.object(duplicate_calls, "default_timer", return_value=0.0):
+            detector.observe(_REQUEST, "first")
+        with mock.patch.object(duplicate_calls, "default_timer", return_value=11.0):
+            assert detector.observe(_REQUEST, "second") is None
+
+    def test_max_entries(self):
+        """Test the oldest requests are forgotten once the set is full."""
+        detector = DuplicateCallDetector(max_entries=1)
+        detector.observe(_REQUEST, "first")
+        detector.observe({**_REQUEST, "gen_ai.prompt.digest": "def"}, "second")
+
+        assert detector.observe(_REQUEST, "third") is None
+
+
+class TestDuplicateCallDetection:
+    @pytest.fixture
+    def detector(self, monkeypatch):
+        monkeypatch.setenv(OTEL_INSTRUMENTATION_GENAI_DUPLICATE_CALL_DETECTION, "true")
+        detector = configure_duplicate_call_detector()
+        yield detector
+        configure_duplicate_call_detector()
+
+    def test_prompt_digest_attribute(self, detector):
+        """Test prompts are identified by their digest when content is not captured."""
+        messages = [Message(role="user", content="hello")]
+        attributes = generate_message_attributes(messages, capture_content=False)
+
+        assert attributes["gen_ai.prompt.digest"] == prompt_digest(messages)
+        assert prompt_digest(messages) != prompt_digest(
+            [Message(role="user", content="hi")]
+        )
+
+    def test_span_processor(self, detector):
+        """Test spans of duplicate requests link to the span of the first request."""
+        exporter = InMemorySpanExporter()
+        tracer_provider = TracerProvider()
+        tracer_provider.add_span_processor(DuplicateCallSpanProcessor())
+        tracer_provider.add_span_processor(SimpleSpanProcessor(exporter))
+        tracer = tracer_provider.get_tracer(__name__)
+
+        for _ in range(2):
+            with tracer.start_as_current_span("chat gpt-4o", attributes=_REQUEST):
+                pass
+        with tracer.start_as_current_span("other", attributes={"a": 1}):
+            pass
+
+        first, second, other = exporter.get_finished_spans()
+        assert "gen_ai.request.duplicate_of" not in first.attributes
+        assert second.attributes["gen_ai.request.duplicate_of"] == format(
+            first.context.span_id, "016x"
+        )
+        assert "gen_ai.request.duplicate_of" not in other.attributes
+
+    def test_requests_metric(self, detector):
+        """Test requests are counted per model, by whether they are duplicates."""
+        reader = InMemoryMetricReader()
+        tracer_provider = TracerProvider()
+        tracer_provider.add_span_processor(
+            DuplicateCallSpanProcessor(
+                meter_provider=MeterProvider(metric_readers=[reader])
+            )
+        )
+        tracer = tracer_provider.get_tracer(__name__)
+
+        for attributes in [
+            _REQUEST,
+            _REQUEST,
+            {**_REQUEST, "gen_ai.request.model": "gpt-4o-mini"},
+        ]:
+            with tracer.start_as_current_span("chat", attributes=attributes):
+                pass
+
+        (resource_metrics,) = reader.get_metrics_data().resource_metrics
+        (metric,) = resource_metrics.scope_metrics[0].metrics
+        assert metric.name == GEN_AI_CLIENT_REQUESTS
+        assert {
+            (
+                point.attributes["gen_ai.request.model"],
+                point.attributes["gen_ai.request.duplicate"],
+            ): point.value
+            for point in metric.data.data_points
+        } == {
+            ("gpt-4o", False): 1,
+            ("gpt-4o", True): 1,
+            ("gpt-4o-mini", False): 1,
+        }
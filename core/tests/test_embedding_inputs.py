@@ -0,0 +1,93 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from llm_tracekit.core import (
+    OTEL_INSTRUMENTATION_GENAI_EMBEDDING_INPUT_SAMPLE_SIZE,
+    generate_embedding_input_attributes,
+)
+
+
+class TestGenerateEmbeddingInputAttributes:
+    def test_single_text(self):
+        """Test a single text item is summarized and recorded as a prompt."""
+        attributes = generate_embedding_input_attributes(
+            ["hello"], capture_content=True
+        )
+
+        assert attributes["gen_ai.embeddings.input.count"] == 1
+        assert attributes["gen_ai.embeddings.input.characters"] == 5
+        assert "gen_ai.embeddings.input.tokens" not in attributes
+        assert len(attributes["gen_ai.embeddings.input.hashes"]) == 1
+        assert attributes["gen_ai.prompt.0.role"] == "user"
+        assert attributes["gen_ai.prompt.0.content"] == "hello"
+
+    def test_large_batch_is_sampled(self):
+        """Test only the sampled items of a batch become prompts."""
+        items = [f"item {index}" for index in range(2048)]
+
+        attributes = generate_embedding_input_attributes(
+            items, capture_content=True, sample_size=2
+        )
+
+        assert attributes["gen_ai.embeddings.input.count"] == 2048
+        assert attributes["gen_ai.embeddings.input.characters"] == sum(
+            len(item) for item in items
+        )
+        assert len(attributes["gen_ai.embeddings.input.hashes"]) == 2048
+        assert attributes["gen_ai.prompt.1.content"] == "item 1"
+        assert "gen_ai.prompt.2.role" not in attributes
+
+    def test_token_arrays(self):
+        """Test token id items are counted as tokens."""
+        attributes = generate_embedding_input_attributes(
+            [[1, 2, 3], [4, 5]], capture_content=True
+        )
+
+        assert attributes["gen_ai.embeddings.input.count"] == 2
+        assert attributes["gen_ai.embeddings.input.tokens"] == 5
+        assert "gen_ai.embeddings.input.characters" not in attributes
+        assert "gen_ai.prompt.0.content" not in attributes
+
+    def test_identical_items_have_identical_hashes(self):
+        """Test the item hashes expose duplicated items."""
+        attributes = generate_embedding_input_attributes(
+            ["a", "b", "a"], capture_content=True
+        )
+
+        hashes = attributes["gen_ai.embeddings.input.hashes"]
+        assert hashes[0] == hashes[2]
+        assert hashes[0] != hashes[1]
+
+    def test_no_content(self):
+        """Test counts are recorded without content or hashes when capture is off."""
+        attributes = generate_embedding_input_attributes(
+            ["hello", "world"], capture_content=False
+        )
+
+        assert attributes["gen_ai.embeddings.input.count"] == 2
+        assert attributes["gen_ai.embeddings.input.characters"] == 10
+        assert "gen_ai.embeddings.input.hashes" not in attributes
+        assert "gen_ai.prompt.0.content" not in attributes
+        assert attributes["gen_ai.prompt.1.role"] == "user"
+
+    def test_sample_size_from_environment(self, monkeypatch: pytest.MonkeyPatch):
+        """Test the sample size is read from the environment."""
+        monkeypatch.setenv(OTEL_INSTRUMENTATION_GENAI_EMBEDDING_INPUT_SAMPLE_SIZE, "0")
+
+        attributes = generate_embedding_input_attributes(["a"], capture_content=True)
+
+        assert attributes["gen_ai.embeddings.input.count"] == 1
+        assert "gen_ai.prompt.0.role" not in attributes
@@ -0,0 +1,129 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import base64
+import math
+import struct
+
+import pytest
+
+from llm_tracekit.core import (
+    EMBEDDING_VECTOR_CAPTURE_FLOAT16,
+    EMBEDDING_VECTOR_CAPTURE_INT8,
+    EMBEDDING_VECTOR_CAPTURE_PREFIX,
+    EMBEDDING_VECTOR_CAPTURE_SUMMARY,
+    OTEL_INSTRUMENTATION_GENAI_EMBEDDING_VECTOR_CAPTURE,
+    OTEL_INSTRUMENTATION_GENAI_EMBEDDING_VECTOR_PREFIX_LENGTH,
+    generate_embedding_vector_attributes,
+    set_embedding_vector_capture_mode,
+)
+from llm_tracekit.core import _embedding_vectors
+
+_VECTOR = [0.5, -0.25, 0.125, 1.0, -1.0]
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(_embedding_vectors, "_numpy", lambda: None)
+    return request.param
+
+
+@pytest.fixture(autouse=True)
+def _reset_capture_mode(monkeypatch):
+    # Set before deleting so the values set by the tests are undone as well
+    for name in (
+        OTEL_INSTRUMENTATION_GENAI_EMBEDDING_VECTOR_CAPTURE,
+        OTEL_INSTRUMENTATION_GENAI_EMBEDDING_VECTOR_PREFIX_LENGTH,
+    ):
+        monkeypatch.setenv(name, "")
+        monkeypatch.delenv(name)
+
+
+class TestGenerateEmbeddingVectorAttributes:
+    def test_full_by_default(self):
+        """Test the vector is recorded as is when no capture mode is configured."""
+        assert generate_embedding_vector_attributes(2, (0.5, 1.0)) == {
+            "gen_ai.embeddings.2.vector": [0.5, 1.0]
+        }
+
+    def test_summary(self, backend):
+        """Test the summary mode records the dimensions and statistics of the vector."""
+        attributes = generate_embedding_vector_attributes(
+            0, _VECTOR, EMBEDDING_VECTOR_CAPTURE_SUMMARY
+        )
+
+        assert "gen_ai.embeddings.0.vector" not in attributes
+        assert attributes["gen_ai.embeddings.0.vector.dimensions"] == 5
+        assert attributes["gen_ai.embeddings.0.vector.norm"] == pytest.approx(
+            math.sqrt(sum(value * value for value in _VECTOR))
+        )
+        assert attributes["gen_ai.embeddings.0.vector.min"] == -1.0
+        assert attributes["gen_ai.embeddings.0.vector.max"] == 1.0
+        assert attributes["gen_ai.embeddings.0.vector.mean"] == pytest.approx(0.075)
+
+    def test_int8(self, backend):
+        """Test the int8 mode encodes components that restore the vector within the scale."""
+        attributes = generate_embedding_vector_attributes(
+            0, _VECTOR, EMBEDDING_VECTOR_CAPTURE_INT8
+        )
+
+        assert attributes["gen_ai.embeddings.0.vector.encoding"] == "int8"
+        scale = attributes["gen_ai.embeddings.0.vector.scale"]
+        quantized = base64.b64decode(attributes["gen_ai.embeddings.0.vector.encoded"])
+        restored = [value * scale for value in struct.unpack("5b", quantized)]
+        assert restored == pytest.approx(_VECTOR, abs=scale)
+
+    def test_float16(self, backend):
+        """Test the float16 mode encodes little-endian half precision components."""
+        attributes = generate_embedding_vector_attributes(
+            0, [*_VECTOR, 1e6], EMBEDDING_VECTOR_CAPTURE_FLOAT16
+        )
+
+        assert attributes["gen_ai.embeddings.0.vector.encoding"] == "float16"
+        encoded = base64.b64decode(attributes["gen_ai.embeddings.0.vector.encoded"])
+        assert list(struct.unpack("<6e", encoded)) == [*_VECTOR, 65504.0]
+
+    def test_prefix(self):
+        """Test the prefix mode keeps the configured number of components."""
+        set_embedding_vector_capture_mode(
+            EMBEDDING_VECTOR_CAPTURE_PREFIX, prefix_length=2
+        )
+
+        assert generate_embedding_vector_attributes(1, _VECTOR) == {
+            "gen_ai.embeddings.1.vector.dimensions": 5,
+            "gen_ai.embeddings.1.vector": [0.5, -0.25],
+        }
+
+    def test_base64_vector(self, backend):
+        """Test vectors returned with `encoding_format="base64"` are decoded."""
+        encoded = base64.b64encode(struct.pack("<5f", *_VECTOR)).decode("ascii")
+
+        attributes = generate_embedding_vector_attributes(
+            0, encoded, EMBEDDING_VECTOR_CAPTURE_SUMMARY
+        )
+
+        assert attributes["gen_ai.embeddings.0.vector.dimensions"] == 5
+        assert attributes["gen_ai.embeddings.0.vector.max"] == 1.0
+
+    def test_empty_vector(self, backend):
+        """Test an empty vector only records its dimensions."""
+        assert generate_embedding_vector_attributes(
+            0, [], EMBEDDING_VECTOR_CAPTURE_INT8
+        ) == {"gen_ai.embeddings.0.vector.dimensions": 0}
+
+    def test_unknown_mode_is_rejected(self):
+        """Test configuring an unknown capture mode raises."""
+        with pytest.raises(ValueError):
+            set_embedding_vector_capture_mode("compressed")
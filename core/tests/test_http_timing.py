@@ -0,0 +1,205 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+
+import llm_tracekit.core._extended_gen_ai_attributes as ExtendedGenAIAttributes
+from llm_tracekit.core import (
+    GEN_AI_CLIENT_HTTP_PHASE_DURATION,
+    HTTP_PHASE_BODY,
+    HTTP_PHASE_CONNECT,
+    HTTP_PHASE_QUEUE,
+    HTTP_PHASE_TIME_TO_HEADERS,
+    OTEL_INSTRUMENTATION_GENAI_HTTP_TIMING,
+    Instruments,
+    provider_build_request,
+)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _APIClient:
+    """Builds requests the way the provider SDKs do, on an httpx client."""
+
+    def __init__(self, client):
+        self._client = client
+
+    def _build_request(self, path):
+        return self._client.build_request("POST", path, content=b"{}")
+
+
+@pytest.fixture(name="base_url")
+def fixture_base_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(name="span_exporter")
+def fixture_span_exporter():
+    return InMemorySpanExporter()
+
+
+@pytest.fixture(name="tracer")
+def fixture_tracer(span_exporter):
+    tracer_provider = TracerProvider()
+    tracer_provider.add_span_processor(SimpleSpanProcessor(span_exporter))
+    return tracer_provider.get_tracer(__name__)
+
+
+@pytest.fixture(name="metric_reader")
+def fixture_metric_reader():
+    return InMemoryMetricReader()
+
+
+@pytest.fixture(name="build_request")
+def fixture_build_request(metric_reader, monkeypatch):
+    monkeypatch.setenv(OTEL_INSTRUMENTATION_GENAI_HTTP_TIMING, "true")
+    instruments = Instruments(
+        MeterProvider(metric_readers=[metric_reader]).get_meter(__name__)
+    )
+    return provider_build_request(instruments, "openai", ("/chat/completions",))
+
+
+def _phase_points(metric_reader):
+    (resource_metrics,) = metric_reader.get_metrics_data().resource_metrics
+    (metric,) = [
+        metric
+        for metric in resource_metrics.scope_metrics[0].metrics
+        if metric.name == GEN_AI_CLIENT_HTTP_PHASE_DURATION
+    ]
+    return {
+        (
+            point.attributes[ExtendedGenAIAttributes.GEN_AI_HTTP_PHASE],
+            point.attributes[ExtendedGenAIAttributes.GEN_AI_HTTP_CONNECTION_REUSED],
+        ): point
+        for point in metric.data.data_points
+    }
+
+
+def test_sync_requests(base_url, tracer, span_exporter, metric_reader, build_request):
+    """Test new and reused connections are timed phase by phase."""
+    with httpx.Client(base_url=base_url) as client:
+        api_client = _APIClient(client)
+        for _ in range(2):
+            with tracer.start_as_current_span("chat"):
+                request = build_request(
+                    api_client._build_request, api_client, ("/chat/completions",), {}
+                )
+                client.send(request).read()
+
+    first, second = span_exporter.get_finished_spans()
+    assert (
+        first.attributes[ExtendedGenAIAttributes.GEN_AI_HTTP_CONNECTION_REUSED] is False
+    )
+    assert first.attributes[ExtendedGenAIAttributes.GEN_AI_HTTP_CONNECT_DURATION] >= 0
+    assert (
+        second.attributes[ExtendedGenAIAttributes.GEN_AI_HTTP_CONNECTION_REUSED] is True
+    )
+    assert ExtendedGenAIAttributes.GEN_AI_HTTP_CONNECT_DURATION not in second.attributes
+    for span in (first, second):
+        for attribute in (
+            ExtendedGenAIAttributes.GEN_AI_HTTP_QUEUE_DURATION,
+            ExtendedGenAIAttributes.GEN_AI_HTTP_TIME_TO_HEADERS,
+            ExtendedGenAIAttributes.GEN_AI_HTTP_BODY_DURATION,
+        ):
+            assert span.attributes[attribute] >= 0
+
+    points = _phase_points(metric_reader)
+    assert set(points) == {
+        (HTTP_PHASE_QUEUE, False),
+        (HTTP_PHASE_CONNECT, False),
+        (HTTP_PHASE_TIME_TO_HEADERS, False),
+        (HTTP_PHASE_BODY, False),
+        (HTTP_PHASE_QUEUE, True),
+        (HTTP_PHASE_TIME_TO_HEADERS, True),
+        (HTTP_PHASE_BODY, True),
+    }
+    assert points[(HTTP_PHASE_QUEUE, True)].attributes["gen_ai.system"] == "openai"
+    assert points[(HTTP_PHASE_QUEUE, True)].attributes["server.address"] == (
+        "127.0.0.1"
+    )
+
+
+def test_async_request(base_url, tracer, span_exporter, build_request):
+    """Test requests of async clients are timed with an async trace callback."""
+
+    async def send():
+        async with httpx.AsyncClient(base_url=base_url) as client:
+            api_client = _APIClient(client)
+            with tracer.start_as_current_span("chat"):
+                request = build_request(
+                    api_client._build_request, api_client, ("/chat/completions",), {}
+                )
+                await (await client.send(request)).aread()
+
+    asyncio.run(send())
+
+    (span,) = span_exporter.get_finished_spans()
+    assert (
+        span.attributes[ExtendedGenAIAttributes.GEN_AI_HTTP_CONNECTION_REUSED] is False
+    )
+    assert span.attributes[ExtendedGenAIAttributes.GEN_AI_HTTP_TIME_TO_HEADERS] >= 0
+
+
+@pytest.mark.parametrize(
+    "path, in_span, enabled",
+    [
+        ("/models", True, True),
+        ("/chat/completions", False, True),
+        ("/chat/completions", True, False),
+    ],
+)
+def test_untimed_requests(tracer, build_request, monkeypatch, path, in_span, enabled):
+    """Test only requests to the instrumented endpoints of a recording span are timed."""
+    if not enabled:
+        monkeypatch.delenv(OTEL_INSTRUMENTATION_GENAI_HTTP_TIMING)
+    api_client = _APIClient(httpx.Client(base_url="http://127.0.0.1"))
+
+    if in_span:
+        with tracer.start_as_current_span("chat"):
+            request = build_request(api_client._build_request, api_client, (path,), {})
+    else:
+        request = build_request(api_client._build_request, api_client, (path,), {})
+
+    assert "trace" not in request.extensions
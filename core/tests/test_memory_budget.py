@@ -0,0 +1,156 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+
+import llm_tracekit.core._memory_budget as memory_budget
+from llm_tracekit.core import (
+    CAPTURE_MODE_METADATA_ONLY,
+    CAPTURE_MODE_TRUNCATED,
+    GEN_AI_CLIENT_STREAM_BUFFERED_BYTES,
+    GEN_AI_CLIENT_STREAM_CAPTURE_DEGRADATIONS,
+    Instruments,
+    StreamMemoryBudget,
+    configure_stream_memory_budget,
+)
+
+
+@pytest.fixture(autouse=True)
+def restore_budget(monkeypatch):
+    monkeypatch.setattr(
+        memory_budget, "_stream_memory_budget", memory_budget._stream_memory_budget
+    )
+
+
+class TestStreamMemoryBudget:
+    def test_unlimited_budget_accepts_everything(self):
+        """Test nothing is accounted without a limit."""
+        budget = StreamMemoryBudget()
+        reservation = budget.open_buffer()
+
+        assert reservation.charge(10**9)
+        assert budget.buffered_bytes == 0
+        assert reservation.attributes() == {}
+
+    def test_truncates_when_limit_is_crossed(self):
+        """Test a stream stops buffering once the shared limit is crossed."""
+        budget = StreamMemoryBudget(limit_bytes=100)
+        first = budget.open_buffer()
+        second = budget.open_buffer()
+
+        assert first.charge(60)
+        assert not second.charge(50)
+        assert not second.charge(1)
+        assert second.capture_mode == CAPTURE_MODE_TRUNCATED
+        assert second.content_allowed
+        assert second.attributes() == {"gen_ai.stream.capture_mode": "truncated"}
+        assert budget.buffered_bytes == 60
+        assert budget.degradations[CAPTURE_MODE_TRUNCATED] == 1
+
+        first.release()
+        assert budget.buffered_bytes == 0
+        assert budget.open_buffer().charge(100)
+
+    def test_metadata_only_mode(self):
+        """Test content is withheld entirely in metadata-only mode."""
+        budget = StreamMemoryBudget(
+            limit_bytes=10, degrade_to=CAPTURE_MODE_METADATA_ONLY
+        )
+        reservation = budget.open_buffer()
+
+        assert reservation.charge(5)
+        assert not reservation.charge(6)
+        assert not reservation.content_allowed
+        assert budget.degradations[CAPTURE_MODE_METADATA_ONLY] == 1
+
+    def test_abandoned_reservation_is_released(self):
+        """Test a reservation that is garbage collected returns its bytes."""
+        budget = StreamMemoryBudget(limit_bytes=100)
+        reservation = budget.open_buffer()
+        reservation.charge(40)
+
+        del reservation
+
+        assert budget.buffered_bytes == 0
+
+    def test_invalid_degrade_mode(self):
+        """Test unsupported degrade modes are rejected."""
+        with pytest.raises(ValueError):
+            StreamMemoryBudget(limit_bytes=10, degrade_to="full")
+
+
+class TestStreamMemoryBudgetMetrics:
+    def _collect(self, reader):
+        metrics_data = reader.get_metrics_data()
+        if metrics_data is None:
+            return {}
+        return {
+            metric.name: metric
+            for resource_metrics in metrics_data.resource_metrics
+            for scope_metrics in resource_metrics.scope_metrics
+            for metric in scope_metrics.metrics
+        }
+
+    def test_no_metrics_without_limit(self):
+        """Test the budget metrics are not reported while no limit is configured."""
+        configure_stream_memory_budget(None)
+        reader = InMemoryMetricReader()
+        Instruments(MeterProvider(metric_readers=[reader]).get_meter(__name__))
+
+        assert self._collect(reader) == {}
+
+    def test_reports_buffered_bytes_and_degradations(self):
+        """Test buffered bytes and degradations are observed from the global budget."""
+        budget = configure_stream_memory_budget(100)
+        reader = InMemoryMetricReader()
+        Instruments(MeterProvider(metric_readers=[reader]).get_meter(__name__))
+
+        reservation = budget.open_buffer()
+        reservation.charge(70)
+        budget.open_buffer().charge(40)
+
+        metrics = self._collect(reader)
+        buffered = metrics[GEN_AI_CLIENT_STREAM_BUFFERED_BYTES].data.data_points
+        assert [point.value for point in buffered] == [70]
+        degradations = {
+            point.attributes["gen_ai.stream.capture_mode"]: point.value
+            for point in metrics[
+                GEN_AI_CLIENT_STREAM_CAPTURE_DEGRADATIONS
+            ].data.data_points
+        }
+        assert degradations == {"truncated": 1, "metadata_only": 0}
+
+    def test_reported_once_per_meter_provider(self):
+        """Test the budget metrics are reported by one meter of every meter provider."""
+        budget = configure_stream_memory_budget(100)
+        readers = [InMemoryMetricReader(), InMemoryMetricReader()]
+        first_provider = MeterProvider(metric_readers=[readers[0]])
+        Instruments(first_provider.get_meter("first"))
+        Instruments(first_provider.get_meter("second"))
+        Instruments(MeterProvider(metric_readers=[readers[1]]).get_meter("third"))
+        budget.open_buffer().charge(30)
+
+        scopes = [
+            [
+                scope_metrics.scope.name
+                for resource_metrics in reader.get_metrics_data().resource_metrics
+                for scope_metrics in resource_metrics.scope_metrics
+                for metric in scope_metrics.metrics
+                if metric.name == GEN_AI_CLIENT_STREAM_BUFFERED_BYTES
+            ]
+            for reader in readers
+        ]
+        assert scopes == [["first"], ["third"]]
@@ -0,0 +1,146 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import (
+    AggregationTemporality,
+    ExponentialHistogramDataPoint,
+    HistogramDataPoint,
+    InMemoryMetricReader,
+)
+
+import llm_tracekit.core.coralogix as coralogix
+from llm_tracekit.core import (
+    DELTA_TEMPORALITY,
+    GEN_AI_CLIENT_ACTIVE_REQUESTS,
+    GEN_AI_CLIENT_OPERATION_DURATION_BUCKETS,
+    Instruments,
+    create_meter_provider,
+    create_metric_views,
+    setup_export_to_coralogix,
+)
+
+_OPERATION_DURATION = "gen_ai.client.operation.duration"
+
+
+def _metrics(reader):
+    return {
+        metric.name: metric
+        for resource_metrics in reader.get_metrics_data().resource_metrics
+        for scope_metrics in resource_metrics.scope_metrics
+        for metric in scope_metrics.metrics
+    }
+
+
+def _instruments(reader, **kwargs):
+    meter_provider = create_meter_provider([reader], **kwargs)
+    return Instruments(meter_provider.get_meter(__name__))
+
+
+def test_explicit_bucket_views():
+    """Test the operation duration histogram is aggregated into its buckets, as deltas."""
+    reader = InMemoryMetricReader(preferred_temporality=DELTA_TEMPORALITY)
+    instruments = _instruments(reader)
+    instruments.operation_duration_histogram.record(0.3)
+    instruments.active_requests_counter.add(1)
+
+    metrics = _metrics(reader)
+    duration = metrics[_OPERATION_DURATION].data
+    (data_point,) = duration.data_points
+    assert isinstance(data_point, HistogramDataPoint)
+    assert list(data_point.explicit_bounds) == GEN_AI_CLIENT_OPERATION_DURATION_BUCKETS
+    assert duration.aggregation_temporality == AggregationTemporality.DELTA
+
+    active_requests = metrics[GEN_AI_CLIENT_ACTIVE_REQUESTS].data
+    assert active_requests.aggregation_temporality == AggregationTemporality.CUMULATIVE
+
+    instruments.operation_duration_histogram.record(0.3)
+    (data_point,) = _metrics(reader)[_OPERATION_DURATION].data.data_points
+    assert data_point.count == 1
+
+
+def test_exponential_histogram_views():
+    """Test the gen_ai histograms are aggregated into bounded exponential histograms."""
+    reader = InMemoryMetricReader()
+    instruments = _instruments(
+        reader, exponential_histograms=True, exponential_histogram_max_size=20
+    )
+    for duration in [0.01, 0.5, 3.0, 60.0]:
+        instruments.operation_duration_histogram.record(duration)
+    instruments.token_usage_histogram.record(1000)
+
+    metrics = _metrics(reader)
+    (data_point,) = metrics[_OPERATION_DURATION].data.data_points
+    assert isinstance(data_point, ExponentialHistogramDataPoint)
+    assert data_point.count == 4
+    assert len(data_point.positive.bucket_counts) <= 20
+    (data_point,) = metrics["gen_ai.client.token.usage"].data.data_points
+    assert isinstance(data_point, ExponentialHistogramDataPoint)
+
+
+def test_exponential_histogram_max_size():
+    """Test an exponential histogram needs room for at least two buckets."""
+    with pytest.raises(ValueError):
+        create_metric_views(
+            exponential_histograms=True, exponential_histogram_max_size=1
+        )
+
+
+def test_setup_sets_meter_provider(monkeypatch):
+    """Test the meter provider is set up with a periodic reader when metrics are exported."""
+    meter_providers = []
+    monkeypatch.setattr(coralogix, "set_meter_provider", meter_providers.append)
+    monkeypatch.setattr(coralogix.trace, "set_tracer_provider", lambda provider: None)
+
+    setup_export_to_coralogix(
+        service_name="test",
+        coralogix_endpoint="localhost:4317",
+        use_batch_processor=False,
+        capture_content=False,
+        metric_export_interval_millis=1000,
+        export_metrics=False,
+    )
+    assert meter_providers == []
+
+    setup_export_to_coralogix(
+        service_name="test",
+        coralogix_endpoint="localhost:4317",
+        use_batch_processor=False,
+        capture_content=False,
+        metric_export_interval_millis=1000,
+        export_metrics=True,
+    )
+    (meter_provider,) = meter_providers
+    (reader,) = meter_provider._sdk_config.metric_readers
+    assert reader._export_interval_millis == 1000
+    assert meter_provider._sdk_config.resource.attributes["service.name"] == "test"
+    meter_provider.shutdown(timeout_millis=100)
+
+
+def test_setup_keeps_meter_provider(monkeypatch):
+    """Test a meter provider that is already set up is not replaced."""
+    meter_providers = []
+    monkeypatch.setattr(coralogix, "set_meter_provider", meter_providers.append)
+    monkeypatch.setattr(coralogix, "get_meter_provider", MeterProvider)
+    monkeypatch.setattr(coralogix.trace, "set_tracer_provider", lambda provider: None)
+
+    setup_export_to_coralogix(
+        service_name="test",
+        coralogix_endpoint="localhost:4317",
+        use_batch_processor=False,
+        capture_content=False,
+        export_metrics=True,
+    )
+    assert meter_providers == []
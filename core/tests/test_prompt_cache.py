@@ -0,0 +1,120 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+from opentelemetry.semconv._incubating.metrics import gen_ai_metrics  # type: ignore[attr-defined]
+
+from llm_tracekit.core import (
+    GEN_AI_CLIENT_TOKEN_CACHE_HIT_RATIO,
+    Instruments,
+    cache_hit_ratio,
+    generate_cache_usage_attributes,
+    record_cache_usage_metrics,
+)
+
+_ATTRIBUTES = {"gen_ai.system": "test"}
+
+
+class TestGenerateCacheUsageAttributes:
+    def test_read_and_creation(self):
+        """Test cached token counts are recorded with the hit ratio."""
+        assert generate_cache_usage_attributes(
+            cache_read_input_tokens=75,
+            cache_creation_input_tokens=5,
+            total_input_tokens=100,
+        ) == {
+            "gen_ai.usage.cache_read.input_tokens": 75,
+            "gen_ai.usage.cache_creation.input_tokens": 5,
+            "gen_ai.usage.cache_hit_ratio": 0.75,
+        }
+
+    def test_no_cache_usage(self):
+        """Test nothing is recorded when the provider reports no cache usage."""
+        assert generate_cache_usage_attributes(total_input_tokens=100) == {}
+
+    def test_no_input_tokens(self):
+        """Test the hit ratio is omitted when the total input is unknown or empty."""
+        assert cache_hit_ratio(10, None) is None
+        assert cache_hit_ratio(0, 0) is None
+
+    def test_ratio_is_capped(self):
+        """Test inconsistent usage never reports a hit ratio above 1."""
+        assert cache_hit_ratio(120, 100) == 1.0
+
+
+class TestRecordCacheUsageMetrics:
+    @staticmethod
+    def _collect(reader: InMemoryMetricReader):
+        metrics_data = reader.get_metrics_data()
+        if metrics_data is None:
+            return {}
+        return {
+            metric.name: metric
+            for resource_metrics in metrics_data.resource_metrics
+            for scope_metrics in resource_metrics.scope_metrics
+            for metric in scope_metrics.metrics
+        }
+
+    @pytest.fixture
+    def reader(self):
+        return InMemoryMetricReader()
+
+    @pytest.fixture
+    def instruments(self, reader):
+        return Instruments(MeterProvider(metric_readers=[reader]).get_meter(__name__))
+
+    def test_records_cached_token_types(self, reader, instruments):
+        """Test cached tokens are recorded with their own token types."""
+        record_cache_usage_metrics(
+            instruments,
+            _ATTRIBUTES,
+            cache_read_input_tokens=30,
+            cache_creation_input_tokens=10,
+            total_input_tokens=120,
+        )
+
+        metrics = self._collect(reader)
+        token_usage = {
+            point.attributes["gen_ai.token.type"]: point.sum
+            for point in metrics[
+                gen_ai_metrics.GEN_AI_CLIENT_TOKEN_USAGE
+            ].data.data_points
+        }
+        assert token_usage == {"cached_read": 30, "cached_write": 10}
+        (ratio,) = metrics[GEN_AI_CLIENT_TOKEN_CACHE_HIT_RATIO].data.data_points
+        assert ratio.sum == 0.25
+        assert dict(ratio.attributes) == _ATTRIBUTES
+
+    def test_cache_miss(self, reader, instruments):
+        """Test a request without cache hits records a zero hit ratio."""
+        record_cache_usage_metrics(
+            instruments,
+            _ATTRIBUTES,
+            cache_read_input_tokens=0,
+            total_input_tokens=50,
+        )
+
+        metrics = self._collect(reader)
+        assert gen_ai_metrics.GEN_AI_CLIENT_TOKEN_USAGE not in metrics
+        (ratio,) = metrics[GEN_AI_CLIENT_TOKEN_CACHE_HIT_RATIO].data.data_points
+        assert ratio.count == 1
+        assert ratio.sum == 0
+
+    def test_unreported_cache_usage(self, reader, instruments):
+        """Test nothing is recorded when the provider does not report cache usage."""
+        record_cache_usage_metrics(instruments, _ATTRIBUTES, total_input_tokens=50)
+
+        assert self._collect(reader) == {}
@@ -0,0 +1,198 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import mock
+
+import pytest
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+
+import llm_tracekit.core._prompt_prefix as prompt_prefix
+from llm_tracekit.core import (
+    GEN_AI_CLIENT_PROMPT_CACHEABLE_PREFIX_SHARE,
+    OTEL_INSTRUMENTATION_GENAI_PROMPT_PREFIX_ANALYSIS,
+    CountMinSketch,
+    Instruments,
+    Message,
+    PromptPrefixAnalyzer,
+    configure_prompt_prefix_analyzer,
+    generate_message_attributes,
+)
+
+_SYSTEM = Message(role="system", content="You are a helpful assistant. " * 20)
+
+
+def _conversation(turns: int) -> list[Message]:
+    messages = [_SYSTEM]
+    for turn in range(turns):
+        messages.append(Message(role="user", content=f"question {turn} " * 10))
+        messages.append(Message(role="assistant", content=f"answer {turn} " * 10))
+    return messages
+
+
+class TestCountMinSketch:
+    def test_add_returns_previous_estimate(self):
+        """Test adding a key returns its count before the addition."""
+        sketch = CountMinSketch(width=64, depth=3)
+
+        assert sketch.add(12345) == 0
+        assert sketch.add(12345) == 1
+        assert sketch.estimate(12345) == 2
+        assert sketch.estimate(54321) == 0
+
+    def test_add_prefixes(self):
+        """Test only the leading keys counted before are reported."""
+        sketch = CountMinSketch(width=64, depth=3)
+        sketch.add_prefixes([1, 2])
+
+        assert sketch.add_prefixes([1, 3, 2]) == 1
+        assert sketch.estimate(2) == 2
+
+
+class TestPromptPrefixAnalyzer:
+    def test_fingerprint_is_block_aligned(self):
+        """Test a digest is produced for every complete block of the prompt."""
+        analyzer = PromptPrefixAnalyzer(block_size=64)
+        length, boundaries = analyzer.fingerprint(_conversation(2))
+
+        assert length > 0
+        assert len(boundaries) == length // 64
+
+    def test_fingerprint_matches_full_hash(self):
+        """Test incremental hashing produces the digests of hashing the prompt at once."""
+        messages = _conversation(3)
+        incremental = PromptPrefixAnalyzer(block_size=64)
+        for turns in range(1, 4):
+            incremental.fingerprint(_conversation(turns))
+
+        assert incremental.fingerprint(messages) == PromptPrefixAnalyzer(
+            block_size=64
+        ).fingerprint(messages)
+
+    def test_growing_conversation_reuses_transitions(self):
+        """Test messages hashed on an earlier turn are not hashed again."""
+        analyzer = PromptPrefixAnalyzer(block_size=64)
+        analyzer.fingerprint(_conversation(2))
+
+        with mock.patch.object(
+            prompt_prefix, "_advance", wraps=prompt_prefix._advance
+        ) as advance:
+            analyzer.fingerprint(_conversation(3))
+
+        assert advance.call_count == 2
+
+    def test_transitions_keyed_by_digest(self):
+        """Test the memoized transitions do not keep the content of the messages."""
+        analyzer = PromptPrefixAnalyzer(block_size=64)
+        content = "a long message " * 100
+        analyzer.fingerprint([Message(role="user", content=content)])
+
+        ((state, digest),) = analyzer._transitions
+        assert len(digest) == 16
+        assert len(state[2]) < 64
+
+    def test_shared_prefix(self):
+        """Test the prefix shared with an earlier prompt is counted as cacheable."""
+        analyzer = PromptPrefixAnalyzer(block_size=64)
+
+        first = analyzer.analyze("gpt-4o", _conversation(1))
+        second = analyzer.analyze("gpt-4o", _conversation(2))
+
+        _, first_boundaries = analyzer.fingerprint(_conversation(1))
+        _, second_boundaries = analyzer.fingerprint(_conversation(2))
+        shared_blocks = len(first_boundaries)
+        assert first_boundaries == second_boundaries[:shared_blocks]
+        assert first == {"gen_ai.prompt.prefix_hash": f"{first_boundaries[0]:016x}"}
+        assert second == {
+            "gen_ai.prompt.prefix_hash": f"{second_boundaries[shared_blocks - 1]:016x}"
+        }
+
+        first_length, _ = analyzer.fingerprint(_conversation(1))
+        second_length, _ = analyzer.fingerprint(_conversation(2))
+        assert analyzer.totals() == {
+            "gpt-4o": (shared_blocks * 64, first_length + second_length)
+        }
+
+    def test_models_are_counted_apart(self):
+        """Test prefixes sent to another model are not cacheable."""
+        analyzer = PromptPrefixAnalyzer(block_size=64)
+        analyzer.analyze("gpt-4o", _conversation(1))
+        analyzer.analyze("gpt-4o-mini", _conversation(1))
+
+        assert analyzer.totals()["gpt-4o-mini"][0] == 0
+
+    def test_models_are_bounded(self):
+        """Test the least recently used models are dropped."""
+        analyzer = PromptPrefixAnalyzer(block_size=64, max_models=2)
+        for model in ("a", "b", "c"):
+            analyzer.analyze(model, _conversation(1))
+
+        assert set(analyzer.totals()) == {"b", "c"}
+
+    def test_short_prompt(self):
+        """Test prompts shorter than a block have no prefix hash."""
+        analyzer = PromptPrefixAnalyzer()
+
+        assert analyzer.analyze("gpt-4o", [Message(role="user", content="hi")]) == {}
+
+
+class TestPromptPrefixAttributes:
+    @pytest.fixture
+    def analyzer(self, monkeypatch):
+        monkeypatch.setenv(OTEL_INSTRUMENTATION_GENAI_PROMPT_PREFIX_ANALYSIS, "true")
+        analyzer = configure_prompt_prefix_analyzer(block_size=64)
+        yield analyzer
+        configure_prompt_prefix_analyzer()
+
+    def test_message_attributes(self, analyzer):
+        """Test prompts with a model are fingerprinted when the analysis is enabled."""
+        attributes = generate_message_attributes(
+            _conversation(1), capture_content=False, model="gpt-4o"
+        )
+
+        assert "gen_ai.prompt.prefix_hash" in attributes
+        assert "gen_ai.prompt.prefix_hash" not in generate_message_attributes(
+            _conversation(1), capture_content=False
+        )
+
+    def test_disabled(self, monkeypatch):
+        """Test prompts are not fingerprinted unless the analysis is enabled."""
+        monkeypatch.delenv(
+            OTEL_INSTRUMENTATION_GENAI_PROMPT_PREFIX_ANALYSIS, raising=False
+        )
+
+        assert "gen_ai.prompt.prefix_hash" not in generate_message_attributes(
+            _conversation(1), capture_content=False, model="gpt-4o"
+        )
+
+    def test_cacheable_prefix_share_metric(self, analyzer):
+        """Test the share of cacheable prompt characters since the previous collection is observed per model."""
+        reader = InMemoryMetricReader()
+        Instruments(MeterProvider(metric_readers=[reader]).get_meter(__name__))
+
+        analyzer.analyze("gpt-4o", _conversation(1))
+        analyzer.analyze("gpt-4o", _conversation(1))
+        length, boundaries = analyzer.fingerprint(_conversation(1))
+
+        (resource_metrics,) = reader.get_metrics_data().resource_metrics
+        (metric,) = resource_metrics.scope_metrics[0].metrics
+        assert metric.name == GEN_AI_CLIENT_PROMPT_CACHEABLE_PREFIX_SHARE
+        (point,) = metric.data.data_points
+        assert dict(point.attributes) == {"gen_ai.request.model": "gpt-4o"}
+        assert point.value == pytest.approx(len(boundaries) * 64 / (2 * length))
+
+        analyzer.analyze("gpt-4o", _conversation(1))
+        (resource_metrics,) = reader.get_metrics_data().resource_metrics
+        (point,) = resource_metrics.scope_metrics[0].metrics[0].data.data_points
+        assert point.value == pytest.approx(len(boundaries) * 64 / length)
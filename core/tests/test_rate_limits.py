@@ -0,0 +1,123 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from types import SimpleNamespace
+from unittest import mock
+
+import httpx
+import pytest
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+from opentelemetry.sdk.trace import TracerProvider
+
+import llm_tracekit.core._cardinality as cardinality
+from llm_tracekit.core import (
+    OTEL_INSTRUMENTATION_GENAI_CAPTURE_RATE_LIMITS,
+    RATE_LIMIT_TYPE_INPUT_TOKENS,
+    RATE_LIMIT_TYPE_REQUESTS,
+    RATE_LIMIT_TYPE_TOKENS,
+    Instruments,
+    MetricAttributeLimiter,
+    RateLimit,
+    parse_rate_limit_headers,
+    parse_retry_after,
+    provider_retry_timeout,
+)
+
+
+def test_parse_openai_headers():
+    """Test the OpenAI rate limit headers are parsed by type, ignoring invalid values."""
+    headers = httpx.Headers(
+        {
+            "X-RateLimit-Limit-Requests": "500",
+            "X-RateLimit-Remaining-Requests": "499",
+            "X-RateLimit-Remaining-Tokens": "not a number",
+            "X-RateLimit-Reset-Requests": "120ms",
+        }
+    )
+
+    assert parse_rate_limit_headers(headers) == {
+        RATE_LIMIT_TYPE_REQUESTS: RateLimit(remaining=499, limit=500)
+    }
+
+
+def test_parse_anthropic_headers():
+    """Test the Anthropic rate limit headers are parsed by type."""
+    headers = httpx.Headers(
+        {
+            "anthropic-ratelimit-requests-remaining": "49",
+            "anthropic-ratelimit-tokens-remaining": "7000",
+            "anthropic-ratelimit-input-tokens-limit": "40000",
+        }
+    )
+
+    assert parse_rate_limit_headers(headers) == {
+        RATE_LIMIT_TYPE_REQUESTS: RateLimit(remaining=49),
+        RATE_LIMIT_TYPE_TOKENS: RateLimit(remaining=7000),
+        RATE_LIMIT_TYPE_INPUT_TOKENS: RateLimit(limit=40000),
+    }
+
+
+@pytest.mark.parametrize(
+    "headers, expected",
+    [
+        ({}, None),
+        ({"retry-after": "2"}, 2.0),
+        ({"retry-after-ms": "250", "retry-after": "1"}, 0.25),
+        ({"retry-after": "soon"}, None),
+    ],
+)
+def test_parse_retry_after(headers, expected):
+    """Test `retry-after-ms` takes precedence over the seconds of `retry-after`."""
+    assert parse_retry_after(httpx.Headers(headers)) == expected
+
+
+def test_parse_retry_after_date():
+    """Test a `retry-after` HTTP date is converted to the seconds until it."""
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    headers = httpx.Headers({"retry-after": format_datetime(retry_at, usegmt=True)})
+
+    assert 28 <= parse_retry_after(headers) <= 30
+
+
+def test_retries_reuse_call_attributes(monkeypatch):
+    """Test the metric attributes of a call are only limited once over its retries."""
+    monkeypatch.setenv(OTEL_INSTRUMENTATION_GENAI_CAPTURE_RATE_LIMITS, "true")
+    limiter = MetricAttributeLimiter()
+    monkeypatch.setattr(cardinality, "_metric_attribute_limiter", limiter)
+    instruments = Instruments(
+        MeterProvider(metric_readers=[InMemoryMetricReader()]).get_meter(__name__)
+    )
+    retry_timeout = provider_retry_timeout(
+        instruments, "openai", ("/chat/completions",)
+    )
+    client = SimpleNamespace(
+        base_url=httpx.URL("https://api.openai.com/v1/"), api_key="sk-test"
+    )
+    options = SimpleNamespace(url="/chat/completions", json_data={"model": "gpt-4o"})
+    tracer = TracerProvider().get_tracer(__name__)
+
+    with mock.patch.object(
+        limiter, "limit_attributes", wraps=limiter.limit_attributes
+    ) as limit_attributes:
+        for _ in range(2):
+            with tracer.start_as_current_span("chat gpt-4o"):
+                for remaining_retries in (2, 1):
+                    retry_timeout(
+                        lambda *args: 0.5, client, (remaining_retries, options), {}
+                    )
+
+    assert limit_attributes.call_count == 2
@@ -0,0 +1,87 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+
+from llm_tracekit.core import (
+    Instruments,
+    ReasoningTimer,
+    generate_reasoning_usage_attributes,
+    record_reasoning_usage_metrics,
+)
+
+
+class TestReasoningTimer:
+    def test_estimate_after_reasoning(self):
+        """Test the estimate is the time until the first content delta."""
+        timer = ReasoningTimer(start_time=0.0)
+        timer.mark_reasoning()
+        timer.mark_content()
+        first_content_time = timer.first_content_time
+        timer.mark_content()
+
+        assert timer.first_content_time == first_content_time
+        assert timer.estimate() == first_content_time
+
+    def test_estimate_from_reasoning_tokens(self):
+        """Test reported reasoning tokens are enough to report an estimate."""
+        timer = ReasoningTimer(start_time=0.0)
+        timer.mark_content()
+
+        assert timer.estimate() is None
+        assert timer.estimate(reasoning_output_tokens=10) == timer.first_content_time
+
+    def test_no_content(self):
+        """Test no estimate is reported before any content delta."""
+        timer = ReasoningTimer()
+        timer.mark_reasoning()
+
+        assert timer.estimate() is None
+
+    def test_unobserved_stream(self):
+        """Test streams processed after the fact report no estimate."""
+        timer = ReasoningTimer(start_time=0.0, observed=False)
+        timer.mark_reasoning()
+        timer.mark_content()
+
+        assert timer.estimate() is None
+
+
+class TestReasoningUsage:
+    def test_attributes(self):
+        """Test the reasoning tokens and duration are recorded when known."""
+        assert generate_reasoning_usage_attributes(
+            reasoning_output_tokens=12, reasoning_duration=1.5
+        ) == {
+            "gen_ai.usage.reasoning.output_tokens": 12,
+            "gen_ai.response.reasoning_duration": 1.5,
+        }
+        assert generate_reasoning_usage_attributes() == {}
+
+    def test_metrics(self):
+        """Test reasoning tokens are recorded with their own token type."""
+        reader = InMemoryMetricReader()
+        instruments = Instruments(
+            MeterProvider(metric_readers=[reader]).get_meter(__name__)
+        )
+
+        record_reasoning_usage_metrics(instruments, {}, reasoning_output_tokens=0)
+        record_reasoning_usage_metrics(instruments, {}, reasoning_output_tokens=12)
+
+        (resource_metrics,) = reader.get_metrics_data().resource_metrics
+        (metric,) = resource_metrics.scope_metrics[0].metrics
+        (point,) = metric.data.data_points
+        assert dict(point.attributes) == {"gen_ai.token.type": "reasoning"}
+        assert point.sum == 12
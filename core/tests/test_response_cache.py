@@ -0,0 +1,185 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from unittest import mock
+
+import pytest
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+
+import llm_tracekit.core._response_cache as response_cache
+from llm_tracekit.core import (
+    GEN_AI_CLIENT_CACHE_HIT_DURATION,
+    OTEL_INSTRUMENTATION_GENAI_RESPONSE_CACHE,
+    AsyncReplayStream,
+    Instruments,
+    ReplayStream,
+    ResponseCache,
+    get_response_cache,
+    is_deterministic_request,
+    record_response_cache_hit,
+    request_cache_key,
+    set_response_cache,
+)
+
+
+class TestResponseCache:
+    def test_get_and_set(self):
+        """Test stored values are returned and hits and misses are counted."""
+        cache = ResponseCache()
+        assert cache.get("key") is None
+
+        cache.set("key", {"id": "1"})
+
+        assert cache.get("key") == {"id": "1"}
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted once the cache is full."""
+        cache = ResponseCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_ttl(self):
+        """Test entries expire after the TTL."""
+        cache = ResponseCache(ttl_seconds=10)
+        with mock.patch.object(response_cache.time, "time", return_value=100.0):
+            cache.set("key", 1)
+        with mock.patch.object(response_cache.time, "time", return_value=105.0):
+            assert cache.get("key") == 1
+        with mock.patch.object(response_cache.time, "time", return_value=111.0):
+            assert cache.get("key") is None
+        assert len(cache) == 0
+
+    def test_disk_tier(self, tmp_path):
+        """Test entries stored on disk are served by a new cache."""
+        path = str(tmp_path / "responses.db")
+        cache = ResponseCache(path=path)
+        cache.set("key", {"choices": [{"text": "hello"}]})
+        cache.close()
+
+        reopened = ResponseCache(max_entries=0, path=path)
+
+        assert reopened.get("key") == {"choices": [{"text": "hello"}]}
+        reopened.clear()
+        assert reopened.get("key") is None
+        reopened.close()
+
+    def test_disk_tier_expired_rows_are_deleted(self, tmp_path, monkeypatch):
+        """Test expired rows are deleted from the database as entries are written."""
+        monkeypatch.setattr(response_cache, "_PURGE_INTERVAL_SECONDS", 0.0)
+        path = str(tmp_path / "responses.db")
+        cache = ResponseCache(ttl_seconds=10, path=path)
+        with mock.patch.object(response_cache.time, "time", return_value=100.0):
+            cache.set("old", 1)
+        with mock.patch.object(response_cache.time, "time", return_value=200.0):
+            cache.set("new", 2)
+
+        keys = cache._connection.execute("SELECT key FROM responses").fetchall()
+        assert keys == [("new",)]
+        cache.close()
+
+
+class TestRequestCacheKey:
+    def test_canonical(self):
+        """Test the key does not depend on the order of the request parameters."""
+        first = request_cache_key("openai", {"model": "gpt-4o", "temperature": 0})
+        second = request_cache_key("openai", {"temperature": 0, "model": "gpt-4o"})
+
+        assert first == second
+        assert first != request_cache_key("anthropic", {"model": "gpt-4o"})
+
+    def test_unserializable(self):
+        """Test requests that cannot be serialized are not cached."""
+        assert request_cache_key("openai", {"file": object()}) is None
+
+    def test_deterministic_request(self):
+        """Test temperature 0 or an explicit seed make a request deterministic."""
+        assert is_deterministic_request(temperature=0)
+        assert is_deterministic_request(temperature=1, seed=7)
+        assert not is_deterministic_request(temperature=0.5)
+        assert not is_deterministic_request()
+
+
+class TestReplayStream:
+    def test_replay(self):
+        """Test a replayed stream yields the cached chunks."""
+        with ReplayStream([1, 2, 3]) as stream:
+            assert list(stream) == [1, 2, 3]
+
+    def test_async_replay(self):
+        """Test an async replayed stream yields the cached chunks."""
+
+        async def consume():
+            async with AsyncReplayStream([1, 2]) as stream:
+                return [chunk async for chunk in stream]
+
+        assert asyncio.run(consume()) == [1, 2]
+
+
+class TestProcessResponseCache:
+    @pytest.fixture(autouse=True)
+    def reset_cache(self):
+        yield
+        set_response_cache(response_cache._UNSET)
+
+    def test_disabled_by_default(self, monkeypatch):
+        """Test responses are not cached unless the cache is enabled."""
+        monkeypatch.delenv(OTEL_INSTRUMENTATION_GENAI_RESPONSE_CACHE, raising=False)
+
+        assert get_response_cache() is None
+
+    def test_enabled(self, monkeypatch):
+        """Test a single cache is created once the cache is enabled."""
+        monkeypatch.setenv(OTEL_INSTRUMENTATION_GENAI_RESPONSE_CACHE, "true")
+
+        assert isinstance(get_response_cache(), ResponseCache)
+        assert get_response_cache() is get_response_cache()
+
+    def test_cache_hit_metric(self):
+        """Test cache hits are recorded to their own histogram."""
+        reader = InMemoryMetricReader()
+        instruments = Instruments(
+            MeterProvider(metric_readers=[reader]).get_meter(__name__)
+        )
+
+        record_response_cache_hit(
+            instruments,
+            0.001,
+            {
+                "gen_ai.operation.name": "chat",
+                "gen_ai.system": "openai",
+                "gen_ai.request.model": "gpt-4o",
+                "gen_ai.prompt.0.role": "user",
+            },
+        )
+
+        (resource_metrics,) = reader.get_metrics_data().resource_metrics
+        metrics = {
+            metric.name: metric for metric in resource_metrics.scope_metrics[0].metrics
+        }
+        (point,) = metrics[GEN_AI_CLIENT_CACHE_HIT_DURATION].data.data_points
+        assert point.count == 1
+        assert dict(point.attributes) == {
+            "gen_ai.operation.name": "chat",
+            "gen_ai.system": "openai",
+            "gen_ai.request.model": "gpt-4o",
+        }
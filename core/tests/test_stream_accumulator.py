@@ -0,0 +1,100 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from llm_tracekit.core import (
+    CAPTURE_MODE_TRUNCATED,
+    StreamAccumulator,
+    StreamMemoryBudget,
+)
+
+
+class TestStreamAccumulator:
+    def test_joins_string_chunks(self):
+        """Test string chunks are joined in order."""
+        accumulator = StreamAccumulator()
+        for chunk in ["Hel", "lo", "", " world"]:
+            accumulator.append(chunk)
+
+        assert accumulator.getvalue() == "Hello world"
+        assert accumulator.getvalue() == "Hello world"
+        assert len(accumulator) == 11
+
+    def test_decodes_characters_split_across_chunks(self):
+        """Test UTF-8 bytes split mid-character are decoded once complete."""
+        encoded = "héllo 👋".encode()
+        accumulator = StreamAccumulator()
+        for index in range(len(encoded)):
+            accumulator.append(encoded[index : index + 1])
+
+        assert accumulator.getvalue() == "héllo 👋"
+
+    def test_incomplete_character_is_not_consumed(self):
+        """Test reading mid-character does not lose the pending bytes."""
+        encoded = "👋".encode()
+        accumulator = StreamAccumulator()
+        accumulator.append(encoded[:2])
+
+        assert accumulator.getvalue() == "�"
+
+        accumulator.append(encoded[2:])
+        assert accumulator.getvalue() == "👋"
+
+    def test_max_bytes_truncates(self):
+        """Test content beyond max_bytes is cut and marked as truncated."""
+        accumulator = StreamAccumulator(max_bytes=8)
+
+        assert accumulator.append("hello")
+        assert not accumulator.append(" world")
+        assert not accumulator.append("!")
+        assert accumulator.getvalue() == "hello wo"
+        assert accumulator.truncated
+
+    def test_charges_reservation(self):
+        """Test chunks refused by the memory budget are dropped."""
+        budget = StreamMemoryBudget(limit_bytes=6, degrade_to=CAPTURE_MODE_TRUNCATED)
+        reservation = budget.open_buffer()
+        accumulator = StreamAccumulator(reservation)
+
+        assert accumulator.append("abcd")
+        assert not accumulator.append("efgh")
+        assert not accumulator.append("i")
+        assert accumulator.getvalue() == "abcd"
+        assert budget.buffered_bytes == 4
+
+        reservation.release()
+        assert budget.buffered_bytes == 0
+
+    def test_content_limit_of_budget(self):
+        """Test the budget's content limit caps every accumulator of a stream."""
+        budget = StreamMemoryBudget(content_limit_bytes=4)
+        reservation = budget.open_buffer()
+        first, second = StreamAccumulator(reservation), StreamAccumulator(reservation)
+
+        assert reservation.attributes() == {}
+        assert not first.append("abcdef")
+        assert second.append("gh")
+        assert (first.getvalue(), second.getvalue()) == ("abcd", "gh")
+        assert reservation.attributes() == {
+            "gen_ai.stream.capture_mode": CAPTURE_MODE_TRUNCATED
+        }
+
+    def test_clear(self):
+        """Test a cleared accumulator can be reused for the next block."""
+        accumulator = StreamAccumulator()
+        accumulator.append("first")
+        accumulator.clear()
+        accumulator.append("second")
+
+        assert accumulator.getvalue() == "second"
+        assert not StreamAccumulator()
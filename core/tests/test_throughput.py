@@ -0,0 +1,144 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from timeit import default_timer
+from unittest import mock
+
+import pytest
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+
+import llm_tracekit.core._cardinality as cardinality
+from llm_tracekit.core import (
+    GEN_AI_CLIENT_ACTIVE_REQUESTS,
+    GEN_AI_CLIENT_ACTIVE_STREAMS,
+    GEN_AI_CLIENT_OUTPUT_THROUGHPUT,
+    Instruments,
+    MetricAttributeLimiter,
+    ReasoningTimer,
+    record_output_throughput,
+    record_stream_output_throughput,
+    track_request,
+    track_stream,
+)
+
+_SPAN_ATTRIBUTES = {
+    "gen_ai.operation.name": "chat",
+    "gen_ai.system": "openai",
+    "gen_ai.request.model": "gpt-4o-mini",
+    "gen_ai.request.temperature": 0.5,
+}
+
+
+@pytest.fixture(name="reader")
+def fixture_reader():
+    return InMemoryMetricReader()
+
+
+@pytest.fixture(name="instruments")
+def fixture_instruments(reader):
+    return Instruments(MeterProvider(metric_readers=[reader]).get_meter(__name__))
+
+
+def _data_points(reader, name):
+    metrics_data = reader.get_metrics_data()
+    if metrics_data is None:
+        return []
+    return [
+        data_point
+        for resource_metrics in metrics_data.resource_metrics
+        for scope_metrics in resource_metrics.scope_metrics
+        for metric in scope_metrics.metrics
+        if metric.name == name
+        for data_point in metric.data.data_points
+    ]
+
+
+def test_in_flight_request(reader, instruments):
+    """Test a request is counted until it ends, once, by its system and model."""
+    in_flight = track_request(instruments, _SPAN_ATTRIBUTES)
+    (data_point,) = _data_points(reader, GEN_AI_CLIENT_ACTIVE_REQUESTS)
+    assert data_point.value == 1
+    assert dict(data_point.attributes) == {
+        "gen_ai.operation.name": "chat",
+        "gen_ai.system": "openai",
+        "gen_ai.request.model": "gpt-4o-mini",
+    }
+
+    in_flight.end()
+    in_flight.end()
+    (data_point,) = _data_points(reader, GEN_AI_CLIENT_ACTIVE_REQUESTS)
+    assert data_point.value == 0
+
+
+def test_stream_reuses_request_attributes(reader, instruments, monkeypatch):
+    """Test a stream is counted with the attributes its request was limited with."""
+    limiter = MetricAttributeLimiter()
+    monkeypatch.setattr(cardinality, "_metric_attribute_limiter", limiter)
+    with mock.patch.object(
+        limiter, "limit_attributes", wraps=limiter.limit_attributes
+    ) as limit_attributes:
+        in_flight = track_request(instruments, _SPAN_ATTRIBUTES)
+        in_flight.end()
+        active_stream = track_stream(instruments, _SPAN_ATTRIBUTES, in_flight)
+
+    assert limit_attributes.call_count == 1
+    (data_point,) = _data_points(reader, GEN_AI_CLIENT_ACTIVE_STREAMS)
+    assert data_point.value == 1
+    assert dict(data_point.attributes) == in_flight.attributes
+    active_stream.end()
+
+
+def test_output_throughput(reader, instruments):
+    """Test the throughput is the output tokens per second, and skips empty responses."""
+    record_output_throughput(instruments, {}, output_tokens=100, generation_time=2.0)
+    record_output_throughput(instruments, {}, output_tokens=0, generation_time=2.0)
+    record_output_throughput(instruments, {}, output_tokens=100, generation_time=0.0)
+
+    (data_point,) = _data_points(reader, GEN_AI_CLIENT_OUTPUT_THROUGHPUT)
+    assert data_point.count == 1
+    assert data_point.sum == 50
+
+
+def test_stream_output_throughput(reader, instruments):
+    """Test stream throughput leaves out the time to first token and reasoning tokens."""
+    timer = ReasoningTimer(start_time=default_timer() - 10)
+    timer.mark_reasoning()
+    timer.mark_content()
+    timer.first_content_time -= 1
+
+    record_stream_output_throughput(
+        instruments,
+        {},
+        output_tokens=60,
+        reasoning_timer=timer,
+        reasoning_output_tokens=40,
+    )
+
+    (data_point,) = _data_points(reader, GEN_AI_CLIENT_OUTPUT_THROUGHPUT)
+    assert data_point.sum == pytest.approx(20, rel=0.05)
+
+
+def test_unobserved_stream_output_throughput(reader, instruments):
+    """Test streams processed after they ended, or without content, are not recorded."""
+    unobserved_timer = ReasoningTimer(start_time=default_timer(), observed=False)
+    unobserved_timer.mark_content()
+    record_stream_output_throughput(
+        instruments, {}, output_tokens=60, reasoning_timer=unobserved_timer
+    )
+    record_stream_output_throughput(
+        instruments, {}, output_tokens=60, reasoning_timer=ReasoningTimer()
+    )
+
+    assert _data_points(reader, GEN_AI_CLIENT_OUTPUT_THROUGHPUT) == []
@@ -0,0 +1,158 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import mock
+
+import pytest
+
+import llm_tracekit.core._token_estimation as token_estimation
+from llm_tracekit.core import (
+    ApproximateTokenEstimator,
+    Choice,
+    Message,
+    TiktokenTokenEstimator,
+    TokenEstimator,
+    ToolCall,
+    get_token_estimator,
+    set_token_estimator,
+)
+
+
+class _CountingEstimator(TokenEstimator):
+    def __init__(self, cache_size: int = 16):
+        super().__init__(cache_size)
+        self.calls = 0
+
+    def _count_text(self, text, model):
+        self.calls += 1
+        return len(text.split())
+
+
+class TestApproximateTokenEstimator:
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("", 0),
+            ("This is a test", 4),
+            ("Hello, world! How are you doing today?", 10),
+            ("1234567", 3),
+            ("日本語", 3),
+        ],
+    )
+    def test_count_tokens(self, text, expected):
+        """Test words, digits and multi-byte text are counted like BPE merges them."""
+        assert ApproximateTokenEstimator().count_tokens(text) == expected
+
+    def test_calibration(self):
+        """Test counts are scaled by the factor of the longest matching model prefix."""
+        estimator = ApproximateTokenEstimator(
+            calibration={"claude": 2.0, "claude-3-haiku": 0.5}
+        )
+        text = "one two three four"
+
+        assert estimator.count_tokens(text, "claude-sonnet-4") == 8
+        assert estimator.count_tokens(text, "claude-3-haiku-20240307") == 2
+        assert estimator.count_tokens(text, "gpt-4o") == 4
+
+
+class TestTokenEstimator:
+    def test_memoized(self):
+        """Test repeated messages of a conversation are only counted once."""
+        estimator = _CountingEstimator()
+        messages = [
+            Message(role="system", content="You are helpful"),
+            Message(role="user", content="hello there"),
+        ]
+
+        first = estimator.count_message_tokens(messages, "model")
+        second = estimator.count_message_tokens(
+            [*messages, Message(role="user", content="again")], "model"
+        )
+
+        assert first == 3 + 2 * 3 + 3 + 2
+        assert second == first + 3 + 1
+        assert estimator.calls == 3
+
+    def test_cache_size(self):
+        """Test the least recently used counts are dropped once the cache is full."""
+        estimator = _CountingEstimator(cache_size=1)
+        for content in ["a", "b", "a"]:
+            estimator.count_message_tokens([Message(role="user", content=content)])
+
+        assert estimator.calls == 3
+
+    def test_only_messages_are_memoized(self):
+        """Test other text, such as stream deltas, is counted without the memoization."""
+        estimator = _CountingEstimator()
+        for _ in range(2):
+            estimator.count_tokens("a delta", "model")
+
+        assert estimator.calls == 2
+        assert not estimator._counts
+
+    def test_count_choice_tokens(self):
+        """Test the content and tool calls of every choice are counted."""
+        estimator = _CountingEstimator()
+        choices = [
+            Choice(content="one two"),
+            Choice(
+                tool_calls=[
+                    ToolCall(function_name="get_weather", function_arguments="{} {}")
+                ]
+            ),
+        ]
+
+        assert estimator.count_choice_tokens(choices) == 2 + 1 + 2
+
+
+class TestTiktokenTokenEstimator:
+    def test_fallback_without_tiktoken(self):
+        """Test tokens are approximated when tiktoken is not installed."""
+        with mock.patch.object(token_estimation, "_tiktoken", return_value=None):
+            estimator = TiktokenTokenEstimator()
+            assert estimator.count_tokens("This is a test", "gpt-4o") == 4
+
+    def test_fallback_when_encoding_fails(self):
+        """Test tokens are approximated when an encoding cannot be loaded."""
+        tiktoken = mock.Mock()
+        tiktoken.encoding_for_model.side_effect = ConnectionError
+        with mock.patch.object(token_estimation, "_tiktoken", return_value=tiktoken):
+            estimator = TiktokenTokenEstimator()
+            assert estimator.count_tokens("This is a test", "gpt-4o") == 4
+            assert estimator.count_tokens("A test", "gpt-4o") == 2
+
+        tiktoken.encoding_for_model.assert_called_once_with("gpt-4o")
+
+    def test_encoding(self):
+        """Test tokens are counted with the encoding of the model."""
+        encoding = mock.Mock()
+        encoding.encode.return_value = [1, 2, 3]
+        tiktoken = mock.Mock()
+        tiktoken.encoding_for_model.return_value = encoding
+        with mock.patch.object(token_estimation, "_tiktoken", return_value=tiktoken):
+            assert TiktokenTokenEstimator().count_tokens("abc", "gpt-4o") == 3
+
+
+class TestProcessTokenEstimator:
+    def test_set_token_estimator(self):
+        """Test the process-wide estimator can be replaced and restored."""
+        estimator = ApproximateTokenEstimator()
+        set_token_estimator(estimator)
+        try:
+            assert get_token_estimator() is estimator
+        finally:
+            set_token_estimator(None)
+
+        assert isinstance(get_token_estimator(), TokenEstimator)
+        assert get_token_estimator() is not estimator
@@ -0,0 +1,179 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gc
+import json
+import weakref
+
+from llm_tracekit.core import ToolAttributesCache
+
+
+class _Tool:
+    def __init__(self, name: str):
+        self.name = name
+
+
+class _CountingBuilder:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, tools):
+        self.calls += 1
+        return {
+            f"gen_ai.request.tools.{index}.function.name": (
+                tool["name"] if isinstance(tool, dict) else tool.name
+            )
+            for index, tool in enumerate(tools)
+        }
+
+
+_WEATHER_TOOL = {"name": "get_weather", "parameters": {"type": "object"}}
+_TIME_TOOL = {"name": "get_time", "parameters": {"type": "object"}}
+
+
+class TestToolAttributesCache:
+    def test_block_is_computed_once_per_tool_list(self):
+        """Test the attribute block is reused for the same tool list."""
+        build = _CountingBuilder()
+        cache = ToolAttributesCache(build)
+        tools = [_WEATHER_TOOL, _TIME_TOOL]
+
+        first = cache.get(tools)
+        second = cache.get(tools)
+
+        assert first is second
+        assert first == {
+            "gen_ai.request.tools.0.function.name": "get_weather",
+            "gen_ai.request.tools.1.function.name": "get_time",
+        }
+        assert build.calls == 1
+
+    def test_new_list_with_same_tools_is_a_hit(self):
+        """Test a rebuilt list holding the same tool objects reuses the block."""
+        build = _CountingBuilder()
+        cache = ToolAttributesCache(build)
+
+        cache.get([_WEATHER_TOOL, _TIME_TOOL])
+        cache.get((_WEATHER_TOOL, _TIME_TOOL))
+
+        assert build.calls == 1
+
+    def test_changed_tool_list_is_a_miss(self):
+        """Test adding, removing or reordering tools recomputes the block."""
+        build = _CountingBuilder()
+        cache = ToolAttributesCache(build)
+        tools = [_WEATHER_TOOL]
+        cache.get(tools)
+
+        tools.append(_TIME_TOOL)
+        grown = cache.get(tools)
+        reordered = cache.get([_TIME_TOOL, _WEATHER_TOOL])
+
+        assert grown["gen_ai.request.tools.1.function.name"] == "get_time"
+        assert reordered["gen_ai.request.tools.0.function.name"] == "get_time"
+        assert build.calls == 3
+
+    def test_equal_tools_are_a_hit(self):
+        """Test tools rebuilt for every request are matched by their structure."""
+        build = _CountingBuilder()
+        cache = ToolAttributesCache(build)
+
+        cache.get([_WEATHER_TOOL])
+        cache.get([json.loads(json.dumps(_WEATHER_TOOL))])
+        cache.get([_Tool("get_weather")])
+        cache.get([_Tool("get_weather")])
+
+        assert build.calls == 2
+
+    def test_mutated_tool_is_a_miss(self):
+        """Test a tool mutated in place recomputes the block."""
+        build = _CountingBuilder()
+        cache = ToolAttributesCache(build)
+        dict_tool = {"name": "get_weather"}
+        object_tool = _Tool("get_time")
+        cache.get([dict_tool, object_tool])
+
+        dict_tool["name"] = "get_forecast"
+        assert cache.get([dict_tool, object_tool]) == {
+            "gen_ai.request.tools.0.function.name": "get_forecast",
+            "gen_ai.request.tools.1.function.name": "get_time",
+        }
+        object_tool.name = "get_date"
+        assert cache.get([dict_tool, object_tool]) == {
+            "gen_ai.request.tools.0.function.name": "get_forecast",
+            "gen_ai.request.tools.1.function.name": "get_date",
+        }
+        assert build.calls == 3
+
+    def test_empty_tool_list(self):
+        """Test an empty tool list yields no attributes without building."""
+        build = _CountingBuilder()
+        cache = ToolAttributesCache(build)
+
+        assert cache.get([]) == {}
+        assert build.calls == 0
+        assert len(cache) == 0
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test the cache keeps at most `maxsize` tool lists."""
+        build = _CountingBuilder()
+        cache = ToolAttributesCache(build, maxsize=2)
+
+        cache.get([_WEATHER_TOOL])
+        cache.get([_TIME_TOOL])
+        cache.get([_WEATHER_TOOL])
+        cache.get([_WEATHER_TOOL, _TIME_TOOL])
+
+        assert len(cache) == 2
+        cache.get([_WEATHER_TOOL])
+        assert build.calls == 3
+        cache.get([_TIME_TOOL])
+        assert build.calls == 4
+
+    def test_tools_are_not_kept_alive(self):
+        """Test the cache does not hold references to the tools."""
+        cache = ToolAttributesCache(_CountingBuilder())
+        tool = _Tool("get_weather")
+        tool_reference = weakref.ref(tool)
+        cache.get([tool])
+        del tool
+        gc.collect()
+
+        assert tool_reference() is None
+        assert len(cache) == 1
+
+    def test_unserializable_tools_are_not_cached(self):
+        """Test tools that cannot be serialized are built on every call."""
+        build = _CountingBuilder()
+        cache = ToolAttributesCache(build)
+        tool = {"name": "get_weather"}
+        tool["self"] = tool
+
+        cache.get([tool])
+        cache.get([tool])
+
+        assert build.calls == 2
+        assert len(cache) == 0
+
+    def test_disabled_cache(self):
+        """Test a cache with `maxsize=0` builds the block on every call."""
+        build = _CountingBuilder()
+        cache = ToolAttributesCache(build, maxsize=0)
+        tools = [_WEATHER_TOOL]
+
+        cache.get(tools)
+        cache.get(tools)
+
+        assert build.calls == 2
+        assert len(cache) == 0
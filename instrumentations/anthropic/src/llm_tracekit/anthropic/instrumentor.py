@@ -16,17 +16,26 @@
 
 from typing import Collection
 
+import anthropic._base_client
 from anthropic.resources.messages.messages import AsyncMessages, Messages
 from opentelemetry.instrumentation.instrumentor import (  # type: ignore[attr-defined]
     BaseInstrumentor,
 )
 from opentelemetry.instrumentation.utils import unwrap
 from opentelemetry.metrics import get_meter, Meter
+from opentelemetry.semconv._incubating.attributes import (
+    gen_ai_attributes as GenAIAttributes,
+)
 from opentelemetry.semconv.schemas import Schemas
 from opentelemetry.trace import get_tracer
 from wrapt import wrap_function_wrapper
 
-from llm_tracekit.core import Instruments, is_content_enabled
+from llm_tracekit.core import (
+    Instruments,
+    is_content_enabled,
+    provider_build_request,
+    provider_retry_timeout,
+)
 from llm_tracekit.anthropic.package import _instruments
 from llm_tracekit.anthropic.patch import (
     async_messages_create,
@@ -35,6 +44,9 @@ from llm_tracekit.anthropic.patch import (
     messages_stream,
 )
 
+# the endpoint of the instrumented methods, whose HTTP requests are observed
+_OBSERVED_PATHS = ("/messages",)
+
 
 class AnthropicInstrumentor(BaseInstrumentor):
     def __init__(self) -> None:
@@ -82,9 +94,29 @@ class AnthropicInstrumentor(BaseInstrumentor):
             name="AsyncMessages.stream",
             wrapper=async_messages_stream(tracer, instruments, capture_content),
         )
+        wrap_function_wrapper(
+            module="anthropic._base_client",
+            name="BaseClient._build_request",
+            wrapper=provider_build_request(
+                instruments,
+                GenAIAttributes.GenAiSystemValues.ANTHROPIC.value,
+                _OBSERVED_PATHS,
+            ),
+        )
+        wrap_function_wrapper(
+            module="anthropic._base_client",
+            name="BaseClient._calculate_retry_timeout",
+            wrapper=provider_retry_timeout(
+                instruments,
+                GenAIAttributes.GenAiSystemValues.ANTHROPIC.value,
+                _OBSERVED_PATHS,
+            ),
+        )
 
     def _uninstrument(self, **kwargs) -> None:
         unwrap(Messages, "create")
         unwrap(Messages, "stream")
         unwrap(AsyncMessages, "create")
         unwrap(AsyncMessages, "stream")
+        unwrap(anthropic._base_client.BaseClient, "_build_request")
+        unwrap(anthropic._base_client.BaseClient, "_calculate_retry_timeout")
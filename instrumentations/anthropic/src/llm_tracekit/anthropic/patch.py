@@ -19,6 +19,7 @@ from types import SimpleNamespace
 from typing import Any
 
 from anthropic._streaming import AsyncStream, Stream
+from opentelemetry import trace
 from opentelemetry.semconv._incubating.attributes import (
     gen_ai_attributes as GenAIAttributes,
 )
@@ -29,18 +30,39 @@ from opentelemetry.trace import Span, SpanKind, Tracer
 from opentelemetry.util.types import AttributeValue
 
 from llm_tracekit.core import (
+    AsyncReplayStream,
     Choice,
+    ReplayStream,
     ToolCall,
     handle_span_exception,
+    deferred_message_events,
+    InFlight,
     Instruments,
+    generate_cache_usage_attributes,
     generate_choice_attributes,
+    generate_reasoning_usage_attributes,
     generate_response_attributes,
+    get_stream_memory_budget,
+    limit_metric_attributes,
+    record_cache_usage_metrics,
+    record_output_throughput,
+    record_response_cache_hit,
+    record_stream_output_throughput,
+    track_request,
+    track_stream,
+    ReasoningTimer,
+    StreamAccumulator,
 )
+from llm_tracekit.core import _extended_gen_ai_attributes as ExtendedGenAIAttributes
 from llm_tracekit.anthropic.utils import (
+    get_cache_usage,
     get_message_response_attributes,
     get_messages_request_attributes,
+    get_response_cache_key,
     is_streaming,
+    load_cached_message,
     stop_reason_to_finish_reason,
+    store_cached_message,
 )
 
 
@@ -52,9 +74,13 @@ def messages_create(
     """Wrap sync `Messages.create`."""
 
     def traced_method(wrapped, instance, args, kwargs):
-        span_attributes = dict(
-            get_messages_request_attributes(kwargs, instance, capture_content)
-        )
+        with deferred_message_events() as message_events:
+            span_attributes = dict(
+                get_messages_request_attributes(kwargs, instance, capture_content)
+            )
+        cache_key = get_response_cache_key(kwargs, instance)
+        if cache_key is not None:
+            span_attributes[ExtendedGenAIAttributes.GEN_AI_CACHE_HIT] = False
 
         span_name = (
             f"{span_attributes[GenAIAttributes.GEN_AI_OPERATION_NAME]} "
@@ -66,20 +92,40 @@ def messages_create(
             attributes=span_attributes,
             end_on_exit=False,
         ) as span:
+            message_events.emit()
             start = default_timer()
+            in_flight = track_request(instruments, span_attributes)
             result = None
             error_type = None
+            cached = load_cached_message(cache_key, is_streaming(kwargs))
             try:
-                result = wrapped(*args, **kwargs)
-                if is_streaming(kwargs):
-                    return AnthropicStreamWrapper(
-                        result,
-                        span,
-                        capture_content,
-                        span_attributes,
-                        instruments,
-                        start,
-                    )
+                if cached is not None:
+                    span.set_attribute(ExtendedGenAIAttributes.GEN_AI_CACHE_HIT, True)
+                    if is_streaming(kwargs):
+                        return AnthropicStreamWrapper(
+                            ReplayStream(cached),
+                            span,
+                            capture_content,
+                            span_attributes,
+                            instruments,
+                            start,
+                            cached=True,
+                        )
+                    result = cached
+                else:
+                    result = wrapped(*args, **kwargs)
+                    if is_streaming(kwargs):
+                        return AnthropicStreamWrapper(
+                            result,
+                            span,
+                            capture_content,
+                            span_attributes,
+                            instruments,
+                            start,
+                            cache_key=cache_key,
+                            request=in_flight,
+                        )
+                    store_cached_message(cache_key, result)
 
                 if span.is_recording():
                     span.set_attributes(
@@ -94,8 +140,14 @@ def messages_create(
                 handle_span_exception(span, error)
                 raise
             finally:
+                in_flight.end()
                 duration = max((default_timer() - start), 0)
-                if not is_streaming(kwargs):
+                if cached is not None:
+                    if not is_streaming(kwargs):
+                        record_response_cache_hit(
+                            instruments, duration, span_attributes
+                        )
+                elif not is_streaming(kwargs):
                     _record_metrics(
                         instruments,
                         duration,
@@ -115,9 +167,13 @@ def async_messages_create(
     """Wrap async `AsyncMessages.create`."""
 
     async def traced_method(wrapped, instance, args, kwargs):
-        span_attributes = dict(
-            get_messages_request_attributes(kwargs, instance, capture_content)
-        )
+        with deferred_message_events() as message_events:
+            span_attributes = dict(
+                get_messages_request_attributes(kwargs, instance, capture_content)
+            )
+        cache_key = get_response_cache_key(kwargs, instance)
+        if cache_key is not None:
+            span_attributes[ExtendedGenAIAttributes.GEN_AI_CACHE_HIT] = False
 
         span_name = (
             f"{span_attributes[GenAIAttributes.GEN_AI_OPERATION_NAME]} "
@@ -129,20 +185,40 @@ def async_messages_create(
             attributes=span_attributes,
             end_on_exit=False,
         ) as span:
+            message_events.emit()
             start = default_timer()
+            in_flight = track_request(instruments, span_attributes)
             result = None
             error_type = None
+            cached = load_cached_message(cache_key, is_streaming(kwargs))
             try:
-                result = await wrapped(*args, **kwargs)
-                if is_streaming(kwargs):
-                    return AnthropicAsyncStreamWrapper(
-                        result,
-                        span,
-                        capture_content,
-                        span_attributes,
-                        instruments,
-                        start,
-                    )
+                if cached is not None:
+                    span.set_attribute(ExtendedGenAIAttributes.GEN_AI_CACHE_HIT, True)
+                    if is_streaming(kwargs):
+                        return AnthropicAsyncStreamWrapper(
+                            AsyncReplayStream(cached),
+                            span,
+                            capture_content,
+                            span_attributes,
+                            instruments,
+                            start,
+                            cached=True,
+                        )
+                    result = cached
+                else:
+                    result = await wrapped(*args, **kwargs)
+                    if is_streaming(kwargs):
+                        return AnthropicAsyncStreamWrapper(
+                            result,
+                            span,
+                            capture_content,
+                            span_attributes,
+                            instruments,
+                            start,
+                            cache_key=cache_key,
+                            request=in_flight,
+                        )
+                    store_cached_message(cache_key, result)
 
                 if span.is_recording():
                     span.set_attributes(
@@ -157,8 +233,14 @@ def async_messages_create(
                 handle_span_exception(span, error)
                 raise
             finally:
+                in_flight.end()
                 duration = max((default_timer() - start), 0)
-                if not is_streaming(kwargs):
+                if cached is not None:
+                    if not is_streaming(kwargs):
+                        record_response_cache_hit(
+                            instruments, duration, span_attributes
+                        )
+                elif not is_streaming(kwargs):
                     _record_metrics(
                         instruments,
                         duration,
@@ -176,7 +258,14 @@ def _record_metrics(
     result: Any,
     span_attributes: dict[str, Any],
     error_type: str | None,
+    streamed: bool = False,
+    reasoning_timer: ReasoningTimer | None = None,
 ) -> None:
+    """Records the metrics of a request.
+
+    The output throughput of a `streamed` response is only recorded when the
+    `reasoning_timer` of the stream observed its first content delta.
+    """
     common_attributes: dict[str, AttributeValue] = {
         GenAIAttributes.GEN_AI_OPERATION_NAME: GenAIAttributes.GenAiOperationNameValues.CHAT.value,
         GenAIAttributes.GEN_AI_SYSTEM: GenAIAttributes.GenAiSystemValues.ANTHROPIC.value,
@@ -201,6 +290,7 @@ def _record_metrics(
             ServerAttributes.SERVER_PORT
         ]
 
+    common_attributes = limit_metric_attributes(instruments, common_attributes)
     instruments.operation_duration_histogram.record(
         duration,
         attributes=common_attributes,
@@ -228,18 +318,34 @@ def _record_metrics(
                 out_tok,
                 attributes=completion_attributes,
             )
+        record_cache_usage_metrics(
+            instruments, common_attributes, **get_cache_usage(usage)
+        )
+        if error_type is None and reasoning_timer is not None:
+            record_stream_output_throughput(
+                instruments, common_attributes, out_tok, reasoning_timer
+            )
+        elif error_type is None and not streamed:
+            record_output_throughput(instruments, common_attributes, out_tok, duration)
 
 
 class _AnthropicStreamAccumState:
-    def __init__(self) -> None:
+    def __init__(
+        self, capture_content: bool = True, start_time: float | None = None
+    ) -> None:
+        self.capture_content = capture_content
+        self.reasoning_timer = ReasoningTimer(start_time)
+        self.buffer_reservation = get_stream_memory_budget().open_buffer()
         self.message_id: str | None = None
         self.response_model: str | None = None
-        self.text_parts: list[str] = []
+        self.text = StreamAccumulator(self.buffer_reservation)
         self.stop_reason: Any = None
         self.input_tokens: int | None = None
         self.output_tokens: int | None = None
+        self.cache_read_input_tokens: int | None = None
+        self.cache_creation_input_tokens: int | None = None
         self._tool_meta: dict[int, tuple[str, str]] = {}
-        self._tool_json_parts: dict[int, list[str]] = {}
+        self._tool_json_parts: dict[int, StreamAccumulator] = {}
 
     def process_event(self, event: Any) -> None:
         et = getattr(event, "type", None)
@@ -250,50 +356,82 @@ class _AnthropicStreamAccumState:
                 mdl = getattr(msg, "model", None)
                 if mdl is not None:
                     self.response_model = str(mdl)
+                self._process_usage(getattr(msg, "usage", None))
         elif et == "content_block_start":
             idx = getattr(event, "index", 0)
             block = getattr(event, "content_block", None)
             if block is None:
                 return
             bt = getattr(block, "type", None)
-            if bt == "tool_use":
+            if bt in ("thinking", "redacted_thinking"):
+                self.reasoning_timer.mark_reasoning()
+            elif bt == "tool_use":
                 tid = getattr(block, "id", "") or ""
                 name = getattr(block, "name", "") or ""
                 self._tool_meta[idx] = (tid, name)
-                self._tool_json_parts.setdefault(idx, [])
+                self._tool_json_parts.setdefault(
+                    idx, StreamAccumulator(self.buffer_reservation)
+                )
         elif et == "content_block_delta":
             idx = getattr(event, "index", 0)
             delta = getattr(event, "delta", None)
             if delta is None:
                 return
             dt = getattr(delta, "type", None)
+            if dt == "thinking_delta":
+                self.reasoning_timer.mark_reasoning()
+            elif dt in ("text_delta", "input_json_delta"):
+                self.reasoning_timer.mark_content()
+            if not self.capture_content:
+                # without content capture only the metadata of the stream is kept
+                return
             if dt == "text_delta":
-                self.text_parts.append(str(getattr(delta, "text", "") or ""))
+                self.text.append(str(getattr(delta, "text", "") or ""))
             elif dt == "input_json_delta":
-                self._tool_json_parts.setdefault(idx, []).append(
-                    str(getattr(delta, "partial_json", "") or "")
-                )
+                partial_json = str(getattr(delta, "partial_json", "") or "")
+                self._tool_json_parts.setdefault(
+                    idx, StreamAccumulator(self.buffer_reservation)
+                ).append(partial_json)
         elif et == "message_delta":
             d = getattr(event, "delta", None)
             if d is not None:
                 sr = getattr(d, "stop_reason", None)
                 if sr is not None:
                     self.stop_reason = sr
-            usage = getattr(event, "usage", None)
-            if usage is not None:
-                it = getattr(usage, "input_tokens", None)
-                ot = getattr(usage, "output_tokens", None)
-                if it is not None:
-                    self.input_tokens = it
-                if ot is not None:
-                    self.output_tokens = ot
+            self._process_usage(getattr(event, "usage", None))
+
+    def _process_usage(self, usage: Any) -> None:
+        # `message_start` carries the input usage and `message_delta` the
+        # output usage, so only the reported counts are overwritten
+        if usage is None:
+            return
+        it = getattr(usage, "input_tokens", None)
+        ot = getattr(usage, "output_tokens", None)
+        cr = getattr(usage, "cache_read_input_tokens", None)
+        cc = getattr(usage, "cache_creation_input_tokens", None)
+        if it is not None:
+            self.input_tokens = it
+        if ot is not None:
+            self.output_tokens = ot
+        if cr is not None:
+            self.cache_read_input_tokens = cr
+        if cc is not None:
+            self.cache_creation_input_tokens = cc
+
+    def usage(self) -> SimpleNamespace:
+        return SimpleNamespace(
+            input_tokens=self.input_tokens,
+            output_tokens=self.output_tokens,
+            cache_read_input_tokens=self.cache_read_input_tokens,
+            cache_creation_input_tokens=self.cache_creation_input_tokens,
+        )
 
     def build_response_attributes(self, capture_content: bool) -> dict[str, Any]:
         tool_calls: list[ToolCall] = []
         for idx in sorted(self._tool_meta.keys()):
             tid, name = self._tool_meta[idx]
-            parts = self._tool_json_parts.get(idx, [])
-            arg_str = "".join(parts) if parts else None
+            parts = self._tool_json_parts.get(idx)
+            arg_str = parts.getvalue() if parts else None
             tool_calls.append(
                 ToolCall(
                     id=tid,
@@ -302,7 +440,7 @@ class _AnthropicStreamAccumState:
                     function_arguments=arg_str,
                 )
             )
-        content = "".join(self.text_parts) if self.text_parts else None
+        content = self.text.getvalue() if self.text else None
         choice = Choice(
             finish_reason=stop_reason_to_finish_reason(self.stop_reason),
             role="assistant",
@@ -317,7 +455,15 @@ class _AnthropicStreamAccumState:
                 usage_input_tokens=self.input_tokens,
                 usage_output_tokens=self.output_tokens,
             ),
-            **generate_choice_attributes([choice], capture_content),
+            **generate_cache_usage_attributes(**get_cache_usage(self.usage())),
+            # the API does not report thinking tokens apart from the output tokens
+            **generate_reasoning_usage_attributes(
+                reasoning_duration=self.reasoning_timer.estimate()
+            ),
+            **generate_choice_attributes(
+                [choice], capture_content and self.buffer_reservation.content_allowed
+            ),
+            **self.buffer_reservation.attributes(),
         }
 
 
@@ -330,6 +476,9 @@ class AnthropicStreamWrapper:
         span_attributes: dict[str, Any],
         instruments: Instruments,
         start_time: float,
+        cache_key: str | None = None,
+        cached: bool = False,
+        request: InFlight | None = None,
     ) -> None:
         self.stream = stream
         self.span = span
@@ -337,19 +486,35 @@ class AnthropicStreamWrapper:
         self._span_attributes = span_attributes
         self._instruments = instruments
         self._start_time = start_time
-        self._state = _AnthropicStreamAccumState()
+        self._state = _AnthropicStreamAccumState(capture_content, start_time)
         self._finished = False
+        # events of a response that will be cached are kept until the stream ends
+        self._cache_key = cache_key
+        self._cached_events: list[Any] = []
+        self._cached = cached
+        self._active_stream = (
+            None if cached else track_stream(instruments, span_attributes, request)
+        )
 
     def _finalize(self, error_type: str | None = None) -> None:
         if self._finished:
             return
         self._finished = True
         if self.span.is_recording():
-            self.span.set_attributes(
-                self._state.build_response_attributes(self.capture_content)
-            )
+            with trace.use_span(self.span, end_on_exit=False):
+                self.span.set_attributes(
+                    self._state.build_response_attributes(self.capture_content)
+                )
         self.span.end()
+        self._state.buffer_reservation.release()
+        if self._active_stream is not None:
+            self._active_stream.end()
         duration = max((default_timer() - self._start_time), 0)
+        if self._cached:
+            record_response_cache_hit(
+                self._instruments, duration, self._span_attributes
+            )
+            return
         result = None
         if (
             self._state.input_tokens is not None
@@ -357,10 +522,7 @@ class AnthropicStreamWrapper:
         ):
             result = SimpleNamespace(
                 model=self._state.response_model,
-                usage=SimpleNamespace(
-                    input_tokens=self._state.input_tokens,
-                    output_tokens=self._state.output_tokens,
-                ),
+                usage=self._state.usage(),
             )
         _record_metrics(
             self._instruments,
@@ -368,6 +530,8 @@ class AnthropicStreamWrapper:
             result,
             self._span_attributes,
             error_type,
+            streamed=True,
+            reasoning_timer=self._state.reasoning_timer,
         )
 
     def __enter__(self) -> AnthropicStreamWrapper:
@@ -392,8 +556,11 @@ class AnthropicStreamWrapper:
         try:
             event = next(self.stream)
             self._state.process_event(event)
+            if self._cache_key is not None:
+                self._cached_events.append(event)
             return event
         except StopIteration:
+            store_cached_message(self._cache_key, self._cached_events)
             self._finalize()
             raise
         except Exception as error:
@@ -411,6 +578,9 @@ class AnthropicAsyncStreamWrapper:
         span_attributes: dict[str, Any],
         instruments: Instruments,
         start_time: float,
+        cache_key: str | None = None,
+        cached: bool = False,
+        request: InFlight | None = None,
     ) -> None:
         self.stream = stream
         self.span = span
@@ -418,19 +588,35 @@ class AnthropicAsyncStreamWrapper:
         self._span_attributes = span_attributes
         self._instruments = instruments
         self._start_time = start_time
-        self._state = _AnthropicStreamAccumState()
+        self._state = _AnthropicStreamAccumState(capture_content, start_time)
         self._finished = False
+        # events of a response that will be cached are kept until the stream ends
+        self._cache_key = cache_key
+        self._cached_events: list[Any] = []
+        self._cached = cached
+        self._active_stream = (
+            None if cached else track_stream(instruments, span_attributes, request)
+        )
 
     def _finalize(self, error_type: str | None = None) -> None:
         if self._finished:
             return
         self._finished = True
         if self.span.is_recording():
-            self.span.set_attributes(
-                self._state.build_response_attributes(self.capture_content)
-            )
+            with trace.use_span(self.span, end_on_exit=False):
+                self.span.set_attributes(
+                    self._state.build_response_attributes(self.capture_content)
+                )
         self.span.end()
+        self._state.buffer_reservation.release()
+        if self._active_stream is not None:
+            self._active_stream.end()
         duration = max((default_timer() - self._start_time), 0)
+        if self._cached:
+            record_response_cache_hit(
+                self._instruments, duration, self._span_attributes
+            )
+            return
         result = None
         if (
             self._state.input_tokens is not None
@@ -438,10 +624,7 @@ class AnthropicAsyncStreamWrapper:
         ):
             result = SimpleNamespace(
                 model=self._state.response_model,
-                usage=SimpleNamespace(
-                    input_tokens=self._state.input_tokens,
-                    output_tokens=self._state.output_tokens,
-                ),
+                usage=self._state.usage(),
             )
         _record_metrics(
             self._instruments,
@@ -449,6 +632,8 @@ class AnthropicAsyncStreamWrapper:
             result,
             self._span_attributes,
             error_type,
+            streamed=True,
+            reasoning_timer=self._state.reasoning_timer,
         )
 
     async def __aenter__(self) -> AnthropicAsyncStreamWrapper:
@@ -476,8 +661,11 @@ class AnthropicAsyncStreamWrapper:
         try:
             event = await self.stream.__anext__()
             self._state.process_event(event)
+            if self._cache_key is not None:
+                self._cached_events.append(event)
             return event
         except StopAsyncIteration:
+            store_cached_message(self._cache_key, self._cached_events)
             self._finalize()
             raise
         except Exception as error:
@@ -494,9 +682,10 @@ def messages_stream(
     """Wrap sync `Messages.stream`."""
 
     def traced_method(wrapped, instance, args, kwargs):
-        span_attributes = dict(
-            get_messages_request_attributes(kwargs, instance, capture_content)
-        )
+        with deferred_message_events() as message_events:
+            span_attributes = dict(
+                get_messages_request_attributes(kwargs, instance, capture_content)
+            )
         span_name = (
             f"{span_attributes[GenAIAttributes.GEN_AI_OPERATION_NAME]} "
             f"{span_attributes[GenAIAttributes.GEN_AI_REQUEST_MODEL]}"
@@ -506,6 +695,8 @@ def messages_stream(
             kind=SpanKind.CLIENT,
             attributes=span_attributes,
         )
+        with trace.use_span(span, end_on_exit=False):
+            message_events.emit()
         start = default_timer()
         try:
             inner_manager = wrapped(*args, **kwargs)
@@ -536,9 +727,10 @@ def async_messages_stream(
     """Wrap `AsyncMessages.stream` (the method itself is not a coroutine)."""
 
     def traced_method(wrapped, instance, args, kwargs):
-        span_attributes = dict(
-            get_messages_request_attributes(kwargs, instance, capture_content)
-        )
+        with deferred_message_events() as message_events:
+            span_attributes = dict(
+                get_messages_request_attributes(kwargs, instance, capture_content)
+            )
         span_name = (
             f"{span_attributes[GenAIAttributes.GEN_AI_OPERATION_NAME]} "
             f"{span_attributes[GenAIAttributes.GEN_AI_REQUEST_MODEL]}"
@@ -548,6 +740,8 @@ def async_messages_stream(
             kind=SpanKind.CLIENT,
             attributes=span_attributes,
         )
+        with trace.use_span(span, end_on_exit=False):
+            message_events.emit()
         start = default_timer()
         try:
             inner_manager = wrapped(*args, **kwargs)
@@ -589,10 +783,15 @@ class _MessageStreamManagerWrapper:
         self._instruments = instruments
         self._start_time = start_time
         self._stream: Any = None
+        self._active_stream: InFlight | None = None
 
     def __enter__(self) -> Any:
+        in_flight = track_request(self._instruments, self._span_attributes)
         try:
             self._stream = self._inner.__enter__()
+            self._active_stream = track_stream(
+                self._instruments, self._span_attributes, in_flight
+            )
             return self._stream
         except Exception as error:
             handle_span_exception(self._span, error)
@@ -605,6 +804,8 @@ class _MessageStreamManagerWrapper:
                 type(error).__qualname__,
             )
             raise
+        finally:
+            in_flight.end()
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
         error_type = None
@@ -626,12 +827,15 @@ class _MessageStreamManagerWrapper:
         finally:
             self._inner.__exit__(exc_type, exc_val, exc_tb)
             self._span.end()
+            if self._active_stream is not None:
+                self._active_stream.end()
             _record_metrics(
                 self._instruments,
                 max(default_timer() - self._start_time, 0),
                 final_msg,
                 self._span_attributes,
                 error_type,
+                streamed=True,
             )
 
 
@@ -654,10 +858,15 @@ class _AsyncMessageStreamManagerWrapper:
         self._instruments = instruments
         self._start_time = start_time
         self._stream: Any = None
+        self._active_stream: InFlight | None = None
 
     async def __aenter__(self) -> Any:
+        in_flight = track_request(self._instruments, self._span_attributes)
         try:
             self._stream = await self._inner.__aenter__()
+            self._active_stream = track_stream(
+                self._instruments, self._span_attributes, in_flight
+            )
             return self._stream
         except Exception as error:
             handle_span_exception(self._span, error)
@@ -670,6 +879,8 @@ class _AsyncMessageStreamManagerWrapper:
                 type(error).__qualname__,
             )
             raise
+        finally:
+            in_flight.end()
 
     async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
         error_type = None
@@ -691,10 +902,13 @@ class _AsyncMessageStreamManagerWrapper:
         finally:
             await self._inner.__aexit__(exc_type, exc_val, exc_tb)
             self._span.end()
+            if self._active_stream is not None:
+                self._active_stream.end()
             _record_metrics(
                 self._instruments,
                 max(default_timer() - self._start_time, 0),
                 final_msg,
                 self._span_attributes,
                 error_type,
+                streamed=True,
             )
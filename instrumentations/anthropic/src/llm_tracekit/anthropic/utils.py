@@ -15,10 +15,15 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Mapping
+import logging
+from typing import Any, Mapping, Sequence
 from urllib.parse import urlparse
 
+from anthropic._constants import RAW_RESPONSE_HEADER
+from anthropic._models import construct_type
 from anthropic._utils import is_given
+from anthropic.types import Message as AnthropicMessage
+from anthropic.types import RawMessageStreamEvent
 from httpx import URL
 from opentelemetry.semconv._incubating.attributes import (
     gen_ai_attributes as GenAIAttributes,
@@ -26,20 +31,28 @@ from opentelemetry.semconv._incubating.attributes import (
 from opentelemetry.semconv._incubating.attributes import (
     server_attributes as ServerAttributes,
 )
+from pydantic import ValidationError
 
 from llm_tracekit.core import (
+    ClientAttributesCache,
     Choice,
     Message,
+    ToolAttributesCache,
     ToolCall,
     attribute_generator,
-    generate_base_attributes,
+    generate_cache_usage_attributes,
     generate_choice_attributes,
     generate_message_attributes,
     generate_request_attributes,
     generate_response_attributes,
+    get_response_cache,
+    is_deterministic_request,
+    request_cache_key,
 )
 from llm_tracekit.core import _extended_gen_ai_attributes as ExtendedGenAIAttributes
 
+logger = logging.getLogger(__name__)
+
 
 def _get_prop(obj: Any, name: str) -> Any:
     if isinstance(obj, Mapping):
@@ -70,6 +83,12 @@ def generate_server_address_and_port_attributes(client_instance: Any) -> dict[st
     return attributes
 
 
+_client_attributes = ClientAttributesCache(
+    GenAIAttributes.GenAiSystemValues.ANTHROPIC,
+    generate_server_address_and_port_attributes,
+)
+
+
 def _tool_result_content_to_str(block: Any) -> str | None:
     content = _get_prop(block, "content")
     if content is None:
@@ -200,14 +219,8 @@ def build_prompt_messages(kwargs: dict[str, Any]) -> list[Message]:
     return out
 
 
-def _tools_request_attributes(tools: Any) -> dict[str, Any]:
+def _build_tools_request_attributes(tool_list: Sequence[Any]) -> dict[str, Any]:
     attributes: dict[str, Any] = {}
-    if tools is None or not is_given(tools):
-        return attributes
-    try:
-        tool_list = list(tools)
-    except TypeError:
-        return attributes
     for index, tool in enumerate(tool_list):
         if not isinstance(tool, Mapping):
             continue
@@ -236,6 +249,18 @@ def _tools_request_attributes(tools: Any) -> dict[str, Any]:
     return attributes
 
 
+_tool_attributes = ToolAttributesCache(_build_tools_request_attributes)
+
+
+def _tools_request_attributes(tools: Any) -> Mapping[str, Any]:
+    if tools is None or not is_given(tools):
+        return {}
+    try:
+        return _tool_attributes.get(tools)
+    except TypeError:
+        return {}
+
+
 @attribute_generator
 def get_messages_request_attributes(
     kwargs: dict[str, Any],
@@ -255,11 +280,12 @@ def get_messages_request_attributes(
         req_kwargs["max_tokens"] = kwargs.get("max_tokens")
 
     attributes: dict[str, Any] = {
-        **generate_base_attributes(system=GenAIAttributes.GenAiSystemValues.ANTHROPIC),
+        **_client_attributes.get(client_instance),
         **generate_request_attributes(**req_kwargs),
         **generate_message_attributes(
             messages=build_prompt_messages(kwargs),
             capture_content=capture_content,
+            model=kwargs.get("model"),
         ),
         **_tools_request_attributes(kwargs.get("tools")),
     }
@@ -270,7 +296,6 @@ def get_messages_request_attributes(
         if uid is not None:
             attributes[ExtendedGenAIAttributes.GEN_AI_REQUEST_USER] = uid
 
-    attributes.update(generate_server_address_and_port_attributes(client_instance))
     return attributes
 
 
@@ -308,6 +333,28 @@ def anthropic_message_to_choice(message: Any) -> Choice:
     )
 
 
+def get_cache_usage(usage: Any) -> dict[str, int | None]:
+    """Read the prompt cache usage of a Messages usage object.
+
+    Anthropic reports the cached tokens apart from `input_tokens`, so the total
+    input of the request is the sum of the three.
+    """
+    input_tokens = getattr(usage, "input_tokens", None) if usage else None
+    cache_read = getattr(usage, "cache_read_input_tokens", None) if usage else None
+    cache_creation = (
+        getattr(usage, "cache_creation_input_tokens", None) if usage else None
+    )
+    total_input_tokens = None
+    if input_tokens is not None:
+        total_input_tokens = input_tokens + (cache_read or 0) + (cache_creation or 0)
+
+    return {
+        "cache_read_input_tokens": cache_read,
+        "cache_creation_input_tokens": cache_creation,
+        "total_input_tokens": total_input_tokens,
+    }
+
+
 @attribute_generator
 def get_message_response_attributes(
     result: Any, capture_content: bool
@@ -324,6 +371,7 @@ def get_message_response_attributes(
             usage_input_tokens=in_tok,
             usage_output_tokens=out_tok,
         ),
+        **generate_cache_usage_attributes(**get_cache_usage(usage)),
         **generate_choice_attributes([choice], capture_content),
     }
 
@@ -336,3 +384,72 @@ def stop_reason_to_finish_reason(stop_reason: Any) -> str:
     if stop_reason is None:
         return "error"
     return str(stop_reason)
+
+
+_RESPONSE_CACHE_IGNORED_KWARGS = frozenset(("timeout",))
+
+
+def get_response_cache_key(kwargs: dict[str, Any], client_instance: Any) -> str | None:
+    """Returns the response cache key of a messages request, None if its response is not cached."""
+    if get_response_cache() is None:
+        return None
+    # the Messages API has no seed parameter
+    if not is_deterministic_request(temperature=kwargs.get("temperature")):
+        return None
+
+    if RAW_RESPONSE_HEADER in (kwargs.get("extra_headers") or {}):
+        # `with_raw_response` and `with_streaming_response` return the HTTP
+        # response instead of the parsed one, which is not cached
+        return None
+
+    request = {
+        key: value
+        for key, value in kwargs.items()
+        if key not in _RESPONSE_CACHE_IGNORED_KWARGS and is_given(value)
+    }
+    base_client = getattr(client_instance, "_client", None)
+    request["base_url"] = str(getattr(base_client, "base_url", ""))
+    return request_cache_key(GenAIAttributes.GenAiSystemValues.ANTHROPIC.value, request)
+
+
+def load_cached_message(
+    cache_key: str | None, stream: bool
+) -> AnthropicMessage | list[Any] | None:
+    """Returns the cached response of a request: a message, or the events of a stream."""
+    if cache_key is None:
+        return None
+    cache = get_response_cache()
+    cached = cache.get(cache_key) if cache is not None else None
+    if cached is None:
+        return None
+
+    try:
+        if stream:
+            return [
+                construct_type(type_=RawMessageStreamEvent, value=event)
+                for event in cached
+            ]
+        return AnthropicMessage.model_validate(cached)
+    except (ValidationError, TypeError):
+        return None
+
+
+def store_cached_message(
+    cache_key: str | None, result: AnthropicMessage | list[Any]
+) -> None:
+    if cache_key is None:
+        return
+    cache = get_response_cache()
+    if cache is None:
+        return
+
+    try:
+        if isinstance(result, AnthropicMessage):
+            cache.set(cache_key, result.model_dump(mode="json"))
+        elif isinstance(result, list) and all(
+            hasattr(event, "model_dump") for event in result
+        ):
+            cache.set(cache_key, [event.model_dump(mode="json") for event in result])
+    except Exception:  # pylint: disable=broad-except
+        # caching must never fail the request
+        logger.debug("Failed to store the response in the cache", exc_info=True)
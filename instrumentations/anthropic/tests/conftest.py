@@ -107,9 +107,11 @@ def fixture_vcr(vcr):
 
 
 @pytest.fixture(autouse=True)
-def anthropic_env_vars():
+def anthropic_env_vars(monkeypatch):
     if not os.getenv("ANTHROPIC_API_KEY"):
         os.environ["ANTHROPIC_API_KEY"] = "test_anthropic_api_key"
+    # the cassettes are recorded against the default API URL
+    monkeypatch.delenv("ANTHROPIC_BASE_URL", raising=False)
 
 
 def handle_response(response):
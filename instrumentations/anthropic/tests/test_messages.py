@@ -15,6 +15,7 @@
 from __future__ import annotations
 
 import os
+from types import SimpleNamespace
 
 import pytest
 from anthropic import Anthropic, AsyncAnthropic
@@ -24,8 +25,16 @@ from opentelemetry.semconv._incubating.attributes import (
 from opentelemetry.trace import StatusCode
 
 import llm_tracekit.core._extended_gen_ai_attributes as ExtendedGenAIAttributes
-
-from utils import assert_base_chat_span, assert_completion, assert_prompt_messages
+import llm_tracekit.core._response_cache as response_cache
+from llm_tracekit.anthropic.patch import _AnthropicStreamAccumState
+from llm_tracekit.core import ResponseCache, set_response_cache
+
+from utils import (
+    assert_base_chat_span,
+    assert_completion,
+    assert_prompt_messages,
+    replay_client,
+)
 
 MODEL = os.environ.get("ANTHROPIC_TEST_MODEL", "claude-haiku-4-5-20251001")
 
@@ -248,3 +257,120 @@ def test_messages_no_content_capture(span_exporter, instrument_no_content):
     )
     assert GenAIAttributes.GEN_AI_RESPONSE_ID in span.attributes
     assert span.attributes[GenAIAttributes.GEN_AI_RESPONSE_ID] == resp.id
+
+
+@pytest.fixture
+def enable_response_cache():
+    set_response_cache(ResponseCache())
+    yield
+    set_response_cache(response_cache._UNSET)
+
+
+def test_messages_response_cache(
+    span_exporter, instrument_with_content, enable_response_cache
+):
+    client, requests = replay_client("test_messages_completion")
+    kwargs = {
+        "model": MODEL,
+        "max_tokens": _MAX_TOKENS,
+        "temperature": 0,
+        "messages": [{"role": "user", "content": _USER_PROMPT}],
+    }
+
+    resp = client.messages.create(**kwargs)
+    cached_resp = client.messages.create(**kwargs)
+
+    assert cached_resp == resp
+    assert len(requests) == 1
+    miss, hit = _chat_spans(span_exporter.get_finished_spans())
+    assert miss.attributes[ExtendedGenAIAttributes.GEN_AI_CACHE_HIT] is False
+    assert hit.attributes[ExtendedGenAIAttributes.GEN_AI_CACHE_HIT] is True
+    assert hit.attributes[GenAIAttributes.GEN_AI_RESPONSE_ID] == resp.id
+
+
+def test_messages_streaming_response_cache(
+    span_exporter, instrument_with_content, enable_response_cache
+):
+    client, requests = replay_client("test_messages_streaming")
+    kwargs = {
+        "model": MODEL,
+        "max_tokens": _MAX_TOKENS,
+        "temperature": 0,
+        "stream": True,
+        "messages": [{"role": "user", "content": _USER_PROMPT}],
+    }
+
+    events = list(client.messages.create(**kwargs))
+    replayed_events = list(client.messages.create(**kwargs))
+
+    assert replayed_events == events
+    assert len(requests) == 1
+    miss, hit = _chat_spans(span_exporter.get_finished_spans())
+    assert hit.attributes[ExtendedGenAIAttributes.GEN_AI_CACHE_HIT] is True
+    for attribute in (
+        GenAIAttributes.GEN_AI_RESPONSE_ID,
+        GenAIAttributes.GEN_AI_USAGE_OUTPUT_TOKENS,
+    ):
+        assert hit.attributes[attribute] == miss.attributes[attribute]
+
+
+def test_messages_raw_response_not_cached(
+    span_exporter, instrument_with_content, enable_response_cache
+):
+    client, requests = replay_client("test_messages_completion")
+    kwargs = {
+        "model": MODEL,
+        "max_tokens": _MAX_TOKENS,
+        "temperature": 0,
+        "messages": [{"role": "user", "content": _USER_PROMPT}],
+    }
+
+    raw_responses = [
+        client.messages.with_raw_response.create(**kwargs) for _ in range(2)
+    ]
+
+    assert len(requests) == 2
+    assert raw_responses[1].parse().id == raw_responses[0].parse().id
+    for span in _chat_spans(span_exporter.get_finished_spans()):
+        assert ExtendedGenAIAttributes.GEN_AI_CACHE_HIT not in span.attributes
+
+
+def test_stream_state_estimates_thinking_duration():
+    state = _AnthropicStreamAccumState(capture_content=False, start_time=0.0)
+    for event in [
+        SimpleNamespace(
+            type="content_block_start",
+            index=0,
+            content_block=SimpleNamespace(type="thinking"),
+        ),
+        SimpleNamespace(
+            type="content_block_delta",
+            index=0,
+            delta=SimpleNamespace(type="thinking_delta", thinking="Hmm"),
+        ),
+        SimpleNamespace(
+            type="content_block_delta",
+            index=1,
+            delta=SimpleNamespace(type="text_delta", text=_ASSISTANT_REPLY),
+        ),
+    ]:
+        state.process_event(event)
+
+    attributes = state.build_response_attributes(capture_content=False)
+    state.buffer_reservation.release()
+    assert attributes[ExtendedGenAIAttributes.GEN_AI_RESPONSE_REASONING_DURATION] > 0
+
+
+def test_stream_state_without_thinking_has_no_reasoning_duration():
+    state = _AnthropicStreamAccumState(capture_content=False, start_time=0.0)
+    state.process_event(
+        SimpleNamespace(
+            type="content_block_delta",
+            index=0,
+            delta=SimpleNamespace(type="text_delta", text=_ASSISTANT_REPLY),
+        )
+    )
+
+    attributes = state.build_response_attributes(capture_content=False)
+    state.buffer_reservation.release()
+    assert ExtendedGenAIAttributes.GEN_AI_RESPONSE_REASONING_DURATION not in attributes
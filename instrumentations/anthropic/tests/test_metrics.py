@@ -24,6 +24,12 @@ from opentelemetry.semconv._incubating.attributes import (
 )
 from opentelemetry.semconv._incubating.metrics import gen_ai_metrics  # type: ignore[attr-defined]
 
+from llm_tracekit.core import (
+    GEN_AI_CLIENT_ACTIVE_REQUESTS,
+    GEN_AI_CLIENT_OUTPUT_THROUGHPUT,
+    GEN_AI_CLIENT_TOKEN_CACHE_HIT_RATIO,
+)
+
 MODEL = os.environ.get("ANTHROPIC_TEST_MODEL", "claude-haiku-4-5-20251001")
 
 
@@ -40,7 +46,7 @@ def test_messages_metrics(metric_reader, instrument_with_content):
     metrics = metric_reader.get_metrics_data().resource_metrics
     assert len(metrics) == 1
     metric_data = metrics[0].scope_metrics[0].metrics
-    assert len(metric_data) == 2
+    assert len(metric_data) == 5
 
     duration_metric = next(
         m
@@ -66,3 +72,23 @@ def test_messages_metrics(metric_reader, instrument_with_content):
     }
     assert GenAIAttributes.GenAiTokenTypeValues.INPUT.value in types
     assert GenAIAttributes.GenAiTokenTypeValues.COMPLETION.value in types
+
+    cache_hit_ratio_metric = next(
+        m for m in metric_data if m.name == GEN_AI_CLIENT_TOKEN_CACHE_HIT_RATIO
+    )
+    cache_hit_ratio_point = cache_hit_ratio_metric.data.data_points[0]
+    assert cache_hit_ratio_point.count == 1
+    assert cache_hit_ratio_point.sum == 0
+
+    throughput_metric = next(
+        m for m in metric_data if m.name == GEN_AI_CLIENT_OUTPUT_THROUGHPUT
+    )
+    (throughput_point,) = throughput_metric.data.data_points
+    assert throughput_point.count == 1
+    assert throughput_point.sum > 0
+
+    active_requests_metric = next(
+        m for m in metric_data if m.name == GEN_AI_CLIENT_ACTIVE_REQUESTS
+    )
+    (active_requests_point,) = active_requests_metric.data.data_points
+    assert active_requests_point.value == 0
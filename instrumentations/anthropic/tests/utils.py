@@ -12,6 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from pathlib import Path
+
+import httpx
+import yaml
+from anthropic import Anthropic
 from opentelemetry.sdk.trace import ReadableSpan
 from opentelemetry.semconv._incubating.attributes import (
     gen_ai_attributes as GenAIAttributes,
@@ -90,3 +95,36 @@ def assert_completion(
         assert span.attributes.get(content_key) == content
     elif not expect_content:
         assert content_key not in span.attributes
+
+
+def replay_client(cassette_name: str) -> tuple[Anthropic, list[httpx.Request]]:
+    """Returns a client answering every request with the response recorded in a cassette.
+
+    Unlike a cassette, the client replays the response any number of times,
+    regardless of the configured base URL, and the requests it received are
+    returned for the test to count.
+    """
+    cassette_path = Path(__file__).parent / "cassettes" / f"{cassette_name}.yaml"
+    (interaction,) = yaml.safe_load(cassette_path.read_text())["interactions"]
+    response = interaction["response"]
+    headers = {
+        name: values[0]
+        for name, values in response["headers"].items()
+        if name.lower() == "content-type"
+    }
+    requests: list[httpx.Request] = []
+
+    def handle_request(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(
+            response["status"]["code"],
+            headers=headers,
+            content=response["body"]["string"],
+        )
+
+    client = Anthropic(
+        api_key="test_anthropic_api_key",
+        base_url="https://api.anthropic.com",
+        http_client=httpx.Client(transport=httpx.MockTransport(handle_request)),
+    )
+    return client, requests
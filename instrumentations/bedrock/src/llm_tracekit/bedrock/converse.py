@@ -26,17 +26,26 @@ from opentelemetry.trace import Span
 from wrapt import ObjectProxy
 
 from llm_tracekit.core import _extended_gen_ai_attributes as ExtendedGenAIAttributes
-from llm_tracekit.bedrock.utils import decode_tool_use_in_stream, record_metrics
-from llm_tracekit.core import Instruments, attribute_generator
+from llm_tracekit.bedrock.utils import (
+    decode_tool_use_in_stream,
+    get_cache_usage,
+    get_generation_time,
+    record_metrics,
+)
+from llm_tracekit.core import InFlight, Instruments, attribute_generator
 from llm_tracekit.core import (
     Choice,
     Message,
     ToolCall,
     generate_base_attributes,
+    generate_cache_usage_attributes,
     generate_choice_attributes,
     generate_message_attributes,
     generate_request_attributes,
     generate_response_attributes,
+    get_stream_memory_budget,
+    StreamAccumulator,
+    StreamBufferReservation,
 )
 
 
@@ -195,7 +204,9 @@ def generate_attributes_from_converse_input(
             max_tokens=inference_config.get("maxTokens"),
         ),
         **generate_message_attributes(
-            messages=messages, capture_content=capture_content
+            messages=messages,
+            capture_content=capture_content,
+            model=kwargs.get("modelId"),
         ),
         **tool_attributes,
         **user_attributes,
@@ -209,11 +220,23 @@ def record_converse_result_attributes(
     instruments: Instruments,
     capture_content: bool,
     model: str | None,
+    buffer_reservation: StreamBufferReservation | None = None,
+    first_content_time: float | None = None,
 ):
+    if buffer_reservation is not None:
+        capture_content = capture_content and buffer_reservation.content_allowed
+        span.set_attributes(buffer_reservation.attributes())
+        buffer_reservation.release()
+
     finish_reason = result.get("stopReason")
     usage_data = result.get("usage", {})
     usage_input_tokens = usage_data.get("inputTokens")
     usage_output_tokens = usage_data.get("outputTokens")
+    cache_usage = get_cache_usage(
+        input_tokens=usage_input_tokens,
+        cache_read_input_tokens=usage_data.get("cacheReadInputTokens"),
+        cache_creation_input_tokens=usage_data.get("cacheWriteInputTokens"),
+    )
 
     response_attributes = generate_response_attributes(
         model=model,
@@ -222,6 +245,7 @@ def record_converse_result_attributes(
         usage_output_tokens=usage_output_tokens,
     )
     span.set_attributes(response_attributes)
+    span.set_attributes(generate_cache_usage_attributes(**cache_usage))
 
     response_message = result.get("output", {}).get("message")
     if response_message is not None:
@@ -251,6 +275,14 @@ def record_converse_result_attributes(
         response_model=model,
         usage_input_tokens=usage_input_tokens,
         usage_output_tokens=usage_output_tokens,
+        generation_time=get_generation_time(
+            duration,
+            streamed=buffer_reservation is not None,
+            first_content_time=first_content_time,
+        ),
+        cache_read_input_tokens=cache_usage["cache_read_input_tokens"],
+        cache_creation_input_tokens=cache_usage["cache_creation_input_tokens"],
+        total_input_tokens=cache_usage["total_input_tokens"],
     )
 
 
@@ -262,17 +294,24 @@ class ConverseStreamWrapper(ObjectProxy):
         stream: EventStream,
         stream_done_callback: Callable[[dict[str, int | str]], None],
         stream_error_callback: Callable[[Exception], None],
+        capture_content: bool = True,
+        active_stream: InFlight | None = None,
     ):
         super().__init__(stream)
 
         self._stream_done_callback = stream_done_callback
         self._stream_error_callback = stream_error_callback
+        self._capture_content = capture_content
+        self._active_stream = active_stream
+        self._first_content_time: float | None = None
         # accumulating things in the same shape of non-streaming version
         # {"usage": {"inputTokens": 0, "outputTokens": 0}, "stopReason": "finish", "output": {"message": {"role": "", "content": [{"text": ""}]}
         self._response: dict[str, Any] = {}
         self._message = None
         self._content_block: dict[str, Any] = {}
         self._record_message = False
+        self._buffer_reservation = get_stream_memory_budget().open_buffer()
+        self._content_block_buffer = StreamAccumulator(self._buffer_reservation)
 
     def __iter__(self):
         try:
@@ -282,6 +321,9 @@ class ConverseStreamWrapper(ObjectProxy):
         except EventStreamError as exc:
             self._stream_error_callback(exc)
             raise
+        finally:
+            if self._active_stream is not None:
+                self._active_stream.end()
 
     def _process_event(self, event):
         # pylint: disable=too-many-branches
@@ -302,21 +344,28 @@ class ConverseStreamWrapper(ObjectProxy):
         if "contentBlockDelta" in event:
             # {'contentBlockDelta': {'delta': {'text': "Hello"}, 'contentBlockIndex': 0}}
             # {'contentBlockDelta': {'delta': {'toolUse': {'input': '{"location":"Seattle"}'}}, 'contentBlockIndex': 1}}
-            if self._record_message:
+            if self._first_content_time is None:
+                self._first_content_time = default_timer()
+            # without content capture only the metadata of the stream is kept
+            if self._record_message and self._capture_content:
                 delta = event["contentBlockDelta"].get("delta", {})
                 if "text" in delta:
                     self._content_block.setdefault("text", "")
-                    self._content_block["text"] += delta["text"]
+                    self._content_block_buffer.append(delta["text"])
                 elif "toolUse" in delta:
                     self._content_block["toolUse"].setdefault("input", "")
-                    self._content_block["toolUse"]["input"] += delta["toolUse"].get(
-                        "input", ""
-                    )
+                    self._content_block_buffer.append(delta["toolUse"].get("input", ""))
             return
 
         if "contentBlockStop" in event:
             # {'contentBlockStop': {'contentBlockIndex': 0}}
             if self._record_message and self._message is not None:
+                if "text" in self._content_block:
+                    self._content_block["text"] = self._content_block_buffer.getvalue()
+                if "input" in self._content_block.get("toolUse", {}):
+                    self._content_block["toolUse"]["input"] = (
+                        self._content_block_buffer.getvalue()
+                    )
                 if "toolUse" in self._content_block:
                     self._content_block["toolUse"] = decode_tool_use_in_stream(
                         self._content_block["toolUse"]
@@ -324,6 +373,7 @@ class ConverseStreamWrapper(ObjectProxy):
 
                 self._message["content"].append(self._content_block)
                 self._content_block = {}
+                self._content_block_buffer.clear()
             return
 
         if "messageStop" in event:
@@ -352,6 +402,15 @@ class ConverseStreamWrapper(ObjectProxy):
                 if output_tokens is not None:
                     self._response["usage"]["outputTokens"] = output_tokens
 
-            self._stream_done_callback(self._response)
+                for cache_key in ("cacheReadInputTokens", "cacheWriteInputTokens"):
+                    cache_tokens = usage.get(cache_key)
+                    if cache_tokens is not None:
+                        self._response["usage"][cache_key] = cache_tokens
+
+            self._stream_done_callback(
+                self._response,
+                buffer_reservation=self._buffer_reservation,
+                first_content_time=self._first_content_time,
+            )
 
             return
@@ -27,7 +27,7 @@ from wrapt import ObjectProxy
 from llm_tracekit.core import _extended_gen_ai_attributes as ExtendedGenAIAttributes
 from llm_tracekit.bedrock import parsing_utils
 from llm_tracekit.bedrock.utils import record_metrics
-from llm_tracekit.core import Instruments, attribute_generator
+from llm_tracekit.core import InFlight, Instruments, attribute_generator
 from llm_tracekit.core import (
     Choice,
     Message,
@@ -36,6 +36,9 @@ from llm_tracekit.core import (
     generate_message_attributes,
     generate_request_attributes,
     generate_response_attributes,
+    get_stream_memory_budget,
+    StreamAccumulator,
+    StreamBufferReservation,
 )
 
 
@@ -93,7 +96,13 @@ def record_invoke_agent_result_attributes(
     start_time: float,
     instruments: Instruments,
     capture_content: bool,
+    buffer_reservation: StreamBufferReservation | None = None,
 ):
+    if buffer_reservation is not None:
+        capture_content = capture_content and buffer_reservation.content_allowed
+        span.set_attributes(buffer_reservation.attributes())
+        buffer_reservation.release()
+
     try:
         current_choice = Choice(role="assistant", content=result.content)
 
@@ -156,11 +165,17 @@ class InvokeAgentStreamWrapper(ObjectProxy):
         stream: EventStream,
         stream_done_callback: Callable[[AgentStreamResult], None],
         stream_error_callback: Callable[[Exception], None],
+        capture_content: bool = True,
+        active_stream: InFlight | None = None,
     ):
         super().__init__(stream)
         self._stream_done_callback = stream_done_callback
         self._stream_error_callback = stream_error_callback
+        self._capture_content = capture_content
+        self._active_stream = active_stream
         self._result = AgentStreamResult()
+        self._buffer_reservation = get_stream_memory_budget().open_buffer()
+        self._content = StreamAccumulator(self._buffer_reservation)
 
     def __iter__(self):
         try:
@@ -168,10 +183,17 @@ class InvokeAgentStreamWrapper(ObjectProxy):
                 self._process_event(event)
                 yield event
 
-            self._stream_done_callback(self._result)
+            if self._result.content is not None:
+                self._result.content = self._content.getvalue()
+            self._stream_done_callback(
+                self._result, buffer_reservation=self._buffer_reservation
+            )
         except EventStreamError as exc:
             self._stream_error_callback(exc)
             raise
+        finally:
+            if self._active_stream is not None:
+                self._active_stream.end()
 
     def _process_usage_data(self, usage: dict[str, int]):
         input_tokens = usage.get("inputTokens")
@@ -255,8 +277,9 @@ class InvokeAgentStreamWrapper(ObjectProxy):
                 self._result.content = ""
 
             encoded_content = event["chunk"].get("bytes")
-            if encoded_content is not None:
-                self._result.content += encoded_content.decode()
+            # without content capture only the metadata of the stream is kept
+            if encoded_content is not None and self._capture_content:
+                self._content.append(encoded_content)
 
         if "trace" in event and "trace" in event.get("trace", {}):
             self._process_trace_event(event["trace"]["trace"])
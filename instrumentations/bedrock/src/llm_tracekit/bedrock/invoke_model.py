@@ -16,10 +16,14 @@ from llm_tracekit.core import (
     Message,
     ToolCall,
     generate_base_attributes,
+    generate_cache_usage_attributes,
     generate_choice_attributes,
     generate_message_attributes,
     generate_request_attributes,
     generate_response_attributes,
+    get_stream_memory_budget,
+    StreamAccumulator,
+    StreamBufferReservation,
 )
 
 import json
@@ -37,8 +41,13 @@ from opentelemetry.trace import Span
 from wrapt import ObjectProxy
 
 from llm_tracekit.core import _extended_gen_ai_attributes as ExtendedGenAIAttributes
-from llm_tracekit.bedrock.utils import decode_tool_use_in_stream, record_metrics
-from llm_tracekit.core import Instruments, attribute_generator
+from llm_tracekit.bedrock.utils import (
+    decode_tool_use_in_stream,
+    get_cache_usage,
+    get_generation_time,
+    record_metrics,
+)
+from llm_tracekit.core import InFlight, Instruments, attribute_generator
 
 
 class _ModelType(Enum):
@@ -188,12 +197,20 @@ def _generate_claude_request_and_message_attributes(
             top_p=parsed_body.get("top_p"),
         ),
         **generate_message_attributes(
-            messages=messages, capture_content=capture_content
+            messages=messages, capture_content=capture_content, model=model_id
         ),
         **tool_attributes,
     }
 
 
+def _get_claude_cache_usage(usage_data: dict[str, Any]) -> dict[str, int | None]:
+    return get_cache_usage(
+        input_tokens=usage_data.get("input_tokens"),
+        cache_read_input_tokens=usage_data.get("cache_read_input_tokens"),
+        cache_creation_input_tokens=usage_data.get("cache_creation_input_tokens"),
+    )
+
+
 def _generate_claude_response_and_choice_attributes(
     parsed_body: dict[str, Any], capture_content: bool
 ) -> dict[str, Any]:
@@ -217,6 +234,7 @@ def _generate_claude_response_and_choice_attributes(
             usage_input_tokens=usage_data.get("input_tokens"),
             usage_output_tokens=usage_data.get("output_tokens"),
         ),
+        **generate_cache_usage_attributes(**_get_claude_cache_usage(usage_data)),
         **generate_choice_attributes(choices=[choice], capture_content=capture_content),
     }
 
@@ -234,7 +252,7 @@ def _generate_llama_request_and_message_attributes(
         messages = [Message(role="user", content=parsed_body["prompt"])]
         attributes.update(
             generate_message_attributes(
-                messages=messages, capture_content=capture_content
+                messages=messages, capture_content=capture_content, model=model_id
             )
         )
 
@@ -321,11 +339,19 @@ def record_invoke_model_result_attributes(
     instruments: Instruments,
     capture_content: bool,
     model_id: str | None,
+    buffer_reservation: StreamBufferReservation | None = None,
+    first_content_time: float | None = None,
 ):
+    if buffer_reservation is not None:
+        capture_content = capture_content and buffer_reservation.content_allowed
+        span.set_attributes(buffer_reservation.attributes())
+        buffer_reservation.release()
+
     request_model = model_id
     response_model = model_id
     usage_input_tokens = None
     usage_output_tokens = None
+    cache_usage: dict[str, int | None] = {}
     try:
         model_type = _get_model_type_from_model_id(model_id)
         if model_type is None:
@@ -359,6 +385,7 @@ def record_invoke_model_result_attributes(
             response_model = parsed_body.get("model")
             usage_input_tokens = parsed_body.get("usage", {}).get("input_tokens")
             usage_output_tokens = parsed_body.get("usage", {}).get("output_tokens")
+            cache_usage = _get_claude_cache_usage(parsed_body.get("usage", {}))
 
     finally:
         duration = max((default_timer() - start_time), 0)
@@ -370,6 +397,14 @@ def record_invoke_model_result_attributes(
             response_model=response_model,
             usage_input_tokens=usage_input_tokens,
             usage_output_tokens=usage_output_tokens,
+            generation_time=get_generation_time(
+                duration,
+                streamed=buffer_reservation is not None,
+                first_content_time=first_content_time,
+            ),
+            cache_read_input_tokens=cache_usage.get("cache_read_input_tokens"),
+            cache_creation_input_tokens=cache_usage.get("cache_creation_input_tokens"),
+            total_input_tokens=cache_usage.get("total_input_tokens"),
         )
 
 
@@ -382,20 +417,27 @@ class InvokeModelWithResponseStreamWrapper(ObjectProxy):
         stream_done_callback: Callable[[dict[str, int | str]], None],
         stream_error_callback: Callable[[Exception], None],
         model_id: str | None,
+        capture_content: bool = True,
+        active_stream: InFlight | None = None,
     ):
         super().__init__(stream)
 
         self._stream_done_callback = stream_done_callback
         self._stream_error_callback = stream_error_callback
         self._model_id = model_id
+        self._capture_content = capture_content
+        self._active_stream = active_stream
+        self._first_content_time: float | None = None
 
         # accumulating things in the same shape of the Converse API
         # {"usage": {"inputTokens": 0, "outputTokens": 0}, "stopReason": "finish", "output": {"message": {"role": "", "content": [{"text": ""}]}
         self._response: dict[str, Any] = {}
         self._message = None
         self._content_block: dict[str, Any] = {}
-        self._tool_json_input_buffer = ""
         self._record_message = False
+        self._buffer_reservation = get_stream_memory_budget().open_buffer()
+        self._content_block_buffer = StreamAccumulator(self._buffer_reservation)
+        self._tool_json_input_buffer = StreamAccumulator(self._buffer_reservation)
 
     def __iter__(self):
         try:
@@ -405,6 +447,9 @@ class InvokeModelWithResponseStreamWrapper(ObjectProxy):
         except EventStreamError as exc:
             self._stream_error_callback(exc)
             raise
+        finally:
+            if self._active_stream is not None:
+                self._active_stream.end()
 
     def _process_event(self, event):
         if "chunk" not in event:
@@ -443,11 +488,24 @@ class InvokeModelWithResponseStreamWrapper(ObjectProxy):
         if output_tokens is not None:
             self._response["usage"]["output_tokens"] = output_tokens
 
+        cache_read_tokens = invocation_metrics.get("cacheReadInputTokenCount")
+        if cache_read_tokens is not None:
+            self._response["usage"]["cache_read_input_tokens"] = cache_read_tokens
+
+        cache_write_tokens = invocation_metrics.get("cacheWriteInputTokenCount")
+        if cache_write_tokens is not None:
+            self._response["usage"]["cache_creation_input_tokens"] = cache_write_tokens
+
     def _process_meta_llama_chunk(self, chunk):
         if self._message is None:
             self._message = {"generation": ""}
+            self._content_block_buffer.clear()
 
-        self._message["generation"] += chunk.get("generation", "")
+        if chunk.get("generation") and self._first_content_time is None:
+            self._first_content_time = default_timer()
+        # without content capture only the metadata of the stream is kept
+        if self._capture_content:
+            self._content_block_buffer.append(chunk.get("generation", ""))
 
         if chunk.get("stop_reason") is not None and self._message is not None:
             invocation_metrics = chunk.get("amazon-bedrock-invocationMetrics")
@@ -455,10 +513,14 @@ class InvokeModelWithResponseStreamWrapper(ObjectProxy):
                 self._process_meta_llama_invocation_metrics(invocation_metrics)
 
             self._response["stop_reason"] = chunk["stop_reason"]
-            self._response["generation"] = self._message["generation"]
+            self._response["generation"] = self._content_block_buffer.getvalue()
             self._message = None
 
-            self._stream_done_callback(self._response)
+            self._stream_done_callback(
+                self._response,
+                buffer_reservation=self._buffer_reservation,
+                first_content_time=self._first_content_time,
+            )
             return
 
     def _process_anthropic_claude_chunk(self, chunk):
@@ -493,25 +555,34 @@ class InvokeModelWithResponseStreamWrapper(ObjectProxy):
         if message_type == "content_block_delta":
             # {'type': 'content_block_delta', 'index': 0, 'delta': {'type': 'text_delta', 'text': 'Here'}}
             # {'type': 'content_block_delta', 'index': 1, 'delta': {'type': 'input_json_delta', 'partial_json': ''}}
-            if self._record_message:
+            if self._first_content_time is None:
+                self._first_content_time = default_timer()
+            # without content capture only the metadata of the stream is kept
+            if self._record_message and self._capture_content:
                 delta = chunk.get("delta", {})
                 if delta.get("type") == "text_delta":
-                    self._content_block["text"] += delta.get("text", "")
+                    self._content_block_buffer.append(delta.get("text", ""))
                 elif delta.get("type") == "input_json_delta":
-                    self._tool_json_input_buffer += delta.get("partial_json", "")
+                    self._tool_json_input_buffer.append(delta.get("partial_json", ""))
             return
 
         if message_type == "content_block_stop":
             # {'type': 'content_block_stop', 'index': 0}
+            if self._content_block_buffer:
+                self._content_block["text"] = (
+                    self._content_block.get("text", "")
+                    + self._content_block_buffer.getvalue()
+                )
             if self._tool_json_input_buffer:
-                self._content_block["input"] = self._tool_json_input_buffer
+                self._content_block["input"] = self._tool_json_input_buffer.getvalue()
 
             if self._message is not None:
                 self._message["content"].append(
                     decode_tool_use_in_stream(self._content_block)
                 )
             self._content_block = {}
-            self._tool_json_input_buffer = ""
+            self._content_block_buffer.clear()
+            self._tool_json_input_buffer.clear()
             return
 
         if message_type == "message_delta":
@@ -534,5 +605,9 @@ class InvokeModelWithResponseStreamWrapper(ObjectProxy):
                 self._record_message = False
                 self._message = None
 
-            self._stream_done_callback(self._response)
+            self._stream_done_callback(
+                self._response,
+                buffer_reservation=self._buffer_reservation,
+                first_content_time=self._first_content_time,
+            )
             return
@@ -19,6 +19,7 @@ from typing import Callable
 
 from botocore.eventstream import EventStream
 from botocore.response import StreamingBody
+from opentelemetry import trace
 from opentelemetry.trace import Span, SpanKind, Tracer
 
 from llm_tracekit.bedrock.converse import (
@@ -37,7 +38,13 @@ from llm_tracekit.bedrock.invoke_model import (
     record_invoke_model_result_attributes,
 )
 from llm_tracekit.bedrock.utils import record_metrics
-from llm_tracekit.core import handle_span_exception, Instruments
+from llm_tracekit.core import (
+    handle_span_exception,
+    deferred_message_events,
+    Instruments,
+    track_request,
+    track_stream,
+)
 
 
 def _handle_error(
@@ -57,6 +64,20 @@ def _handle_error(
     )
 
 
+def _in_span(span: Span, callback: Callable, **kwargs) -> Callable:
+    """Binds `kwargs` to `callback`, running it with `span` current.
+
+    Stream callbacks run when the caller consumes the stream, outside of the span,
+    so the content events they emit would not be correlated with it otherwise.
+    """
+
+    def in_span(*args, **callback_kwargs):
+        with trace.use_span(span, end_on_exit=False):
+            return callback(*args, span=span, **kwargs, **callback_kwargs)
+
+    return in_span
+
+
 def invoke_model_wrapper(
     original_function: Callable,
     tracer: Tracer,
@@ -66,16 +87,19 @@ def invoke_model_wrapper(
     @wraps(original_function)
     def wrapper(*args, **kwargs):
         model = kwargs.get("modelId")
-        span_attributes = generate_attributes_from_invoke_input(
-            kwargs=kwargs, capture_content=capture_content
-        )
+        with deferred_message_events() as message_events:
+            span_attributes = generate_attributes_from_invoke_input(
+                kwargs=kwargs, capture_content=capture_content
+            )
         with tracer.start_as_current_span(
             name="bedrock.invoke_model",
             kind=SpanKind.CLIENT,
             attributes=span_attributes,
             end_on_exit=False,
         ) as span:
+            message_events.emit()
             start_time = default_timer()
+            in_flight = track_request(instruments, span_attributes)
             try:
                 result = original_function(*args, **kwargs)
                 body = result.get("body")
@@ -106,6 +130,8 @@ def invoke_model_wrapper(
                     model=model,
                 )
                 raise
+            finally:
+                in_flight.end()
 
     return wrapper
 
@@ -119,9 +145,10 @@ def invoke_model_with_response_stream_wrapper(
     @wraps(original_function)
     def wrapper(*args, **kwargs):
         model = kwargs.get("modelId")
-        span_attributes = generate_attributes_from_invoke_input(
-            kwargs=kwargs, capture_content=capture_content
-        )
+        with deferred_message_events() as message_events:
+            span_attributes = generate_attributes_from_invoke_input(
+                kwargs=kwargs, capture_content=capture_content
+            )
 
         with tracer.start_as_current_span(
             name="bedrock.invoke_model_with_response_stream",
@@ -129,15 +156,17 @@ def invoke_model_with_response_stream_wrapper(
             attributes=span_attributes,
             end_on_exit=False,
         ) as span:
+            message_events.emit()
             start_time = default_timer()
+            in_flight = track_request(instruments, span_attributes)
             try:
                 result = original_function(*args, **kwargs)
                 if "body" in result and isinstance(result["body"], EventStream):
                     result["body"] = InvokeModelWithResponseStreamWrapper(
                         stream=result["body"],
-                        stream_done_callback=partial(
+                        stream_done_callback=_in_span(
+                            span,
                             record_invoke_model_result_attributes,
-                            span=span,
                             start_time=start_time,
                             instruments=instruments,
                             capture_content=capture_content,
@@ -151,6 +180,10 @@ def invoke_model_with_response_stream_wrapper(
                             model=model,
                         ),
                         model_id=model,
+                        capture_content=capture_content,
+                        active_stream=track_stream(
+                            instruments, span_attributes, in_flight
+                        ),
                     )
 
                 return result
@@ -163,6 +196,8 @@ def invoke_model_with_response_stream_wrapper(
                     model=model,
                 )
                 raise
+            finally:
+                in_flight.end()
 
     return wrapper
 
@@ -176,16 +211,19 @@ def converse_wrapper(
     @wraps(original_function)
     def wrapper(*args, **kwargs):
         model = kwargs.get("modelId")
-        span_attributes = generate_attributes_from_converse_input(
-            kwargs=kwargs, capture_content=capture_content
-        )
+        with deferred_message_events() as message_events:
+            span_attributes = generate_attributes_from_converse_input(
+                kwargs=kwargs, capture_content=capture_content
+            )
         with tracer.start_as_current_span(
             name="bedrock.converse",
             kind=SpanKind.CLIENT,
             attributes=span_attributes,
             end_on_exit=False,
         ) as span:
+            message_events.emit()
             start_time = default_timer()
+            in_flight = track_request(instruments, span_attributes)
             try:
                 result = original_function(*args, **kwargs)
                 record_converse_result_attributes(
@@ -206,6 +244,8 @@ def converse_wrapper(
                     model=model,
                 )
                 raise
+            finally:
+                in_flight.end()
 
     return wrapper
 
@@ -219,9 +259,10 @@ def converse_stream_wrapper(
     @wraps(original_function)
     def wrapper(*args, **kwargs):
         model = kwargs.get("modelId")
-        span_attributes = generate_attributes_from_converse_input(
-            kwargs=kwargs, capture_content=capture_content
-        )
+        with deferred_message_events() as message_events:
+            span_attributes = generate_attributes_from_converse_input(
+                kwargs=kwargs, capture_content=capture_content
+            )
 
         with tracer.start_as_current_span(
             name="bedrock.converse_stream",
@@ -229,15 +270,17 @@ def converse_stream_wrapper(
             attributes=span_attributes,
             end_on_exit=False,
         ) as span:
+            message_events.emit()
             start_time = default_timer()
+            in_flight = track_request(instruments, span_attributes)
             try:
                 result = original_function(*args, **kwargs)
                 if "stream" in result and isinstance(result["stream"], EventStream):
                     result["stream"] = ConverseStreamWrapper(
                         stream=result["stream"],
-                        stream_done_callback=partial(
+                        stream_done_callback=_in_span(
+                            span,
                             record_converse_result_attributes,
-                            span=span,
                             start_time=start_time,
                             instruments=instruments,
                             capture_content=capture_content,
@@ -250,6 +293,10 @@ def converse_stream_wrapper(
                             instruments=instruments,
                             model=model,
                         ),
+                        capture_content=capture_content,
+                        active_stream=track_stream(
+                            instruments, span_attributes, in_flight
+                        ),
                     )
 
                 return result
@@ -262,6 +309,8 @@ def converse_stream_wrapper(
                     model=model,
                 )
                 raise
+            finally:
+                in_flight.end()
 
     return wrapper
 
@@ -274,24 +323,27 @@ def invoke_agent_wrapper(
 ):
     @wraps(original_function)
     def wrapper(*args, **kwargs):
-        span_attributes = generate_attributes_from_invoke_agent_input(
-            kwargs=kwargs, capture_content=capture_content
-        )
+        with deferred_message_events() as message_events:
+            span_attributes = generate_attributes_from_invoke_agent_input(
+                kwargs=kwargs, capture_content=capture_content
+            )
         with tracer.start_as_current_span(
             name="bedrock.invoke_agent",
             kind=SpanKind.CLIENT,
             attributes=span_attributes,
             end_on_exit=False,
         ) as span:
+            message_events.emit()
             start_time = default_timer()
+            in_flight = track_request(instruments, span_attributes)
             try:
                 result = original_function(*args, **kwargs)
                 if "completion" in result:
                     result["completion"] = InvokeAgentStreamWrapper(
                         stream=result["completion"],
-                        stream_done_callback=partial(
+                        stream_done_callback=_in_span(
+                            span,
                             record_invoke_agent_result_attributes,
-                            span=span,
                             start_time=start_time,
                             instruments=instruments,
                             capture_content=capture_content,
@@ -302,6 +354,10 @@ def invoke_agent_wrapper(
                             start_time=start_time,
                             instruments=instruments,
                         ),
+                        capture_content=capture_content,
+                        active_stream=track_stream(
+                            instruments, span_attributes, in_flight
+                        ),
                     )
 
                 return result
@@ -313,6 +369,8 @@ def invoke_agent_wrapper(
                     instruments=instruments,
                 )
                 raise
+            finally:
+                in_flight.end()
 
     return wrapper
 
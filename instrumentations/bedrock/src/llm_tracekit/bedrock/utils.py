@@ -13,13 +13,20 @@
 # limitations under the License.
 
 import json
+from timeit import default_timer
 
 from opentelemetry.semconv._incubating.attributes import (
     gen_ai_attributes as GenAIAttributes,
 )
 from opentelemetry.semconv.attributes import error_attributes as ErrorAttributes
+from opentelemetry.util.types import AttributeValue
 
-from llm_tracekit.core import Instruments
+from llm_tracekit.core import (
+    Instruments,
+    limit_metric_attributes,
+    record_cache_usage_metrics,
+    record_output_throughput,
+)
 
 
 def record_metrics(
@@ -30,8 +37,12 @@ def record_metrics(
     usage_input_tokens: int | None = None,
     usage_output_tokens: int | None = None,
     error_type: str | None = None,
+    cache_read_input_tokens: int | None = None,
+    cache_creation_input_tokens: int | None = None,
+    total_input_tokens: int | None = None,
+    generation_time: float | None = None,
 ):
-    common_attributes = {
+    common_attributes: dict[str, AttributeValue] = {
         GenAIAttributes.GEN_AI_OPERATION_NAME: GenAIAttributes.GenAiOperationNameValues.CHAT.value,
         GenAIAttributes.GEN_AI_SYSTEM: GenAIAttributes.GenAiSystemValues.AWS_BEDROCK.value,
     }
@@ -44,6 +55,7 @@ def record_metrics(
     if error_type:
         common_attributes[ErrorAttributes.ERROR_TYPE] = error_type
 
+    common_attributes = limit_metric_attributes(instruments, common_attributes)
     instruments.operation_duration_histogram.record(
         duration,
         attributes=common_attributes,
@@ -69,10 +81,58 @@ def record_metrics(
             attributes=completion_attributes,
         )
 
+    record_cache_usage_metrics(
+        instruments,
+        common_attributes,
+        cache_read_input_tokens=cache_read_input_tokens,
+        cache_creation_input_tokens=cache_creation_input_tokens,
+        total_input_tokens=total_input_tokens,
+    )
+
+    if not error_type:
+        record_output_throughput(
+            instruments, common_attributes, usage_output_tokens, generation_time
+        )
+
+
+def get_generation_time(
+    duration: float,
+    streamed: bool,
+    first_content_time: float | None,
+) -> float | None:
+    # streams are timed from their first content, to leave out the time to the
+    # first token, responses returned at once from the start of the request
+    if not streamed:
+        return duration
+    if first_content_time is None:
+        return None
+    return max(default_timer() - first_content_time, 0)
+
+
+def get_cache_usage(
+    input_tokens: int | None,
+    cache_read_input_tokens: int | None,
+    cache_creation_input_tokens: int | None,
+) -> dict[str, int | None]:
+    # Bedrock reports the cached tokens apart from the input tokens
+    total_input_tokens = None
+    if input_tokens is not None:
+        total_input_tokens = (
+            input_tokens
+            + (cache_read_input_tokens or 0)
+            + (cache_creation_input_tokens or 0)
+        )
+
+    return {
+        "cache_read_input_tokens": cache_read_input_tokens,
+        "cache_creation_input_tokens": cache_creation_input_tokens,
+        "total_input_tokens": total_input_tokens,
+    }
+
 
 def decode_tool_use_in_stream(tool_use):
-    # input get sent encoded in json
-    if "input" in tool_use:
+    # input get sent encoded in json, unless no delta was recorded for it
+    if isinstance(tool_use.get("input"), str):
         try:
             tool_use["input"] = json.loads(tool_use["input"])
         except json.JSONDecodeError:
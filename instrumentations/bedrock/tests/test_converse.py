@@ -20,6 +20,11 @@ import pytest
 from botocore.exceptions import ClientError
 
 import llm_tracekit.core._extended_gen_ai_attributes as ExtendedGenAIAttributes
+from llm_tracekit.core import (
+    GEN_AI_CLIENT_ACTIVE_REQUESTS,
+    GEN_AI_CLIENT_ACTIVE_STREAMS,
+    GEN_AI_CLIENT_OUTPUT_THROUGHPUT,
+)
 from .utils import (
     IMAGE_DATA,
     assert_attributes_in_span,
@@ -168,6 +173,18 @@ def _run_and_check_converse(
         usage_output_tokens=result["usage"]["outputTokens"],
     )
 
+    metrics_by_name = {metric.name: metric for metric in metric_data}
+    (throughput,) = metrics_by_name[GEN_AI_CLIENT_OUTPUT_THROUGHPUT].data.data_points
+    assert throughput.count == 1
+    assert throughput.sum > 0
+    (active_requests,) = metrics_by_name[GEN_AI_CLIENT_ACTIVE_REQUESTS].data.data_points
+    assert active_requests.value == 0
+    if stream:
+        (active_streams,) = metrics_by_name[
+            GEN_AI_CLIENT_ACTIVE_STREAMS
+        ].data.data_points
+        assert active_streams.value == 0
+
 
 def _run_and_check_converse_tool_calls(
     bedrock_client,
@@ -23,6 +23,7 @@ from typing import Any
 from opentelemetry.semconv._incubating.attributes import (
     gen_ai_attributes as GenAIAttributes,
 )
+from opentelemetry import trace
 from opentelemetry.trace import SpanKind, Tracer
 
 from llm_tracekit.gemini.state import GeminiOperationState, GeminiSpanContext
@@ -32,8 +33,21 @@ from llm_tracekit.gemini.utils import (
     build_request_details,
     build_response_details,
     GeminiEmbedResponseDetails,
+    GeminiUsage,
+)
+from llm_tracekit.core import (
+    handle_span_exception,
+    deferred_message_events,
+    InFlight,
+    Instruments,
+    limit_metric_attributes,
+    record_cache_usage_metrics,
+    record_output_throughput,
+    record_reasoning_usage_metrics,
+    record_stream_output_throughput,
+    track_request,
+    track_stream,
 )
-from llm_tracekit.core import handle_span_exception, Instruments
 
 
 _GEMINI_SYSTEM_VALUE = getattr(
@@ -65,13 +79,14 @@ def generate_content_wrapper(
         system_instruction = _get_argument(args, kwargs, name="system_instruction")
         config_payload = _get_argument(args, kwargs, name="config", position=2)
 
-        request_details = build_request_details(
-            model=model,
-            contents=contents,
-            system_instruction=system_instruction,
-            config=config_payload,
-            capture_content=config.capture_content,
-        )
+        with deferred_message_events() as message_events:
+            request_details = build_request_details(
+                model=model,
+                contents=contents,
+                system_instruction=system_instruction,
+                config=config_payload,
+                capture_content=config.capture_content,
+            )
 
         span_attributes = dict(request_details.span_attributes)
         with config.tracer.start_as_current_span(
@@ -80,9 +95,11 @@ def generate_content_wrapper(
             attributes=span_attributes,
             end_on_exit=False,
         ) as span:
+            message_events.emit()
             operation_state = _prepare_operation_state(
                 span, request_details, config.capture_content
             )
+            in_flight = track_request(config.instruments, span_attributes)
 
             try:
                 result = wrapped(*args, **kwargs)
@@ -106,6 +123,7 @@ def generate_content_wrapper(
                 _handle_exception(operation_state, error)
                 raise
             finally:
+                in_flight.end()
                 _record_metrics(operation_state, config.instruments)
 
     return traced_method
@@ -126,13 +144,14 @@ def generate_content_stream_wrapper(
         system_instruction = _get_argument(args, kwargs, name="system_instruction")
         config_payload = _get_argument(args, kwargs, name="config", position=2)
 
-        request_details = build_request_details(
-            model=model,
-            contents=contents,
-            system_instruction=system_instruction,
-            config=config_payload,
-            capture_content=config.capture_content,
-        )
+        with deferred_message_events() as message_events:
+            request_details = build_request_details(
+                model=model,
+                contents=contents,
+                system_instruction=system_instruction,
+                config=config_payload,
+                capture_content=config.capture_content,
+            )
 
         span_attributes = dict(request_details.span_attributes)
 
@@ -141,20 +160,26 @@ def generate_content_stream_wrapper(
             kind=SpanKind.CLIENT,
             attributes=span_attributes,
         )
+        with trace.use_span(span, end_on_exit=False):
+            message_events.emit()
         operation_state = _prepare_operation_state(
             span, request_details, config.capture_content
         )
 
+        in_flight = track_request(config.instruments, span_attributes)
         try:
             stream = wrapped(*args, **kwargs)
         except Exception as error:
             _handle_exception(operation_state, error)
             raise
+        finally:
+            in_flight.end()
 
         return GeminiStreamWrapper(
             stream=stream,
             operation_state=operation_state,
             instruments=config.instruments,
+            active_stream=track_stream(config.instruments, span_attributes, in_flight),
         )
 
     return traced_method
@@ -175,13 +200,14 @@ def async_generate_content_wrapper(
         system_instruction = _get_argument(args, kwargs, name="system_instruction")
         config_payload = _get_argument(args, kwargs, name="config", position=2)
 
-        request_details = build_request_details(
-            model=model,
-            contents=contents,
-            system_instruction=system_instruction,
-            config=config_payload,
-            capture_content=config.capture_content,
-        )
+        with deferred_message_events() as message_events:
+            request_details = build_request_details(
+                model=model,
+                contents=contents,
+                system_instruction=system_instruction,
+                config=config_payload,
+                capture_content=config.capture_content,
+            )
 
         span_attributes = dict(request_details.span_attributes)
 
@@ -190,16 +216,21 @@ def async_generate_content_wrapper(
             kind=SpanKind.CLIENT,
             attributes=span_attributes,
         )
+        with trace.use_span(span, end_on_exit=False):
+            message_events.emit()
         operation_state = _prepare_operation_state(
             span, request_details, config.capture_content
         )
 
+        in_flight = track_request(config.instruments, span_attributes)
+
         try:
             result = await wrapped(*args, **kwargs)
-            operation_state.response_details = build_response_details(
-                response=result,
-                capture_content=config.capture_content,
-            )
+            with trace.use_span(span, end_on_exit=False):
+                operation_state.response_details = build_response_details(
+                    response=result,
+                    capture_content=config.capture_content,
+                )
             operation_state.finish_reasons = (
                 operation_state.response_details.finish_reasons
             )
@@ -214,6 +245,7 @@ def async_generate_content_wrapper(
             _handle_exception(operation_state, error)
             raise
         finally:
+            in_flight.end()
             _record_metrics(operation_state, config.instruments)
 
     return traced_method
@@ -234,13 +266,14 @@ def async_generate_content_stream_wrapper(
         system_instruction = _get_argument(args, kwargs, name="system_instruction")
         config_payload = _get_argument(args, kwargs, name="config", position=2)
 
-        request_details = build_request_details(
-            model=model,
-            contents=contents,
-            system_instruction=system_instruction,
-            config=config_payload,
-            capture_content=config.capture_content,
-        )
+        with deferred_message_events() as message_events:
+            request_details = build_request_details(
+                model=model,
+                contents=contents,
+                system_instruction=system_instruction,
+                config=config_payload,
+                capture_content=config.capture_content,
+            )
 
         span_attributes = dict(request_details.span_attributes)
 
@@ -249,20 +282,26 @@ def async_generate_content_stream_wrapper(
             kind=SpanKind.CLIENT,
             attributes=span_attributes,
         )
+        with trace.use_span(span, end_on_exit=False):
+            message_events.emit()
         operation_state = _prepare_operation_state(
             span, request_details, config.capture_content
         )
 
+        in_flight = track_request(config.instruments, span_attributes)
         try:
             stream = await wrapped(*args, **kwargs)
         except Exception as error:
             _handle_exception(operation_state, error)
             raise
+        finally:
+            in_flight.end()
 
         return GeminiAsyncStreamWrapper(
             stream=stream,
             operation_state=operation_state,
             instruments=config.instruments,
+            active_stream=track_stream(config.instruments, span_attributes, in_flight),
         )
 
     return traced_method
@@ -274,10 +313,12 @@ class GeminiStreamWrapper(Iterator[Any]):
         stream: Iterator[Any],
         operation_state: GeminiOperationState,
         instruments: Instruments,
+        active_stream: InFlight | None = None,
     ) -> None:
         self._stream = stream
         self._state = operation_state
         self._instruments = instruments
+        self._active_stream = active_stream
         self._finalized = False
 
     def __iter__(self) -> "GeminiStreamWrapper":
@@ -317,6 +358,7 @@ class GeminiStreamWrapper(Iterator[Any]):
         handle_span_exception(self._state.span_context.span, error)
         self._state.mark_span_finished()
         self._finalized = True
+        self._end_active_stream()
         _record_metrics(self._state, self._instruments)
 
     def _finalize(self) -> None:
@@ -326,7 +368,9 @@ class GeminiStreamWrapper(Iterator[Any]):
         self._finalized = True
         stream_state = self._state.stream_state
         if stream_state is not None and self._state.response_details is None:
-            self._state.response_details = stream_state.finalize()
+            # the choice events of the response are correlated with the current span
+            with trace.use_span(self._state.span_context.span, end_on_exit=False):
+                self._state.response_details = stream_state.finalize()
             self._state.finish_reasons = self._state.response_details.finish_reasons
 
         span = self._state.span_context.span
@@ -336,8 +380,13 @@ class GeminiStreamWrapper(Iterator[Any]):
             span.end()
             self._state.mark_span_finished()
 
+        self._end_active_stream()
         _record_metrics(self._state, self._instruments)
 
+    def _end_active_stream(self) -> None:
+        if self._active_stream is not None:
+            self._active_stream.end()
+
     def __del__(self) -> None:
         self._finalize()
 
@@ -348,10 +397,12 @@ class GeminiAsyncStreamWrapper(AsyncIterator[Any]):
         stream: AsyncIterator[Any],
         operation_state: GeminiOperationState,
         instruments: Instruments,
+        active_stream: InFlight | None = None,
     ) -> None:
         self._stream = stream
         self._state = operation_state
         self._instruments = instruments
+        self._active_stream = active_stream
         self._finalized = False
 
     def __aiter__(self) -> "GeminiAsyncStreamWrapper":
@@ -392,6 +443,7 @@ class GeminiAsyncStreamWrapper(AsyncIterator[Any]):
         handle_span_exception(self._state.span_context.span, error)
         self._state.mark_span_finished()
         self._finalized = True
+        self._end_active_stream()
         _record_metrics(self._state, self._instruments)
 
     async def _finalize(self) -> None:
@@ -401,7 +453,9 @@ class GeminiAsyncStreamWrapper(AsyncIterator[Any]):
         self._finalized = True
         stream_state = self._state.stream_state
         if stream_state is not None and self._state.response_details is None:
-            self._state.response_details = stream_state.finalize()
+            # the choice events of the response are correlated with the current span
+            with trace.use_span(self._state.span_context.span, end_on_exit=False):
+                self._state.response_details = stream_state.finalize()
             self._state.finish_reasons = self._state.response_details.finish_reasons
 
         span = self._state.span_context.span
@@ -411,9 +465,15 @@ class GeminiAsyncStreamWrapper(AsyncIterator[Any]):
             span.end()
             self._state.mark_span_finished()
 
+        self._end_active_stream()
         _record_metrics(self._state, self._instruments)
 
+    def _end_active_stream(self) -> None:
+        if self._active_stream is not None:
+            self._active_stream.end()
+
     def __del__(self) -> None:
+        self._end_active_stream()
         _record_metrics(self._state, self._instruments)
 
 
@@ -470,6 +530,7 @@ def _record_metrics(
     if operation_state.error_type is not None:
         common_attributes["error.type"] = operation_state.error_type
 
+    common_attributes = limit_metric_attributes(instruments, common_attributes)
     instruments.operation_duration_histogram.record(
         duration_s,
         attributes=common_attributes,
@@ -497,9 +558,47 @@ def _record_metrics(
                 attributes=completion_attributes,
             )
 
+        record_cache_usage_metrics(
+            instruments,
+            common_attributes,
+            cache_read_input_tokens=usage.cached_content_tokens,
+            total_input_tokens=usage.prompt_tokens,
+        )
+        record_reasoning_usage_metrics(
+            instruments,
+            common_attributes,
+            reasoning_output_tokens=usage.thoughts_tokens,
+        )
+
+        if operation_state.error_type is None:
+            _record_output_throughput(
+                operation_state, usage, instruments, common_attributes, duration_s
+            )
+
     operation_state.mark_metrics_recorded()
 
 
+def _record_output_throughput(
+    operation_state: GeminiOperationState,
+    usage: GeminiUsage,
+    instruments: Instruments,
+    attributes: dict[str, Any],
+    duration_s: float,
+) -> None:
+    stream_state = operation_state.stream_state
+    if stream_state is None:
+        record_output_throughput(
+            instruments, attributes, usage.candidates_tokens, duration_s
+        )
+    elif stream_state.reasoning_timer is not None:
+        record_stream_output_throughput(
+            instruments,
+            attributes,
+            usage.candidates_tokens,
+            stream_state.reasoning_timer,
+        )
+
+
 def _get_argument(args, kwargs, name: str, position: int | None = None):
     if name in kwargs:
         return kwargs[name]
@@ -523,12 +622,13 @@ def embed_content_wrapper(
         contents = _get_argument(args, kwargs, name="contents", position=1)
         config_payload = _get_argument(args, kwargs, name="config", position=2)
 
-        request_details = build_embed_request_details(
-            model=model,
-            contents=contents,
-            config=config_payload,
-            capture_content=config.capture_content,
-        )
+        with deferred_message_events() as message_events:
+            request_details = build_embed_request_details(
+                model=model,
+                contents=contents,
+                config=config_payload,
+                capture_content=config.capture_content,
+            )
 
         span_attributes = dict(request_details.span_attributes)
         start_time_ns = perf_counter_ns()
@@ -539,8 +639,10 @@ def embed_content_wrapper(
             attributes=span_attributes,
             end_on_exit=False,
         ) as span:
+            message_events.emit()
             error_type = None
             response_details = None
+            in_flight = track_request(config.instruments, span_attributes)
             try:
                 result = wrapped(*args, **kwargs)
                 response_details = build_embed_response_details(
@@ -558,6 +660,7 @@ def embed_content_wrapper(
                 handle_span_exception(span, error)
                 raise
             finally:
+                in_flight.end()
                 _record_embed_metrics(
                     instruments=config.instruments,
                     start_time_ns=start_time_ns,
@@ -584,12 +687,13 @@ def async_embed_content_wrapper(
         contents = _get_argument(args, kwargs, name="contents", position=1)
         config_payload = _get_argument(args, kwargs, name="config", position=2)
 
-        request_details = build_embed_request_details(
-            model=model,
-            contents=contents,
-            config=config_payload,
-            capture_content=config.capture_content,
-        )
+        with deferred_message_events() as message_events:
+            request_details = build_embed_request_details(
+                model=model,
+                contents=contents,
+                config=config_payload,
+                capture_content=config.capture_content,
+            )
 
         span_attributes = dict(request_details.span_attributes)
         start_time_ns = perf_counter_ns()
@@ -600,8 +704,10 @@ def async_embed_content_wrapper(
             attributes=span_attributes,
             end_on_exit=False,
         ) as span:
+            message_events.emit()
             error_type = None
             response_details = None
+            in_flight = track_request(config.instruments, span_attributes)
             try:
                 result = await wrapped(*args, **kwargs)
                 response_details = build_embed_response_details(
@@ -619,6 +725,7 @@ def async_embed_content_wrapper(
                 handle_span_exception(span, error)
                 raise
             finally:
+                in_flight.end()
                 _record_embed_metrics(
                     instruments=config.instruments,
                     start_time_ns=start_time_ns,
@@ -659,6 +766,7 @@ def _record_embed_metrics(
     if error_type is not None:
         common_attributes["error.type"] = error_type
 
+    common_attributes = limit_metric_attributes(instruments, common_attributes)
     instruments.operation_duration_histogram.record(
         duration_s,
         attributes=common_attributes,
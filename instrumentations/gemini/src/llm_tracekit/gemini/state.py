@@ -47,7 +47,8 @@ class GeminiOperationState:
     def ensure_stream_state(self) -> GeminiStreamState:
         if self.stream_state is None:
             self.stream_state = GeminiStreamState(
-                capture_content=self.span_context.capture_content
+                capture_content=self.span_context.capture_content,
+                start_time=self.span_context.start_time_ns / 1_000_000_000,
             )
         return self.stream_state
 
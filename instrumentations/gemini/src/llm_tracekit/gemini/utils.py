@@ -18,7 +18,7 @@ from __future__ import annotations
 import json
 from dataclasses import asdict, dataclass, field, is_dataclass
 from enum import Enum
-from typing import Any, Iterable, Sequence
+from typing import Any, Iterable, Mapping, Sequence
 
 from opentelemetry.semconv._incubating.attributes import (
     gen_ai_attributes as GenAIAttributes,
@@ -29,10 +29,20 @@ from llm_tracekit.core import (
     Message,
     ToolCall,
     generate_base_attributes,
+    generate_cache_usage_attributes,
     generate_choice_attributes,
+    generate_embedding_input_attributes,
+    generate_embedding_vector_attributes,
     generate_message_attributes,
+    generate_reasoning_usage_attributes,
     generate_request_attributes,
     generate_response_attributes,
+    get_stream_memory_budget,
+    StreamBufferReservation,
+    StreamAccumulator,
+    ToolAttributesCache,
+    ReasoningTimer,
+    is_deferred_stream_processing_enabled,
 )
 from llm_tracekit.core import _extended_gen_ai_attributes as ExtendedGenAIAttributes
 
@@ -45,6 +55,8 @@ _OPERATION_NAME_EMBEDDINGS = GenAIAttributes.GenAiOperationNameValues.EMBEDDINGS
 class GeminiUsage:
     prompt_tokens: int | None = None
     candidates_tokens: int | None = None
+    cached_content_tokens: int | None = None
+    thoughts_tokens: int | None = None
 
 
 @dataclass
@@ -86,7 +98,7 @@ class GeminiToolCallBuffer:
     index: int
     tool_call_id: str | None = None
     function_name: str | None = None
-    arguments: list[str] = field(default_factory=list)
+    arguments: StreamAccumulator = field(default_factory=StreamAccumulator)
 
     def add_arguments(self, value: str | None, capture_content: bool) -> None:
         if not capture_content:
@@ -98,7 +110,7 @@ class GeminiToolCallBuffer:
     def to_tool_call(self, capture_content: bool) -> ToolCall:
         arguments_value: str | None = None
         if capture_content and self.arguments:
-            arguments_value = "".join(self.arguments)
+            arguments_value = self.arguments.getvalue()
 
         return ToolCall(
             id=self.tool_call_id,
@@ -113,20 +125,26 @@ class GeminiCandidateBuffer:
     index: int
     role: str | None = None
     finish_reason: str | None = None
-    text_parts: list[str] = field(default_factory=list)
+    reservation: StreamBufferReservation | None = None
+    text: StreamAccumulator = field(init=False)
     tool_calls: dict[int, GeminiToolCallBuffer] = field(default_factory=dict)
 
+    def __post_init__(self) -> None:
+        self.text = StreamAccumulator(self.reservation)
+
     def append_text(self, text: str | None) -> None:
         if text is None:
             return
-        self.text_parts.append(text)
+        self.text.append(text)
 
     def upsert_tool_call(
         self, tool_call: GeminiPartialToolCall, capture_content: bool
     ) -> None:
         call_index = tool_call.index
         if call_index not in self.tool_calls:
-            self.tool_calls[call_index] = GeminiToolCallBuffer(index=call_index)
+            self.tool_calls[call_index] = GeminiToolCallBuffer(
+                index=call_index, arguments=StreamAccumulator(self.reservation)
+            )
 
         buffer = self.tool_calls[call_index]
         if tool_call.tool_call_id is not None:
@@ -137,8 +155,8 @@ class GeminiCandidateBuffer:
 
     def to_choice(self, capture_content: bool) -> Choice:
         content_value: str | None = None
-        if self.text_parts:
-            content_value = "".join(self.text_parts)
+        if self.text:
+            content_value = self.text.getvalue()
 
         tool_calls_list: list[ToolCall] | None = None
         if self.tool_calls:
@@ -162,8 +180,32 @@ class GeminiStreamState:
     response_id: str | None = None
     usage: GeminiUsage = field(default_factory=GeminiUsage)
     candidate_buffers: dict[int, GeminiCandidateBuffer] = field(default_factory=dict)
+    buffer_reservation: StreamBufferReservation = field(
+        default_factory=lambda: get_stream_memory_budget().open_buffer()
+    )
+    defer_processing: bool = field(
+        default_factory=is_deferred_stream_processing_enabled
+    )
+    pending_chunks: list[Any] = field(default_factory=list)
+    # `timeit.default_timer` reading of the request, only known for streams
+    start_time: float | None = None
+    reasoning_timer: ReasoningTimer | None = field(init=False, default=None)
+
+    def __post_init__(self) -> None:
+        if self.start_time is not None:
+            self.reasoning_timer = ReasoningTimer(
+                self.start_time, observed=not self.defer_processing
+            )
 
     def ingest_chunk(self, chunk: Any) -> None:
+        if self.defer_processing:
+            # only keep a reference to the chunk, it is parsed in `finalize`
+            self.pending_chunks.append(chunk)
+            return
+
+        self._process_chunk(chunk)
+
+    def _process_chunk(self, chunk: Any) -> None:
         if chunk is None:
             return
 
@@ -180,6 +222,10 @@ class GeminiStreamState:
             self.usage.prompt_tokens = usage.prompt_tokens
         if usage.candidates_tokens is not None:
             self.usage.candidates_tokens = usage.candidates_tokens
+        if usage.cached_content_tokens is not None:
+            self.usage.cached_content_tokens = usage.cached_content_tokens
+        if usage.thoughts_tokens is not None:
+            self.usage.thoughts_tokens = usage.thoughts_tokens
 
         for index, candidate in enumerate(
             _iter_sequence(_safe_get(chunk, "candidates"))
@@ -197,16 +243,28 @@ class GeminiStreamState:
             if role is not None:
                 buffer.role = role
             for part_index, part in enumerate(_iter_parts(content)):
-                text_part = _extract_text_from_part(part)
-                if text_part is not None:
-                    buffer.append_text(text_part)
+                if (
+                    self.reasoning_timer is not None
+                    and self.reasoning_timer.first_content_time is None
+                ):
+                    _observe_reasoning(self.reasoning_timer, part)
+                # without content capture only the metadata of the stream is kept
+                if self.capture_content:
+                    buffer.append_text(_extract_text_from_part(part))
                 partial_tool_call = extract_tool_call_from_part(part, part_index)
                 if partial_tool_call is not None:
                     buffer.upsert_tool_call(partial_tool_call, self.capture_content)
 
     def finalize(self) -> GeminiResponseDetails:
+        for chunk in self.pending_chunks:
+            self._process_chunk(chunk)
+        self.pending_chunks.clear()
+
+        capture_content = (
+            self.capture_content and self.buffer_reservation.content_allowed
+        )
         choices = [
-            buffer.to_choice(self.capture_content)
+            buffer.to_choice(capture_content)
             for _, buffer in sorted(self.candidate_buffers.items())
         ]
         finish_reasons = [
@@ -230,10 +288,25 @@ class GeminiStreamState:
                 usage_input_tokens=self.usage.prompt_tokens,
                 usage_output_tokens=self.usage.candidates_tokens,
             ),
+            # `prompt_token_count` already includes the cached content tokens
+            **generate_cache_usage_attributes(
+                cache_read_input_tokens=self.usage.cached_content_tokens,
+                total_input_tokens=self.usage.prompt_tokens,
+            ),
+            **generate_reasoning_usage_attributes(
+                reasoning_output_tokens=self.usage.thoughts_tokens,
+                reasoning_duration=(
+                    self.reasoning_timer.estimate(self.usage.thoughts_tokens)
+                    if self.reasoning_timer is not None
+                    else None
+                ),
+            ),
             **generate_choice_attributes(
-                choices=choices, capture_content=self.capture_content
+                choices=choices, capture_content=capture_content
             ),
+            **self.buffer_reservation.attributes(),
         }
+        self.buffer_reservation.release()
 
         return GeminiResponseDetails(
             span_attributes=attributes,
@@ -247,7 +320,7 @@ class GeminiStreamState:
     def _get_candidate_buffer(self, candidate_index: int) -> GeminiCandidateBuffer:
         if candidate_index not in self.candidate_buffers:
             self.candidate_buffers[candidate_index] = GeminiCandidateBuffer(
-                index=candidate_index
+                index=candidate_index, reservation=self.buffer_reservation
             )
         return self.candidate_buffers[candidate_index]
 
@@ -281,6 +354,7 @@ def build_request_details(
     message_attributes = generate_message_attributes(
         messages=messages,
         capture_content=capture_content,
+        model=model,
     )
 
     attributes: dict[str, Any] = {
@@ -399,6 +473,10 @@ def extract_usage_metadata(value: Any) -> GeminiUsage:
     return GeminiUsage(
         prompt_tokens=prompt_tokens,
         candidates_tokens=candidates_tokens,
+        cached_content_tokens=_as_int(
+            _safe_get(metadata, "cached_content_token_count")
+        ),
+        thoughts_tokens=_as_int(_safe_get(metadata, "thoughts_token_count")),
     )
 
 
@@ -435,13 +513,9 @@ def _config_to_request_attributes(config: Any) -> dict[str, Any]:
     return attributes
 
 
-def _config_to_tool_attributes(config: Any) -> dict[str, Any]:
-    if config is None:
-        return {}
-
-    tools_value = _safe_get(config, "tools")
+def _build_tool_attributes(tools: Sequence[Any]) -> dict[str, Any]:
     tool_definitions: list[Any] = []
-    for tool in _iter_sequence(tools_value):
+    for tool in tools:
         function_declarations = (
             _safe_get(tool, "function_declarations")
             or _safe_get(tool, "functionDeclarations")
@@ -486,6 +560,16 @@ def _config_to_tool_attributes(config: Any) -> dict[str, Any]:
     return attributes
 
 
+_tool_attributes = ToolAttributesCache(_build_tool_attributes)
+
+
+def _config_to_tool_attributes(config: Any) -> Mapping[str, Any]:
+    if config is None:
+        return {}
+
+    return _tool_attributes.get(_iter_sequence(_safe_get(config, "tools")))
+
+
 def _contents_to_messages(contents: Any) -> list[Message]:
     messages: list[Message] = []
     for entry in _iter_sequence(contents):
@@ -581,7 +665,7 @@ def _contents_to_messages(contents: Any) -> list[Message]:
                     id=buffer.tool_call_id,
                     type="function",
                     function_name=buffer.function_name,
-                    function_arguments="".join(buffer.arguments)
+                    function_arguments=buffer.arguments.getvalue()
                     if buffer.arguments
                     else None,
                 )
@@ -623,6 +707,13 @@ def _iter_sequence(value: Any) -> Iterable[Any]:
     return (value,)
 
 
+def _observe_reasoning(reasoning_timer: ReasoningTimer, part: Any) -> None:
+    if _safe_get(part, "thought"):
+        reasoning_timer.mark_reasoning()
+    elif _safe_get(part, "text") or _safe_get(part, "function_call") is not None:
+        reasoning_timer.mark_content()
+
+
 def _extract_text_from_part(part: Any) -> str | None:
     if part is None:
         return None
@@ -895,19 +986,18 @@ def build_embed_request_details(
     capture_content: bool,
 ) -> GeminiEmbedRequestDetails:
     """Build request details for embed_content operations."""
-    messages = _embed_contents_to_messages(contents)
-
     attributes: dict[str, Any] = {
         **generate_base_attributes(system=_GOOGLE_GENAI_SYSTEM),
         GenAIAttributes.GEN_AI_OPERATION_NAME: _OPERATION_NAME_EMBEDDINGS,
         GenAIAttributes.GEN_AI_REQUEST_MODEL: model,
     }
 
-    message_attributes = generate_message_attributes(
-        messages=messages,
+    input_attributes = generate_embedding_input_attributes(
+        _embed_contents_to_items(contents),
         capture_content=capture_content,
+        item_text=_stringify_value,
     )
-    attributes.update(message_attributes)
+    attributes.update(input_attributes)
 
     output_dimensionality = _safe_get(config, "output_dimensionality")
     if output_dimensionality is not None:
@@ -944,11 +1034,7 @@ def build_embed_response_details(
         for index, embedding in enumerate(_iter_sequence(embeddings)):
             values = _safe_get(embedding, "values")
             if values is not None:
-                attributes[
-                    ExtendedGenAIAttributes.GEN_AI_EMBEDDING_VECTOR.format(
-                        embedding_index=index
-                    )
-                ] = list(values) if not isinstance(values, list) else values
+                attributes.update(generate_embedding_vector_attributes(index, values))
 
     return GeminiEmbedResponseDetails(
         span_attributes=attributes,
@@ -957,27 +1043,15 @@ def build_embed_response_details(
     )
 
 
-def _embed_contents_to_messages(contents: Any) -> list[Message]:
-    """Convert embed_content contents to messages for attribute generation."""
-    messages: list[Message] = []
-
+def _embed_contents_to_items(contents: Any) -> list[Any]:
+    """Split embed_content contents into the items that are embedded."""
     if contents is None:
-        return messages
+        return []
 
     if isinstance(contents, str):
-        messages.append(Message(role="user", content=contents))
-        return messages
+        return [contents]
 
-    for entry in _iter_sequence(contents):
-        if entry is None:
-            continue
-        if isinstance(entry, str):
-            messages.append(Message(role="user", content=entry))
-        else:
-            text_value = _stringify_value(entry)
-            messages.append(Message(role="user", content=text_value))
-
-    return messages
+    return [entry for entry in _iter_sequence(contents) if entry is not None]
 
 
 def _extract_embed_usage(response: Any) -> GeminiUsage:
@@ -15,7 +15,7 @@
 from __future__ import annotations
 
 import json
-from collections.abc import Mapping
+from collections.abc import Mapping, Sequence
 from timeit import default_timer
 from typing import Any
 from uuid import UUID
@@ -23,12 +23,23 @@ from uuid import UUID
 from langchain_core.callbacks import BaseCallbackHandler  # type: ignore
 from langchain_core.messages import BaseMessage  # type: ignore
 from langchain_core.outputs import LLMResult  # type: ignore
+from opentelemetry import trace
 from opentelemetry.semconv._incubating.attributes import (
     gen_ai_attributes as GenAIAttributes,
 )
 
 import llm_tracekit.core._extended_gen_ai_attributes as ExtendedGenAIAttributes
-from llm_tracekit.core import handle_span_exception
+from llm_tracekit.core import (
+    ToolAttributesCache,
+    deferred_message_events,
+    get_token_estimator,
+    handle_span_exception,
+    is_token_usage_estimation_enabled,
+    limit_metric_attributes,
+    record_output_throughput,
+    track_request,
+    track_stream,
+)
 from llm_tracekit.core._metrics import Instruments
 from llm_tracekit.langchain.span_manager import LangChainSpanManager, LangChainSpanState
 from llm_tracekit.langchain.utils import (
@@ -116,13 +127,14 @@ class LangChainCallbackHandler(BaseCallbackHandler):  # type: ignore[misc]
             ),
         )
 
-        span_attributes: dict[str, Any] = {
-            **generate_base_attributes(system=system_value),
-            **request_attributes,
-            **generate_message_attributes(
-                messages=prompt_history, capture_content=self._capture_content
-            ),
-        }
+        with deferred_message_events() as message_events:
+            span_attributes: dict[str, Any] = {
+                **generate_base_attributes(system=system_value),
+                **request_attributes,
+                **generate_message_attributes(
+                    messages=prompt_history, capture_content=self._capture_content
+                ),
+            }
 
         available_tool_attributes = _generate_available_tools_attributes(
             invocation_params
@@ -160,7 +172,34 @@ class LangChainCallbackHandler(BaseCallbackHandler):  # type: ignore[misc]
 
         state = self._span_manager.get_state(run_id)
         if state:
+            with trace.use_span(state.span, end_on_exit=False):
+                message_events.emit()
             state.request_model = request_model
+            if is_token_usage_estimation_enabled():
+                state.prompt_history = prompt_history
+            if self._instruments is not None:
+                state.in_flight = track_request(self._instruments, span_attributes)
+        return None
+
+    def on_llm_new_token(
+        self,
+        token: str,
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        state = self._span_manager.get_state(run_id)
+        if state is None or state.first_token_time is not None:
+            return None
+
+        # the request of a streamed run is answered once its first token arrives
+        state.first_token_time = default_timer()
+        if state.in_flight is not None:
+            state.in_flight.end()
+            state.in_flight = track_stream(
+                self._instruments, state.span_attributes, state.in_flight
+            )
         return None
 
     def on_llm_end(
@@ -179,6 +218,20 @@ class LangChainCallbackHandler(BaseCallbackHandler):  # type: ignore[misc]
         choices, finish_reasons, input_tokens, output_tokens = build_response_choices(
             generations
         )
+        usage_estimated = False
+        if state.prompt_history is not None and (
+            input_tokens is None or output_tokens is None
+        ):
+            estimator = get_token_estimator()
+            if input_tokens is None:
+                input_tokens = estimator.count_message_tokens(
+                    state.prompt_history, state.request_model
+                )
+            if output_tokens is None:
+                output_tokens = estimator.count_choice_tokens(
+                    choices, state.request_model
+                )
+            usage_estimated = True
 
         llm_output = getattr(response, "llm_output", None)
         response_model = _extract_response_model(llm_output)
@@ -194,10 +247,16 @@ class LangChainCallbackHandler(BaseCallbackHandler):  # type: ignore[misc]
                 usage_input_tokens=input_tokens,
                 usage_output_tokens=output_tokens,
             ),
-            **generate_choice_attributes(
-                choices=choices, capture_content=self._capture_content
-            ),
         }
+        # the chat span is not current in callbacks, so it is activated for the choice events
+        with trace.use_span(state.span, end_on_exit=False):
+            response_attributes.update(
+                generate_choice_attributes(
+                    choices=choices, capture_content=self._capture_content
+                )
+            )
+        if usage_estimated:
+            response_attributes[ExtendedGenAIAttributes.GEN_AI_USAGE_ESTIMATED] = True
 
         state.span.set_attributes(response_attributes)
         state.span_attributes.update(response_attributes)
@@ -210,6 +269,7 @@ class LangChainCallbackHandler(BaseCallbackHandler):  # type: ignore[misc]
             usage_input_tokens=input_tokens,
             usage_output_tokens=output_tokens,
             error_type=None,
+            usage_estimated=usage_estimated,
         )
 
         self._span_manager.end_span(run_id)
@@ -251,6 +311,7 @@ class LangChainCallbackHandler(BaseCallbackHandler):  # type: ignore[misc]
         usage_input_tokens: int | None,
         usage_output_tokens: int | None,
         error_type: str | None,
+        usage_estimated: bool = False,
     ) -> None:
         if self._instruments is None:
             return
@@ -273,11 +334,17 @@ class LangChainCallbackHandler(BaseCallbackHandler):  # type: ignore[misc]
         if error_type:
             common_attributes["error.type"] = error_type
 
+        common_attributes = limit_metric_attributes(
+            self._instruments, common_attributes
+        )
         self._instruments.operation_duration_histogram.record(
             duration,
             attributes=common_attributes,
         )
 
+        if usage_estimated:
+            common_attributes[ExtendedGenAIAttributes.GEN_AI_USAGE_ESTIMATED] = True
+
         if usage_input_tokens is not None:
             input_attributes = {
                 **common_attributes,
@@ -298,6 +365,20 @@ class LangChainCallbackHandler(BaseCallbackHandler):  # type: ignore[misc]
                 attributes=completion_attributes,
             )
 
+        if error_type is None:
+            # streamed runs are timed from their first token
+            generation_time = (
+                duration
+                if state.first_token_time is None
+                else default_timer() - state.first_token_time
+            )
+            record_output_throughput(
+                self._instruments,
+                common_attributes,
+                usage_output_tokens,
+                generation_time,
+            )
+
 
 def _extract_invocation_params(kwargs: dict[str, Any]) -> dict[str, Any]:
     invocation_params = kwargs.get("invocation_params")
@@ -363,13 +444,7 @@ def _get_value(
     return None
 
 
-def _generate_available_tools_attributes(
-    invocation_params: dict[str, Any],
-) -> dict[str, Any]:
-    tools = invocation_params.get("tools")
-    if not isinstance(tools, list):
-        return {}
-
+def _build_available_tools_attributes(tools: Sequence[Any]) -> dict[str, Any]:
     attributes: dict[str, Any] = {}
     for tool_index, tool in enumerate(tools):
         if not isinstance(tool, Mapping):
@@ -427,3 +502,16 @@ def _generate_available_tools_attributes(
         ] = serialized_parameters
 
     return attributes
+
+
+_available_tool_attributes = ToolAttributesCache(_build_available_tools_attributes)
+
+
+def _generate_available_tools_attributes(
+    invocation_params: dict[str, Any],
+) -> Mapping[str, Any]:
+    tools = invocation_params.get("tools")
+    if not isinstance(tools, list):
+        return {}
+
+    return _available_tool_attributes.get(tools)
@@ -34,6 +34,8 @@ from opentelemetry.semconv._incubating.attributes import (
 )
 from opentelemetry.trace import Span, SpanKind, Tracer, set_span_in_context
 
+from llm_tracekit.core import InFlight, Message
+
 
 @dataclass
 class LangChainSpanState:
@@ -51,6 +53,11 @@ class LangChainSpanState:
     span_attributes: dict[str, Any] = field(default_factory=dict)
     system_value: str | None = None
     request_model: str | None = None
+    # only kept to estimate the token usage of responses that do not report it
+    prompt_history: list[Message] | None = None
+    # the request, or once its first token arrived the stream, counted as in flight
+    in_flight: InFlight | None = None
+    first_token_time: float | None = None
 
 
 class LangChainSpanManager:
@@ -94,6 +101,8 @@ class LangChainSpanManager:
         for child_id in list(state.children):
             self.end_span(child_id)
 
+        if state.in_flight is not None:
+            state.in_flight.end()
         state.span.end()
 
     def _create_span(
@@ -0,0 +1,107 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for estimating the token usage of responses that do not report it."""
+
+from uuid import uuid4
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+from opentelemetry.semconv._incubating.attributes import (
+    gen_ai_attributes as GenAIAttributes,
+)
+
+import llm_tracekit.core._extended_gen_ai_attributes as ExtendedGenAIAttributes
+from llm_tracekit.core import (
+    OTEL_INSTRUMENTATION_GENAI_ESTIMATE_TOKEN_USAGE,
+    ApproximateTokenEstimator,
+    Choice,
+    Message,
+    set_token_estimator,
+)
+
+
+@pytest.fixture
+def estimator(monkeypatch):
+    monkeypatch.setenv(OTEL_INSTRUMENTATION_GENAI_ESTIMATE_TOKEN_USAGE, "true")
+    estimator = ApproximateTokenEstimator()
+    set_token_estimator(estimator)
+    yield estimator
+    set_token_estimator(None)
+
+
+def _run_chat(handler, message: AIMessage) -> None:
+    run_id = uuid4()
+    handler.on_chat_model_start(
+        serialized={"name": "ChatOpenAI"},
+        messages=[[HumanMessage(content="Say this is a test")]],
+        run_id=run_id,
+        invocation_params={"model": "gpt-4o-mini"},
+    )
+    handler.on_llm_end(
+        response=LLMResult(
+            generations=[
+                [
+                    ChatGeneration(
+                        message=message, generation_info={"finish_reason": "stop"}
+                    )
+                ]
+            ]
+        ),
+        run_id=run_id,
+    )
+
+
+def test_missing_usage_is_estimated(span_exporter, instrument_langchain, estimator):
+    """Test the token usage of a response without usage metadata is estimated."""
+    _run_chat(instrument_langchain._handler, AIMessage(content="This is a test."))
+
+    (span,) = span_exporter.get_finished_spans()
+    assert span.attributes[ExtendedGenAIAttributes.GEN_AI_USAGE_ESTIMATED] is True
+    assert span.attributes[
+        GenAIAttributes.GEN_AI_USAGE_INPUT_TOKENS
+    ] == estimator.count_message_tokens(
+        [Message(role="user", content="Say this is a test")], "gpt-4o-mini"
+    )
+    assert span.attributes[
+        GenAIAttributes.GEN_AI_USAGE_OUTPUT_TOKENS
+    ] == estimator.count_choice_tokens(
+        [Choice(content="This is a test.")], "gpt-4o-mini"
+    )
+
+
+def test_reported_usage_is_kept(span_exporter, instrument_langchain, estimator):
+    """Test reported token usage is not replaced by an estimate."""
+    _run_chat(
+        instrument_langchain._handler,
+        AIMessage(
+            content="This is a test.",
+            usage_metadata={"input_tokens": 12, "output_tokens": 5, "total_tokens": 17},
+        ),
+    )
+
+    (span,) = span_exporter.get_finished_spans()
+    assert ExtendedGenAIAttributes.GEN_AI_USAGE_ESTIMATED not in span.attributes
+    assert span.attributes[GenAIAttributes.GEN_AI_USAGE_INPUT_TOKENS] == 12
+    assert span.attributes[GenAIAttributes.GEN_AI_USAGE_OUTPUT_TOKENS] == 5
+
+
+def test_estimation_disabled(span_exporter, instrument_langchain):
+    """Test token usage is not estimated unless estimation is enabled."""
+    _run_chat(instrument_langchain._handler, AIMessage(content="This is a test."))
+
+    (span,) = span_exporter.get_finished_spans()
+    assert ExtendedGenAIAttributes.GEN_AI_USAGE_ESTIMATED not in span.attributes
+    assert GenAIAttributes.GEN_AI_USAGE_INPUT_TOKENS not in span.attributes
@@ -20,19 +20,23 @@ from opentelemetry.semconv._incubating.attributes import (
 )
 
 import json
-from typing import Any
+from typing import Any, Mapping, Sequence
+from opentelemetry import trace
 from opentelemetry.trace import Span
 
 from llm_tracekit.core import (
     Choice,
     Message,
+    ToolAttributesCache,
     ToolCall,
     generate_base_attributes,
     generate_choice_attributes,
     generate_message_attributes,
     generate_request_attributes,
     generate_response_attributes,
+    get_token_estimator,
     is_content_enabled,
+    is_token_usage_estimation_enabled,
 )
 from llm_tracekit.core import _extended_gen_ai_attributes as ExtendedGenAIAttributes
 
@@ -111,7 +115,13 @@ class LitellmCallback(OpenTelemetry):
             choices.append(choice)
         return choices
 
-    def set_attributes(  # noqa: PLR0915
+    def set_attributes(self, span: Span, kwargs, response_obj: Any | None):
+        # the attributes are set once the call ended, outside of the span, so it is
+        # made current for the content events to be correlated with it
+        with trace.use_span(span, end_on_exit=False):
+            self._set_attributes(span, kwargs, response_obj)
+
+    def _set_attributes(  # noqa: PLR0915
         self, span: Span, kwargs, response_obj: Any | None
     ):
         try:
@@ -122,25 +132,41 @@ class LitellmCallback(OpenTelemetry):
             choices: list[Choice] = []
 
             response_attributes: dict[str, Any] = {}
+            usage_estimated = False
 
             if "messages" in kwargs:
                 messages = self.parse_messages(kwargs.get("messages"))
 
             if response_obj is not None:
+                if "choices" in response_obj:
+                    raw_choices = response_obj.get("choices")
+                    choices = self.parse_choices(raw_choices)
+
                 usage = response_obj.get("usage")
+                input_tokens = usage.get("prompt_tokens") if usage is not None else None
+                output_tokens = (
+                    usage.get("completion_tokens") if usage is not None else None
+                )
+                if is_token_usage_estimation_enabled() and (
+                    input_tokens is None or output_tokens is None
+                ):
+                    estimator = get_token_estimator()
+                    if input_tokens is None:
+                        input_tokens = estimator.count_message_tokens(
+                            messages, kwargs.get("model")
+                        )
+                    if output_tokens is None:
+                        output_tokens = estimator.count_choice_tokens(
+                            choices, kwargs.get("model")
+                        )
+                    usage_estimated = True
+
                 response_attributes = generate_response_attributes(
                     model=response_obj.get("model"),
                     id=response_obj.get("id"),
-                    usage_input_tokens=usage.get("prompt_tokens")
-                    if usage is not None
-                    else None,
-                    usage_output_tokens=usage.get("completion_tokens")
-                    if usage is not None
-                    else None,
+                    usage_input_tokens=input_tokens,
+                    usage_output_tokens=output_tokens,
                 )
-                if "choices" in response_obj:
-                    raw_choices = response_obj.get("choices")
-                    choices = self.parse_choices(raw_choices)
 
             capture_content = is_content_enabled()
 
@@ -175,6 +201,9 @@ class LitellmCallback(OpenTelemetry):
             if user is not None:
                 attributes[ExtendedGenAIAttributes.GEN_AI_REQUEST_USER] = str(user)
 
+            if usage_estimated:
+                attributes[ExtendedGenAIAttributes.GEN_AI_USAGE_ESTIMATED] = True
+
             for key, value in attributes.items():
                 if value is not None:
                     self.safe_set_attribute(
@@ -187,18 +216,9 @@ class LitellmCallback(OpenTelemetry):
             pass
 
 
-def _generate_available_tools_attributes(
-    tools: Any | None,
-    optional_params: dict[str, Any],
-) -> dict[str, Any]:
-    candidates = tools
-    if not candidates:
-        candidates = optional_params.get("tools")
-    if not isinstance(candidates, list):
-        return {}
-
+def _build_available_tools_attributes(tools: Sequence[Any]) -> dict[str, Any]:
     attributes: dict[str, Any] = {}
-    for tool_index, tool in enumerate(candidates):
+    for tool_index, tool in enumerate(tools):
         if not isinstance(tool, dict):
             continue
 
@@ -252,3 +272,19 @@ def _generate_available_tools_attributes(
             ] = serialized_parameters
 
     return attributes
+
+
+_available_tool_attributes = ToolAttributesCache(_build_available_tools_attributes)
+
+
+def _generate_available_tools_attributes(
+    tools: Any | None,
+    optional_params: dict[str, Any],
+) -> Mapping[str, Any]:
+    candidates = tools
+    if not candidates:
+        candidates = optional_params.get("tools")
+    if not isinstance(candidates, list):
+        return {}
+
+    return _available_tool_attributes.get(candidates)
@@ -25,7 +25,12 @@ from opentelemetry.semconv.schemas import Schemas
 from opentelemetry.trace import get_tracer
 from wrapt import wrap_function_wrapper
 
-from llm_tracekit.core import is_content_enabled, Instruments
+from llm_tracekit.core import (
+    is_content_enabled,
+    provider_build_request,
+    provider_retry_timeout,
+    Instruments,
+)
 from llm_tracekit.microsoft_foundry.package import _instruments
 from llm_tracekit.microsoft_foundry.patch import (
     chat_completions_create,
@@ -35,9 +40,13 @@ from llm_tracekit.microsoft_foundry.patch import (
     embeddings_create,
     async_embeddings_create,
 )
+from llm_tracekit.microsoft_foundry.utils import MICROSOFT_FOUNDRY_SYSTEM
 
 _INSTRUMENTED_CLIENTS: weakref.WeakSet = weakref.WeakSet()
 
+# the endpoints of the instrumented methods, whose HTTP requests are observed
+_OBSERVED_PATHS = ("/chat/completions", "/embeddings", "/responses")
+
 
 class MicrosoftFoundryInstrumentor(BaseInstrumentor):
     def __init__(self):
@@ -139,6 +148,43 @@ class MicrosoftFoundryInstrumentor(BaseInstrumentor):
             )
         else:
             self._wrap_sync_client_methods(client, tracer, instruments, capture_content)
+        self._wrap_http_methods(client, instruments)
+
+    def _wrap_http_methods(self, client, instruments):
+        """Wrap the request builder and retry timeout of an OpenAI client to observe its HTTP requests."""
+        if hasattr(client, "_build_request"):
+            original_build_request = client._build_request
+            build_request_wrapper = provider_build_request(
+                instruments, MICROSOFT_FOUNDRY_SYSTEM, _OBSERVED_PATHS
+            )
+
+            def wrapped_build_request(
+                *args,
+                _orig=original_build_request,
+                _wrap=build_request_wrapper,
+                _inst=client,
+                **kwargs,
+            ):
+                return _wrap(_orig, _inst, args, kwargs)
+
+            client._build_request = wrapped_build_request
+
+        if hasattr(client, "_calculate_retry_timeout"):
+            original_retry_timeout = client._calculate_retry_timeout
+            retry_timeout_wrapper = provider_retry_timeout(
+                instruments, MICROSOFT_FOUNDRY_SYSTEM, _OBSERVED_PATHS
+            )
+
+            def wrapped_retry_timeout(
+                *args,
+                _orig=original_retry_timeout,
+                _wrap=retry_timeout_wrapper,
+                _inst=client,
+                **kwargs,
+            ):
+                return _wrap(_orig, _inst, args, kwargs)
+
+            client._calculate_retry_timeout = wrapped_retry_timeout
 
     def _wrap_sync_client_methods(self, client, tracer, instruments, capture_content):
         """Wrap sync OpenAI client methods."""
@@ -12,7 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from functools import partial
 from timeit import default_timer
+from types import SimpleNamespace
 from typing import Any
 
 from opentelemetry.semconv._incubating.attributes import (
@@ -24,18 +26,34 @@ from opentelemetry.semconv._incubating.attributes import (
 from opentelemetry.trace import SpanKind, Tracer
 from opentelemetry.util.types import AttributeValue
 
-from llm_tracekit.core import handle_span_exception, Instruments
+from llm_tracekit.core import (
+    handle_span_exception,
+    deferred_message_events,
+    Instruments,
+    ReasoningTimer,
+    limit_metric_attributes,
+    record_cache_usage_metrics,
+    record_output_throughput,
+    record_reasoning_usage_metrics,
+    record_stream_output_throughput,
+    track_request,
+    track_stream,
+)
 from llm_tracekit.microsoft_foundry.utils import (
     MICROSOFT_FOUNDRY_SYSTEM,
+    get_cached_input_tokens,
+    get_reasoning_output_tokens,
     get_chat_request_attributes,
     get_chat_response_attributes,
     get_responses_request_attributes,
     get_responses_response_attributes,
     get_embedding_request_attributes,
     get_embedding_response_attributes,
+    inject_stream_usage_option,
     is_streaming,
 )
 from llm_tracekit.microsoft_foundry.stream_wrappers import (
+    BaseChatStreamWrapper,
     ChatStreamWrapper,
     AsyncChatStreamWrapper,
     ResponsesStreamWrapper,
@@ -59,14 +77,13 @@ def _usage_prompt_and_completion_tokens(result: Any) -> tuple[int | None, int |
     return input_tok, output_tok
 
 
-def _record_metrics(
+def _metric_attributes(
     instruments: Instruments,
-    duration: float,
     result: Any,
     span_attributes: dict,
     error_type: str | None,
     operation_name: str = GenAIAttributes.GenAiOperationNameValues.CHAT.value,
-):
+) -> dict[str, AttributeValue]:
     common_attributes: dict[str, AttributeValue] = {
         GenAIAttributes.GEN_AI_OPERATION_NAME: operation_name,
         GenAIAttributes.GEN_AI_SYSTEM: MICROSOFT_FOUNDRY_SYSTEM,
@@ -102,11 +119,14 @@ def _record_metrics(
             ServerAttributes.SERVER_PORT
         ]
 
-    instruments.operation_duration_histogram.record(
-        duration,
-        attributes=common_attributes,
-    )
+    return limit_metric_attributes(instruments, common_attributes)
 
+
+def _record_token_metrics(
+    instruments: Instruments,
+    common_attributes: dict[str, AttributeValue],
+    result: Any,
+):
     prompt_tokens, completion_tokens = _usage_prompt_and_completion_tokens(result)
     if prompt_tokens is not None:
         input_attributes = {
@@ -128,6 +148,86 @@ def _record_metrics(
             attributes=completion_attributes,
         )
 
+    record_cache_usage_metrics(
+        instruments,
+        common_attributes,
+        cache_read_input_tokens=get_cached_input_tokens(
+            getattr(result, "usage", None) if result else None
+        ),
+        total_input_tokens=prompt_tokens,
+    )
+    record_reasoning_usage_metrics(
+        instruments,
+        common_attributes,
+        reasoning_output_tokens=get_reasoning_output_tokens(
+            getattr(result, "usage", None) if result else None
+        ),
+    )
+
+
+def _record_metrics(
+    instruments: Instruments,
+    duration: float,
+    result: Any,
+    span_attributes: dict,
+    error_type: str | None,
+    operation_name: str = GenAIAttributes.GenAiOperationNameValues.CHAT.value,
+):
+    common_attributes = _metric_attributes(
+        instruments, result, span_attributes, error_type, operation_name
+    )
+    instruments.operation_duration_histogram.record(
+        duration,
+        attributes=common_attributes,
+    )
+    _record_token_metrics(instruments, common_attributes, result)
+    if error_type is None:
+        record_output_throughput(
+            instruments,
+            common_attributes,
+            _usage_prompt_and_completion_tokens(result)[1],
+            duration,
+        )
+
+
+def _record_stream_token_metrics(
+    instruments: Instruments,
+    span_attributes: dict,
+    stream: BaseChatStreamWrapper,
+):
+    """Records the token usage and output throughput of a chat stream, once it ended."""
+    result = SimpleNamespace(
+        model=stream.response_model,
+        service_tier=stream.service_tier,
+        usage=stream.usage,
+    )
+    common_attributes = _metric_attributes(instruments, result, span_attributes, None)
+    _record_token_metrics(instruments, common_attributes, result)
+    record_stream_output_throughput(
+        instruments,
+        common_attributes,
+        _usage_prompt_and_completion_tokens(result)[1],
+        stream.reasoning_timer,
+        get_reasoning_output_tokens(stream.usage),
+    )
+
+
+def _record_responses_stream_throughput(
+    instruments: Instruments,
+    span_attributes: dict,
+    response: Any,
+    reasoning_timer: ReasoningTimer,
+):
+    """Records the output throughput of a responses stream, once it ended."""
+    usage = getattr(response, "usage", None)
+    record_stream_output_throughput(
+        instruments,
+        _metric_attributes(instruments, response, span_attributes, None),
+        getattr(usage, "output_tokens", None),
+        reasoning_timer,
+        get_reasoning_output_tokens(usage),
+    )
+
 
 def _record_embedding_metrics(
     instruments: Instruments,
@@ -161,6 +261,7 @@ def _record_embedding_metrics(
         if isinstance(server_port, int):
             common_attributes[ServerAttributes.SERVER_PORT] = server_port
 
+    common_attributes = limit_metric_attributes(instruments, common_attributes)
     instruments.operation_duration_histogram.record(
         duration,
         attributes=common_attributes,
@@ -190,9 +291,11 @@ def chat_completions_create(
     """Wrap chat.completions.create for tracing."""
 
     def traced_method(wrapped, instance, args, kwargs):
-        span_attributes = {
-            **get_chat_request_attributes(kwargs, instance, capture_content)
-        }
+        with deferred_message_events() as message_events:
+            span_attributes = {
+                **get_chat_request_attributes(kwargs, instance, capture_content)
+            }
+        usage_injected = inject_stream_usage_option(kwargs)
 
         span_name = f"{span_attributes[GenAIAttributes.GEN_AI_OPERATION_NAME]} {span_attributes[GenAIAttributes.GEN_AI_REQUEST_MODEL]}"
         with tracer.start_as_current_span(
@@ -201,13 +304,29 @@ def chat_completions_create(
             attributes=span_attributes,
             end_on_exit=False,
         ) as span:
+            message_events.emit()
             start = default_timer()
+            in_flight = track_request(instruments, span_attributes)
             result = None
             error_type = None
             try:
                 result = wrapped(*args, **kwargs)
                 if is_streaming(kwargs):
-                    return ChatStreamWrapper(result, span, capture_content)
+                    return ChatStreamWrapper(
+                        result,
+                        span,
+                        capture_content,
+                        start_time=start,
+                        hide_usage_chunk=usage_injected,
+                        on_usage=partial(
+                            _record_stream_token_metrics,
+                            instruments,
+                            span_attributes,
+                        ),
+                        active_stream=track_stream(
+                            instruments, span_attributes, in_flight
+                        ),
+                    )
 
                 if span.is_recording():
                     span.set_attributes(
@@ -222,6 +341,7 @@ def chat_completions_create(
                 handle_span_exception(span, error)
                 raise
             finally:
+                in_flight.end()
                 duration = max((default_timer() - start), 0)
                 _record_metrics(
                     instruments,
@@ -242,9 +362,11 @@ def async_chat_completions_create(
     """Wrap async chat.completions.create for tracing."""
 
     async def traced_method(wrapped, instance, args, kwargs):
-        span_attributes = {
-            **get_chat_request_attributes(kwargs, instance, capture_content)
-        }
+        with deferred_message_events() as message_events:
+            span_attributes = {
+                **get_chat_request_attributes(kwargs, instance, capture_content)
+            }
+        usage_injected = inject_stream_usage_option(kwargs)
 
         span_name = f"{span_attributes[GenAIAttributes.GEN_AI_OPERATION_NAME]} {span_attributes[GenAIAttributes.GEN_AI_REQUEST_MODEL]}"
         with tracer.start_as_current_span(
@@ -253,13 +375,29 @@ def async_chat_completions_create(
             attributes=span_attributes,
             end_on_exit=False,
         ) as span:
+            message_events.emit()
             start = default_timer()
+            in_flight = track_request(instruments, span_attributes)
             result = None
             error_type = None
             try:
                 result = await wrapped(*args, **kwargs)
                 if is_streaming(kwargs):
-                    return AsyncChatStreamWrapper(result, span, capture_content)
+                    return AsyncChatStreamWrapper(
+                        result,
+                        span,
+                        capture_content,
+                        start_time=start,
+                        hide_usage_chunk=usage_injected,
+                        on_usage=partial(
+                            _record_stream_token_metrics,
+                            instruments,
+                            span_attributes,
+                        ),
+                        active_stream=track_stream(
+                            instruments, span_attributes, in_flight
+                        ),
+                    )
 
                 if span.is_recording():
                     span.set_attributes(
@@ -274,6 +412,7 @@ def async_chat_completions_create(
                 handle_span_exception(span, error)
                 raise
             finally:
+                in_flight.end()
                 duration = max((default_timer() - start), 0)
                 _record_metrics(
                     instruments,
@@ -294,9 +433,12 @@ def responses_create(
     """Wrap responses.create for tracing."""
 
     def traced_method(wrapped, instance, args, kwargs):
-        span_attributes = {
-            **get_responses_request_attributes(dict(kwargs), instance, capture_content)
-        }
+        with deferred_message_events() as message_events:
+            span_attributes = {
+                **get_responses_request_attributes(
+                    dict(kwargs), instance, capture_content
+                )
+            }
 
         span_name = f"{span_attributes[GenAIAttributes.GEN_AI_OPERATION_NAME]} {span_attributes[GenAIAttributes.GEN_AI_REQUEST_MODEL]}"
         with tracer.start_as_current_span(
@@ -305,13 +447,28 @@ def responses_create(
             attributes=span_attributes,
             end_on_exit=False,
         ) as span:
+            message_events.emit()
             start = default_timer()
+            in_flight = track_request(instruments, span_attributes)
             result = None
             error_type = None
             try:
                 result = wrapped(*args, **kwargs)
                 if is_streaming(kwargs):
-                    return ResponsesStreamWrapper(result, span, capture_content)
+                    return ResponsesStreamWrapper(
+                        result,
+                        span,
+                        capture_content,
+                        start_time=start,
+                        on_response=partial(
+                            _record_responses_stream_throughput,
+                            instruments,
+                            span_attributes,
+                        ),
+                        active_stream=track_stream(
+                            instruments, span_attributes, in_flight
+                        ),
+                    )
 
                 if span.is_recording():
                     span.set_attributes(
@@ -326,6 +483,7 @@ def responses_create(
                 handle_span_exception(span, error)
                 raise
             finally:
+                in_flight.end()
                 duration = max((default_timer() - start), 0)
                 _record_metrics(
                     instruments,
@@ -346,9 +504,12 @@ def async_responses_create(
     """Wrap async responses.create for tracing."""
 
     async def traced_method(wrapped, instance, args, kwargs):
-        span_attributes = {
-            **get_responses_request_attributes(dict(kwargs), instance, capture_content)
-        }
+        with deferred_message_events() as message_events:
+            span_attributes = {
+                **get_responses_request_attributes(
+                    dict(kwargs), instance, capture_content
+                )
+            }
 
         span_name = f"{span_attributes[GenAIAttributes.GEN_AI_OPERATION_NAME]} {span_attributes[GenAIAttributes.GEN_AI_REQUEST_MODEL]}"
         with tracer.start_as_current_span(
@@ -357,13 +518,28 @@ def async_responses_create(
             attributes=span_attributes,
             end_on_exit=False,
         ) as span:
+            message_events.emit()
             start = default_timer()
+            in_flight = track_request(instruments, span_attributes)
             result = None
             error_type = None
             try:
                 result = await wrapped(*args, **kwargs)
                 if is_streaming(kwargs):
-                    return AsyncResponsesStreamWrapper(result, span, capture_content)
+                    return AsyncResponsesStreamWrapper(
+                        result,
+                        span,
+                        capture_content,
+                        start_time=start,
+                        on_response=partial(
+                            _record_responses_stream_throughput,
+                            instruments,
+                            span_attributes,
+                        ),
+                        active_stream=track_stream(
+                            instruments, span_attributes, in_flight
+                        ),
+                    )
 
                 if span.is_recording():
                     span.set_attributes(
@@ -378,6 +554,7 @@ def async_responses_create(
                 handle_span_exception(span, error)
                 raise
             finally:
+                in_flight.end()
                 duration = max((default_timer() - start), 0)
                 _record_metrics(
                     instruments,
@@ -398,11 +575,12 @@ def embeddings_create(
     """Wrap embeddings.create for tracing."""
 
     def traced_method(wrapped, instance, args, kwargs):
-        span_attributes = get_embedding_request_attributes(
-            kwargs=kwargs,
-            client_instance=instance,
-            capture_content=capture_content,
-        )
+        with deferred_message_events() as message_events:
+            span_attributes = get_embedding_request_attributes(
+                kwargs=kwargs,
+                client_instance=instance,
+                capture_content=capture_content,
+            )
 
         span_name = f"{span_attributes[GenAIAttributes.GEN_AI_OPERATION_NAME]} {span_attributes[GenAIAttributes.GEN_AI_REQUEST_MODEL]}"
         with tracer.start_as_current_span(
@@ -411,7 +589,9 @@ def embeddings_create(
             attributes=span_attributes,
             end_on_exit=False,
         ) as span:
+            message_events.emit()
             start = default_timer()
+            in_flight = track_request(instruments, span_attributes)
             result = None
             error_type = None
             try:
@@ -427,6 +607,7 @@ def embeddings_create(
                 handle_span_exception(span, error)
                 raise
             finally:
+                in_flight.end()
                 duration = max((default_timer() - start), 0)
                 _record_embedding_metrics(
                     instruments=instruments,
@@ -447,11 +628,12 @@ def async_embeddings_create(
     """Wrap async embeddings.create for tracing."""
 
     async def traced_method(wrapped, instance, args, kwargs):
-        span_attributes = get_embedding_request_attributes(
-            kwargs=kwargs,
-            client_instance=instance,
-            capture_content=capture_content,
-        )
+        with deferred_message_events() as message_events:
+            span_attributes = get_embedding_request_attributes(
+                kwargs=kwargs,
+                client_instance=instance,
+                capture_content=capture_content,
+            )
 
         span_name = f"{span_attributes[GenAIAttributes.GEN_AI_OPERATION_NAME]} {span_attributes[GenAIAttributes.GEN_AI_REQUEST_MODEL]}"
 
@@ -461,7 +643,9 @@ def async_embeddings_create(
             attributes=span_attributes,
             end_on_exit=False,
         ) as span:
+            message_events.emit()
             start = default_timer()
+            in_flight = track_request(instruments, span_attributes)
             result = None
             error_type = None
             try:
@@ -477,6 +661,7 @@ def async_embeddings_create(
                 handle_span_exception(span, error)
                 raise
             finally:
+                in_flight.end()
                 duration = max((default_timer() - start), 0)
                 _record_embedding_metrics(
                     instruments=instruments,
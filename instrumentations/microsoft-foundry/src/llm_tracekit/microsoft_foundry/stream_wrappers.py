@@ -12,9 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Any, Literal
+import inspect
+from typing import Any, Callable, Literal
 
 from openai import AsyncStream, Stream
+from openai.types.chat import ChatCompletionChunk
+from opentelemetry import trace
 from opentelemetry.semconv._incubating.attributes import (
     gen_ai_attributes as GenAIAttributes,
 )
@@ -24,39 +27,51 @@ from llm_tracekit.core import (
     ToolCall,
     Choice,
     attribute_generator,
+    generate_cache_usage_attributes,
     generate_choice_attributes,
+    generate_reasoning_usage_attributes,
     generate_response_attributes,
     handle_span_exception,
+    get_stream_memory_budget,
+    InFlight,
+    StreamBufferReservation,
+    StreamAccumulator,
+    is_deferred_stream_processing_enabled,
+    ReasoningTimer,
 )
 from llm_tracekit.microsoft_foundry.utils import (
+    get_cached_input_tokens,
+    get_reasoning_output_tokens,
     get_responses_response_attributes,
+    is_usage_chunk,
 )
 
 
 class ToolCallBuffer:
-    def __init__(self, index, tool_call_id, function_name):
+    def __init__(
+        self, index, tool_call_id, function_name, reservation: StreamBufferReservation
+    ):
         self.index = index
         self.function_name = function_name
         self.tool_call_id = tool_call_id
-        self.arguments: list[str] = []
+        self.arguments = StreamAccumulator(reservation)
 
     def append_arguments(self, arguments):
-        if arguments:
-            self.arguments.append(arguments)
+        self.arguments.append(arguments)
 
 
 class ChoiceBuffer:
-    def __init__(self, index):
+    def __init__(self, index, reservation: StreamBufferReservation):
         self.index = index
-        self.finish_reason = None
-        self.text_content: list[str] = []
+        self.finish_reason: str | None = None
+        self.text_content = StreamAccumulator(reservation)
         self.tool_calls_buffers: list[ToolCallBuffer | None] = []
+        self._reservation = reservation
 
     def append_text_content(self, content):
-        if content:
-            self.text_content.append(content)
+        self.text_content.append(content)
 
-    def append_tool_call(self, tool_call):
+    def append_tool_call(self, tool_call, capture_content=True):
         idx = tool_call.index
         for _ in range(len(self.tool_calls_buffers), idx + 1):
             self.tool_calls_buffers.append(None)
@@ -64,10 +79,12 @@ class ChoiceBuffer:
         if not self.tool_calls_buffers[idx]:
             func = getattr(tool_call, "function", None)
             func_name = getattr(func, "name", None) if func else None
-            self.tool_calls_buffers[idx] = ToolCallBuffer(idx, tool_call.id, func_name)
+            self.tool_calls_buffers[idx] = ToolCallBuffer(
+                idx, tool_call.id, func_name, self._reservation
+            )
 
         func = getattr(tool_call, "function", None)
-        if func:
+        if func and capture_content:
             args = getattr(func, "arguments", None)
             if args and self.tool_calls_buffers[idx]:
                 self.tool_calls_buffers[idx].append_arguments(args)
@@ -81,24 +98,68 @@ class BaseChatStreamWrapper:
     finish_reasons: list = []
     prompt_tokens: int | None = 0
     completion_tokens: int | None = 0
+    cached_tokens: int | None = None
+    reasoning_tokens: int | None = None
+    usage: Any = None
 
     def __init__(
         self,
         stream: Stream | AsyncStream,
         span: Span,
         capture_content: bool,
+        start_time: float | None = None,
+        hide_usage_chunk: bool = False,
+        on_usage: "Callable[[BaseChatStreamWrapper], None] | None" = None,
+        active_stream: InFlight | None = None,
     ):
         self.stream = stream
         self.span = span
         self.choice_buffers: list[ChoiceBuffer] = []
         self._span_started = False
         self.capture_content = capture_content
+        self._buffer_reservation = get_stream_memory_budget().open_buffer()
+        self._response_fields_pending = True
+        self._pending_chunks: list[Any] = []
+        self.ingest_chunk: Callable[[Any], None] = self.process_chunk
+        defer_processing = is_deferred_stream_processing_enabled()
+        if defer_processing:
+            # only keep a reference to every chunk, they are parsed in bulk in `cleanup`
+            self.ingest_chunk = self._pending_chunks.append
+        self._reasoning_timer = ReasoningTimer(
+            start_time, observed=not defer_processing
+        )
+        # the usage chunk of a stream whose usage was only requested by the
+        # instrumentation is not returned to the caller
+        self._hide_usage_chunk = hide_usage_chunk
+        self._on_usage = on_usage
+        self._active_stream = active_stream
+
         self.setup()
 
+    @property
+    def reasoning_timer(self) -> ReasoningTimer:
+        return self._reasoning_timer
+
     def setup(self):
         if not self._span_started:
             self._span_started = True
 
+    def parse(self, *args, **kwargs):
+        """Parses a raw response, and keeps tracing the stream it holds."""
+        parsed = self.stream.parse(*args, **kwargs)
+        if inspect.isawaitable(parsed):
+            return self._parse_async(parsed)
+        return self._trace_parsed(parsed)
+
+    async def _parse_async(self, parsed):
+        return self._trace_parsed(await parsed)
+
+    def _trace_parsed(self, parsed):
+        if isinstance(parsed, (Stream, AsyncStream)):
+            self.stream = parsed
+            return self
+        return parsed
+
     @attribute_generator
     def _generate_response_attributes(self) -> dict[str, Any]:
         parsed_choices = []
@@ -106,7 +167,7 @@ class BaseChatStreamWrapper:
         for choice in self.choice_buffers:
             content = None
             if choice.text_content:
-                content = "".join(choice.text_content)
+                content = choice.text_content.getvalue()
 
             tool_calls = None
             if choice.tool_calls_buffers:
@@ -118,7 +179,7 @@ class BaseChatStreamWrapper:
                                 id=tool_call.tool_call_id,
                                 type="function",
                                 function_name=tool_call.function_name,
-                                function_arguments="".join(tool_call.arguments),
+                                function_arguments=tool_call.arguments.getvalue(),
                             )
                         )
 
@@ -141,7 +202,21 @@ class BaseChatStreamWrapper:
                 usage_input_tokens=self.prompt_tokens,
                 usage_output_tokens=self.completion_tokens,
             ),
-            **generate_choice_attributes(parsed_choices, self.capture_content),
+            **generate_cache_usage_attributes(
+                cache_read_input_tokens=self.cached_tokens,
+                total_input_tokens=self.prompt_tokens,
+            ),
+            **generate_reasoning_usage_attributes(
+                reasoning_output_tokens=self.reasoning_tokens,
+                reasoning_duration=self._reasoning_timer.estimate(
+                    self.reasoning_tokens
+                ),
+            ),
+            **generate_choice_attributes(
+                parsed_choices,
+                self.capture_content and self._buffer_reservation.content_allowed,
+            ),
+            **self._buffer_reservation.attributes(),
         }
 
         if self.service_tier:
@@ -155,12 +230,19 @@ class BaseChatStreamWrapper:
         if not self._span_started:
             return
 
+        self.process_pending_chunks()
         if self.span.is_recording():
-            span_attributes = self._generate_response_attributes()
+            with trace.use_span(self.span, end_on_exit=False):
+                span_attributes = self._generate_response_attributes()
             self.span.set_attributes(span_attributes)
 
         self.span.end()
+        self._buffer_reservation.release()
         self._span_started = False
+        if self._active_stream is not None:
+            self._active_stream.end()
+        if self._on_usage is not None and self.usage is not None:
+            self._on_usage(self)
 
     def set_response_model(self, chunk):
         if self.response_model:
@@ -194,35 +276,104 @@ class BaseChatStreamWrapper:
                 continue
 
             choice_index = getattr(choice, "index", 0)
-            for idx in range(len(self.choice_buffers), choice_index + 1):
-                self.choice_buffers.append(ChoiceBuffer(idx))
+            if choice_index >= len(self.choice_buffers):
+                self._ensure_choice_buffers(choice_index + 1)
 
             finish_reason = getattr(choice, "finish_reason", None)
             if finish_reason:
                 self.choice_buffers[choice_index].finish_reason = finish_reason
 
-            content = getattr(delta, "content", None)
-            if content is not None:
-                self.choice_buffers[choice_index].append_text_content(content)
+            if getattr(delta, "content", None) or getattr(delta, "tool_calls", None):
+                self._reasoning_timer.mark_content()
+
+            # without content capture only the metadata of the stream is kept
+            if self.capture_content:
+                content = getattr(delta, "content", None)
+                if content is not None:
+                    self.choice_buffers[choice_index].append_text_content(content)
 
             tool_calls = getattr(delta, "tool_calls", None)
             if tool_calls is not None:
                 for tool_call in tool_calls:
-                    self.choice_buffers[choice_index].append_tool_call(tool_call)
+                    self.choice_buffers[choice_index].append_tool_call(
+                        tool_call, self.capture_content
+                    )
 
     def set_usage(self, chunk):
         usage = getattr(chunk, "usage", None)
         if usage:
+            self.usage = usage
             self.completion_tokens = getattr(usage, "completion_tokens", None)
             self.prompt_tokens = getattr(usage, "prompt_tokens", None)
+            self.cached_tokens = get_cached_input_tokens(usage)
+            self.reasoning_tokens = get_reasoning_output_tokens(usage)
+
+    def _ensure_choice_buffers(self, count: int):
+        self.choice_buffers.extend(
+            ChoiceBuffer(idx, self._buffer_reservation)
+            for idx in range(len(self.choice_buffers), count)
+        )
+
+    def _process_typed_chunk(self, chunk: ChatCompletionChunk):
+        # every field of a typed chunk is always present, so it is read directly
+        # instead of probed, and the one-time fields are only read until known
+        if self._response_fields_pending:
+            self.response_id = self.response_id or chunk.id or None
+            self.response_model = self.response_model or chunk.model or None
+            self.service_tier = self.service_tier or chunk.service_tier or None
+            self._response_fields_pending = not (
+                self.response_id and self.response_model
+            )
+
+        choice_buffers = self.choice_buffers
+        reasoning_timer = self._reasoning_timer
+        for choice in chunk.choices:
+            index = choice.index
+            if index >= len(choice_buffers):
+                self._ensure_choice_buffers(index + 1)
+
+            choice_buffer = choice_buffers[index]
+            if choice.finish_reason:
+                choice_buffer.finish_reason = choice.finish_reason
+
+            delta = choice.delta
+            if reasoning_timer.first_content_time is None and (
+                delta.content or delta.tool_calls
+            ):
+                reasoning_timer.mark_content()
+
+            # without content capture only the metadata of the stream is kept
+            if self.capture_content and delta.content is not None:
+                choice_buffer.text_content.append(delta.content)
+
+            if delta.tool_calls is not None:
+                for tool_call in delta.tool_calls:
+                    choice_buffer.append_tool_call(tool_call, self.capture_content)
+
+        usage = chunk.usage
+        if usage is not None:
+            self.usage = usage
+            self.completion_tokens = usage.completion_tokens
+            self.prompt_tokens = usage.prompt_tokens
+            self.cached_tokens = get_cached_input_tokens(usage)
+            self.reasoning_tokens = get_reasoning_output_tokens(usage)
 
     def process_chunk(self, chunk):
+        if type(chunk) is ChatCompletionChunk:
+            self._process_typed_chunk(chunk)
+            return
+
         self.set_response_id(chunk)
         self.set_response_model(chunk)
         self.set_response_service_tier(chunk)
         self.build_streaming_response(chunk)
         self.set_usage(chunk)
 
+    def process_pending_chunks(self):
+        for chunk in self._pending_chunks:
+            self.process_chunk(chunk)
+        self._pending_chunks.clear()
+
 
 class ChatStreamWrapper(BaseChatStreamWrapper):
     def __enter__(self):
@@ -247,7 +398,10 @@ class ChatStreamWrapper(BaseChatStreamWrapper):
     def __next__(self):
         try:
             chunk = next(self.stream)
-            self.process_chunk(chunk)
+            if self._hide_usage_chunk and is_usage_chunk(chunk):
+                self.ingest_chunk(chunk)
+                chunk = next(self.stream)
+            self.ingest_chunk(chunk)
             return chunk
         except StopIteration:
             self.cleanup()
@@ -281,7 +435,10 @@ class AsyncChatStreamWrapper(BaseChatStreamWrapper):
     async def __anext__(self):
         try:
             chunk = await self.stream.__anext__()
-            self.process_chunk(chunk)
+            if self._hide_usage_chunk and is_usage_chunk(chunk):
+                self.ingest_chunk(chunk)
+                chunk = await self.stream.__anext__()
+            self.ingest_chunk(chunk)
             return chunk
         except StopAsyncIteration:
             self.cleanup()
@@ -291,24 +448,75 @@ class AsyncChatStreamWrapper(BaseChatStreamWrapper):
             self.cleanup()
             raise
 
-    def parse(self):
-        return self.stream.parse()
+
+_RESPONSES_CONTENT_DELTA_EVENTS = frozenset(
+    (
+        "response.output_text.delta",
+        "response.refusal.delta",
+        "response.function_call_arguments.delta",
+    )
+)
+_RESPONSES_REASONING_DELTA_EVENTS = frozenset(
+    (
+        "response.reasoning_text.delta",
+        "response.reasoning_summary_text.delta",
+    )
+)
+
+
+def _reasoning_duration_attributes(
+    reasoning_timer: ReasoningTimer, response: Any
+) -> dict[str, Any]:
+    return generate_reasoning_usage_attributes(
+        reasoning_duration=reasoning_timer.estimate(
+            get_reasoning_output_tokens(getattr(response, "usage", None))
+        )
+    )
+
+
+def _end_responses_stream(
+    stream_wrapper: "ResponsesStreamWrapper | AsyncResponsesStreamWrapper",
+) -> None:
+    if stream_wrapper._active_stream is not None:
+        stream_wrapper._active_stream.end()
+    if stream_wrapper._on_response is None or stream_wrapper._stream_error is not None:
+        return
+    response = stream_wrapper._final_response or getattr(
+        stream_wrapper.stream, "response", None
+    )
+    if response is not None:
+        stream_wrapper._on_response(response, stream_wrapper._reasoning_timer)
 
 
 class ResponsesStreamWrapper:
     """Wrap Responses API SSE streams; finalize span on response.completed."""
 
-    def __init__(self, stream: Stream, span: Span, capture_content: bool) -> None:
+    def __init__(
+        self,
+        stream: Stream,
+        span: Span,
+        capture_content: bool,
+        start_time: float | None = None,
+        on_response: "Callable[[Any, ReasoningTimer], None] | None" = None,
+        active_stream: InFlight | None = None,
+    ) -> None:
         self.stream = stream
         self.span = span
         self.capture_content = capture_content
+        self._reasoning_timer = ReasoningTimer(start_time)
         self._final_response: Any = None
         self._stream_error: Any = None
         self._span_finalized = False
+        self._on_response = on_response
+        self._active_stream = active_stream
 
     def process_event(self, event: Any) -> None:
         etype = getattr(event, "type", None)
-        if etype == "response.completed":
+        if etype in _RESPONSES_CONTENT_DELTA_EVENTS:
+            self._reasoning_timer.mark_content()
+        elif etype in _RESPONSES_REASONING_DELTA_EVENTS:
+            self._reasoning_timer.mark_reasoning()
+        elif etype == "response.completed":
             self._final_response = getattr(event, "response", None)
         elif etype == "response.failed":
             self._final_response = getattr(event, "response", None)
@@ -327,18 +535,31 @@ class ResponsesStreamWrapper:
             msg = getattr(self._stream_error, "message", str(self._stream_error))
             handle_span_exception(self.span, RuntimeError(msg))
         elif self._final_response is not None and self.span.is_recording():
-            self.span.set_attributes(
-                get_responses_response_attributes(
-                    self._final_response, self.capture_content
+            with trace.use_span(self.span, end_on_exit=False):
+                self.span.set_attributes(
+                    get_responses_response_attributes(
+                        self._final_response, self.capture_content
+                    )
+                )
+                self.span.set_attributes(
+                    _reasoning_duration_attributes(
+                        self._reasoning_timer, self._final_response
+                    )
                 )
-            )
         else:
             response = getattr(self.stream, "response", None)
             if response is not None and self.span.is_recording():
-                self.span.set_attributes(
-                    get_responses_response_attributes(response, self.capture_content)
-                )
+                with trace.use_span(self.span, end_on_exit=False):
+                    self.span.set_attributes(
+                        get_responses_response_attributes(
+                            response, self.capture_content
+                        )
+                    )
+                    self.span.set_attributes(
+                        _reasoning_duration_attributes(self._reasoning_timer, response)
+                    )
         self.span.end()
+        _end_responses_stream(self)
 
     def __enter__(self) -> "ResponsesStreamWrapper":
         return self
@@ -375,17 +596,32 @@ class ResponsesStreamWrapper:
 class AsyncResponsesStreamWrapper:
     """Async variant of ResponsesStreamWrapper."""
 
-    def __init__(self, stream: AsyncStream, span: Span, capture_content: bool) -> None:
+    def __init__(
+        self,
+        stream: AsyncStream,
+        span: Span,
+        capture_content: bool,
+        start_time: float | None = None,
+        on_response: "Callable[[Any, ReasoningTimer], None] | None" = None,
+        active_stream: InFlight | None = None,
+    ) -> None:
         self.stream = stream
         self.span = span
         self.capture_content = capture_content
+        self._reasoning_timer = ReasoningTimer(start_time)
         self._final_response: Any = None
         self._stream_error: Any = None
         self._span_finalized = False
+        self._on_response = on_response
+        self._active_stream = active_stream
 
     def process_event(self, event: Any) -> None:
         etype = getattr(event, "type", None)
-        if etype == "response.completed":
+        if etype in _RESPONSES_CONTENT_DELTA_EVENTS:
+            self._reasoning_timer.mark_content()
+        elif etype in _RESPONSES_REASONING_DELTA_EVENTS:
+            self._reasoning_timer.mark_reasoning()
+        elif etype == "response.completed":
             self._final_response = getattr(event, "response", None)
         elif etype == "response.failed":
             self._final_response = getattr(event, "response", None)
@@ -404,18 +640,31 @@ class AsyncResponsesStreamWrapper:
             msg = getattr(self._stream_error, "message", str(self._stream_error))
             handle_span_exception(self.span, RuntimeError(msg))
         elif self._final_response is not None and self.span.is_recording():
-            self.span.set_attributes(
-                get_responses_response_attributes(
-                    self._final_response, self.capture_content
+            with trace.use_span(self.span, end_on_exit=False):
+                self.span.set_attributes(
+                    get_responses_response_attributes(
+                        self._final_response, self.capture_content
+                    )
+                )
+                self.span.set_attributes(
+                    _reasoning_duration_attributes(
+                        self._reasoning_timer, self._final_response
+                    )
                 )
-            )
         else:
             response = getattr(self.stream, "response", None)
             if response is not None and self.span.is_recording():
-                self.span.set_attributes(
-                    get_responses_response_attributes(response, self.capture_content)
-                )
+                with trace.use_span(self.span, end_on_exit=False):
+                    self.span.set_attributes(
+                        get_responses_response_attributes(
+                            response, self.capture_content
+                        )
+                    )
+                    self.span.set_attributes(
+                        _reasoning_duration_attributes(self._reasoning_timer, response)
+                    )
         self.span.end()
+        _end_responses_stream(self)
 
     async def __aenter__(self) -> "AsyncResponsesStreamWrapper":
         return self
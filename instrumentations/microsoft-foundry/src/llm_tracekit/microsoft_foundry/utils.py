@@ -13,7 +13,7 @@
 # limitations under the License.
 
 import json
-from typing import Any, Mapping
+from typing import Any, Mapping, Sequence
 from urllib.parse import urlparse
 
 from httpx import URL
@@ -26,15 +26,21 @@ from opentelemetry.semconv._incubating.attributes import (
 )
 
 from llm_tracekit.core import (
+    ClientAttributesCache,
+    ToolAttributesCache,
     ToolCall,
     Message,
     Choice,
     attribute_generator,
-    generate_base_attributes,
+    generate_cache_usage_attributes,
+    generate_reasoning_usage_attributes,
+    generate_embedding_input_attributes,
+    generate_embedding_vector_attributes,
     generate_message_attributes,
     generate_choice_attributes,
     generate_request_attributes,
     generate_response_attributes,
+    is_stream_usage_injection_enabled,
     _extended_gen_ai_attributes as ExtendedGenAIAttributes,
 )
 
@@ -55,6 +61,33 @@ def is_streaming(kwargs):
     return non_numerical_value_is_set(kwargs.get("stream"))
 
 
+def inject_stream_usage_option(kwargs: dict[str, Any]) -> bool:
+    """Requests the token usage of a stream, when enabled and the caller did not.
+
+    Returns whether `stream_options.include_usage` was added to `kwargs`, in
+    which case the extra usage chunk must not be returned to the caller.
+    """
+    if not is_stream_usage_injection_enabled() or not is_streaming(kwargs):
+        return False
+
+    stream_options = kwargs.get("stream_options")
+    if isinstance(stream_options, Mapping):
+        # an explicit `include_usage`, even a false one, is left as is
+        if "include_usage" in stream_options:
+            return False
+        kwargs["stream_options"] = {**stream_options, "include_usage": True}
+    else:
+        kwargs["stream_options"] = {"include_usage": True}
+    return True
+
+
+def is_usage_chunk(chunk: Any) -> bool:
+    """Checks if a stream chunk is the final one, that only reports the token usage."""
+    return getattr(chunk, "usage", None) is not None and not getattr(
+        chunk, "choices", None
+    )
+
+
 def generate_server_address_and_port_attributes(client_instance) -> dict[str, Any]:
     base_client = getattr(client_instance, "_client", None)
     base_url = getattr(base_client, "base_url", None)
@@ -78,6 +111,11 @@ def generate_server_address_and_port_attributes(client_instance) -> dict[str, An
     return attributes
 
 
+_client_attributes = ClientAttributesCache(
+    MICROSOFT_FOUNDRY_SYSTEM, generate_server_address_and_port_attributes
+)
+
+
 def extract_foundry_context(kwargs: dict[str, Any]) -> dict[str, Any]:
     """Extract Microsoft Foundry-specific context from extra_body and kwargs."""
     attributes: dict[str, Any] = {}
@@ -135,7 +173,7 @@ def parse_tool_calls(
 
 
 def messages_to_span_attributes(
-    messages: list, capture_content: bool
+    messages: list, capture_content: bool, model: str | None = None
 ) -> dict[str, Any]:
     parsed_messages = []
     for message in messages:
@@ -155,7 +193,7 @@ def messages_to_span_attributes(
         )
 
     return generate_message_attributes(
-        messages=parsed_messages, capture_content=capture_content
+        messages=parsed_messages, capture_content=capture_content, model=model
     )
 
 
@@ -185,12 +223,8 @@ def choices_to_span_attributes(choices: list, capture_content: bool) -> dict[str
     )
 
 
-def _extract_tools_attributes(tools: list | None) -> dict[str, Any]:
-    """Extract tool definitions to span attributes."""
+def _build_chat_tools_attributes(tools: Sequence[Any]) -> dict[str, Any]:
     attributes: dict[str, Any] = {}
-    if tools is None or not isinstance(tools, list):
-        return attributes
-
     for index, tool in enumerate(tools):
         if hasattr(tool, "model_dump") and callable(getattr(tool, "model_dump")):
             tool = tool.model_dump(mode="python")
@@ -223,13 +257,23 @@ def _extract_tools_attributes(tools: list | None) -> dict[str, Any]:
     return attributes
 
 
+_chat_tool_attributes = ToolAttributesCache(_build_chat_tools_attributes)
+
+
+def _extract_tools_attributes(tools: list | None) -> Mapping[str, Any]:
+    """Extract tool definitions to span attributes."""
+    if tools is None or not isinstance(tools, list):
+        return {}
+    return _chat_tool_attributes.get(tools)
+
+
 @attribute_generator
 def get_chat_request_attributes(
     kwargs: dict[str, Any], client_instance, capture_content: bool
 ) -> dict[str, Any]:
     """Build span attributes for chat.completions.create."""
     attributes = {
-        **generate_base_attributes(system=MICROSOFT_FOUNDRY_SYSTEM),
+        **_client_attributes.get(client_instance),
         **generate_request_attributes(
             model=kwargs.get("model"),
             temperature=kwargs.get("temperature"),
@@ -239,7 +283,9 @@ def get_chat_request_attributes(
             frequency_penalty=kwargs.get("frequency_penalty"),
         ),
         **messages_to_span_attributes(
-            messages=kwargs.get("messages", []), capture_content=capture_content
+            messages=kwargs.get("messages", []),
+            capture_content=capture_content,
+            model=kwargs.get("model"),
         ),
         ExtendedGenAIAttributes.GEN_AI_REQUEST_USER: kwargs.get("user"),
     }
@@ -265,7 +311,6 @@ def get_chat_request_attributes(
     if tools is not None and tools is not NOT_GIVEN:
         attributes.update(_extract_tools_attributes(tools))
 
-    attributes.update(generate_server_address_and_port_attributes(client_instance))
     attributes.update(extract_foundry_context(kwargs))
 
     service_tier = kwargs.get("service_tier")
@@ -279,6 +324,28 @@ def get_chat_request_attributes(
     return attributes
 
 
+def get_cached_input_tokens(usage: Any) -> int | None:
+    """Read the prompt cache hits from Chat Completions or Responses usage objects."""
+    if usage is None:
+        return None
+    details = getattr(usage, "prompt_tokens_details", None) or getattr(
+        usage, "input_tokens_details", None
+    )
+    cached_tokens = getattr(details, "cached_tokens", None)
+    return cached_tokens if isinstance(cached_tokens, int) else None
+
+
+def get_reasoning_output_tokens(usage: Any) -> int | None:
+    """Read the reasoning tokens from Chat Completions or Responses usage objects."""
+    if usage is None:
+        return None
+    details = getattr(usage, "completion_tokens_details", None) or getattr(
+        usage, "output_tokens_details", None
+    )
+    reasoning_tokens = getattr(details, "reasoning_tokens", None)
+    return reasoning_tokens if isinstance(reasoning_tokens, int) else None
+
+
 @attribute_generator
 def get_chat_response_attributes(result: Any, capture_content: bool) -> dict[str, Any]:
     """Build span attributes from ChatCompletion response."""
@@ -306,6 +373,13 @@ def get_chat_response_attributes(result: Any, capture_content: bool) -> dict[str
             usage_input_tokens=usage_input_tokens,
             usage_output_tokens=usage_output_tokens,
         ),
+        **generate_cache_usage_attributes(
+            cache_read_input_tokens=get_cached_input_tokens(usage),
+            total_input_tokens=usage_input_tokens,
+        ),
+        **generate_reasoning_usage_attributes(
+            reasoning_output_tokens=get_reasoning_output_tokens(usage),
+        ),
         **choices_to_span_attributes(choices, capture_content),
     }
 
@@ -485,6 +559,16 @@ def _responses_tool_item_to_attributes(tool: Any, index: int) -> dict[str, Any]:
     return attributes
 
 
+def _build_responses_tools_attributes(tools: Sequence[Any]) -> dict[str, Any]:
+    attributes: dict[str, Any] = {}
+    for index, tool in enumerate(tools):
+        attributes.update(_responses_tool_item_to_attributes(tool, index))
+    return attributes
+
+
+_responses_tool_attributes = ToolAttributesCache(_build_responses_tools_attributes)
+
+
 def _response_status_to_finish_reason(response: Any) -> str:
     status = getattr(response, "status", None)
     if status == "completed":
@@ -576,7 +660,7 @@ def get_responses_request_attributes(
 
     prompt_messages = _responses_input_to_messages(input_val, instructions)
     attributes: dict[str, Any] = {
-        **generate_base_attributes(system=MICROSOFT_FOUNDRY_SYSTEM),
+        **_client_attributes.get(client_instance),
         **generate_request_attributes(
             model=kwargs.get("model"),
             temperature=kwargs.get("temperature"),
@@ -586,7 +670,9 @@ def get_responses_request_attributes(
             frequency_penalty=None,
         ),
         **generate_message_attributes(
-            messages=prompt_messages, capture_content=capture_content
+            messages=prompt_messages,
+            capture_content=capture_content,
+            model=kwargs.get("model"),
         ),
         ExtendedGenAIAttributes.GEN_AI_REQUEST_USER: kwargs.get("user"),
     }
@@ -599,14 +685,12 @@ def get_responses_request_attributes(
             tool_list = list(tools)
         else:
             tool_list = [tools]
-        for index, tool in enumerate(tool_list):
-            attributes.update(_responses_tool_item_to_attributes(tool, index))
+        attributes.update(_responses_tool_attributes.get(tool_list))
 
     prev_id = kwargs.get("previous_response_id")
     if prev_id is not None and prev_id is not NOT_GIVEN:
         attributes["gen_ai.openai.request.previous_response_id"] = prev_id
 
-    attributes.update(generate_server_address_and_port_attributes(client_instance))
     attributes.update(extract_foundry_context(kwargs))
 
     service_tier = kwargs.get("service_tier")
@@ -646,6 +730,13 @@ def get_responses_response_attributes(
             usage_input_tokens=usage_input,
             usage_output_tokens=usage_output,
         ),
+        **generate_cache_usage_attributes(
+            cache_read_input_tokens=get_cached_input_tokens(usage),
+            total_input_tokens=usage_input,
+        ),
+        **generate_reasoning_usage_attributes(
+            reasoning_output_tokens=get_reasoning_output_tokens(usage),
+        ),
         **generate_choice_attributes(
             choices=[choice],
             capture_content=capture_content,
@@ -659,28 +750,18 @@ def get_responses_response_attributes(
     return attributes
 
 
-def _embedding_input_to_prompt_messages(embedding_input: Any) -> list[Message]:
-    """Convert embeddings input to prompt messages."""
-
-    def to_message(content: str | None) -> Message:
-        return Message(role="user", content=content)
-
-    if embedding_input is None:
+def _embedding_input_to_items(embedding_input: Any) -> list[Any]:
+    """Split embeddings input into the items that are embedded."""
+    if embedding_input is None or embedding_input is NOT_GIVEN:
         return []
 
-    if isinstance(embedding_input, str):
-        return [to_message(embedding_input)]
-
     if isinstance(embedding_input, list):
-        messages: list[Message] = []
-        for item in embedding_input:
-            if isinstance(item, str):
-                messages.append(to_message(item))
-            else:
-                messages.append(to_message(None))
-        return messages
+        # A flat list of token ids is a single item
+        if embedding_input and isinstance(embedding_input[0], int):
+            return [embedding_input]
+        return embedding_input
 
-    return [to_message(None)]
+    return [embedding_input]
 
 
 @attribute_generator
@@ -691,8 +772,9 @@ def get_embedding_request_attributes(
 ) -> dict[str, Any]:
     """Build span attributes for embeddings.create."""
     attributes: dict[str, Any] = {
-        GenAIAttributes.GEN_AI_OPERATION_NAME: "embeddings",
-        GenAIAttributes.GEN_AI_SYSTEM: MICROSOFT_FOUNDRY_SYSTEM,
+        **_client_attributes.get(
+            client_instance, GenAIAttributes.GenAiOperationNameValues.EMBEDDINGS
+        ),
         GenAIAttributes.GEN_AI_REQUEST_MODEL: kwargs.get("model"),
         ExtendedGenAIAttributes.GEN_AI_REQUEST_USER: kwargs.get("user"),
     }
@@ -711,15 +793,13 @@ def get_embedding_request_attributes(
             dimensions
         )
 
-    embedding_input = kwargs.get("input")
-    prompt_messages = _embedding_input_to_prompt_messages(embedding_input)
     attributes.update(
-        generate_message_attributes(
-            messages=prompt_messages, capture_content=capture_content
+        generate_embedding_input_attributes(
+            _embedding_input_to_items(kwargs.get("input")),
+            capture_content=capture_content,
         )
     )
 
-    attributes.update(generate_server_address_and_port_attributes(client_instance))
     return attributes
 
 
@@ -752,10 +832,8 @@ def get_embedding_response_attributes(
                 index = getattr(item, "index", None)
                 embedding = getattr(item, "embedding", None)
                 if index is not None and embedding is not None:
-                    attributes[
-                        ExtendedGenAIAttributes.GEN_AI_EMBEDDING_VECTOR.format(
-                            embedding_index=index
-                        )
-                    ] = embedding
+                    attributes.update(
+                        generate_embedding_vector_attributes(index, embedding)
+                    )
 
     return attributes
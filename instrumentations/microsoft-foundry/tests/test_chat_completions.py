@@ -15,9 +15,20 @@
 import os
 
 import pytest
+from openai.types.chat import ChatCompletionChunk
 from opentelemetry.semconv._incubating.attributes import (
     gen_ai_attributes as GenAIAttributes,
 )
+from opentelemetry.semconv._incubating.metrics import gen_ai_metrics
+
+from llm_tracekit.core import (
+    GEN_AI_CLIENT_ACTIVE_REQUESTS,
+    GEN_AI_CLIENT_ACTIVE_STREAMS,
+    GEN_AI_CLIENT_OUTPUT_THROUGHPUT,
+    OTEL_INSTRUMENTATION_GENAI_INJECT_STREAM_USAGE,
+    Instruments,
+)
+from llm_tracekit.microsoft_foundry.patch import chat_completions_create
 
 from .utils import (
     assert_base_chat_span,
@@ -189,3 +200,94 @@ def test_chat_completion_multi_turn(
         ],
         expect_content=True,
     )
+
+
+def _chunk(choices, usage=None) -> ChatCompletionChunk:
+    return ChatCompletionChunk.model_validate(
+        {
+            "id": "chatcmpl-1",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": MODEL,
+            "choices": choices,
+            "usage": usage,
+        }
+    )
+
+
+def test_chat_completion_streaming_injected_usage(
+    span_exporter, metric_reader, tracer_provider, meter_provider, monkeypatch
+):
+    monkeypatch.setenv(OTEL_INSTRUMENTATION_GENAI_INJECT_STREAM_USAGE, "true")
+    requests = []
+
+    def create(**kwargs):
+        requests.append(kwargs)
+        return iter(
+            [
+                _chunk(
+                    [
+                        {
+                            "index": 0,
+                            "delta": {"role": "assistant", "content": "1, 2, 3"},
+                            "finish_reason": "stop",
+                        }
+                    ]
+                ),
+                _chunk(
+                    [],
+                    {"prompt_tokens": 11, "completion_tokens": 5, "total_tokens": 16},
+                ),
+            ]
+        )
+
+    traced_create = chat_completions_create(
+        tracer_provider.get_tracer(__name__),
+        Instruments(meter_provider.get_meter(__name__)),
+        capture_content=False,
+    )
+    chunks = list(
+        traced_create(
+            create,
+            None,
+            (),
+            {
+                "model": MODEL,
+                "messages": [{"role": "user", "content": "Count to 3"}],
+                "stream": True,
+            },
+        )
+    )
+
+    (request,) = requests
+    assert request["stream_options"] == {"include_usage": True}
+    # the usage chunk was only requested by the instrumentation
+    assert len(chunks) == 1
+    assert chunks[0].choices
+
+    (span,) = span_exporter.get_finished_spans()
+    assert span.attributes[GenAIAttributes.GEN_AI_USAGE_INPUT_TOKENS] == 11
+    assert span.attributes[GenAIAttributes.GEN_AI_USAGE_OUTPUT_TOKENS] == 5
+
+    (resource_metrics,) = metric_reader.get_metrics_data().resource_metrics
+    token_usage_metric = next(
+        metric
+        for metric in resource_metrics.scope_metrics[0].metrics
+        if metric.name == gen_ai_metrics.GEN_AI_CLIENT_TOKEN_USAGE
+    )
+    assert {
+        point.attributes[GenAIAttributes.GEN_AI_TOKEN_TYPE]: point.sum
+        for point in token_usage_metric.data.data_points
+    } == {
+        GenAIAttributes.GenAiTokenTypeValues.INPUT.value: 11,
+        GenAIAttributes.GenAiTokenTypeValues.COMPLETION.value: 5,
+    }
+
+    metrics = {
+        metric.name: metric for metric in resource_metrics.scope_metrics[0].metrics
+    }
+    (throughput_point,) = metrics[GEN_AI_CLIENT_OUTPUT_THROUGHPUT].data.data_points
+    assert throughput_point.count == 1
+    for name in (GEN_AI_CLIENT_ACTIVE_REQUESTS, GEN_AI_CLIENT_ACTIVE_STREAMS):
+        (active_point,) = metrics[name].data.data_points
+        assert active_point.value == 0
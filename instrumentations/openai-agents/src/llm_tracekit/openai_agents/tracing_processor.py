@@ -38,6 +38,7 @@ from opentelemetry.trace import (
     Status,
     StatusCode,
     SpanKind,
+    use_span,
 )
 from opentelemetry.trace.propagation import _SPAN_KEY
 
@@ -537,7 +538,9 @@ class OpenAIAgentsTracingProcessor(TracingProcessor):
             processor = self._span_processors.get(type(span.span_data))
             if processor is not None:
                 if isinstance(span.span_data, ResponseSpanData):
-                    attributes = processor(span.span_data, state, span.parent_id)
+                    # content events are emitted within the span they belong to
+                    with use_span(open_span, end_on_exit=False):
+                        attributes = processor(span.span_data, state, span.parent_id)
                 else:
                     attributes = processor(span.span_data)
                 open_span.set_attributes(attributes)
@@ -13,8 +13,16 @@
 # limitations under the License.
 
 import pytest
+from opentelemetry.context import Context, attach, detach
+from opentelemetry.sdk._logs import LoggerProvider
+from opentelemetry.sdk._logs.export import (
+    InMemoryLogRecordExporter,
+    SimpleLogRecordProcessor,
+)
 
+import llm_tracekit.core._content_events as content_events
 import llm_tracekit.core._extended_gen_ai_attributes as ExtendedGenAIAttributes
+from llm_tracekit.core import OTEL_INSTRUMENTATION_GENAI_CONTENT_EXPORT_MODE
 from .utils import (
     assert_attributes,
     assert_choices_in_span,
@@ -76,6 +84,55 @@ async def test_agent_single_turn(span_exporter, instrument):
     )
 
 
+@pytest.mark.vcr()
+@pytest.mark.asyncio()
+@pytest.mark.parametrize("vcr_cassette_name", ["test_agent_single_turn"])
+async def test_agent_content_events(
+    span_exporter, instrument, monkeypatch, vcr_cassette_name
+):
+    monkeypatch.setenv(OTEL_INSTRUMENTATION_GENAI_CONTENT_EXPORT_MODE, "event")
+    log_exporter = InMemoryLogRecordExporter()
+    logger_provider = LoggerProvider()
+    logger_provider.add_log_record_processor(SimpleLogRecordProcessor(log_exporter))
+    monkeypatch.setattr(content_events, "_logger", logger_provider.get_logger(__name__))
+
+    # spans may end while another span is current, e.g. when an agent is
+    # streamed from a background task
+    processor = instrument._agent_tracer
+    on_span_end = processor.on_span_end
+
+    def on_span_end_in_another_context(span):
+        token = attach(Context())
+        try:
+            on_span_end(span)
+        finally:
+            detach(token)
+
+    monkeypatch.setattr(processor, "on_span_end", on_span_end_in_another_context)
+
+    simple_agent = Agent(
+        name="SimpleAgent",
+        model="gpt-4o-mini",
+        instructions="Be a helpful assistant",
+    )
+    await Runner.run(simple_agent, "Say 'This is a test.'")
+
+    (response_span,) = [
+        span for span in span_exporter.get_finished_spans() if span.name == "Response"
+    ]
+    assert "gen_ai.prompt.0.content" not in response_span.attributes
+
+    logs = [log.log_record for log in log_exporter.get_finished_logs()]
+    assert [log.event_name for log in logs] == [
+        "gen_ai.system.message",
+        "gen_ai.user.message",
+        "gen_ai.choice",
+    ]
+    for log in logs:
+        assert log.trace_id == response_span.context.trace_id
+        assert log.span_id == response_span.context.span_id
+
+
 @pytest.mark.vcr()
 @pytest.mark.asyncio()
 async def test_agent_tool_usage(span_exporter, instrument):
@@ -430,9 +487,7 @@ async def test_agent_user_from_trace_metadata(span_exporter, instrument):
 
     spans = span_exporter.get_finished_spans()
 
-    final_response_span = next(
-        (s for s in spans if s.name == "Response"), None
-    )
+    final_response_span = next((s for s in spans if s.name == "Response"), None)
     assert final_response_span is not None
 
     assert (
@@ -458,9 +513,7 @@ async def test_agent_user_from_run_config_metadata(span_exporter, instrument):
 
     spans = span_exporter.get_finished_spans()
 
-    final_response_span = next(
-        (s for s in spans if s.name == "Response"), None
-    )
+    final_response_span = next((s for s in spans if s.name == "Response"), None)
     assert final_response_span is not None
 
     assert (
@@ -482,9 +535,10 @@ async def test_agent_no_user_attribute_when_missing(span_exporter, instrument):
 
     spans = span_exporter.get_finished_spans()
 
-    final_response_span = next(
-        (s for s in spans if s.name == "Response"), None
-    )
+    final_response_span = next((s for s in spans if s.name == "Response"), None)
     assert final_response_span is not None
 
-    assert ExtendedGenAIAttributes.GEN_AI_REQUEST_USER not in final_response_span.attributes
\ No newline at end of file
+    assert (
+        ExtendedGenAIAttributes.GEN_AI_REQUEST_USER
+        not in final_response_span.attributes
+    )
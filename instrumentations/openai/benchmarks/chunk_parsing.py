@@ -0,0 +1,88 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measures the time `process_chunk` spends on a single `ChatCompletionChunk`.
+
+Typed chunks take the fused fast path; the same chunks wrapped in a plain
+proxy object take the generic `getattr` probing path.
+
+Usage: python benchmarks/chunk_parsing.py
+"""
+
+import time
+
+from openai.types.chat import ChatCompletionChunk
+from opentelemetry.sdk.trace import TracerProvider
+
+from llm_tracekit.openai.patch import StreamWrapper
+
+_CHUNK_COUNT = 2_000
+_ROUNDS = 20
+
+
+class _UntypedChunk:
+    """Exposes the fields of a chunk without being a `ChatCompletionChunk`."""
+
+    def __init__(self, chunk: ChatCompletionChunk):
+        self.__dict__.update(dict(chunk))
+
+
+def _build_chunks(count: int) -> list[ChatCompletionChunk]:
+    return [
+        ChatCompletionChunk.model_validate(
+            {
+                "id": "chatcmpl-benchmark",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": "gpt-4o-mini",
+                "choices": [
+                    {
+                        "index": 0,
+                        "delta": {"content": f" token{index}"},
+                        "finish_reason": "stop" if index == count - 1 else None,
+                    }
+                ],
+            }
+        )
+        for index in range(count)
+    ]
+
+
+def _measure(chunks) -> float:
+    """Returns the best time per chunk in nanoseconds."""
+    tracer = TracerProvider().get_tracer(__name__)
+    best = float("inf")
+    for _ in range(_ROUNDS):
+        span = tracer.start_span("chat gpt-4o-mini")
+        wrapper = StreamWrapper(iter(()), span, capture_content=True)  # type: ignore[arg-type]
+        process_chunk = wrapper.process_chunk
+        start = time.perf_counter_ns()
+        for chunk in chunks:
+            process_chunk(chunk)
+        best = min(best, (time.perf_counter_ns() - start) / len(chunks))
+        wrapper.cleanup()
+    return best
+
+
+def main():
+    chunks = _build_chunks(_CHUNK_COUNT)
+    print(f"{_CHUNK_COUNT} chunks per stream, best of {_ROUNDS}")
+    print(f"typed    {_measure(chunks):6.0f} ns/chunk")
+    print(
+        f"untyped  {_measure([_UntypedChunk(chunk) for chunk in chunks]):6.0f} ns/chunk"
+    )
+
+
+if __name__ == "__main__":
+    main()
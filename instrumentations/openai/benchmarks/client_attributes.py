@@ -0,0 +1,66 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measures building the client-dependent request attributes, with and without the cache.
+
+Each call merges the base and server attributes of a client into a new
+attribute dict, as the request attribute builders do.
+
+Usage: python benchmarks/client_attributes.py
+"""
+
+import time
+
+from openai import OpenAI
+from opentelemetry.semconv._incubating.attributes import (
+    gen_ai_attributes as GenAIAttributes,
+)
+
+from llm_tracekit.core import generate_base_attributes
+from llm_tracekit.openai.utils import (
+    _client_attributes,
+    generate_server_address_and_port_attributes,
+)
+
+_CALLS = 1_000_000
+
+
+def _uncached(client_instance) -> dict:
+    return {
+        **generate_base_attributes(system=GenAIAttributes.GenAiSystemValues.OPENAI),
+        **generate_server_address_and_port_attributes(client_instance),
+    }
+
+
+def _cached(client_instance) -> dict:
+    return {**_client_attributes.get(client_instance)}
+
+
+def main():
+    client_instance = OpenAI(
+        api_key="benchmark", base_url="https://llm-proxy.example.com:8443/v1"
+    ).chat.completions
+    assert _uncached(client_instance) == _cached(client_instance)
+
+    print(f"{_CALLS} calls")
+    for label, build in (("uncached", _uncached), ("cached", _cached)):
+        start = time.perf_counter()
+        for _ in range(_CALLS):
+            build(client_instance)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<9} {elapsed:6.2f} s  {elapsed / _CALLS * 1e9:6.0f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measures the request attributes of a 2048 item embeddings batch.
+
+Compares recording every item as a prompt message with the sampled batch
+summary used by the instrumentation.
+
+Usage: python benchmarks/embedding_inputs.py
+"""
+
+import time
+
+from llm_tracekit.core import (
+    Message,
+    generate_embedding_input_attributes,
+    generate_message_attributes,
+)
+
+_BATCH_SIZE = 2048
+_ROUNDS = 20
+
+
+def _per_item(items: list[str]) -> dict:
+    return generate_message_attributes(
+        messages=[Message(role="user", content=item) for item in items],
+        capture_content=True,
+    )
+
+
+def _summarized(items: list[str]) -> dict:
+    return generate_embedding_input_attributes(items, capture_content=True)
+
+
+def main():
+    items = [
+        f"Document {index}: " + "lorem ipsum " * 20 for index in range(_BATCH_SIZE)
+    ]
+
+    print(f"{_BATCH_SIZE} items, best of {_ROUNDS}")
+    for label, build in (("per item", _per_item), ("summary", _summarized)):
+        best = float("inf")
+        for _ in range(_ROUNDS):
+            start = time.perf_counter()
+            attributes = build(items)
+            best = min(best, time.perf_counter() - start)
+        print(f"{label:<9} {len(attributes):5d} attributes  {best * 1e3:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
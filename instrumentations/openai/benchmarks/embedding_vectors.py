@@ -0,0 +1,69 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measures the size and build time of the embedding vector attributes per capture mode.
+
+The response holds a batch of 3072 dimensional vectors, as returned by
+text-embedding-3-large. The size is that of the attribute values as they are
+encoded by the OTLP exporter (8 bytes per double, 1 byte per character).
+
+Usage: python benchmarks/embedding_vectors.py
+"""
+
+import random
+import time
+
+from llm_tracekit.core import EMBEDDING_VECTOR_CAPTURE_MODES
+from llm_tracekit.core import generate_embedding_vector_attributes
+
+_BATCH_SIZE = 32
+_DIMENSIONS = 3072
+_ROUNDS = 5
+
+
+def _encoded_size(attributes: dict) -> int:
+    size = 0
+    for value in attributes.values():
+        if isinstance(value, list):
+            size += 8 * len(value)
+        elif isinstance(value, str):
+            size += len(value)
+        else:
+            size += 8
+    return size
+
+
+def main():
+    rng = random.Random(0)
+    vectors = [
+        [rng.uniform(-0.1, 0.1) for _ in range(_DIMENSIONS)] for _ in range(_BATCH_SIZE)
+    ]
+
+    print(f"{_BATCH_SIZE} vectors of {_DIMENSIONS} dimensions, best of {_ROUNDS}")
+    for capture_mode in EMBEDDING_VECTOR_CAPTURE_MODES:
+        best = float("inf")
+        for _ in range(_ROUNDS):
+            attributes: dict = {}
+            start = time.perf_counter()
+            for index, vector in enumerate(vectors):
+                attributes.update(
+                    generate_embedding_vector_attributes(index, vector, capture_mode)
+                )
+            best = min(best, time.perf_counter() - start)
+        size = _encoded_size(attributes)
+        print(f"{capture_mode:<8} {size / 1024:8.1f} KiB  {best * 1e3:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measures the latency `StreamWrapper` adds to every chunk of a stream.
+
+A fast token stream of typed `ChatCompletionChunk`s is consumed directly and
+through `StreamWrapper`, with chunks parsed as they arrive and with deferred
+processing. The time spent in the final `cleanup` is reported separately,
+since with deferred processing that is where the chunks are parsed.
+
+Usage: python benchmarks/stream_latency.py
+"""
+
+import os
+import time
+
+from openai.types.chat import ChatCompletionChunk
+from opentelemetry.sdk.trace import TracerProvider
+
+from llm_tracekit.core import OTEL_INSTRUMENTATION_GENAI_DEFER_STREAM_PROCESSING
+from llm_tracekit.openai.patch import StreamWrapper
+
+_CHUNK_COUNT = 2_000
+_ROUNDS = 20
+
+
+def _build_chunks(count: int) -> list[ChatCompletionChunk]:
+    return [
+        ChatCompletionChunk.model_validate(
+            {
+                "id": "chatcmpl-benchmark",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": "gpt-4o-mini",
+                "choices": [
+                    {
+                        "index": 0,
+                        "delta": {"content": f" token{index}"},
+                        "finish_reason": "stop" if index == count - 1 else None,
+                    }
+                ],
+            }
+        )
+        for index in range(count)
+    ]
+
+
+def _consume(chunks, deferred: bool | None) -> tuple[float, float]:
+    """Returns the time spent iterating and the time spent finalizing, in seconds."""
+    if deferred is None:
+        start = time.perf_counter()
+        for _ in iter(chunks):
+            pass
+        return time.perf_counter() - start, 0.0
+
+    os.environ[OTEL_INSTRUMENTATION_GENAI_DEFER_STREAM_PROCESSING] = str(deferred)
+    span = TracerProvider().get_tracer(__name__).start_span("chat gpt-4o-mini")
+    wrapper = StreamWrapper(iter(chunks), span, capture_content=True)  # type: ignore[arg-type]
+    start = time.perf_counter()
+    for _ in range(len(chunks)):
+        next(wrapper)
+    iterated = time.perf_counter()
+    wrapper.cleanup()
+    return iterated - start, time.perf_counter() - iterated
+
+
+def main():
+    chunks = _build_chunks(_CHUNK_COUNT)
+    baseline = min(_consume(chunks, None)[0] for _ in range(_ROUNDS))
+    print(f"{_CHUNK_COUNT} chunks per stream, best of {_ROUNDS}")
+    for label, deferred in (("immediate", False), ("deferred", True)):
+        results = [_consume(chunks, deferred) for _ in range(_ROUNDS)]
+        iteration = min(result[0] for result in results)
+        cleanup = min(result[1] for result in results)
+        print(
+            f"{label:<9}  added {(iteration - baseline) / _CHUNK_COUNT * 1e9:7.0f} ns/chunk  "
+            f"cleanup {cleanup * 1e3:6.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
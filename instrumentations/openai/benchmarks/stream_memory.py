@@ -0,0 +1,84 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measures the peak memory of an instrumented chat completion stream.
+
+Streams of 10k typed `ChatCompletionChunk`s are consumed through
+`StreamWrapper` with and without content capture, and the peak allocation
+reported by tracemalloc is compared. Chunks are generated lazily, as they
+would be read off the network, so only what the wrapper keeps is measured.
+
+Usage: python benchmarks/stream_memory.py
+"""
+
+import time
+import tracemalloc
+
+from openai.types.chat import ChatCompletionChunk
+from opentelemetry.sdk.trace import TracerProvider
+
+from llm_tracekit.openai.patch import StreamWrapper
+
+_CHUNK_COUNT = 10_000
+_DELTA = "lorem ipsum dolor sit amet "
+
+
+def _chunks(count: int):
+    for index in range(count):
+        last = index == count - 1
+        yield ChatCompletionChunk.model_validate(
+            {
+                "id": "chatcmpl-benchmark",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": "gpt-4o-mini",
+                "choices": [
+                    {
+                        "index": 0,
+                        "delta": {"content": None if last else f"{_DELTA}{index}"},
+                        "finish_reason": "stop" if last else None,
+                    }
+                ],
+            }
+        )
+
+
+def _measure(capture_content: bool) -> tuple[int, float]:
+    tracer = TracerProvider().get_tracer(__name__)
+    span = tracer.start_span("chat gpt-4o-mini")
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    wrapper = StreamWrapper(_chunks(_CHUNK_COUNT), span, capture_content)  # type: ignore[arg-type]
+    for _ in wrapper:
+        pass
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, elapsed
+
+
+def main():
+    print(f"{_CHUNK_COUNT} chunks per stream")
+    for capture_content in (True, False):
+        peak, elapsed = _measure(capture_content)
+        print(
+            f"capture_content={capture_content!s:<5}  "
+            f"peak {peak / 1024:8.1f} KiB  "
+            f"{elapsed / _CHUNK_COUNT * 1e6:6.2f} us/chunk"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measures building the tool attributes of a chat request, with and without the cache.
+
+Every request passes the same 30 module-level tool definitions, each with a
+small JSON schema, as agent frameworks usually do.
+
+Usage: python benchmarks/tool_attributes.py
+"""
+
+import time
+
+from llm_tracekit.openai.utils import (
+    _build_chat_tools_attributes,
+    _chat_tool_attributes,
+)
+
+_CALLS = 20_000
+_TOOL_COUNT = 30
+
+_TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": f"tool_{index}",
+            "description": f"Looks up record type {index} by its identifier.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "string", "description": "Record identifier"},
+                    "limit": {"type": "integer", "minimum": 1, "maximum": 100},
+                    "fields": {"type": "array", "items": {"type": "string"}},
+                },
+                "required": ["id"],
+            },
+        },
+    }
+    for index in range(_TOOL_COUNT)
+]
+
+
+def _uncached(tools) -> dict:
+    return {**_build_chat_tools_attributes(tools)}
+
+
+def _cached(tools) -> dict:
+    return {**_chat_tool_attributes.get(tools)}
+
+
+def main():
+    assert _uncached(_TOOLS) == _cached(_TOOLS)
+
+    print(f"{_CALLS} calls, {_TOOL_COUNT} tools")
+    for label, build in (("uncached", _uncached), ("cached", _cached)):
+        start = time.perf_counter()
+        for _ in range(_CALLS):
+            # Requests usually pass a new list holding the same tools
+            build(list(_TOOLS))
+        elapsed = time.perf_counter() - start
+        print(f"{label:<9} {elapsed:6.2f} s  {elapsed / _CALLS * 1e6:6.1f} us/call")
+
+
+if __name__ == "__main__":
+    main()
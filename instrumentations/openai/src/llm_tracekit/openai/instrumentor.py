@@ -48,11 +48,19 @@ from opentelemetry.instrumentation.instrumentor import (  # type: ignore[attr-de
 )
 from opentelemetry.instrumentation.utils import unwrap
 from opentelemetry.metrics import get_meter
+from opentelemetry.semconv._incubating.attributes import (
+    gen_ai_attributes as GenAIAttributes,
+)
 from opentelemetry.semconv.schemas import Schemas
 from opentelemetry.trace import get_tracer
 from wrapt import wrap_function_wrapper
 
-from llm_tracekit.core import is_content_enabled, Instruments
+from llm_tracekit.core import (
+    is_content_enabled,
+    provider_build_request,
+    provider_retry_timeout,
+    Instruments,
+)
 from llm_tracekit.openai.package import _instruments
 from llm_tracekit.openai.patch import (
     async_chat_completions_create,
@@ -63,6 +71,9 @@ from llm_tracekit.openai.patch import (
     responses_create,
 )
 
+# the endpoints of the instrumented methods, whose HTTP requests are observed
+_OBSERVED_PATHS = ("/chat/completions", "/embeddings", "/responses")
+
 
 class OpenAIInstrumentor(BaseInstrumentor):
     def __init__(self):
@@ -129,6 +140,25 @@ class OpenAIInstrumentor(BaseInstrumentor):
             wrapper=async_responses_create(tracer, instruments, is_content_enabled()),
         )
 
+        wrap_function_wrapper(
+            module="openai._base_client",
+            name="BaseClient._build_request",
+            wrapper=provider_build_request(
+                instruments,
+                GenAIAttributes.GenAiSystemValues.OPENAI.value,
+                _OBSERVED_PATHS,
+            ),
+        )
+        wrap_function_wrapper(
+            module="openai._base_client",
+            name="BaseClient._calculate_retry_timeout",
+            wrapper=provider_retry_timeout(
+                instruments,
+                GenAIAttributes.GenAiSystemValues.OPENAI.value,
+                _OBSERVED_PATHS,
+            ),
+        )
+
     def _uninstrument(self, **kwargs):
         unwrap(openai.resources.chat.completions.Completions, "create")
         unwrap(openai.resources.chat.completions.AsyncCompletions, "create")
@@ -136,3 +166,5 @@ class OpenAIInstrumentor(BaseInstrumentor):
         unwrap(openai.resources.embeddings.AsyncEmbeddings, "create")
         unwrap(openai.resources.responses.responses.Responses, "create")
         unwrap(openai.resources.responses.responses.AsyncResponses, "create")
+        unwrap(openai._base_client.BaseClient, "_build_request")
+        unwrap(openai._base_client.BaseClient, "_calculate_retry_timeout")
@@ -12,10 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import inspect
 from timeit import default_timer
-from typing import Any, Literal
+from types import SimpleNamespace
+from typing import Any, Callable, Literal, Mapping
 
 from openai import AsyncStream, Stream
+from openai.types.chat import ChatCompletionChunk
+from opentelemetry import trace
 from opentelemetry.semconv._incubating.attributes import (
     gen_ai_attributes as GenAIAttributes,
 )
@@ -26,22 +30,53 @@ from opentelemetry.trace import Span, SpanKind, Tracer
 from opentelemetry.util.types import AttributeValue
 
 from llm_tracekit.core import (
+    AsyncReplayStream,
+    InFlight,
+    ReplayStream,
     handle_span_exception,
     Instruments,
     attribute_generator,
+    deferred_message_events,
     Choice,
     ToolCall,
+    generate_cache_usage_attributes,
     generate_choice_attributes,
+    generate_reasoning_usage_attributes,
     generate_response_attributes,
+    get_stream_memory_budget,
+    get_token_estimator,
+    is_token_usage_estimation_enabled,
+    limit_metric_attributes,
+    record_cache_usage_metrics,
+    record_reasoning_usage_metrics,
+    record_response_cache_hit,
+    record_output_throughput,
+    record_stream_output_throughput,
+    track_request,
+    track_stream,
+    ReasoningTimer,
+    StreamBufferReservation,
+    StreamAccumulator,
+    is_deferred_stream_processing_enabled,
+    _extended_gen_ai_attributes as ExtendedGenAIAttributes,
 )
 from llm_tracekit.openai.utils import (
+    get_cached_input_tokens,
+    get_reasoning_output_tokens,
     get_embedding_request_attributes,
     get_embedding_response_attributes,
     get_llm_request_attributes,
     get_llm_response_attributes,
     get_responses_request_attributes,
     get_responses_response_attributes,
+    get_response_cache_key,
+    inject_stream_usage_option,
     is_streaming,
+    is_usage_chunk,
+    load_cached_chat_completion,
+    parse_messages,
+    parse_raw_response,
+    store_cached_chat_completion,
 )
 
 
@@ -53,9 +88,14 @@ def chat_completions_create(
     """Wrap the `create` method of the `ChatCompletion` class to trace it."""
 
     def traced_method(wrapped, instance, args, kwargs):
-        span_attributes = {
-            **get_llm_request_attributes(kwargs, instance, capture_content)
-        }
+        with deferred_message_events() as message_events:
+            span_attributes = {
+                **get_llm_request_attributes(kwargs, instance, capture_content)
+            }
+        cache_key = get_response_cache_key(kwargs, instance)
+        if cache_key is not None:
+            span_attributes[ExtendedGenAIAttributes.GEN_AI_CACHE_HIT] = False
+        usage_injected = inject_stream_usage_option(kwargs)
 
         span_name = f"{span_attributes[GenAIAttributes.GEN_AI_OPERATION_NAME]} {span_attributes[GenAIAttributes.GEN_AI_REQUEST_MODEL]}"
         with tracer.start_as_current_span(
@@ -64,13 +104,43 @@ def chat_completions_create(
             attributes=span_attributes,
             end_on_exit=False,
         ) as span:
+            message_events.emit()
             start = default_timer()
+            in_flight = track_request(instruments, span_attributes)
             result = None
             error_type = None
+            cached = load_cached_chat_completion(cache_key, is_streaming(kwargs))
             try:
-                result = wrapped(*args, **kwargs)
-                if is_streaming(kwargs):
-                    return StreamWrapper(result, span, capture_content)
+                if cached is not None:
+                    span.set_attribute(ExtendedGenAIAttributes.GEN_AI_CACHE_HIT, True)
+                    if is_streaming(kwargs):
+                        return StreamWrapper(
+                            ReplayStream(cached),
+                            span,
+                            capture_content,
+                            start_time=start,
+                        )
+                    result = raw_result = cached
+                else:
+                    result = wrapped(*args, **kwargs)
+                    if is_streaming(kwargs):
+                        return StreamWrapper(
+                            result,
+                            span,
+                            capture_content,
+                            start_time=start,
+                            cache_key=cache_key,
+                            instruments=instruments,
+                            span_attributes=span_attributes,
+                            request=in_flight,
+                            request_messages=kwargs.get("messages"),
+                            hide_usage_chunk=usage_injected,
+                        )
+                    # `with_raw_response` returns the HTTP response, which is parsed
+                    # here (the parse is memoized) for the attributes of the span
+                    raw_result = result
+                    result = parse_raw_response(raw_result)
+                    store_cached_chat_completion(cache_key, result)
 
                 if span.is_recording():
                     span.set_attributes(
@@ -78,21 +148,28 @@ def chat_completions_create(
                     )
 
                 span.end()
-                return result
+                return raw_result
 
             except Exception as error:
                 error_type = type(error).__qualname__
                 handle_span_exception(span, error)
                 raise
             finally:
+                in_flight.end()
                 duration = max((default_timer() - start), 0)
-                _record_metrics(
-                    instruments,
-                    duration,
-                    result,
-                    span_attributes,
-                    error_type,
-                )
+                if cached is not None:
+                    record_response_cache_hit(
+                        instruments, duration, span_attributes, in_flight.attributes
+                    )
+                else:
+                    _record_metrics(
+                        instruments,
+                        duration,
+                        result,
+                        span_attributes,
+                        error_type,
+                        in_flight.attributes,
+                    )
 
     return traced_method
 
@@ -105,9 +182,14 @@ def async_chat_completions_create(
     """Wrap the `create` method of the `AsyncChatCompletion` class to trace it."""
 
     async def traced_method(wrapped, instance, args, kwargs):
-        span_attributes = {
-            **get_llm_request_attributes(kwargs, instance, capture_content)
-        }
+        with deferred_message_events() as message_events:
+            span_attributes = {
+                **get_llm_request_attributes(kwargs, instance, capture_content)
+            }
+        cache_key = get_response_cache_key(kwargs, instance)
+        if cache_key is not None:
+            span_attributes[ExtendedGenAIAttributes.GEN_AI_CACHE_HIT] = False
+        usage_injected = inject_stream_usage_option(kwargs)
 
         span_name = f"{span_attributes[GenAIAttributes.GEN_AI_OPERATION_NAME]} {span_attributes[GenAIAttributes.GEN_AI_REQUEST_MODEL]}"
         with tracer.start_as_current_span(
@@ -116,13 +198,43 @@ def async_chat_completions_create(
             attributes=span_attributes,
             end_on_exit=False,
         ) as span:
+            message_events.emit()
             start = default_timer()
+            in_flight = track_request(instruments, span_attributes)
             result = None
             error_type = None
+            cached = load_cached_chat_completion(cache_key, is_streaming(kwargs))
             try:
-                result = await wrapped(*args, **kwargs)
-                if is_streaming(kwargs):
-                    return AsyncStreamWrapper(result, span, capture_content)
+                if cached is not None:
+                    span.set_attribute(ExtendedGenAIAttributes.GEN_AI_CACHE_HIT, True)
+                    if is_streaming(kwargs):
+                        return AsyncStreamWrapper(
+                            AsyncReplayStream(cached),
+                            span,
+                            capture_content,
+                            start_time=start,
+                        )
+                    result = raw_result = cached
+                else:
+                    result = await wrapped(*args, **kwargs)
+                    if is_streaming(kwargs):
+                        return AsyncStreamWrapper(
+                            result,
+                            span,
+                            capture_content,
+                            start_time=start,
+                            cache_key=cache_key,
+                            instruments=instruments,
+                            span_attributes=span_attributes,
+                            request=in_flight,
+                            request_messages=kwargs.get("messages"),
+                            hide_usage_chunk=usage_injected,
+                        )
+                    # `with_raw_response` returns the HTTP response, which is parsed
+                    # here (the parse is memoized) for the attributes of the span
+                    raw_result = result
+                    result = parse_raw_response(raw_result)
+                    store_cached_chat_completion(cache_key, result)
 
                 if span.is_recording():
                     span.set_attributes(
@@ -130,21 +242,28 @@ def async_chat_completions_create(
                     )
 
                 span.end()
-                return result
+                return raw_result
 
             except Exception as error:
                 error_type = type(error).__qualname__
                 handle_span_exception(span, error)
                 raise
             finally:
+                in_flight.end()
                 duration = max((default_timer() - start), 0)
-                _record_metrics(
-                    instruments,
-                    duration,
-                    result,
-                    span_attributes,
-                    error_type,
-                )
+                if cached is not None:
+                    record_response_cache_hit(
+                        instruments, duration, span_attributes, in_flight.attributes
+                    )
+                else:
+                    _record_metrics(
+                        instruments,
+                        duration,
+                        result,
+                        span_attributes,
+                        error_type,
+                        in_flight.attributes,
+                    )
 
     return traced_method
 
@@ -157,11 +276,12 @@ def embeddings_create(
     """Wrap the `create` method of the `Embeddings` class to trace it."""
 
     def traced_method(wrapped, instance, args, kwargs):
-        span_attributes = get_embedding_request_attributes(
-            kwargs=kwargs,
-            client_instance=instance,
-            capture_content=capture_content,
-        )
+        with deferred_message_events() as message_events:
+            span_attributes = get_embedding_request_attributes(
+                kwargs=kwargs,
+                client_instance=instance,
+                capture_content=capture_content,
+            )
 
         span_name = f"{span_attributes[GenAIAttributes.GEN_AI_OPERATION_NAME]} {span_attributes[GenAIAttributes.GEN_AI_REQUEST_MODEL]}"
         with tracer.start_as_current_span(
@@ -170,7 +290,9 @@ def embeddings_create(
             attributes=span_attributes,
             end_on_exit=False,
         ) as span:
+            message_events.emit()
             start = default_timer()
+            in_flight = track_request(instruments, span_attributes)
             result = None
             error_type = None
             try:
@@ -186,6 +308,7 @@ def embeddings_create(
                 handle_span_exception(span, error)
                 raise
             finally:
+                in_flight.end()
                 duration = max((default_timer() - start), 0)
                 _record_embedding_metrics(
                     instruments=instruments,
@@ -193,6 +316,7 @@ def embeddings_create(
                     result=result,
                     span_attributes=span_attributes,
                     error_type=error_type,
+                    admitted=in_flight.attributes,
                 )
 
     return traced_method
@@ -206,11 +330,12 @@ def async_embeddings_create(
     """Wrap the `create` method of the `AsyncEmbeddings` class to trace it."""
 
     async def traced_method(wrapped, instance, args, kwargs):
-        span_attributes = get_embedding_request_attributes(
-            kwargs=kwargs,
-            client_instance=instance,
-            capture_content=capture_content,
-        )
+        with deferred_message_events() as message_events:
+            span_attributes = get_embedding_request_attributes(
+                kwargs=kwargs,
+                client_instance=instance,
+                capture_content=capture_content,
+            )
 
         span_name = f"{span_attributes[GenAIAttributes.GEN_AI_OPERATION_NAME]} {span_attributes[GenAIAttributes.GEN_AI_REQUEST_MODEL]}"
 
@@ -220,7 +345,9 @@ def async_embeddings_create(
             attributes=span_attributes,
             end_on_exit=False,
         ) as span:
+            message_events.emit()
             start = default_timer()
+            in_flight = track_request(instruments, span_attributes)
             result = None
             error_type = None
             try:
@@ -236,6 +363,7 @@ def async_embeddings_create(
                 handle_span_exception(span, error)
                 raise
             finally:
+                in_flight.end()
                 duration = max((default_timer() - start), 0)
                 _record_embedding_metrics(
                     instruments=instruments,
@@ -243,6 +371,7 @@ def async_embeddings_create(
                     result=result,
                     span_attributes=span_attributes,
                     error_type=error_type,
+                    admitted=in_flight.attributes,
                 )
 
     return traced_method
@@ -256,9 +385,12 @@ def responses_create(
     """Wrap `Responses.create` for OpenTelemetry tracing."""
 
     def traced_method(wrapped, instance, args, kwargs):
-        span_attributes = {
-            **get_responses_request_attributes(dict(kwargs), instance, capture_content)
-        }
+        with deferred_message_events() as message_events:
+            span_attributes = {
+                **get_responses_request_attributes(
+                    dict(kwargs), instance, capture_content
+                )
+            }
 
         span_name = f"{span_attributes[GenAIAttributes.GEN_AI_OPERATION_NAME]} {span_attributes[GenAIAttributes.GEN_AI_REQUEST_MODEL]}"
         with tracer.start_as_current_span(
@@ -267,13 +399,23 @@ def responses_create(
             attributes=span_attributes,
             end_on_exit=False,
         ) as span:
+            message_events.emit()
             start = default_timer()
+            in_flight = track_request(instruments, span_attributes)
             result = None
             error_type = None
             try:
                 result = wrapped(*args, **kwargs)
                 if is_streaming(kwargs):
-                    return ResponsesStreamWrapper(result, span, capture_content)
+                    return ResponsesStreamWrapper(
+                        result,
+                        span,
+                        capture_content,
+                        start_time=start,
+                        instruments=instruments,
+                        span_attributes=span_attributes,
+                        request=in_flight,
+                    )
 
                 if span.is_recording():
                     span.set_attributes(
@@ -288,6 +430,7 @@ def responses_create(
                 handle_span_exception(span, error)
                 raise
             finally:
+                in_flight.end()
                 duration = max((default_timer() - start), 0)
                 _record_metrics(
                     instruments,
@@ -295,6 +438,7 @@ def responses_create(
                     result,
                     span_attributes,
                     error_type,
+                    in_flight.attributes,
                 )
 
     return traced_method
@@ -308,9 +452,12 @@ def async_responses_create(
     """Wrap `AsyncResponses.create` for OpenTelemetry tracing."""
 
     async def traced_method(wrapped, instance, args, kwargs):
-        span_attributes = {
-            **get_responses_request_attributes(dict(kwargs), instance, capture_content)
-        }
+        with deferred_message_events() as message_events:
+            span_attributes = {
+                **get_responses_request_attributes(
+                    dict(kwargs), instance, capture_content
+                )
+            }
 
         span_name = f"{span_attributes[GenAIAttributes.GEN_AI_OPERATION_NAME]} {span_attributes[GenAIAttributes.GEN_AI_REQUEST_MODEL]}"
         with tracer.start_as_current_span(
@@ -319,13 +466,23 @@ def async_responses_create(
             attributes=span_attributes,
             end_on_exit=False,
         ) as span:
+            message_events.emit()
             start = default_timer()
+            in_flight = track_request(instruments, span_attributes)
             result = None
             error_type = None
             try:
                 result = await wrapped(*args, **kwargs)
                 if is_streaming(kwargs):
-                    return AsyncResponsesStreamWrapper(result, span, capture_content)
+                    return AsyncResponsesStreamWrapper(
+                        result,
+                        span,
+                        capture_content,
+                        start_time=start,
+                        instruments=instruments,
+                        span_attributes=span_attributes,
+                        request=in_flight,
+                    )
 
                 if span.is_recording():
                     span.set_attributes(
@@ -340,6 +497,7 @@ def async_responses_create(
                 handle_span_exception(span, error)
                 raise
             finally:
+                in_flight.end()
                 duration = max((default_timer() - start), 0)
                 _record_metrics(
                     instruments,
@@ -347,6 +505,7 @@ def async_responses_create(
                     result,
                     span_attributes,
                     error_type,
+                    in_flight.attributes,
                 )
 
     return traced_method
@@ -370,14 +529,14 @@ def _usage_prompt_and_completion_tokens(result: Any) -> tuple[int | None, int |
     return input_tok, output_tok
 
 
-def _record_metrics(
+def _metric_attributes(
     instruments: Instruments,
-    duration: float,
     result,
     span_attributes: dict,
     error_type: str | None,
-):
-    common_attributes = {
+    admitted: Mapping[str, AttributeValue] | None = None,
+) -> dict[str, AttributeValue]:
+    common_attributes: dict[str, AttributeValue] = {
         GenAIAttributes.GEN_AI_OPERATION_NAME: GenAIAttributes.GenAiOperationNameValues.CHAT.value,
         GenAIAttributes.GEN_AI_SYSTEM: GenAIAttributes.GenAiSystemValues.OPENAI.value,
         GenAIAttributes.GEN_AI_REQUEST_MODEL: span_attributes[
@@ -411,12 +570,17 @@ def _record_metrics(
             ServerAttributes.SERVER_PORT
         ]
 
-    instruments.operation_duration_histogram.record(
-        duration,
-        attributes=common_attributes,
-    )
+    return limit_metric_attributes(instruments, common_attributes, admitted)
 
-    prompt_tokens, completion_tokens = _usage_prompt_and_completion_tokens(result)
+
+def _record_token_metrics(
+    instruments: Instruments,
+    common_attributes: dict[str, AttributeValue],
+    prompt_tokens: int | None,
+    completion_tokens: int | None,
+    cached_tokens: int | None = None,
+    reasoning_tokens: int | None = None,
+):
     if prompt_tokens is not None:
         input_attributes = {
             **common_attributes,
@@ -437,6 +601,50 @@ def _record_metrics(
             attributes=completion_attributes,
         )
 
+    record_cache_usage_metrics(
+        instruments,
+        common_attributes,
+        cache_read_input_tokens=cached_tokens,
+        total_input_tokens=prompt_tokens,
+    )
+    record_reasoning_usage_metrics(
+        instruments,
+        common_attributes,
+        reasoning_output_tokens=reasoning_tokens,
+    )
+
+
+def _record_metrics(
+    instruments: Instruments,
+    duration: float,
+    result,
+    span_attributes: dict,
+    error_type: str | None,
+    admitted: Mapping[str, AttributeValue] | None = None,
+):
+    common_attributes = _metric_attributes(
+        instruments, result, span_attributes, error_type, admitted
+    )
+    instruments.operation_duration_histogram.record(
+        duration,
+        attributes=common_attributes,
+    )
+
+    usage = getattr(result, "usage", None) if result else None
+    prompt_tokens, completion_tokens = _usage_prompt_and_completion_tokens(result)
+    _record_token_metrics(
+        instruments,
+        common_attributes,
+        prompt_tokens,
+        completion_tokens,
+        cached_tokens=get_cached_input_tokens(usage),
+        reasoning_tokens=get_reasoning_output_tokens(usage),
+    )
+    if error_type is None:
+        record_output_throughput(
+            instruments, common_attributes, completion_tokens, duration
+        )
+
 
 def _record_embedding_metrics(
     instruments: Instruments,
@@ -444,6 +652,7 @@ def _record_embedding_metrics(
     result,
     span_attributes: dict,
     error_type: str | None,
+    admitted: Mapping[str, AttributeValue] | None = None,
 ):
     common_attributes: dict[str, AttributeValue] = {
         GenAIAttributes.GEN_AI_OPERATION_NAME: GenAIAttributes.GenAiOperationNameValues.EMBEDDINGS.value,
@@ -470,6 +679,9 @@ def _record_embedding_metrics(
         if isinstance(server_port, int):
             common_attributes[ServerAttributes.SERVER_PORT] = server_port
 
+    common_attributes = limit_metric_attributes(
+        instruments, common_attributes, admitted
+    )
     instruments.operation_duration_histogram.record(
         duration,
         attributes=common_attributes,
@@ -492,37 +704,43 @@ def _record_embedding_metrics(
 
 
 class ToolCallBuffer:
-    def __init__(self, index, tool_call_id, function_name):
+    def __init__(
+        self, index, tool_call_id, function_name, reservation: StreamBufferReservation
+    ):
         self.index = index
         self.function_name = function_name
         self.tool_call_id = tool_call_id
-        self.arguments = []
+        self.arguments = StreamAccumulator(reservation)
 
     def append_arguments(self, arguments):
         self.arguments.append(arguments)
 
 
 class ChoiceBuffer:
-    def __init__(self, index):
+    def __init__(self, index, reservation: StreamBufferReservation):
         self.index = index
-        self.finish_reason = None
-        self.text_content = []
-        self.tool_calls_buffers = []
+        self.finish_reason: str | None = None
+        self.text_content = StreamAccumulator(reservation)
+        self.tool_calls_buffers: list[ToolCallBuffer | None] = []
+        self._reservation = reservation
 
     def append_text_content(self, content):
         self.text_content.append(content)
 
-    def append_tool_call(self, tool_call):
+    def append_tool_call(self, tool_call, capture_content=True):
         idx = tool_call.index
         # make sure we have enough tool call buffers
         for _ in range(len(self.tool_calls_buffers), idx + 1):
             self.tool_calls_buffers.append(None)
 
-        if not self.tool_calls_buffers[idx]:
-            self.tool_calls_buffers[idx] = ToolCallBuffer(
-                idx, tool_call.id, tool_call.function.name
+        tool_call_buffer = self.tool_calls_buffers[idx]
+        if tool_call_buffer is None:
+            tool_call_buffer = ToolCallBuffer(
+                idx, tool_call.id, tool_call.function.name, self._reservation
             )
-        self.tool_calls_buffers[idx].append_arguments(tool_call.function.arguments)
+            self.tool_calls_buffers[idx] = tool_call_buffer
+        if capture_content:
+            tool_call_buffer.append_arguments(tool_call.function.arguments)
 
 
 class BaseStreamWrapper:
@@ -533,18 +751,62 @@ class BaseStreamWrapper:
     finish_reasons: list = []
     prompt_tokens: int | None = 0
     completion_tokens: int | None = 0
+    cached_tokens: int | None = None
+    reasoning_tokens: int | None = None
 
     def __init__(
         self,
         stream: Stream | AsyncStream,
         span: Span,
         capture_content: bool,
+        start_time: float | None = None,
+        cache_key: str | None = None,
+        instruments: Instruments | None = None,
+        span_attributes: dict[str, Any] | None = None,
+        request: InFlight | None = None,
+        request_messages: Any = None,
+        hide_usage_chunk: bool = False,
     ):
         self.stream = stream
         self.span = span
         self.choice_buffers: list[ChoiceBuffer] = []
         self._span_started = False
         self.capture_content = capture_content
+        self._buffer_reservation = get_stream_memory_budget().open_buffer()
+        self._response_fields_pending = True
+        self._pending_chunks: list[Any] = []
+        self.ingest_chunk: Callable[[Any], None] = self.process_chunk
+        defer_processing = is_deferred_stream_processing_enabled()
+        if defer_processing:
+            # only keep a reference to every chunk, they are parsed in bulk in `cleanup`
+            self.ingest_chunk = self._pending_chunks.append
+        self._reasoning_timer = ReasoningTimer(
+            start_time, observed=not defer_processing
+        )
+        # the usage chunk of a stream whose usage was only requested by the
+        # instrumentation is neither returned to the caller nor cached
+        self._hide_usage_chunk = hide_usage_chunk
+        self._ingest_usage_chunk = self.ingest_chunk
+        # chunks of a response that will be cached are kept until the stream ends
+        self._cache_key = cache_key
+        self._cached_chunks: list[Any] = []
+        if cache_key is not None:
+            self._ingest_uncached_chunk = self.ingest_chunk
+            self.ingest_chunk = self._ingest_cached_chunk
+        # token usage is recorded when the stream ends, and estimated when the
+        # stream does not report it
+        self._instruments = instruments
+        self._span_attributes = span_attributes or {}
+        self._request_messages = request_messages
+        self._estimate_usage = is_token_usage_estimation_enabled()
+        self._estimated_completion_tokens = 0
+        self._usage_reported = False
+        self.usage_estimated = False
+        self._active_stream = (
+            track_stream(instruments, self._span_attributes, request)
+            if instruments
+            else None
+        )
 
         self.setup()
 
@@ -552,24 +814,42 @@ class BaseStreamWrapper:
         if not self._span_started:
             self._span_started = True
 
+    def parse(self, *args, **kwargs):
+        """Parses a raw response, and keeps tracing the stream it holds."""
+        parsed = self.stream.parse(*args, **kwargs)
+        if inspect.isawaitable(parsed):
+            return self._parse_async(parsed)
+        return self._trace_parsed(parsed)
+
+    async def _parse_async(self, parsed):
+        return self._trace_parsed(await parsed)
+
+    def _trace_parsed(self, parsed):
+        if isinstance(parsed, (Stream, AsyncStream)):
+            self.stream = parsed
+            return self
+        return parsed
+
     @attribute_generator
     def _generate_response_attributes(self) -> dict[str, Any]:
         parsed_choices = []
         for choice in self.choice_buffers:
             content = None
             if choice.text_content:
-                content = "".join(choice.text_content)
+                content = choice.text_content.getvalue()
 
             tool_calls = None
             if choice.tool_calls_buffers:
                 tool_calls = []
                 for tool_call in choice.tool_calls_buffers:
+                    if tool_call is None:
+                        continue
                     tool_calls.append(
                         ToolCall(
                             id=tool_call.tool_call_id,
                             type="function",
                             function_name=tool_call.function_name,
-                            function_arguments="".join(tool_call.arguments),
+                            function_arguments=tool_call.arguments.getvalue(),
                         )
                     )
 
@@ -591,20 +871,100 @@ class BaseStreamWrapper:
                 usage_input_tokens=self.prompt_tokens,
                 usage_output_tokens=self.completion_tokens,
             ),
-            **generate_choice_attributes(parsed_choices, self.capture_content),
+            **generate_cache_usage_attributes(
+                cache_read_input_tokens=self.cached_tokens,
+                total_input_tokens=self.prompt_tokens,
+            ),
+            **generate_reasoning_usage_attributes(
+                reasoning_output_tokens=self.reasoning_tokens,
+                reasoning_duration=self._reasoning_timer.estimate(
+                    self.reasoning_tokens
+                ),
+            ),
+            **generate_choice_attributes(
+                parsed_choices,
+                self.capture_content and self._buffer_reservation.content_allowed,
+            ),
+            **self._buffer_reservation.attributes(),
+            ExtendedGenAIAttributes.GEN_AI_USAGE_ESTIMATED: True
+            if self.usage_estimated
+            else None,
         }
 
+    @property
+    def _request_model(self) -> str | None:
+        return self._span_attributes.get(GenAIAttributes.GEN_AI_REQUEST_MODEL)
+
+    def _estimate_delta_tokens(self, delta):
+        estimator = get_token_estimator()
+        model = self._request_model
+        count = estimator.count_tokens(delta.content, model)
+        for tool_call in delta.tool_calls or ():
+            function = getattr(tool_call, "function", None)
+            if function is not None:
+                count += estimator.count_tokens(function.name, model)
+                count += estimator.count_tokens(function.arguments, model)
+        self._estimated_completion_tokens += count
+
+    def _estimate_missing_usage(self):
+        if self._usage_reported or not self._estimate_usage:
+            return
+
+        self.prompt_tokens = get_token_estimator().count_message_tokens(
+            parse_messages(self._request_messages or []), self._request_model
+        )
+        self.completion_tokens = self._estimated_completion_tokens
+        self.usage_estimated = True
+
+    def _record_usage_metrics(self):
+        if self._instruments is None or not (
+            self._usage_reported or self.usage_estimated
+        ):
+            return
+
+        common_attributes = _metric_attributes(
+            self._instruments,
+            SimpleNamespace(model=self.response_model, service_tier=self.service_tier),
+            self._span_attributes,
+            None,
+            self._active_stream.attributes if self._active_stream else None,
+        )
+        if self.usage_estimated:
+            common_attributes[ExtendedGenAIAttributes.GEN_AI_USAGE_ESTIMATED] = True
+        _record_token_metrics(
+            self._instruments,
+            common_attributes,
+            self.prompt_tokens,
+            self.completion_tokens,
+            cached_tokens=self.cached_tokens,
+            reasoning_tokens=self.reasoning_tokens,
+        )
+        record_stream_output_throughput(
+            self._instruments,
+            common_attributes,
+            self.completion_tokens,
+            self._reasoning_timer,
+            self.reasoning_tokens,
+        )
+
     def cleanup(self):
         if not self._span_started:
             return
 
+        self.process_pending_chunks()
+        self._estimate_missing_usage()
         span_attributes = {}
         if self.span.is_recording():
-            span_attributes = self._generate_response_attributes()
+            with trace.use_span(self.span, end_on_exit=False):
+                span_attributes = self._generate_response_attributes()
 
         self.span.set_attributes(span_attributes)
         self.span.end()
+        self._buffer_reservation.release()
         self._span_started = False
+        if self._active_stream is not None:
+            self._active_stream.end()
+        self._record_usage_metrics()
 
     def set_response_model(self, chunk):
         if self.response_model:
@@ -637,33 +997,118 @@ class BaseStreamWrapper:
                 continue
 
             # make sure we have enough choice buffers
-            for idx in range(len(self.choice_buffers), choice.index + 1):
-                self.choice_buffers.append(ChoiceBuffer(idx))
+            if choice.index >= len(self.choice_buffers):
+                self._ensure_choice_buffers(choice.index + 1)
 
             if choice.finish_reason:
                 self.choice_buffers[choice.index].finish_reason = choice.finish_reason
 
-            if choice.delta.content is not None:
+            if choice.delta.content or choice.delta.tool_calls:
+                self._reasoning_timer.mark_content()
+
+            if self._estimate_usage:
+                self._estimate_delta_tokens(choice.delta)
+
+            # without content capture only the metadata of the stream is kept
+            if self.capture_content and choice.delta.content is not None:
                 self.choice_buffers[choice.index].append_text_content(
                     choice.delta.content
                 )
 
             if choice.delta.tool_calls is not None:
                 for tool_call in choice.delta.tool_calls:
-                    self.choice_buffers[choice.index].append_tool_call(tool_call)
+                    self.choice_buffers[choice.index].append_tool_call(
+                        tool_call, self.capture_content
+                    )
 
     def set_usage(self, chunk):
         if getattr(chunk, "usage", None):
+            self._usage_reported = True
             self.completion_tokens = chunk.usage.completion_tokens
             self.prompt_tokens = chunk.usage.prompt_tokens
+            self.cached_tokens = get_cached_input_tokens(chunk.usage)
+            self.reasoning_tokens = get_reasoning_output_tokens(chunk.usage)
+
+    def _ensure_choice_buffers(self, count: int):
+        self.choice_buffers.extend(
+            ChoiceBuffer(idx, self._buffer_reservation)
+            for idx in range(len(self.choice_buffers), count)
+        )
+
+    def _process_typed_chunk(self, chunk: ChatCompletionChunk):
+        # every field of a typed chunk is always present, so it is read directly
+        # instead of probed, and the one-time fields are only read until known
+        if self._response_fields_pending:
+            self.response_id = self.response_id or chunk.id or None
+            self.response_model = self.response_model or chunk.model or None
+            self.service_tier = self.service_tier or chunk.service_tier or None
+            self._response_fields_pending = not (
+                self.response_id and self.response_model
+            )
+
+        choice_buffers = self.choice_buffers
+        reasoning_timer = self._reasoning_timer
+        for choice in chunk.choices:
+            index = choice.index
+            if index >= len(choice_buffers):
+                self._ensure_choice_buffers(index + 1)
+
+            choice_buffer = choice_buffers[index]
+            if choice.finish_reason:
+                choice_buffer.finish_reason = choice.finish_reason
+
+            delta = choice.delta
+            if reasoning_timer.first_content_time is None and (
+                delta.content or delta.tool_calls
+            ):
+                reasoning_timer.mark_content()
+
+            if self._estimate_usage:
+                self._estimate_delta_tokens(delta)
+
+            # without content capture only the metadata of the stream is kept
+            if self.capture_content and delta.content is not None:
+                choice_buffer.text_content.append(delta.content)
+
+            if delta.tool_calls is not None:
+                for tool_call in delta.tool_calls:
+                    choice_buffer.append_tool_call(tool_call, self.capture_content)
+
+        usage = chunk.usage
+        if usage is not None:
+            self._usage_reported = True
+            self.completion_tokens = usage.completion_tokens
+            self.prompt_tokens = usage.prompt_tokens
+            self.cached_tokens = get_cached_input_tokens(usage)
+            self.reasoning_tokens = get_reasoning_output_tokens(usage)
 
     def process_chunk(self, chunk):
+        if type(chunk) is ChatCompletionChunk:
+            self._process_typed_chunk(chunk)
+            return
+
         self.set_response_id(chunk)
         self.set_response_model(chunk)
         self.set_response_service_tier(chunk)
         self.build_streaming_response(chunk)
         self.set_usage(chunk)
 
+    def _ingest_cached_chunk(self, chunk):
+        self._cached_chunks.append(chunk)
+        self._ingest_uncached_chunk(chunk)
+
+    def store_cached_chunks(self):
+        """Caches the chunks of a stream that was read to the end."""
+        if self._cache_key is not None:
+            store_cached_chat_completion(self._cache_key, self._cached_chunks)
+            self._cache_key = None
+        self._cached_chunks = []
+
+    def process_pending_chunks(self):
+        for chunk in self._pending_chunks:
+            self.process_chunk(chunk)
+        self._pending_chunks.clear()
+
 
 class StreamWrapper(BaseStreamWrapper):
     def __enter__(self):
@@ -689,9 +1134,13 @@ class StreamWrapper(BaseStreamWrapper):
     def __next__(self):
         try:
             chunk = next(self.stream)
-            self.process_chunk(chunk)
+            if self._hide_usage_chunk and is_usage_chunk(chunk):
+                self._ingest_usage_chunk(chunk)
+                chunk = next(self.stream)
+            self.ingest_chunk(chunk)
             return chunk
         except StopIteration:
+            self.store_cached_chunks()
             self.cleanup()
             raise
         except Exception as error:
@@ -724,9 +1173,13 @@ class AsyncStreamWrapper(BaseStreamWrapper):
     async def __anext__(self):
         try:
             chunk = await self.stream.__anext__()
-            self.process_chunk(chunk)
+            if self._hide_usage_chunk and is_usage_chunk(chunk):
+                self._ingest_usage_chunk(chunk)
+                chunk = await self.stream.__anext__()
+            self.ingest_chunk(chunk)
             return chunk
         except StopAsyncIteration:
+            self.store_cached_chunks()
             self.cleanup()
             raise
         except Exception as error:
@@ -734,24 +1187,88 @@ class AsyncStreamWrapper(BaseStreamWrapper):
             self.cleanup()
             raise
 
-    def parse(self):
-        return self.stream.parse()
+
+_RESPONSES_CONTENT_DELTA_EVENTS = frozenset(
+    (
+        "response.output_text.delta",
+        "response.refusal.delta",
+        "response.function_call_arguments.delta",
+    )
+)
+_RESPONSES_REASONING_DELTA_EVENTS = frozenset(
+    (
+        "response.reasoning_text.delta",
+        "response.reasoning_summary_text.delta",
+    )
+)
+
+
+def _end_responses_stream(
+    stream_wrapper: "ResponsesStreamWrapper | AsyncResponsesStreamWrapper",
+) -> None:
+    if stream_wrapper._active_stream is not None:
+        stream_wrapper._active_stream.end()
+    final_response = stream_wrapper._final_response
+    if (
+        stream_wrapper._instruments is None
+        or stream_wrapper._stream_error is not None
+        or final_response is None
+    ):
+        return
+
+    usage = getattr(final_response, "usage", None)
+    record_stream_output_throughput(
+        stream_wrapper._instruments,
+        _metric_attributes(
+            stream_wrapper._instruments,
+            final_response,
+            stream_wrapper._span_attributes,
+            None,
+            stream_wrapper._active_stream.attributes
+            if stream_wrapper._active_stream
+            else None,
+        ),
+        getattr(usage, "output_tokens", None),
+        stream_wrapper._reasoning_timer,
+        get_reasoning_output_tokens(usage),
+    )
 
 
 class ResponsesStreamWrapper:
     """Wrap Responses API SSE streams; finalize span on `response.completed`."""
 
-    def __init__(self, stream: Stream, span: Span, capture_content: bool) -> None:
+    def __init__(
+        self,
+        stream: Stream,
+        span: Span,
+        capture_content: bool,
+        start_time: float | None = None,
+        instruments: Instruments | None = None,
+        span_attributes: dict[str, Any] | None = None,
+        request: InFlight | None = None,
+    ) -> None:
         self.stream = stream
         self.span = span
         self.capture_content = capture_content
+        self._reasoning_timer = ReasoningTimer(start_time)
         self._final_response: Any = None
         self._stream_error: Any = None
         self._span_finalized = False
+        self._instruments = instruments
+        self._span_attributes = span_attributes or {}
+        self._active_stream = (
+            track_stream(instruments, self._span_attributes, request)
+            if instruments
+            else None
+        )
 
     def process_event(self, event: Any) -> None:
         etype = getattr(event, "type", None)
-        if etype == "response.completed":
+        if etype in _RESPONSES_CONTENT_DELTA_EVENTS:
+            self._reasoning_timer.mark_content()
+        elif etype in _RESPONSES_REASONING_DELTA_EVENTS:
+            self._reasoning_timer.mark_reasoning()
+        elif etype == "response.completed":
             self._final_response = getattr(event, "response", None)
         elif etype == "response.failed":
             self._final_response = getattr(event, "response", None)
@@ -766,12 +1283,23 @@ class ResponsesStreamWrapper:
             msg = getattr(self._stream_error, "message", str(self._stream_error))
             handle_span_exception(self.span, RuntimeError(msg))
         elif self._final_response is not None and self.span.is_recording():
-            self.span.set_attributes(
-                get_responses_response_attributes(
-                    self._final_response, self.capture_content
+            with trace.use_span(self.span, end_on_exit=False):
+                self.span.set_attributes(
+                    get_responses_response_attributes(
+                        self._final_response, self.capture_content
+                    )
+                )
+                self.span.set_attributes(
+                    generate_reasoning_usage_attributes(
+                        reasoning_duration=self._reasoning_timer.estimate(
+                            get_reasoning_output_tokens(
+                                getattr(self._final_response, "usage", None)
+                            )
+                        )
+                    )
                 )
-            )
         self.span.end()
+        _end_responses_stream(self)
 
     def __enter__(self) -> "ResponsesStreamWrapper":
         return self
@@ -808,17 +1336,38 @@ class ResponsesStreamWrapper:
 class AsyncResponsesStreamWrapper:
     """Async variant of `ResponsesStreamWrapper`."""
 
-    def __init__(self, stream: AsyncStream, span: Span, capture_content: bool) -> None:
+    def __init__(
+        self,
+        stream: AsyncStream,
+        span: Span,
+        capture_content: bool,
+        start_time: float | None = None,
+        instruments: Instruments | None = None,
+        span_attributes: dict[str, Any] | None = None,
+        request: InFlight | None = None,
+    ) -> None:
         self.stream = stream
         self.span = span
         self.capture_content = capture_content
+        self._reasoning_timer = ReasoningTimer(start_time)
         self._final_response: Any = None
         self._stream_error: Any = None
         self._span_finalized = False
+        self._instruments = instruments
+        self._span_attributes = span_attributes or {}
+        self._active_stream = (
+            track_stream(instruments, self._span_attributes, request)
+            if instruments
+            else None
+        )
 
     def process_event(self, event: Any) -> None:
         etype = getattr(event, "type", None)
-        if etype == "response.completed":
+        if etype in _RESPONSES_CONTENT_DELTA_EVENTS:
+            self._reasoning_timer.mark_content()
+        elif etype in _RESPONSES_REASONING_DELTA_EVENTS:
+            self._reasoning_timer.mark_reasoning()
+        elif etype == "response.completed":
             self._final_response = getattr(event, "response", None)
         elif etype == "response.failed":
             self._final_response = getattr(event, "response", None)
@@ -833,12 +1382,23 @@ class AsyncResponsesStreamWrapper:
             msg = getattr(self._stream_error, "message", str(self._stream_error))
             handle_span_exception(self.span, RuntimeError(msg))
         elif self._final_response is not None and self.span.is_recording():
-            self.span.set_attributes(
-                get_responses_response_attributes(
-                    self._final_response, self.capture_content
+            with trace.use_span(self.span, end_on_exit=False):
+                self.span.set_attributes(
+                    get_responses_response_attributes(
+                        self._final_response, self.capture_content
+                    )
+                )
+                self.span.set_attributes(
+                    generate_reasoning_usage_attributes(
+                        reasoning_duration=self._reasoning_timer.estimate(
+                            get_reasoning_output_tokens(
+                                getattr(self._final_response, "usage", None)
+                            )
+                        )
+                    )
                 )
-            )
         self.span.end()
+        _end_responses_stream(self)
 
     async def __aenter__(self) -> "AsyncResponsesStreamWrapper":
         return self
@@ -13,12 +13,17 @@
 # limitations under the License.
 
 import json
-from typing import Any, Mapping
+import logging
+from typing import Any, Mapping, Sequence
 from urllib.parse import urlparse
 
 from httpx import URL
 from openai import NOT_GIVEN
+from openai._constants import RAW_RESPONSE_HEADER
+from openai._legacy_response import LegacyAPIResponse
+from openai._utils import is_given
 from openai.types.chat.chat_completion import ChatCompletion
+from openai.types.chat.chat_completion_chunk import ChatCompletionChunk
 from openai.types.chat.chat_completion import Choice as OpenAIChoice
 from openai.types.chat.chat_completion_message_tool_call import (
     ChatCompletionMessageToolCall,
@@ -29,20 +34,35 @@ from opentelemetry.semconv._incubating.attributes import (
 from opentelemetry.semconv._incubating.attributes import (
     server_attributes as ServerAttributes,
 )
+from pydantic import ValidationError
 
 from llm_tracekit.core import (
+    ClientAttributesCache,
+    ToolAttributesCache,
     ToolCall,
     Message,
     Choice,
     attribute_generator,
-    generate_base_attributes,
+    generate_cache_usage_attributes,
+    generate_reasoning_usage_attributes,
+    generate_embedding_input_attributes,
+    generate_embedding_vector_attributes,
     generate_message_attributes,
     generate_choice_attributes,
     generate_request_attributes,
     generate_response_attributes,
+    get_response_cache,
+    is_deterministic_request,
+    is_stream_usage_injection_enabled,
+    request_cache_key,
     _extended_gen_ai_attributes as ExtendedGenAIAttributes,
 )
 
+logger = logging.getLogger(__name__)
+
+# request parameters that do not affect the response
+_RESPONSE_CACHE_IGNORED_KWARGS = frozenset(("timeout",))
+
 
 def parse_tool_calls(
     tool_calls: list[dict[str, Any] | ChatCompletionMessageToolCall] | None,
@@ -97,6 +117,12 @@ def generate_server_address_and_port_attributes(client_instance) -> dict[str, An
     return attributes
 
 
+_client_attributes = ClientAttributesCache(
+    GenAIAttributes.GenAiSystemValues.OPENAI,
+    generate_server_address_and_port_attributes,
+)
+
+
 def get_property_value(obj, property_name):
     if isinstance(obj, dict):
         return obj.get(property_name, None)
@@ -104,9 +130,7 @@ def get_property_value(obj, property_name):
     return getattr(obj, property_name, None)
 
 
-def messages_to_span_attributes(
-    messages: list, capture_content: bool
-) -> dict[str, Any]:
+def parse_messages(messages: list) -> list[Message]:
     parsed_messages = []
     for message in messages:
         content = get_property_value(message, "content")
@@ -123,9 +147,14 @@ def messages_to_span_attributes(
                 tool_calls=tool_calls,
             )
         )
+    return parsed_messages
 
+
+def messages_to_span_attributes(
+    messages: list, capture_content: bool, model: str | None = None
+) -> dict[str, Any]:
     return generate_message_attributes(
-        messages=parsed_messages, capture_content=capture_content
+        messages=parse_messages(messages), capture_content=capture_content, model=model
     )
 
 
@@ -172,14 +201,150 @@ def is_streaming(kwargs):
     return non_numerical_value_is_set(kwargs.get("stream"))
 
 
+def inject_stream_usage_option(kwargs: dict[str, Any]) -> bool:
+    """Requests the token usage of a stream, when enabled and the caller did not.
+
+    Returns whether `stream_options.include_usage` was added to `kwargs`, in
+    which case the extra usage chunk must not be returned to the caller.
+    """
+    if not is_stream_usage_injection_enabled() or not is_streaming(kwargs):
+        return False
+
+    stream_options = kwargs.get("stream_options")
+    if isinstance(stream_options, Mapping):
+        # an explicit `include_usage`, even a false one, is left as is
+        if "include_usage" in stream_options:
+            return False
+        kwargs["stream_options"] = {**stream_options, "include_usage": True}
+    else:
+        kwargs["stream_options"] = {"include_usage": True}
+    return True
+
+
+def is_usage_chunk(chunk: Any) -> bool:
+    """Checks if a stream chunk is the final one, that only reports the token usage."""
+    return getattr(chunk, "usage", None) is not None and not getattr(
+        chunk, "choices", None
+    )
+
+
 def non_numerical_value_is_set(value: bool | str | None):
     return bool(value) and value != NOT_GIVEN
 
 
+def get_response_cache_key(kwargs, client_instance) -> str | None:
+    """Returns the response cache key of a chat completions request, None if its response is not cached."""
+    if get_response_cache() is None:
+        return None
+
+    seed = kwargs.get("seed")
+    if not is_deterministic_request(
+        temperature=kwargs.get("temperature"),
+        seed=seed if is_given(seed) else None,
+    ):
+        return None
+
+    if RAW_RESPONSE_HEADER in (kwargs.get("extra_headers") or {}):
+        # `with_raw_response` and `with_streaming_response` return the HTTP
+        # response instead of the parsed one, which is not cached
+        return None
+
+    request = {
+        key: value
+        for key, value in kwargs.items()
+        if key not in _RESPONSE_CACHE_IGNORED_KWARGS and is_given(value)
+    }
+    base_client = getattr(client_instance, "_client", None)
+    request["base_url"] = str(getattr(base_client, "base_url", ""))
+    return request_cache_key(GenAIAttributes.GenAiSystemValues.OPENAI.value, request)
+
+
+def load_cached_chat_completion(
+    cache_key: str | None, stream: bool
+) -> ChatCompletion | list[ChatCompletionChunk] | None:
+    """Returns the cached response of a request: a completion, or the chunks of a stream."""
+    if cache_key is None:
+        return None
+    cache = get_response_cache()
+    cached = cache.get(cache_key) if cache is not None else None
+    if cached is None:
+        return None
+
+    try:
+        if stream:
+            return [ChatCompletionChunk.model_validate(chunk) for chunk in cached]
+        return ChatCompletion.model_validate(cached)
+    except (ValidationError, TypeError):
+        return None
+
+
+def parse_raw_response(result: Any) -> Any:
+    """Returns the parsed response of a `with_raw_response` call, or `result` itself."""
+    if isinstance(result, LegacyAPIResponse):
+        return result.parse()
+    return result
+
+
+def store_cached_chat_completion(
+    cache_key: str | None, result: ChatCompletion | list[ChatCompletionChunk]
+) -> None:
+    if cache_key is None:
+        return
+    cache = get_response_cache()
+    if cache is None:
+        return
+
+    try:
+        if isinstance(result, ChatCompletion):
+            cache.set(cache_key, result.model_dump(mode="json"))
+        elif isinstance(result, list) and all(
+            isinstance(chunk, ChatCompletionChunk) for chunk in result
+        ):
+            cache.set(cache_key, [chunk.model_dump(mode="json") for chunk in result])
+    except Exception:  # pylint: disable=broad-except
+        # caching must never fail the request
+        logger.debug("Failed to store the response in the cache", exc_info=True)
+
+
+def _build_chat_tools_attributes(tools: Sequence[Any]) -> dict[str, Any]:
+    attributes: dict[str, Any] = {}
+    for index, tool in enumerate(tools):
+        if not isinstance(tool, Mapping):
+            continue
+
+        attributes[
+            ExtendedGenAIAttributes.GEN_AI_REQUEST_TOOLS_TYPE.format(tool_index=index)
+        ] = tool.get("type", "function")
+        function = tool.get("function")
+        if function is not None and isinstance(function, Mapping):
+            attributes[
+                ExtendedGenAIAttributes.GEN_AI_REQUEST_TOOLS_FUNCTION_NAME.format(
+                    tool_index=index
+                )
+            ] = function.get("name")
+            attributes[
+                ExtendedGenAIAttributes.GEN_AI_REQUEST_TOOLS_FUNCTION_DESCRIPTION.format(
+                    tool_index=index
+                )
+            ] = function.get("description")
+            function_parameters = function.get("parameters")
+            if function_parameters is not None:
+                attributes[
+                    ExtendedGenAIAttributes.GEN_AI_REQUEST_TOOLS_FUNCTION_PARAMETERS.format(
+                        tool_index=index
+                    )
+                ] = json.dumps(function_parameters)
+
+    return attributes
+
+
+_chat_tool_attributes = ToolAttributesCache(_build_chat_tools_attributes)
+
+
 @attribute_generator
 def get_llm_request_attributes(kwargs, client_instance, capture_content: bool):
     attributes = {
-        **generate_base_attributes(system=GenAIAttributes.GenAiSystemValues.OPENAI),
+        **_client_attributes.get(client_instance),
         **generate_request_attributes(
             model=kwargs.get("model"),
             temperature=kwargs.get("temperature"),
@@ -189,7 +354,9 @@ def get_llm_request_attributes(kwargs, client_instance, capture_content: bool):
             frequency_penalty=kwargs.get("frequency_penalty"),
         ),
         **messages_to_span_attributes(
-            messages=kwargs.get("messages", []), capture_content=capture_content
+            messages=kwargs.get("messages", []),
+            capture_content=capture_content,
+            model=kwargs.get("model"),
         ),
         GenAIAttributes.GEN_AI_OPENAI_REQUEST_SEED: kwargs.get("seed"),
         ExtendedGenAIAttributes.GEN_AI_REQUEST_USER: kwargs.get("user"),
@@ -211,36 +378,8 @@ def get_llm_request_attributes(kwargs, client_instance, capture_content: bool):
 
     tools = kwargs.get("tools")
     if tools is not None and isinstance(tools, list):
-        for index, tool in enumerate(tools):
-            if not isinstance(tool, Mapping):
-                continue
+        attributes.update(_chat_tool_attributes.get(tools))
 
-            attributes[
-                ExtendedGenAIAttributes.GEN_AI_REQUEST_TOOLS_TYPE.format(
-                    tool_index=index
-                )
-            ] = tool.get("type", "function")
-            function = tool.get("function")
-            if function is not None and isinstance(function, Mapping):
-                attributes[
-                    ExtendedGenAIAttributes.GEN_AI_REQUEST_TOOLS_FUNCTION_NAME.format(
-                        tool_index=index
-                    )
-                ] = function.get("name")
-                attributes[
-                    ExtendedGenAIAttributes.GEN_AI_REQUEST_TOOLS_FUNCTION_DESCRIPTION.format(
-                        tool_index=index
-                    )
-                ] = function.get("description")
-                function_parameters = function.get("parameters")
-                if function_parameters is not None:
-                    attributes[
-                        ExtendedGenAIAttributes.GEN_AI_REQUEST_TOOLS_FUNCTION_PARAMETERS.format(
-                            tool_index=index
-                        )
-                    ] = json.dumps(function_parameters)
-
-    attributes.update(generate_server_address_and_port_attributes(client_instance))
     service_tier = kwargs.get("service_tier")
     if service_tier != "auto":
         attributes[GenAIAttributes.GEN_AI_OPENAI_RESPONSE_SERVICE_TIER] = service_tier
@@ -248,6 +387,28 @@ def get_llm_request_attributes(kwargs, client_instance, capture_content: bool):
     return attributes
 
 
+def get_cached_input_tokens(usage: Any) -> int | None:
+    """Read the prompt cache hits from Chat Completions or Responses usage objects."""
+    if usage is None:
+        return None
+    details = getattr(usage, "prompt_tokens_details", None) or getattr(
+        usage, "input_tokens_details", None
+    )
+    cached_tokens = getattr(details, "cached_tokens", None)
+    return cached_tokens if isinstance(cached_tokens, int) else None
+
+
+def get_reasoning_output_tokens(usage: Any) -> int | None:
+    """Read the reasoning tokens from Chat Completions or Responses usage objects."""
+    if usage is None:
+        return None
+    details = getattr(usage, "completion_tokens_details", None) or getattr(
+        usage, "output_tokens_details", None
+    )
+    reasoning_tokens = getattr(details, "reasoning_tokens", None)
+    return reasoning_tokens if isinstance(reasoning_tokens, int) else None
+
+
 @attribute_generator
 def get_llm_response_attributes(
     result: ChatCompletion, capture_content: bool
@@ -273,34 +434,29 @@ def get_llm_response_attributes(
             usage_input_tokens=usage_input_tokens,
             usage_output_tokens=usage_output_tokens,
         ),
+        **generate_cache_usage_attributes(
+            cache_read_input_tokens=get_cached_input_tokens(result.usage),
+            total_input_tokens=usage_input_tokens,
+        ),
+        **generate_reasoning_usage_attributes(
+            reasoning_output_tokens=get_reasoning_output_tokens(result.usage),
+        ),
         **choices_to_span_attributes(result.choices, capture_content),
     }
 
 
-def _embedding_input_to_prompt_messages(
-    embedding_input: Any,
-) -> list[Message]:
-    """Convert embeddings input to prompt messages."""
-
-    def to_message(content: str | None) -> Message:
-        return Message(role="user", content=content)
-
-    if embedding_input is None:
+def _embedding_input_to_items(embedding_input: Any) -> list[Any]:
+    """Split embeddings input into the items that are embedded."""
+    if embedding_input is None or embedding_input is NOT_GIVEN:
         return []
 
-    if isinstance(embedding_input, str):
-        return [to_message(embedding_input)]
-
     if isinstance(embedding_input, list):
-        messages: list[Message] = []
-        for item in embedding_input:
-            if isinstance(item, str):
-                messages.append(to_message(item))
-            else:
-                messages.append(to_message(None))
-        return messages
+        # A flat list of token ids is a single item
+        if embedding_input and isinstance(embedding_input[0], int):
+            return [embedding_input]
+        return embedding_input
 
-    return [to_message(None)]
+    return [embedding_input]
 
 
 @attribute_generator
@@ -314,8 +470,9 @@ def get_embedding_request_attributes(
     """
 
     attributes: dict[str, Any] = {
-        GenAIAttributes.GEN_AI_OPERATION_NAME: "embeddings",
-        GenAIAttributes.GEN_AI_SYSTEM: GenAIAttributes.GenAiSystemValues.OPENAI.value,
+        **_client_attributes.get(
+            client_instance, GenAIAttributes.GenAiOperationNameValues.EMBEDDINGS
+        ),
         GenAIAttributes.GEN_AI_REQUEST_MODEL: kwargs.get("model"),
         ExtendedGenAIAttributes.GEN_AI_REQUEST_USER: kwargs.get("user"),
     }
@@ -334,15 +491,13 @@ def get_embedding_request_attributes(
             dimensions
         )
 
-    embedding_input = kwargs.get("input")
-    prompt_messages = _embedding_input_to_prompt_messages(embedding_input)
     attributes.update(
-        generate_message_attributes(
-            messages=prompt_messages, capture_content=capture_content
+        generate_embedding_input_attributes(
+            _embedding_input_to_items(kwargs.get("input")),
+            capture_content=capture_content,
         )
     )
 
-    attributes.update(generate_server_address_and_port_attributes(client_instance))
     return attributes
 
 
@@ -374,11 +529,9 @@ def get_embedding_response_attributes(
                 index = getattr(item, "index", None)
                 embedding = getattr(item, "embedding", None)
                 if index is not None and embedding is not None:
-                    attributes[
-                        ExtendedGenAIAttributes.GEN_AI_EMBEDDING_VECTOR.format(
-                            embedding_index=index
-                        )
-                    ] = embedding
+                    attributes.update(
+                        generate_embedding_vector_attributes(index, embedding)
+                    )
 
     return attributes
 
@@ -552,6 +705,16 @@ def _responses_tool_item_to_attributes(tool: Any, index: int) -> dict[str, Any]:
     return attributes
 
 
+def _build_responses_tools_attributes(tools: Sequence[Any]) -> dict[str, Any]:
+    attributes: dict[str, Any] = {}
+    for index, tool in enumerate(tools):
+        attributes.update(_responses_tool_item_to_attributes(tool, index))
+    return attributes
+
+
+_responses_tool_attributes = ToolAttributesCache(_build_responses_tools_attributes)
+
+
 def _response_status_to_finish_reason(response: Any) -> str:
     status = getattr(response, "status", None)
     if status == "completed":
@@ -643,7 +806,7 @@ def get_responses_request_attributes(
 
     prompt_messages = _responses_input_to_messages(input_val, instructions)
     attributes: dict[str, Any] = {
-        **generate_base_attributes(system=GenAIAttributes.GenAiSystemValues.OPENAI),
+        **_client_attributes.get(client_instance),
         **generate_request_attributes(
             model=kwargs.get("model"),
             temperature=kwargs.get("temperature"),
@@ -653,7 +816,9 @@ def get_responses_request_attributes(
             frequency_penalty=None,
         ),
         **generate_message_attributes(
-            messages=prompt_messages, capture_content=capture_content
+            messages=prompt_messages,
+            capture_content=capture_content,
+            model=kwargs.get("model"),
         ),
         ExtendedGenAIAttributes.GEN_AI_REQUEST_USER: kwargs.get("user"),
     }
@@ -666,8 +831,7 @@ def get_responses_request_attributes(
             tool_list = list(tools)
         else:
             tool_list = [tools]
-        for index, tool in enumerate(tool_list):
-            attributes.update(_responses_tool_item_to_attributes(tool, index))
+        attributes.update(_responses_tool_attributes.get(tool_list))
 
     prev_id = kwargs.get("previous_response_id")
     if prev_id is not None and prev_id is not NOT_GIVEN:
@@ -679,7 +843,6 @@ def get_responses_request_attributes(
         if conv_id:
             attributes["gen_ai.openai.request.conversation_id"] = conv_id
 
-    attributes.update(generate_server_address_and_port_attributes(client_instance))
     service_tier = kwargs.get("service_tier")
     if (
         service_tier is not None
@@ -720,6 +883,13 @@ def get_responses_response_attributes(
             usage_input_tokens=usage_input,
             usage_output_tokens=usage_output,
         ),
+        **generate_cache_usage_attributes(
+            cache_read_input_tokens=get_cached_input_tokens(usage),
+            total_input_tokens=usage_input,
+        ),
+        **generate_reasoning_usage_attributes(
+            reasoning_output_tokens=get_reasoning_output_tokens(usage),
+        ),
         **generate_choice_attributes(
             choices=[choice],
             capture_content=capture_content,
@@ -14,8 +14,14 @@
 # pylint: disable=too-many-locals
 
 
+import httpx
 import pytest
 from openai import APIConnectionError, APITimeoutError, NotFoundError, OpenAI
+from opentelemetry.sdk._logs import LoggerProvider
+from opentelemetry.sdk._logs.export import (
+    InMemoryLogRecordExporter,
+    SimpleLogRecordProcessor,
+)
 from opentelemetry.semconv._incubating.attributes import (
     error_attributes as ErrorAttributes,
 )
@@ -27,7 +33,15 @@ from opentelemetry.semconv._incubating.attributes import (
 )
 from opentelemetry.semconv._incubating.metrics import gen_ai_metrics
 
+import llm_tracekit.core._content_events as content_events
 import llm_tracekit.core._extended_gen_ai_attributes as ExtendedGenAIAttributes
+import llm_tracekit.core._response_cache as response_cache
+from llm_tracekit.core import (
+    OTEL_INSTRUMENTATION_GENAI_CONTENT_EXPORT_MODE,
+    OTEL_INSTRUMENTATION_GENAI_DEFER_STREAM_PROCESSING,
+    ResponseCache,
+    set_response_cache,
+)
 from .utils import (
     assert_all_attributes,
     assert_completion_attributes,
@@ -68,6 +82,50 @@ def test_chat_completion_with_content(
     )
 
 
+@pytest.mark.vcr()
+@pytest.mark.parametrize(
+    "vcr_cassette_name, stream",
+    [
+        ("test_chat_completion_with_content", False),
+        ("test_chat_completion_streaming", True),
+    ],
+)
+def test_chat_completion_content_events(
+    span_exporter,
+    openai_client,
+    instrument_with_content,
+    monkeypatch,
+    vcr_cassette_name,
+    stream,
+):
+    monkeypatch.setenv(OTEL_INSTRUMENTATION_GENAI_CONTENT_EXPORT_MODE, "event")
+    log_exporter = InMemoryLogRecordExporter()
+    logger_provider = LoggerProvider()
+    logger_provider.add_log_record_processor(SimpleLogRecordProcessor(log_exporter))
+    monkeypatch.setattr(content_events, "_logger", logger_provider.get_logger(__name__))
+
+    kwargs = {
+        "model": "gpt-4" if stream else "gpt-4o-mini",
+        "messages": [{"role": "user", "content": "Say this is a test"}],
+        "stream": stream,
+    }
+    if stream:
+        kwargs["stream_options"] = {"include_usage": True}
+    response = openai_client.chat.completions.create(**kwargs)
+    if stream:
+        for _ in response:
+            pass
+
+    (span,) = span_exporter.get_finished_spans()
+    assert "gen_ai.prompt.0.content" not in span.attributes
+
+    logs = [log.log_record for log in log_exporter.get_finished_logs()]
+    assert [log.event_name for log in logs] == ["gen_ai.user.message", "gen_ai.choice"]
+    for log in logs:
+        assert log.trace_id == span.context.trace_id
+        assert log.span_id == span.context.span_id
+
+
 @pytest.mark.vcr()
 def test_chat_completion_with_content_array(
     span_exporter, openai_client, instrument_with_content
@@ -494,6 +552,61 @@ def test_chat_completion_streaming(
     )
 
 
+@pytest.mark.vcr()
+@pytest.mark.parametrize("vcr_cassette_name", ["test_chat_completion_streaming"])
+def test_chat_completion_streaming_deferred_processing(
+    span_exporter,
+    openai_client,
+    instrument_with_content,
+    monkeypatch,
+    vcr_cassette_name,
+):
+    monkeypatch.setenv(OTEL_INSTRUMENTATION_GENAI_DEFER_STREAM_PROCESSING, "true")
+    llm_model_value = "gpt-4"
+    messages_value = [{"role": "user", "content": "Say this is a test"}]
+
+    kwargs = {
+        "model": llm_model_value,
+        "messages": messages_value,
+        "stream": True,
+        "stream_options": {"include_usage": True},
+    }
+
+    response_stream_usage = None
+    response_stream_model = None
+    response_stream_id = None
+    response_stream_result = ""
+    response = openai_client.chat.completions.create(**kwargs)
+    for chunk in response:
+        # chunks are only parsed once the stream ends
+        assert response.choice_buffers == []
+        if chunk.choices:
+            response_stream_result += chunk.choices[0].delta.content or ""
+
+        if getattr(chunk, "usage", None):
+            response_stream_usage = chunk.usage
+            response_stream_model = chunk.model
+            response_stream_id = chunk.id
+
+    spans = span_exporter.get_finished_spans()
+    assert_all_attributes(
+        spans[0],
+        llm_model_value,
+        response_stream_id,
+        response_stream_model,
+        response_stream_usage.prompt_tokens,
+        response_stream_usage.completion_tokens,
+    )
+
+    choice = {
+        "finish_reason": "stop",
+        "message": {"role": "assistant", "content": response_stream_result},
+    }
+    assert_choices_in_span(
+        span=spans[0], expected_choices=[choice], expect_content=True
+    )
+
+
 @pytest.mark.vcr()
 def test_chat_completion_streaming_not_complete(
     span_exporter, openai_client, instrument_with_content
@@ -654,6 +767,129 @@ def test_chat_completion_with_content_span_unsampled(
     assert len(spans) == 0
 
 
+@pytest.fixture
+def enable_response_cache():
+    set_response_cache(ResponseCache())
+    yield
+    set_response_cache(response_cache._UNSET)
+
+
+@pytest.mark.vcr()
+@pytest.mark.parametrize("vcr_cassette_name", ["test_chat_completion_with_content"])
+def test_chat_completion_response_cache(
+    span_exporter,
+    openai_client,
+    instrument_with_content,
+    enable_response_cache,
+    vcr_cassette_name,
+):
+    kwargs = {
+        "messages": [{"role": "user", "content": "Say this is a test"}],
+        "model": "gpt-4o-mini",
+        "temperature": 0,
+    }
+
+    # the cassette holds a single response, so the second request must not reach the API
+    response = openai_client.chat.completions.create(**kwargs)
+    cached_response = openai_client.chat.completions.create(**kwargs)
+
+    assert cached_response == response
+    miss, hit = span_exporter.get_finished_spans()
+    assert miss.attributes[ExtendedGenAIAttributes.GEN_AI_CACHE_HIT] is False
+    assert hit.attributes[ExtendedGenAIAttributes.GEN_AI_CACHE_HIT] is True
+    assert_completion_attributes(hit, "gpt-4o-mini", response)
+
+
+@pytest.mark.vcr()
+@pytest.mark.parametrize("vcr_cassette_name", ["test_chat_completion_streaming"])
+def test_chat_completion_streaming_response_cache(
+    span_exporter,
+    openai_client,
+    instrument_with_content,
+    enable_response_cache,
+    vcr_cassette_name,
+):
+    kwargs = {
+        "model": "gpt-4",
+        "messages": [{"role": "user", "content": "Say this is a test"}],
+        "stream": True,
+        "stream_options": {"include_usage": True},
+        "seed": 42,
+    }
+
+    chunks = list(openai_client.chat.completions.create(**kwargs))
+    replayed_chunks = list(openai_client.chat.completions.create(**kwargs))
+
+    assert replayed_chunks == chunks
+    miss, hit = span_exporter.get_finished_spans()
+    assert hit.attributes[ExtendedGenAIAttributes.GEN_AI_CACHE_HIT] is True
+    for attribute in (
+        GenAIAttributes.GEN_AI_RESPONSE_ID,
+        GenAIAttributes.GEN_AI_USAGE_OUTPUT_TOKENS,
+        "gen_ai.completion.0.content",
+    ):
+        assert hit.attributes[attribute] == miss.attributes[attribute]
+
+
+def test_chat_completion_raw_response_not_cached(
+    span_exporter, instrument_with_content, enable_response_cache
+):
+    requests = []
+
+    def handle_request(request):
+        requests.append(request)
+        return httpx.Response(
+            200,
+            json={
+                "id": "chatcmpl-raw",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "gpt-4o-mini",
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {"role": "assistant", "content": "This is a test."},
+                    }
+                ],
+            },
+        )
+
+    client = OpenAI(
+        api_key="test_openai_api_key",
+        http_client=httpx.Client(transport=httpx.MockTransport(handle_request)),
+    )
+    raw_responses = [
+        client.chat.completions.with_raw_response.create(
+            messages=[{"role": "user", "content": "Say this is a test"}],
+            model="gpt-4o-mini",
+            temperature=0,
+        )
+        for _ in range(2)
+    ]
+
+    assert len(requests) == 2
+    assert raw_responses[1].parse().id == "chatcmpl-raw"
+    for span in span_exporter.get_finished_spans():
+        assert ExtendedGenAIAttributes.GEN_AI_CACHE_HIT not in span.attributes
+        assert span.attributes[GenAIAttributes.GEN_AI_RESPONSE_ID] == "chatcmpl-raw"
+
+
+def test_chat_completion_nondeterministic_not_cached(
+    span_exporter, openai_client, instrument_with_content, enable_response_cache
+):
+    with pytest.raises(APIConnectionError):
+        openai_client.with_options(
+            base_url="http://localhost:4242", max_retries=0
+        ).chat.completions.create(
+            messages=[{"role": "user", "content": "Say this is a test"}],
+            model="gpt-4o-mini",
+        )
+
+    (span,) = span_exporter.get_finished_spans()
+    assert ExtendedGenAIAttributes.GEN_AI_CACHE_HIT not in span.attributes
+
+
 def chat_completion_multiple_tools_streaming(
     span_exporter, openai_client, expect_content
 ):
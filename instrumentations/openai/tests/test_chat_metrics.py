@@ -1,4 +1,7 @@
+import json
+
 import pytest
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
 from opentelemetry.semconv._incubating.attributes import (  # type: ignore[attr-defined]
     gen_ai_attributes as GenAIAttributes,
 )
@@ -7,6 +10,23 @@ from opentelemetry.semconv._incubating.attributes import (  # type: ignore[attr-
 )
 from opentelemetry.semconv._incubating.metrics import gen_ai_metrics  # type: ignore[attr-defined]
 
+import llm_tracekit.core._cardinality as cardinality
+import llm_tracekit.core._extended_gen_ai_attributes as ExtendedGenAIAttributes
+from llm_tracekit.core import (
+    GEN_AI_CLIENT_ACTIVE_REQUESTS,
+    GEN_AI_CLIENT_ACTIVE_STREAMS,
+    GEN_AI_CLIENT_COLLAPSED_ATTRIBUTE_VALUES,
+    GEN_AI_CLIENT_OUTPUT_THROUGHPUT,
+    GEN_AI_CLIENT_TOKEN_CACHE_HIT_RATIO,
+    OTEL_INSTRUMENTATION_GENAI_ESTIMATE_TOKEN_USAGE,
+    OTEL_INSTRUMENTATION_GENAI_INJECT_STREAM_USAGE,
+    ApproximateTokenEstimator,
+    Message,
+    configure_metric_attribute_limiter,
+    get_metric_attribute_limiter,
+    set_token_estimator,
+)
+
 _DURATION_BUCKETS = (
     0.01,
     0.02,
@@ -88,7 +108,7 @@ def test_chat_completion_metrics(metric_reader, openai_client, instrument_with_c
     assert len(metrics) == 1
 
     metric_data = metrics[0].scope_metrics[0].metrics
-    assert len(metric_data) == 2
+    assert len(metric_data) == 5
 
     duration_metric = next(
         (
@@ -142,6 +162,73 @@ def test_chat_completion_metrics(metric_reader, openai_client, instrument_with_c
     assert output_token_usage.bucket_counts[2] == 1
     assert_all_metric_attributes(output_token_usage)
 
+    cache_hit_ratio_metric = next(
+        (m for m in metric_data if m.name == GEN_AI_CLIENT_TOKEN_CACHE_HIT_RATIO),
+        None,
+    )
+    assert cache_hit_ratio_metric is not None
+
+    cache_hit_ratio_point = cache_hit_ratio_metric.data.data_points[0]
+    assert cache_hit_ratio_point.sum == 0
+    assert cache_hit_ratio_point.count == 1
+    assert_all_metric_attributes(cache_hit_ratio_point)
+
+    throughput_metric = next(
+        m for m in metric_data if m.name == GEN_AI_CLIENT_OUTPUT_THROUGHPUT
+    )
+    (throughput_point,) = throughput_metric.data.data_points
+    assert throughput_point.count == 1
+    # the output tokens over the duration of the whole request
+    assert throughput_point.sum == pytest.approx(5 / duration_point.sum)
+    assert_all_metric_attributes(throughput_point)
+
+    active_requests_metric = next(
+        m for m in metric_data if m.name == GEN_AI_CLIENT_ACTIVE_REQUESTS
+    )
+    (active_requests_point,) = active_requests_metric.data.data_points
+    assert active_requests_point.value == 0
+    assert active_requests_point.attributes[GenAIAttributes.GEN_AI_REQUEST_MODEL] == (
+        llm_model_value
+    )
+
+
+@pytest.mark.vcr()
+@pytest.mark.parametrize("vcr_cassette_name", ["test_chat_completion_metrics"])
+def test_chat_completion_metrics_collapsed_models(
+    metric_reader,
+    openai_client,
+    instrument_with_content,
+    monkeypatch,
+    vcr_cassette_name,
+):
+    monkeypatch.setattr(
+        cardinality, "_metric_attribute_limiter", get_metric_attribute_limiter()
+    )
+    configure_metric_attribute_limiter(0)
+
+    openai_client.chat.completions.create(
+        messages=[{"role": "user", "content": "Say this is a test"}],
+        model="gpt-4o-mini",
+        stream=False,
+    )
+
+    metric_data = metric_reader.get_metrics_data().resource_metrics[0]
+    metrics = {metric.name: metric for metric in metric_data.scope_metrics[0].metrics}
+    duration_point = metrics[
+        gen_ai_metrics.GEN_AI_CLIENT_OPERATION_DURATION
+    ].data.data_points[0]
+    assert duration_point.attributes[GenAIAttributes.GEN_AI_REQUEST_MODEL] == "other"
+    assert duration_point.attributes[GenAIAttributes.GEN_AI_RESPONSE_MODEL] == "other"
+    assert duration_point.attributes[GenAIAttributes.GEN_AI_SYSTEM] == "other"
+
+    collapsed = {
+        point.attributes["gen_ai.metric.attribute"]: point.value
+        for point in metrics[GEN_AI_CLIENT_COLLAPSED_ATTRIBUTE_VALUES].data.data_points
+    }
+    # the duration of the request reuses the attributes of its active request
+    assert collapsed[GenAIAttributes.GEN_AI_REQUEST_MODEL] == 1
+    assert collapsed[GenAIAttributes.GEN_AI_RESPONSE_MODEL] == 1
+
 
 @pytest.mark.vcr()
 @pytest.mark.asyncio()
@@ -159,7 +246,7 @@ async def test_async_chat_completion_metrics(
     assert len(metrics) == 1
 
     metric_data = metrics[0].scope_metrics[0].metrics
-    assert len(metric_data) == 2
+    assert len(metric_data) == 5
 
     duration_metric = next(
         (
@@ -206,3 +293,216 @@ async def test_async_chat_completion_metrics(
     assert output_token_usage is not None
     assert output_token_usage.sum == 12
     assert_all_metric_attributes(output_token_usage)
+
+
+def _token_usage_points(metric_reader):
+    metric_data = metric_reader.get_metrics_data().resource_metrics[0].scope_metrics[0]
+    token_usage_metric = next(
+        m
+        for m in metric_data.metrics
+        if m.name == gen_ai_metrics.GEN_AI_CLIENT_TOKEN_USAGE
+    )
+    return {
+        point.attributes[GenAIAttributes.GEN_AI_TOKEN_TYPE]: point
+        for point in token_usage_metric.data.data_points
+    }
+
+
+@pytest.fixture
+def estimate_token_usage(monkeypatch):
+    monkeypatch.setenv(OTEL_INSTRUMENTATION_GENAI_ESTIMATE_TOKEN_USAGE, "true")
+    estimator = ApproximateTokenEstimator()
+    set_token_estimator(estimator)
+    yield estimator
+    set_token_estimator(None)
+
+
+@pytest.mark.vcr()
+@pytest.mark.parametrize("vcr_cassette_name", ["test_chat_completion_streaming"])
+def test_chat_completion_streaming_metrics(
+    span_exporter,
+    metric_reader,
+    openai_client,
+    instrument_with_content,
+    estimate_token_usage,
+    vcr_cassette_name,
+):
+    for _ in openai_client.chat.completions.create(
+        model="gpt-4",
+        messages=[{"role": "user", "content": "Say this is a test"}],
+        stream=True,
+        stream_options={"include_usage": True},
+    ):
+        pass
+
+    (span,) = span_exporter.get_finished_spans()
+    assert ExtendedGenAIAttributes.GEN_AI_USAGE_ESTIMATED not in span.attributes
+
+    points = _token_usage_points(metric_reader)
+    assert (
+        points[GenAIAttributes.GenAiTokenTypeValues.INPUT.value].sum
+        == span.attributes[GenAIAttributes.GEN_AI_USAGE_INPUT_TOKENS]
+    )
+    assert (
+        points[GenAIAttributes.GenAiTokenTypeValues.COMPLETION.value].sum
+        == span.attributes[GenAIAttributes.GEN_AI_USAGE_OUTPUT_TOKENS]
+    )
+
+    metric_data = metric_reader.get_metrics_data().resource_metrics[0].scope_metrics[0]
+    metrics = {metric.name: metric for metric in metric_data.metrics}
+    (throughput_point,) = metrics[GEN_AI_CLIENT_OUTPUT_THROUGHPUT].data.data_points
+    assert throughput_point.count == 1
+    assert throughput_point.sum > 0
+    for name in (GEN_AI_CLIENT_ACTIVE_REQUESTS, GEN_AI_CLIENT_ACTIVE_STREAMS):
+        (active_point,) = metrics[name].data.data_points
+        assert active_point.value == 0
+
+
+@pytest.mark.vcr()
+@pytest.mark.parametrize(
+    "vcr_cassette_name", ["test_chat_completion_streaming_not_complete"]
+)
+def test_chat_completion_streaming_estimated_usage(
+    span_exporter,
+    metric_reader,
+    openai_client,
+    instrument_with_content,
+    estimate_token_usage,
+    vcr_cassette_name,
+):
+    messages_value = [{"role": "user", "content": "Say this is a test"}]
+
+    content = ""
+    for chunk in openai_client.chat.completions.create(
+        model="gpt-4", messages=messages_value, stream=True
+    ):
+        if chunk.choices:
+            content += chunk.choices[0].delta.content or ""
+
+    (span,) = span_exporter.get_finished_spans()
+    input_tokens = estimate_token_usage.count_message_tokens(
+        [Message(role="user", content="Say this is a test")], "gpt-4"
+    )
+    assert span.attributes[ExtendedGenAIAttributes.GEN_AI_USAGE_ESTIMATED] is True
+    assert span.attributes[GenAIAttributes.GEN_AI_USAGE_INPUT_TOKENS] == input_tokens
+    assert span.attributes[GenAIAttributes.GEN_AI_USAGE_OUTPUT_TOKENS] >= (
+        estimate_token_usage.count_tokens(content, "gpt-4")
+    )
+
+    points = _token_usage_points(metric_reader)
+    input_point = points[GenAIAttributes.GenAiTokenTypeValues.INPUT.value]
+    assert input_point.sum == input_tokens
+    assert (
+        input_point.attributes[ExtendedGenAIAttributes.GEN_AI_USAGE_ESTIMATED] is True
+    )
+
+
+@pytest.fixture
+def inject_stream_usage(monkeypatch):
+    monkeypatch.setenv(OTEL_INSTRUMENTATION_GENAI_INJECT_STREAM_USAGE, "true")
+
+
+def _assert_injected_usage(requests, chunks, span, metric_reader):
+    (request,) = requests
+    assert json.loads(request.content)["stream_options"] == {"include_usage": True}
+    # the usage chunk was only requested by the instrumentation
+    assert len(chunks) > 0
+    assert all(chunk.choices for chunk in chunks)
+
+    assert ExtendedGenAIAttributes.GEN_AI_USAGE_ESTIMATED not in span.attributes
+    assert span.attributes[GenAIAttributes.GEN_AI_USAGE_INPUT_TOKENS] > 0
+    points = _token_usage_points(metric_reader)
+    assert (
+        points[GenAIAttributes.GenAiTokenTypeValues.INPUT.value].sum
+        == span.attributes[GenAIAttributes.GEN_AI_USAGE_INPUT_TOKENS]
+    )
+    assert (
+        points[GenAIAttributes.GenAiTokenTypeValues.COMPLETION.value].sum
+        == span.attributes[GenAIAttributes.GEN_AI_USAGE_OUTPUT_TOKENS]
+    )
+
+
+@pytest.mark.vcr()
+@pytest.mark.parametrize("vcr_cassette_name", ["test_chat_completion_streaming"])
+def test_chat_completion_streaming_injected_usage(
+    span_exporter,
+    metric_reader,
+    instrument_with_content,
+    inject_stream_usage,
+    vcr_cassette_name,
+):
+    requests = []
+    openai_client = OpenAI(
+        http_client=DefaultHttpxClient(event_hooks={"request": [requests.append]})
+    )
+
+    chunks = list(
+        openai_client.chat.completions.create(
+            model="gpt-4",
+            messages=[{"role": "user", "content": "Say this is a test"}],
+            stream=True,
+        )
+    )
+
+    (span,) = span_exporter.get_finished_spans()
+    _assert_injected_usage(requests, chunks, span, metric_reader)
+
+
+@pytest.mark.vcr()
+@pytest.mark.asyncio()
+@pytest.mark.parametrize("vcr_cassette_name", ["test_async_chat_completion_streaming"])
+async def test_async_chat_completion_streaming_raw_response_injected_usage(
+    span_exporter,
+    metric_reader,
+    instrument_with_content,
+    inject_stream_usage,
+    vcr_cassette_name,
+):
+    requests = []
+
+    async def record_request(request):
+        requests.append(request)
+
+    async_openai_client = AsyncOpenAI(
+        http_client=DefaultAsyncHttpxClient(event_hooks={"request": [record_request]})
+    )
+
+    response = await async_openai_client.chat.completions.with_raw_response.create(
+        model="gpt-4",
+        messages=[{"role": "user", "content": "Say this is a test"}],
+        stream=True,
+    )
+    chunks = [chunk async for chunk in response.parse()]
+
+    (span,) = span_exporter.get_finished_spans()
+    _assert_injected_usage(requests, chunks, span, metric_reader)
+
+
+@pytest.mark.vcr()
+@pytest.mark.parametrize("vcr_cassette_name", ["test_chat_completion_streaming"])
+def test_chat_completion_streaming_explicit_usage_option_kept(
+    span_exporter,
+    metric_reader,
+    instrument_with_content,
+    inject_stream_usage,
+    vcr_cassette_name,
+):
+    requests = []
+    openai_client = OpenAI(
+        http_client=DefaultHttpxClient(event_hooks={"request": [requests.append]})
+    )
+
+    chunks = list(
+        openai_client.chat.completions.create(
+            model="gpt-4",
+            messages=[{"role": "user", "content": "Say this is a test"}],
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+    )
+
+    # usage requested by the caller is returned to the caller
+    (request,) = requests
+    assert json.loads(request.content)["stream_options"] == {"include_usage": True}
+    assert chunks[-1].usage is not None
+    assert not chunks[-1].choices
@@ -0,0 +1,210 @@
+# Copyright Coralogix Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for recording the rate limits and retries of OpenAI requests."""
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from openai import AsyncOpenAI, OpenAI
+from opentelemetry.semconv._incubating.attributes import (
+    gen_ai_attributes as GenAIAttributes,
+)
+
+import llm_tracekit.core._extended_gen_ai_attributes as ExtendedGenAIAttributes
+from llm_tracekit.core import (
+    GEN_AI_CLIENT_RATE_LIMIT_LIMIT,
+    GEN_AI_CLIENT_RATE_LIMIT_REMAINING,
+    GEN_AI_CLIENT_RATE_LIMITED_RESPONSES,
+    GEN_AI_CLIENT_REQUEST_RETRIES,
+    GEN_AI_CLIENT_RETRY_BACKOFF_DURATION,
+    OTEL_INSTRUMENTATION_GENAI_CAPTURE_RATE_LIMITS,
+    RATE_LIMIT_TYPE_REQUESTS,
+    RATE_LIMIT_TYPE_TOKENS,
+)
+
+_COMPLETION = {
+    "id": "chatcmpl-1",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-4o-mini",
+    "choices": [
+        {
+            "index": 0,
+            "message": {"role": "assistant", "content": "This is a test."},
+            "finish_reason": "stop",
+        }
+    ],
+    "usage": {"prompt_tokens": 12, "completion_tokens": 5, "total_tokens": 17},
+}
+
+
+class _RateLimitedHandler(BaseHTTPRequestHandler):
+    """Rejects the first request with a 429, and completes the retry."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.requests += 1
+        if self.server.requests == 1:
+            status, body = 429, {"error": {"message": "Rate limit reached"}}
+            headers = {
+                "retry-after-ms": "10",
+                "x-ratelimit-remaining-requests": "0",
+                "x-ratelimit-remaining-tokens": "0",
+            }
+        else:
+            status, body = 200, _COMPLETION
+            headers = {
+                "x-ratelimit-limit-requests": "500",
+                "x-ratelimit-remaining-requests": "499",
+                "x-ratelimit-limit-tokens": "30000",
+                "x-ratelimit-remaining-tokens": "29983",
+            }
+        content = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(name="base_url")
+def fixture_base_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _RateLimitedHandler)
+    server.requests = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(name="capture_rate_limits")
+def fixture_capture_rate_limits(monkeypatch):
+    monkeypatch.setenv(OTEL_INSTRUMENTATION_GENAI_CAPTURE_RATE_LIMITS, "true")
+
+
+def _metrics(metric_reader):
+    (resource_metrics,) = metric_reader.get_metrics_data().resource_metrics
+    return {
+        metric.name: metric
+        for scope_metrics in resource_metrics.scope_metrics
+        for metric in scope_metrics.metrics
+    }
+
+
+def _assert_rate_limited_call(span_exporter, metric_reader):
+    (span,) = span_exporter.get_finished_spans()
+    assert span.attributes[ExtendedGenAIAttributes.GEN_AI_REQUEST_RETRIES] == 1
+    assert span.attributes[ExtendedGenAIAttributes.GEN_AI_RATE_LIMIT_RESPONSES] == 1
+    assert span.attributes[
+        ExtendedGenAIAttributes.GEN_AI_RATE_LIMIT_RETRY_AFTER
+    ] == pytest.approx(0.01)
+    assert span.attributes[
+        ExtendedGenAIAttributes.GEN_AI_REQUEST_BACKOFF_DURATION
+    ] == pytest.approx(0.01)
+    assert (
+        span.attributes[ExtendedGenAIAttributes.GEN_AI_RATE_LIMIT_REMAINING_REQUESTS]
+        == 499
+    )
+    assert (
+        span.attributes[ExtendedGenAIAttributes.GEN_AI_RATE_LIMIT_REMAINING_TOKENS]
+        == 29983
+    )
+
+    metrics = _metrics(metric_reader)
+    (rate_limited,) = metrics[GEN_AI_CLIENT_RATE_LIMITED_RESPONSES].data.data_points
+    assert rate_limited.value == 1
+    (retries,) = metrics[GEN_AI_CLIENT_REQUEST_RETRIES].data.data_points
+    assert retries.value == 1
+    (backoff,) = metrics[GEN_AI_CLIENT_RETRY_BACKOFF_DURATION].data.data_points
+    assert backoff.count == 1
+    assert backoff.sum == pytest.approx(0.01)
+
+    remaining = {
+        point.attributes[ExtendedGenAIAttributes.GEN_AI_RATE_LIMIT_TYPE]: point
+        for point in metrics[GEN_AI_CLIENT_RATE_LIMIT_REMAINING].data.data_points
+    }
+    assert remaining[RATE_LIMIT_TYPE_REQUESTS].value == 499
+    assert remaining[RATE_LIMIT_TYPE_TOKENS].value == 29983
+    attributes = remaining[RATE_LIMIT_TYPE_REQUESTS].attributes
+    assert attributes[GenAIAttributes.GEN_AI_REQUEST_MODEL] == "gpt-4o-mini"
+    assert attributes[GenAIAttributes.GEN_AI_SYSTEM] == "openai"
+    assert len(attributes[ExtendedGenAIAttributes.GEN_AI_API_KEY_ID]) == 12
+    assert "test_openai_api_key" not in attributes.values()
+
+    limits = {
+        point.attributes[ExtendedGenAIAttributes.GEN_AI_RATE_LIMIT_TYPE]: point.value
+        for point in metrics[GEN_AI_CLIENT_RATE_LIMIT_LIMIT].data.data_points
+    }
+    assert limits == {RATE_LIMIT_TYPE_REQUESTS: 500, RATE_LIMIT_TYPE_TOKENS: 30000}
+
+
+def test_rate_limited_chat_completion(
+    base_url, span_exporter, metric_reader, instrument_no_content, capture_rate_limits
+):
+    """Test a call retried after a 429 records its rate limits, retry and backoff."""
+    client = OpenAI(base_url=base_url, max_retries=1)
+    client.chat.completions.create(
+        messages=[{"role": "user", "content": "Say this is a test"}],
+        model="gpt-4o-mini",
+    )
+
+    _assert_rate_limited_call(span_exporter, metric_reader)
+
+
+def test_async_rate_limited_chat_completion(
+    base_url, span_exporter, metric_reader, instrument_no_content, capture_rate_limits
+):
+    """Test the rate limits of async clients are recorded by an async response hook."""
+
+    async def create():
+        async with AsyncOpenAI(base_url=base_url, max_retries=1) as client:
+            await client.chat.completions.create(
+                messages=[{"role": "user", "content": "Say this is a test"}],
+                model="gpt-4o-mini",
+            )
+
+    asyncio.run(create())
+
+    _assert_rate_limited_call(span_exporter, metric_reader)
+
+
+def test_rate_limits_not_captured(
+    base_url, span_exporter, metric_reader, instrument_no_content
+):
+    """Test rate limits and retries are not recorded unless capture is enabled."""
+    client = OpenAI(base_url=base_url, max_retries=1)
+    client.chat.completions.create(
+        messages=[{"role": "user", "content": "Say this is a test"}],
+        model="gpt-4o-mini",
+    )
+
+    (span,) = span_exporter.get_finished_spans()
+    assert ExtendedGenAIAttributes.GEN_AI_REQUEST_RETRIES not in span.attributes
+    assert (
+        ExtendedGenAIAttributes.GEN_AI_RATE_LIMIT_REMAINING_REQUESTS
+        not in span.attributes
+    )
+    assert GEN_AI_CLIENT_RATE_LIMITED_RESPONSES not in _metrics(metric_reader)
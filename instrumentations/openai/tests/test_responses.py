@@ -12,6 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from types import SimpleNamespace
+from typing import Any
+
 import pytest
 from openai import OpenAI
 from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
@@ -122,15 +125,7 @@ def test_responses_no_content(
     assert_choices_in_span(span=span, expected_choices=[choice], expect_content=False)
 
 
-def test_responses_stream_wrapper_completed_sets_span_attributes(
-    tracer_provider,
-    span_exporter: InMemorySpanExporter,
-):
-    from opentelemetry import trace
-
-    trace.set_tracer_provider(tracer_provider)
-    tracer = trace.get_tracer(__name__)
-
+def _completed_event(reasoning_tokens: int = 0) -> ResponseCompletedEvent:
     raw: dict = {
         "id": "resp_stream_test",
         "object": "response",
@@ -160,32 +155,45 @@ def test_responses_stream_wrapper_completed_sets_span_attributes(
             "output_tokens": 3,
             "total_tokens": 8,
             "input_tokens_details": {"cached_tokens": 0},
-            "output_tokens_details": {"reasoning_tokens": 0},
+            "output_tokens_details": {"reasoning_tokens": reasoning_tokens},
         },
     }
-    completed = ResponseCompletedEvent(
+    return ResponseCompletedEvent(
         type="response.completed",
         sequence_number=1,
         response=Response.model_validate(raw),
     )
 
-    class _EventStream:
-        def __init__(self) -> None:
-            self._it = iter([completed])
 
-        def __iter__(self) -> "_EventStream":
-            return self
+class _EventStream:
+    def __init__(self, events: list[Any]) -> None:
+        self._it = iter(events)
 
-        def __next__(self) -> ResponseCompletedEvent:
-            return next(self._it)
+    def __iter__(self) -> "_EventStream":
+        return self
 
-        def close(self) -> None:
-            pass
+    def __next__(self) -> Any:
+        return next(self._it)
+
+    def close(self) -> None:
+        pass
+
+
+def test_responses_stream_wrapper_completed_sets_span_attributes(
+    tracer_provider,
+    span_exporter: InMemorySpanExporter,
+):
+    from opentelemetry import trace
+
+    trace.set_tracer_provider(tracer_provider)
+    tracer = trace.get_tracer(__name__)
 
     with tracer.start_as_current_span(
         "responses_stream_test", end_on_exit=False
     ) as span:
-        wrapper = ResponsesStreamWrapper(_EventStream(), span, capture_content=True)
+        wrapper = ResponsesStreamWrapper(
+            _EventStream([_completed_event()]), span, capture_content=True
+        )
         for _ in wrapper:
             pass
 
@@ -200,3 +208,37 @@ def test_responses_stream_wrapper_completed_sets_span_attributes(
         ]
         == "Streamed reply."
     )
+
+
+def test_responses_stream_wrapper_estimates_reasoning_duration(
+    tracer_provider,
+    span_exporter: InMemorySpanExporter,
+):
+    tracer = tracer_provider.get_tracer(__name__)
+
+    events = [
+        SimpleNamespace(type="response.reasoning_summary_text.delta", delta="Hmm"),
+        SimpleNamespace(type="response.output_text.delta", delta="Streamed reply."),
+        _completed_event(reasoning_tokens=12),
+    ]
+    with tracer.start_as_current_span(
+        "responses_stream_test", end_on_exit=False
+    ) as span:
+        wrapper = ResponsesStreamWrapper(
+            _EventStream(events), span, capture_content=True, start_time=0.0
+        )
+        for _ in wrapper:
+            pass
+
+    (finished,) = span_exporter.get_finished_spans()
+    assert finished.attributes is not None
+    assert (
+        finished.attributes[
+            ExtendedGenAIAttributes.GEN_AI_USAGE_REASONING_OUTPUT_TOKENS
+        ]
+        == 12
+    )
+    assert (
+        finished.attributes[ExtendedGenAIAttributes.GEN_AI_RESPONSE_REASONING_DURATION]
+        > 0
+    )
@@ -17,13 +17,14 @@
 from __future__ import annotations
 
 import json
-from typing import Any
+from typing import Any, Mapping, Sequence
 
 from opentelemetry.trace import Span
 
 from llm_tracekit.core import (
     Choice,
     Message,
+    ToolAttributesCache,
     ToolCall,
     generate_choice_attributes,
     generate_message_attributes,
@@ -206,8 +207,7 @@ def _map_stop_reason(stop_reason: str | None) -> str:
     return reason_mapping.get(stop_reason.lower(), stop_reason)
 
 
-def _process_tool_specs(tool_specs: list[dict]) -> dict[str, Any]:
-    """Process tool specifications to extract tool definition attributes."""
+def _build_tool_specs_attributes(tool_specs: Sequence[dict]) -> dict[str, Any]:
     attributes: dict[str, Any] = {}
 
     for index, tool in enumerate(tool_specs):
@@ -254,6 +254,14 @@ def _process_tool_specs(tool_specs: list[dict]) -> dict[str, Any]:
     return attributes
 
 
+_tool_spec_attributes = ToolAttributesCache(_build_tool_specs_attributes)
+
+
+def _process_tool_specs(tool_specs: list[dict]) -> Mapping[str, Any]:
+    """Process tool specifications to extract tool definition attributes."""
+    return _tool_spec_attributes.get(tool_specs)
+
+
 def create_wrapped_start_model_invoke_span(original_func, capture_content: bool):
     """Create a wrapped version of start_model_invoke_span."""
 